@@ -0,0 +1,111 @@
+-- Employee Hierarchy Migration
+-- Creates a closure table over employee.manager_id so that subtree,
+-- manager-chain and "is X above Y" checks are single indexed queries
+
+-- ============================================================================
+-- Employee Hierarchy Closure Table
+-- One row per (ancestor, descendant) pair, plus a depth-0 self row
+-- ============================================================================
+CREATE TABLE employee_hierarchy (
+    ancestor_id INTEGER NOT NULL REFERENCES employee(id) ON DELETE CASCADE,
+    descendant_id INTEGER NOT NULL REFERENCES employee(id) ON DELETE CASCADE,
+    depth INTEGER NOT NULL,
+    PRIMARY KEY (ancestor_id, descendant_id)
+);
+
+-- ============================================================================
+-- Indexes for Query Performance
+-- ============================================================================
+
+-- Subtree lookups: all reports of a manager down to N levels
+CREATE INDEX idx_employee_hierarchy_ancestor_depth ON employee_hierarchy(ancestor_id, depth);
+
+-- Ancestor lookups: manager chain of an employee
+CREATE INDEX idx_employee_hierarchy_descendant_depth ON employee_hierarchy(descendant_id, depth);
+
+-- ============================================================================
+-- Hierarchy Maintenance
+-- Keeps the closure table in sync on insert and on manager changes,
+-- including FK-driven SET NULL when a manager is deleted
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION sync_employee_hierarchy()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO employee_hierarchy (ancestor_id, descendant_id, depth)
+        VALUES (NEW.id, NEW.id, 0);
+
+        IF NEW.manager_id IS NOT NULL THEN
+            INSERT INTO employee_hierarchy (ancestor_id, descendant_id, depth)
+            SELECT ancestor_id, NEW.id, depth + 1
+            FROM employee_hierarchy
+            WHERE descendant_id = NEW.manager_id;
+        END IF;
+
+        RETURN NEW;
+    END IF;
+
+    IF NEW.manager_id IS NOT DISTINCT FROM OLD.manager_id THEN
+        RETURN NEW;
+    END IF;
+
+    -- Reject cycles: the new manager may not sit inside the moved subtree
+    IF NEW.manager_id IS NOT NULL AND EXISTS (
+        SELECT 1 FROM employee_hierarchy
+        WHERE ancestor_id = NEW.id AND descendant_id = NEW.manager_id
+    ) THEN
+        RAISE EXCEPTION 'Circular reporting relationship: employee % cannot report to %',
+            NEW.id, NEW.manager_id;
+    END IF;
+
+    -- Detach the subtree rooted at NEW.id from its previous ancestors
+    DELETE FROM employee_hierarchy
+    WHERE descendant_id IN (
+        SELECT descendant_id FROM employee_hierarchy WHERE ancestor_id = NEW.id
+    )
+    AND ancestor_id IN (
+        SELECT ancestor_id FROM employee_hierarchy
+        WHERE descendant_id = NEW.id AND depth > 0
+    );
+
+    -- Attach the subtree under the new manager's ancestor chain
+    IF NEW.manager_id IS NOT NULL THEN
+        INSERT INTO employee_hierarchy (ancestor_id, descendant_id, depth)
+        SELECT sup.ancestor_id, sub.descendant_id, sup.depth + sub.depth + 1
+        FROM employee_hierarchy sup
+        CROSS JOIN employee_hierarchy sub
+        WHERE sup.descendant_id = NEW.manager_id
+          AND sub.ancestor_id = NEW.id;
+    END IF;
+
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trigger_employee_hierarchy_sync
+    AFTER INSERT OR UPDATE OF manager_id ON employee
+    FOR EACH ROW
+    EXECUTE FUNCTION sync_employee_hierarchy();
+
+-- ============================================================================
+-- Backfill
+-- Build closure rows for existing employees with a recursive walk
+-- ============================================================================
+INSERT INTO employee_hierarchy (ancestor_id, descendant_id, depth)
+WITH RECURSIVE closure AS (
+    SELECT id AS ancestor_id, id AS descendant_id, 0 AS depth
+    FROM employee
+    UNION ALL
+    SELECT c.ancestor_id, e.id, c.depth + 1
+    FROM closure c
+    JOIN employee e ON e.manager_id = c.descendant_id
+    WHERE c.depth < 100  -- guard against pre-existing reporting cycles
+)
+SELECT ancestor_id, descendant_id, depth FROM closure;
+
+-- ============================================================================
+-- Comments for Documentation
+-- ============================================================================
+COMMENT ON TABLE employee_hierarchy IS 'Closure table of the manager reporting hierarchy, maintained by trigger';
+COMMENT ON COLUMN employee_hierarchy.depth IS 'Reporting levels between ancestor and descendant (0 = self)';
@@ -0,0 +1,31 @@
+-- Time-Off Balance Accrual Migration
+-- Prepares time_off_balance for bulk accrual upserts: fractional balance
+-- values, one row per (employee, balance type, year), and the date of the
+-- last accrual applied so a repeated run does not accrue twice
+
+-- ============================================================================
+-- Fractional Balances
+-- Accruals such as 1.25 days per month were truncated by INTEGER columns
+-- ============================================================================
+ALTER TABLE time_off_balance
+    ALTER COLUMN total_allocated TYPE DOUBLE PRECISION,
+    ALTER COLUMN used TYPE DOUBLE PRECISION,
+    ALTER COLUMN pending TYPE DOUBLE PRECISION,
+    ALTER COLUMN available TYPE DOUBLE PRECISION,
+    ALTER COLUMN carried_over TYPE DOUBLE PRECISION;
+
+ALTER TABLE time_off_balance ADD COLUMN last_accrual_date DATE;
+
+-- ============================================================================
+-- Upsert Key
+-- Keep the most recently updated row of any duplicates before adding it
+-- ============================================================================
+DELETE FROM time_off_balance b
+USING time_off_balance newer
+WHERE b.employee_id = newer.employee_id
+  AND b.balance_type = newer.balance_type
+  AND b.year = newer.year
+  AND (b.last_updated, b.id) < (newer.last_updated, newer.id);
+
+CREATE UNIQUE INDEX uq_time_off_balance_employee_type_year
+    ON time_off_balance(employee_id, balance_type, year);
@@ -0,0 +1,45 @@
+-- Accrual Run Migration
+-- Tracks sharded accrual runs: one row per accrual date processed and
+-- one row per shard of employee ids, with the checkpoint a retried shard
+-- resumes from
+
+-- ============================================================================
+-- Accrual Runs
+-- ============================================================================
+CREATE TABLE accrual_run (
+    id SERIAL PRIMARY KEY,
+    accrual_date DATE NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    shard_size INTEGER NOT NULL,
+    shard_count INTEGER NOT NULL DEFAULT 0,
+    total_employees INTEGER NOT NULL DEFAULT 0,
+    report JSONB,
+    started_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    completed_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE INDEX ix_accrual_run_accrual_date ON accrual_run(accrual_date);
+
+-- ============================================================================
+-- Accrual Run Shards
+-- checkpoint_employee_id is the last employee whose accruals are committed
+-- ============================================================================
+CREATE TABLE accrual_run_shard (
+    id SERIAL PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES accrual_run(id) ON DELETE CASCADE,
+    shard_index INTEGER NOT NULL,
+    first_employee_id INTEGER NOT NULL,
+    last_employee_id INTEGER NOT NULL,
+    employee_count INTEGER NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    checkpoint_employee_id INTEGER,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    employees_processed INTEGER NOT NULL DEFAULT 0,
+    employees_accrued INTEGER NOT NULL DEFAULT 0,
+    elapsed_seconds DOUBLE PRECISION NOT NULL DEFAULT 0,
+    policy_totals JSONB,
+    error TEXT,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+CREATE UNIQUE INDEX uq_accrual_run_shard_run_index ON accrual_run_shard(run_id, shard_index);
@@ -0,0 +1,78 @@
+-- Balance Ledger Migration
+-- Creates an append-only ledger of balance movements per (employee, policy)
+-- and periodic snapshots of its running totals, so "balance as of" reads
+-- are a snapshot lookup plus the short tail of entries after it
+
+-- ============================================================================
+-- Ledger Entries
+-- Signed amounts: accruals, adjustments and carryover add, usage subtracts
+-- ============================================================================
+CREATE TABLE balance_ledger_entry (
+    id BIGSERIAL PRIMARY KEY,
+    employee_id INTEGER NOT NULL REFERENCES employee(id) ON DELETE CASCADE,
+    policy_id INTEGER NOT NULL REFERENCES time_off_policy(id) ON DELETE CASCADE,
+    entry_type VARCHAR(20) NOT NULL,
+    amount DOUBLE PRECISION NOT NULL,
+    effective_date DATE NOT NULL,
+    source_type VARCHAR(50),
+    source_id INTEGER,
+    description TEXT,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+-- As-of reads: the tail after a snapshot for one (employee, policy)
+CREATE INDEX idx_balance_ledger_entry_key_effective
+    ON balance_ledger_entry(employee_id, policy_id, effective_date);
+
+-- ============================================================================
+-- Ledger Snapshots
+-- Running totals per entry type of every entry effective on or before
+-- as_of_date; the primary key serves the latest-snapshot lookup
+-- ============================================================================
+CREATE TABLE balance_ledger_snapshot (
+    employee_id INTEGER NOT NULL REFERENCES employee(id) ON DELETE CASCADE,
+    policy_id INTEGER NOT NULL REFERENCES time_off_policy(id) ON DELETE CASCADE,
+    as_of_date DATE NOT NULL,
+    accrued DOUBLE PRECISION NOT NULL DEFAULT 0,
+    used DOUBLE PRECISION NOT NULL DEFAULT 0,
+    adjusted DOUBLE PRECISION NOT NULL DEFAULT 0,
+    carried_over DOUBLE PRECISION NOT NULL DEFAULT 0,
+    entry_count INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (employee_id, policy_id, as_of_date)
+);
+
+-- Finds the snapshots a backdated write invalidates
+CREATE INDEX idx_balance_ledger_snapshot_as_of_date ON balance_ledger_snapshot(as_of_date);
+
+-- ============================================================================
+-- Opening Entries
+-- Seed the ledger from existing balances, attributed to the (preferably
+-- active) policy of each balance type
+-- ============================================================================
+INSERT INTO balance_ledger_entry (
+    employee_id, policy_id, entry_type, amount, effective_date, source_type, description
+)
+SELECT
+    b.employee_id,
+    p.id,
+    v.entry_type,
+    v.amount,
+    v.effective_date,
+    'migration',
+    'Opening balance from time_off_balance'
+FROM time_off_balance b
+CROSS JOIN LATERAL (
+    SELECT id
+    FROM time_off_policy
+    WHERE policy_type = b.balance_type
+    ORDER BY (status = 'active') DESC, id
+    LIMIT 1
+) p
+CROSS JOIN LATERAL (
+    VALUES
+        ('carryover', b.carried_over, make_date(b.year, 1, 1)),
+        ('accrual', b.total_allocated, COALESCE(b.last_accrual_date, make_date(b.year, 1, 1))),
+        ('usage', -b.used, b.last_updated::date)
+) AS v(entry_type, amount, effective_date)
+WHERE v.amount <> 0;
@@ -0,0 +1,24 @@
+-- Approval Rollup Migration
+-- Daily buckets of time-off decisions per (department, manager, request
+-- type), updated by every approve, deny and cancel, that approval analytics
+-- merge instead of scanning requests. department_id and manager_id are 0
+-- when a request has none.
+--
+-- Existing history is backfilled with ApprovalRollupService.rebuild.
+
+CREATE TABLE approval_rollup (
+    decision_date DATE NOT NULL,
+    department_id INTEGER NOT NULL DEFAULT 0,
+    manager_id INTEGER NOT NULL DEFAULT 0,
+    request_type VARCHAR(50) NOT NULL,
+    approved_count INTEGER NOT NULL DEFAULT 0,
+    denied_count INTEGER NOT NULL DEFAULT 0,
+    cancelled_count INTEGER NOT NULL DEFAULT 0,
+    within_sla_count INTEGER NOT NULL DEFAULT 0,
+    -- DDSketch of decision latencies in hours (1% relative accuracy)
+    latency_sketch JSONB,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (decision_date, department_id, manager_id, request_type)
+);
+
+CREATE INDEX idx_approval_rollup_manager_date ON approval_rollup(manager_id, decision_date);
@@ -0,0 +1,47 @@
+-- Data Version Migration
+-- Version counters for groups of tables, bumped by statement-level
+-- triggers on every write, so caches derived from those tables can key
+-- entries by the version they were computed at. A reader that gets the
+-- version in the same statement as the data it caches can never store
+-- stale data under a current version.
+--
+-- Updating the group's row here holds its lock until the writing
+-- transaction commits, serialising every writer to the group behind the
+-- longest one; 012_data_version_change_log.sql replaces the update with a
+-- per-transaction change row.
+
+CREATE TABLE data_version (
+    name VARCHAR(50) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+INSERT INTO data_version (name) VALUES ('directory');
+
+CREATE OR REPLACE FUNCTION bump_data_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE data_version
+    SET version = version + 1, updated_at = NOW()
+    WHERE name = TG_ARGV[0];
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Directory: employees and the departments and locations they are faceted by
+CREATE TRIGGER trigger_employee_data_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON employee
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_data_version('directory');
+
+CREATE TRIGGER trigger_department_data_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON department
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_data_version('directory');
+
+CREATE TRIGGER trigger_location_data_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON location
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_data_version('directory');
+
+COMMENT ON TABLE data_version IS 'Version counters bumped on every write to a group of tables, for cache keys';
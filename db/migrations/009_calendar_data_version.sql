@@ -0,0 +1,30 @@
+-- Calendar Data Version Migration
+-- Adds a 'calendar' data_version group (see 008_create_data_version.sql)
+-- bumped by every write to the tables business calendars are built from:
+-- holidays, holiday calendars, locations (which assign a holiday calendar)
+-- and work schedules. Each process keys its built calendars by this
+-- version, so a write made by any API or worker process retires every
+-- process's calendars at its next lookup.
+
+INSERT INTO data_version (name) VALUES ('calendar')
+ON CONFLICT (name) DO NOTHING;
+
+CREATE TRIGGER trigger_holiday_calendar_data_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON holiday
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_data_version('calendar');
+
+CREATE TRIGGER trigger_holiday_calendar_calendar_data_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON holiday_calendar
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_data_version('calendar');
+
+CREATE TRIGGER trigger_location_calendar_data_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON location
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_data_version('calendar');
+
+CREATE TRIGGER trigger_work_schedule_calendar_data_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON work_schedule
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION bump_data_version('calendar');
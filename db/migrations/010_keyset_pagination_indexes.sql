@@ -0,0 +1,18 @@
+-- Keyset Pagination Index Migration
+-- Keyset pages order by their sort columns plus the primary key, so the
+-- indexes serving the directory name sort and the per-employee audit
+-- trail gain id as a final column. Each page is then one index seek to the
+-- cursor position followed by a scan of page_size entries.
+--
+-- CONCURRENTLY keeps both tables writable while the indexes are rebuilt;
+-- run this file outside a transaction block.
+
+-- Directory: ORDER BY last_name, first_name, id
+DROP INDEX CONCURRENTLY IF EXISTS idx_employee_name;
+CREATE INDEX CONCURRENTLY idx_employee_name
+    ON employee(last_name, first_name, id);
+
+-- Audit trail: WHERE employee_id = ? ORDER BY change_timestamp DESC, id DESC
+DROP INDEX CONCURRENTLY IF EXISTS idx_audit_employee_timestamp;
+CREATE INDEX CONCURRENTLY idx_audit_employee_timestamp
+    ON employee_audit_trail(employee_id, change_timestamp DESC, id DESC);
@@ -0,0 +1,7 @@
+-- Import Job Validation Error Count Migration
+-- import_jobs.validation_errors keeps only the first MAX_REPORTED_ERRORS
+-- errors found during validation; the full count is stored alongside it so
+-- status responses can report how many errors were left out.
+
+ALTER TABLE import_jobs
+    ADD COLUMN IF NOT EXISTS validation_error_count BIGINT NOT NULL DEFAULT 0;
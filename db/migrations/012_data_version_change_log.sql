@@ -0,0 +1,54 @@
+-- Data Version Change Log Migration
+-- The triggers from 008/009 bumped the group's data_version row, and the
+-- row lock was held until the writing transaction committed. A long write
+-- (a whole import runs in one transaction) blocked every other write to the
+-- group, and a transaction writing to both groups (locations bump
+-- 'calendar' and 'directory') could deadlock with one taking them in the
+-- other order.
+--
+-- Writes now record one row per writing transaction and group in
+-- data_version_change, keyed by transaction id, so concurrent writers
+-- never touch the same row. A group's version is its data_version.version
+-- plus its committed change rows; a reader that gets it in the same
+-- statement as the data it caches still sees the write and its change
+-- row together. fold_data_version_changes() moves committed change rows
+-- into data_version.version without changing any group's version.
+
+CREATE TABLE data_version_change (
+    name VARCHAR(50) NOT NULL REFERENCES data_version(name),
+    xid BIGINT NOT NULL,
+    PRIMARY KEY (name, xid)
+);
+
+CREATE OR REPLACE FUNCTION bump_data_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO data_version_change (name, xid)
+    VALUES (TG_ARGV[0], txid_current())
+    ON CONFLICT DO NOTHING;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Deletes only the change rows visible to it, so rows of transactions
+-- still in flight are left for the next fold
+CREATE OR REPLACE FUNCTION fold_data_version_changes()
+RETURNS BIGINT AS $$
+    WITH folded AS (
+        DELETE FROM data_version_change
+        RETURNING name
+    ),
+    counts AS (
+        SELECT name, count(*) AS changes FROM folded GROUP BY name
+    ),
+    bumped AS (
+        UPDATE data_version
+        SET version = data_version.version + counts.changes, updated_at = NOW()
+        FROM counts
+        WHERE data_version.name = counts.name
+        RETURNING counts.changes
+    )
+    SELECT COALESCE(SUM(changes), 0)::BIGINT FROM bumped;
+$$ LANGUAGE sql;
+
+COMMENT ON TABLE data_version_change IS 'One row per transaction that wrote to a data_version group, until folded';
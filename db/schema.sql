@@ -118,7 +118,7 @@ CREATE INDEX idx_employee_manager_id ON employee(manager_id);
 CREATE INDEX idx_employee_location_id ON employee(location_id);
 CREATE INDEX idx_employee_employment_status ON employee(employment_status);
 CREATE INDEX idx_employee_is_active ON employee(is_active);
-CREATE INDEX idx_employee_name ON employee(last_name, first_name);
+CREATE INDEX idx_employee_name ON employee(last_name, first_name, id);
 
 -- ============================================================================
 -- Add deferred foreign key from Department to Employee
@@ -11,6 +11,7 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from src.database.database import get_db
+from src.infrastructure.redis.caching_service import get_cache_service
 from src.models.employee import Department, Employee
 from src.utils.auth import CurrentUser, UserRole, get_mock_current_user
 from src.utils.errors import ForbiddenError, NotFoundError, ValidationError
@@ -600,6 +601,7 @@ async def update_reporting_relationship(
     employee.manager_id = request.manager_id
     session.commit()
     session.refresh(employee)
+    get_cache_service().invalidate_visibility_sets()
     
     # Get updated hierarchy path
     hierarchy_path = get_employee_hierarchy_path(employee, session)
@@ -1,8 +1,16 @@
 """API endpoints for approval analytics and monitoring."""
 
+import calendar
+from collections import defaultdict
 from datetime import date, datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.database.database import DbSession, get_router_db, run_db
+from src.models.approval_rollup import UNASSIGNED
+from src.models.employee import Department, Employee
 
 from src.schemas.approval_analytics import (
     ApprovalAnalyticsResponse,
@@ -25,6 +33,14 @@ from src.schemas.approval_analytics import (
     TrendComparison,
     TrendDirection,
 )
+from src.services.approval_rollup_service import ApprovalRollupService, RollupTotals
+
+
+# Approval-rate change, in points, that counts as a trend
+TREND_THRESHOLD = 1.0
+
+# Department SLA compliance below this percentage raises an insight
+SLA_COMPLIANCE_TARGET = 95.0
 
 
 approval_analytics_router = APIRouter(
@@ -108,6 +124,7 @@ async def get_approval_analytics(
     include_patterns: bool = Query(default=True, description="Include pattern analysis"),
     include_manager_comparison: bool = Query(default=True, description="Include manager comparison"),
     include_insights: bool = Query(default=True, description="Include actionable insights"),
+    session: DbSession = Depends(get_router_db("approval_analytics")),
 ):
     """
     Get comprehensive approval analytics and performance metrics.
@@ -120,6 +137,11 @@ async def get_approval_analytics(
     - Organizational unit analytics
     - Actionable insights for process improvement
     
+    Figures come from the approval rollups, which every approve, deny and
+    cancel updates, so a date range is read from its daily buckets instead
+    of scanning request history. Decision-time percentiles are within 1% of
+    the exact values.
+    
     **Access Control**: Managers, HR, and administrators can access analytics.
     """
     current_user = get_current_user()
@@ -134,203 +156,176 @@ async def get_approval_analytics(
     end_dt = end_date or date.today()
     start_dt = start_date or (end_dt - timedelta(days=30))
     
-    # Mock approval rate metrics
+    return await run_db(
+        session,
+        load_approval_analytics,
+        start_dt,
+        end_dt,
+        department_id=department_id,
+        manager_id=manager_id,
+        request_type=request_type,
+        include_patterns=include_patterns,
+        include_manager_comparison=include_manager_comparison,
+        include_insights=include_insights,
+    )
+
+
+def load_approval_analytics(
+    session: Session,
+    start_dt: date,
+    end_dt: date,
+    department_id: Optional[int],
+    manager_id: Optional[int],
+    request_type: Optional[str],
+    include_patterns: bool,
+    include_manager_comparison: bool,
+    include_insights: bool,
+) -> ApprovalAnalyticsResponse:
+    """Build approval analytics from the decision rollups of a date range."""
+    rollups = ApprovalRollupService(session)
+    filters = dict(department_id=department_id, manager_id=manager_id, request_type=request_type)
+    summary = rollups.summarize(start_dt, end_dt, **filters)
+    overall = summary.overall
+    
+    # Same-length period immediately before, for the trend
+    period = end_dt - start_dt + timedelta(days=1)
+    previous = rollups.summarize(start_dt - period, start_dt - timedelta(days=1), **filters).overall
+    previous_period_rate = previous.approval_rate if previous.total else None
+    rate_change = None
+    trend = TrendDirection.STABLE
+    if previous_period_rate is not None:
+        rate_change = round(overall.approval_rate - previous_period_rate, 1)
+        if rate_change >= TREND_THRESHOLD:
+            trend = TrendDirection.UP
+        elif rate_change <= -TREND_THRESHOLD:
+            trend = TrendDirection.DOWN
+    
     approval_rates = ApprovalRateMetric(
-        total_requests=245,
-        approved_count=198,
-        denied_count=35,
-        cancelled_count=12,
-        approval_rate=80.8,
-        denial_rate=14.3,
-        previous_period_rate=78.5,
-        rate_change=2.3,
-        trend=TrendDirection.UP,
+        total_requests=overall.total,
+        approved_count=overall.approved,
+        denied_count=overall.denied,
+        cancelled_count=overall.cancelled,
+        approval_rate=overall.approval_rate,
+        denial_rate=overall.denial_rate,
+        previous_period_rate=previous_period_rate,
+        rate_change=rate_change,
+        trend=trend,
     )
     
-    # Mock timeline metrics
     timeline_metrics = TimelineMetric(
-        average_hours_to_decision=18.5,
-        median_hours_to_decision=12.0,
-        min_hours_to_decision=0.5,
-        max_hours_to_decision=96.0,
-        percentile_90=36.0,
-        sla_target_hours=48.0,
-        sla_compliance_rate=92.5,
-        requests_within_sla=227,
-        requests_over_sla=18,
+        average_hours_to_decision=overall.average_hours,
+        median_hours_to_decision=overall.percentile_hours(0.5) or 0.0,
+        min_hours_to_decision=round(overall.latency_min or 0.0, 1),
+        max_hours_to_decision=round(overall.latency_max or 0.0, 1),
+        percentile_90=overall.percentile_hours(0.9) or 0.0,
+        sla_target_hours=rollups.sla_target_hours,
+        sla_compliance_rate=overall.sla_compliance,
+        requests_within_sla=overall.within_sla,
+        requests_over_sla=overall.over_sla,
     )
     
-    # Mock pattern analysis
     daily_patterns = None
     weekly_patterns = None
     monthly_patterns = None
     
     if include_patterns:
-        # Daily pattern (by day of week)
-        daily_patterns = PatternAnalysis(
-            pattern_type="daily",
-            data_points=[
-                PatternDataPoint(label="Monday", count=52, approved=42, denied=8, pending=2, average_time_to_decision=20.0),
-                PatternDataPoint(label="Tuesday", count=48, approved=40, denied=6, pending=2, average_time_to_decision=18.0),
-                PatternDataPoint(label="Wednesday", count=45, approved=36, denied=7, pending=2, average_time_to_decision=17.5),
-                PatternDataPoint(label="Thursday", count=42, approved=34, denied=6, pending=2, average_time_to_decision=19.0),
-                PatternDataPoint(label="Friday", count=58, approved=46, denied=8, pending=4, average_time_to_decision=22.0),
-            ],
-            peak_period="Friday",
-            low_period="Thursday",
-            insights=[
-                "Request volume peaks on Fridays",
-                "Decision times are fastest mid-week",
-                "Consider additional capacity for Friday submissions",
+        # Daily pattern (by day of week of the decision)
+        daily_patterns = build_pattern(
+            "daily",
+            [
+                (calendar.day_name[weekday], None, summary.by_weekday[weekday])
+                for weekday in sorted(summary.by_weekday)
             ],
         )
         
-        # Weekly pattern
-        weekly_patterns = PatternAnalysis(
-            pattern_type="weekly",
-            data_points=[
-                PatternDataPoint(label="Week 1", date=start_dt, count=58, approved=47, denied=9, pending=2),
-                PatternDataPoint(label="Week 2", date=start_dt + timedelta(days=7), count=62, approved=50, denied=10, pending=2),
-                PatternDataPoint(label="Week 3", date=start_dt + timedelta(days=14), count=55, approved=44, denied=8, pending=3),
-                PatternDataPoint(label="Week 4", date=start_dt + timedelta(days=21), count=70, approved=57, denied=8, pending=5),
-            ],
-            peak_period="Week 4",
-            low_period="Week 3",
-            insights=[
-                "Volume tends to increase toward month-end",
-                "Approval rates remain consistent across weeks",
+        # Weekly pattern (weeks starting Monday)
+        weekly_patterns = build_pattern(
+            "weekly",
+            [
+                (f"Week of {week_start.isoformat()}", week_start, summary.by_week[week_start])
+                for week_start in sorted(summary.by_week)
             ],
         )
     
-    # Mock analytics by request type
     by_request_type = [
-        {"request_type": "PTO", "count": 150, "approval_rate": 82.0, "avg_decision_hours": 16.5},
-        {"request_type": "Sick Leave", "count": 60, "approval_rate": 95.0, "avg_decision_hours": 8.0},
-        {"request_type": "Personal", "count": 25, "approval_rate": 72.0, "avg_decision_hours": 24.0},
-        {"request_type": "Bereavement", "count": 10, "approval_rate": 100.0, "avg_decision_hours": 2.0},
+        {
+            "request_type": type_name,
+            "count": totals.total,
+            "approval_rate": totals.approval_rate,
+            "avg_decision_hours": totals.average_hours,
+        }
+        for type_name, totals in sorted(
+            summary.by_request_type.items(), key=lambda item: -item[1].total
+        )
     ]
     
-    # Mock department analytics
-    by_department = [
-        OrgUnitAnalytics(
-            unit_id=100,
-            unit_name="Engineering",
-            unit_type="department",
-            total_requests=85,
-            pending_requests=5,
-            overdue_requests=1,
-            approval_rate=81.5,
-            average_decision_hours=17.0,
-            sla_compliance=93.0,
-            vs_company_average=0.7,
-        ),
-        OrgUnitAnalytics(
-            unit_id=101,
-            unit_name="Sales",
-            unit_type="department",
-            total_requests=65,
-            pending_requests=4,
-            overdue_requests=0,
-            approval_rate=78.5,
-            average_decision_hours=20.0,
-            sla_compliance=90.0,
-            vs_company_average=-2.3,
-        ),
-        OrgUnitAnalytics(
-            unit_id=102,
-            unit_name="Marketing",
+    # Pending work is live state, counted per (department, manager)
+    pending = rollups.pending_counts(**filters)
+    pending_by_department: Dict[int, List[int]] = defaultdict(lambda: [0, 0])
+    pending_by_manager: Dict[int, int] = defaultdict(int)
+    for (unit_id, approver_id), (pending_count, overdue_count) in pending.items():
+        pending_by_department[unit_id][0] += pending_count
+        pending_by_department[unit_id][1] += overdue_count
+        pending_by_manager[approver_id] += pending_count
+    
+    manager_ids = []
+    managers = {}
+    if include_manager_comparison:
+        manager_ids = [unit_id for unit_id in summary.by_manager if unit_id != UNASSIGNED]
+        managers = {
+            row.id: row
+            for row in session.execute(
+                select(Employee.id, Employee.first_name, Employee.last_name, Employee.department_id)
+                .where(Employee.id.in_(manager_ids))
+            )
+        } if manager_ids else {}
+    
+    department_ids = set(summary.by_department) | set(pending_by_department)
+    lookup_ids = department_ids | {manager.department_id for manager in managers.values()}
+    department_names = dict(session.execute(
+        select(Department.id, Department.name).where(Department.id.in_(lookup_ids))
+    ).all()) if lookup_ids else {}
+    
+    by_department = []
+    for unit_id in sorted(department_ids, key=lambda unit: -summary.by_department[unit].total):
+        totals = summary.by_department[unit_id]
+        unit_pending, unit_overdue = pending_by_department[unit_id]
+        by_department.append(OrgUnitAnalytics(
+            unit_id=unit_id,
+            unit_name=department_names.get(unit_id, "Unassigned"),
             unit_type="department",
-            total_requests=45,
-            pending_requests=2,
-            overdue_requests=1,
-            approval_rate=84.0,
-            average_decision_hours=15.0,
-            sla_compliance=95.0,
-            vs_company_average=3.2,
-        ),
-    ]
+            total_requests=totals.total,
+            pending_requests=unit_pending,
+            overdue_requests=unit_overdue,
+            approval_rate=totals.approval_rate,
+            average_decision_hours=totals.average_hours,
+            sla_compliance=totals.sla_compliance,
+            vs_company_average=round(totals.approval_rate - overall.approval_rate, 1),
+        ))
     
-    # Mock manager performance
     manager_performance = []
     if include_manager_comparison:
-        manager_performance = [
-            ManagerPerformance(
-                manager_id=1,
-                manager_name="John Manager",
-                department="Engineering",
-                total_decisions=45,
-                pending_count=3,
-                approval_rate=82.0,
-                denial_rate=16.0,
-                average_decision_hours=15.5,
-                sla_compliance=95.0,
-                vs_team_average=3.5,
-                vs_company_average=1.2,
-                performance_score=88.0,
-            ),
-            ManagerPerformance(
-                manager_id=2,
-                manager_name="Jane Lead",
-                department="Engineering",
-                total_decisions=38,
-                pending_count=2,
-                approval_rate=78.5,
-                denial_rate=18.5,
-                average_decision_hours=18.0,
-                sla_compliance=92.0,
-                vs_team_average=-0.5,
-                vs_company_average=-2.3,
-                performance_score=82.0,
-            ),
-            ManagerPerformance(
-                manager_id=3,
-                manager_name="Bob Director",
-                department="Sales",
-                total_decisions=55,
-                pending_count=4,
-                approval_rate=80.0,
-                denial_rate=14.5,
-                average_decision_hours=22.0,
-                sla_compliance=88.0,
-                vs_team_average=1.5,
-                vs_company_average=-0.8,
-                performance_score=78.0,
-            ),
-        ]
+        for approver_id in sorted(manager_ids, key=lambda unit: -summary.by_manager[unit].decisions):
+            totals = summary.by_manager[approver_id]
+            if not totals.decisions:
+                continue
+            manager = managers.get(approver_id)
+            manager_performance.append(ManagerPerformance(
+                manager_id=approver_id,
+                manager_name=f"{manager.first_name} {manager.last_name}" if manager else f"Manager {approver_id}",
+                department=department_names.get(manager.department_id) if manager else None,
+                total_decisions=totals.decisions,
+                pending_count=pending_by_manager.get(approver_id, 0),
+                approval_rate=totals.approval_rate,
+                denial_rate=totals.denial_rate,
+                average_decision_hours=totals.average_hours,
+                sla_compliance=totals.sla_compliance,
+                vs_company_average=round(totals.approval_rate - overall.approval_rate, 1),
+            ))
     
-    # Mock actionable insights
     insights = []
     if include_insights:
-        insights = [
-            ActionableInsight(
-                insight_id="INS-001",
-                category="performance",
-                severity="info",
-                title="Approval rates improving",
-                description="Approval rates have increased 2.3% compared to previous period",
-                metric_value=2.3,
-                recommended_action="Continue current approval practices",
-            ),
-            ActionableInsight(
-                insight_id="INS-002",
-                category="compliance",
-                severity="warning",
-                title="SLA compliance below target in Sales",
-                description="Sales department SLA compliance is 90%, below 95% target",
-                metric_value=90.0,
-                recommended_action="Review Sales team approval workflows",
-                affected_entity="Sales Department",
-            ),
-            ActionableInsight(
-                insight_id="INS-003",
-                category="trend",
-                severity="info",
-                title="Friday volume spike pattern detected",
-                description="Request submissions are 25% higher on Fridays",
-                metric_value=25.0,
-                recommended_action="Consider staggered submission deadlines",
-            ),
-        ]
+        insights = build_insights(approval_rates, timeline_metrics, by_department)
     
     return ApprovalAnalyticsResponse(
         start_date=start_dt,
@@ -348,6 +343,99 @@ async def get_approval_analytics(
     )
 
 
+def build_pattern(
+    pattern_type: str,
+    periods: List[Tuple[str, Optional[date], RollupTotals]],
+) -> PatternAnalysis:
+    """Pattern analysis over labelled periods of merged rollups."""
+    data_points = [
+        PatternDataPoint(
+            label=label,
+            date=period_start,
+            count=totals.total,
+            approved=totals.approved,
+            denied=totals.denied,
+            average_time_to_decision=totals.average_hours if totals.decisions else None,
+        )
+        for label, period_start, totals in periods
+    ]
+    if not data_points:
+        return PatternAnalysis(pattern_type=pattern_type, data_points=[])
+    
+    peak = max(data_points, key=lambda point: point.count)
+    low = min(data_points, key=lambda point: point.count)
+    insights = [f"Decision volume peaks in {peak.label}" if pattern_type == "weekly"
+                else f"Decision volume peaks on {peak.label}"]
+    timed = [point for point in data_points if point.average_time_to_decision is not None]
+    if len(timed) > 1:
+        fastest = min(timed, key=lambda point: point.average_time_to_decision)
+        insights.append(f"Decisions are fastest for {fastest.label}")
+    
+    return PatternAnalysis(
+        pattern_type=pattern_type,
+        data_points=data_points,
+        peak_period=peak.label,
+        low_period=low.label,
+        insights=insights,
+    )
+
+
+def build_insights(
+    approval_rates: ApprovalRateMetric,
+    timeline_metrics: TimelineMetric,
+    by_department: List[OrgUnitAnalytics],
+) -> List[ActionableInsight]:
+    """Actionable insights from the computed metrics."""
+    insights = []
+    
+    if approval_rates.rate_change is not None and approval_rates.trend != TrendDirection.STABLE:
+        direction = "increased" if approval_rates.trend == TrendDirection.UP else "decreased"
+        insights.append(ActionableInsight(
+            insight_id=f"INS-{len(insights) + 1:03d}",
+            category="trend",
+            severity="info",
+            title=f"Approval rates {direction}",
+            description=(
+                f"Approval rate has {direction} {abs(approval_rates.rate_change)}% "
+                f"compared to the previous period"
+            ),
+            metric_value=approval_rates.rate_change,
+        ))
+    
+    sla_target = timeline_metrics.sla_target_hours
+    if timeline_metrics.percentile_90 > sla_target:
+        insights.append(ActionableInsight(
+            insight_id=f"INS-{len(insights) + 1:03d}",
+            category="performance",
+            severity="warning",
+            title="Slowest decisions exceed the SLA",
+            description=(
+                f"10% of decisions took longer than {timeline_metrics.percentile_90} hours, "
+                f"over the {sla_target:g}-hour SLA"
+            ),
+            metric_value=timeline_metrics.percentile_90,
+            recommended_action="Review approver workloads and delegation coverage",
+        ))
+    
+    for unit in by_department:
+        if unit.total_requests and unit.sla_compliance < SLA_COMPLIANCE_TARGET:
+            insights.append(ActionableInsight(
+                insight_id=f"INS-{len(insights) + 1:03d}",
+                category="compliance",
+                severity="warning",
+                title=f"SLA compliance below target in {unit.unit_name}",
+                description=(
+                    f"{unit.unit_name} SLA compliance is {unit.sla_compliance}%, "
+                    f"below the {SLA_COMPLIANCE_TARGET:g}% target"
+                ),
+                metric_value=unit.sla_compliance,
+                recommended_action=f"Review {unit.unit_name} approval workflows",
+                affected_entity=unit.unit_name,
+            ))
+    
+    return insights
+
+
 # =============================================================================
 # Overdue Endpoint
 # =============================================================================
@@ -32,6 +32,8 @@ from src.schemas.approval_context import (
     TeamMemberAvailability,
     CalendarEntry,
 )
+from src.services.business_calendar_service import BusinessCalendar, BusinessCalendarService
+from src.services.team_absence_service import TeamAbsenceService, TeamAbsenceWindow
 from src.utils.auth import CurrentUser, UserRole, get_mock_current_user
 
 logger = logging.getLogger(__name__)
@@ -89,70 +91,76 @@ def get_team_members(manager_id: int, session: Session) -> List[Employee]:
     return list(session.execute(stmt).scalars().all())
 
 
+def load_team_absences(
+    request: TimeOffRequest,
+    team_members: List[Employee],
+    session: Session,
+) -> TeamAbsenceWindow:
+    """Load the team's approved and pending requests overlapping a request."""
+    return TeamAbsenceService(session).load_window(
+        [member.id for member in team_members],
+        request.start_date,
+        request.end_date,
+    )
+
+
 def analyze_conflicts(
     request: TimeOffRequest,
     team_members: List[Employee],
     session: Session,
+    absences: Optional[TeamAbsenceWindow] = None,
 ) -> tuple[List[ConflictDetail], ConflictSummary]:
     """Analyze conflicts with team members."""
     conflicts = []
     
-    # Get time-off requests from team members in overlapping period
-    for member in team_members:
-        if member.id == request.employee_id:
-            continue
+    if absences is None:
+        absences = load_team_absences(request, team_members, session)
+    members_by_id = {member.id: member for member in team_members}
+    
+    # Time-off requests from team members in overlapping period
+    for member_id, other_req, overlap_start, overlap_end in absences.overlaps(
+        request.start_date,
+        request.end_date,
+        [member.id for member in team_members],
+        exclude_employee_id=request.employee_id,
+    ):
+        member = members_by_id[member_id]
+        overlap_days = (overlap_end - overlap_start).days + 1
         
-        stmt = select(TimeOffRequest).where(
-            TimeOffRequest.employee_id == member.id,
-            TimeOffRequest.status.in_([
-                TimeOffRequestStatus.APPROVED.value,
-                TimeOffRequestStatus.PENDING_APPROVAL.value,
-            ]),
-            TimeOffRequest.start_date <= request.end_date,
-            TimeOffRequest.end_date >= request.start_date,
-        )
-        overlapping = session.execute(stmt).scalars().all()
+        # Generate overlap dates
+        overlap_dates = [
+            overlap_start + timedelta(days=i)
+            for i in range(overlap_days)
+        ]
         
-        for other_req in overlapping:
-            # Calculate overlap
-            overlap_start = max(request.start_date, other_req.start_date)
-            overlap_end = min(request.end_date, other_req.end_date)
-            overlap_days = (overlap_end - overlap_start).days + 1
-            
-            # Generate overlap dates
-            overlap_dates = [
-                overlap_start + timedelta(days=i)
-                for i in range(overlap_days)
-            ]
-            
-            # Determine impact level
-            impact_level = ImpactLevelEnum.LOW
-            if overlap_days > 3:
-                impact_level = ImpactLevelEnum.MEDIUM
-            if overlap_days > 5:
-                impact_level = ImpactLevelEnum.HIGH
-            
-            conflicts.append(ConflictDetail(
-                conflict_id=str(uuid.uuid4()),
-                conflict_type=ConflictTypeEnum.OVERLAP,
-                conflicting_employee=TeamMemberInfo(
-                    id=member.id,
-                    employee_id=member.employee_id,
-                    name=f"{member.first_name} {member.last_name}",
-                    job_title=member.job_title,
-                    is_critical_function=False,
-                    functions=[],
-                ),
-                overlap_dates=overlap_dates,
-                total_overlap_days=overlap_days,
-                impact_level=impact_level,
-                impact_description=f"{overlap_days} days overlap with {member.first_name}",
-                resolution_options=[
-                    "Adjust request dates",
-                    "Coordinate coverage plan",
-                    "Stagger time-off periods",
-                ],
-            ))
+        # Determine impact level
+        impact_level = ImpactLevelEnum.LOW
+        if overlap_days > 3:
+            impact_level = ImpactLevelEnum.MEDIUM
+        if overlap_days > 5:
+            impact_level = ImpactLevelEnum.HIGH
+        
+        conflicts.append(ConflictDetail(
+            conflict_id=str(uuid.uuid4()),
+            conflict_type=ConflictTypeEnum.OVERLAP,
+            conflicting_employee=TeamMemberInfo(
+                id=member.id,
+                employee_id=member.employee_id,
+                name=f"{member.first_name} {member.last_name}",
+                job_title=member.job_title,
+                is_critical_function=False,
+                functions=[],
+            ),
+            overlap_dates=overlap_dates,
+            total_overlap_days=overlap_days,
+            impact_level=impact_level,
+            impact_description=f"{overlap_days} days overlap with {member.first_name}",
+            resolution_options=[
+                "Adjust request dates",
+                "Coordinate coverage plan",
+                "Stagger time-off periods",
+            ],
+        ))
     
     # Build summary
     critical_count = sum(1 for c in conflicts if c.impact_level == ImpactLevelEnum.CRITICAL)
@@ -190,36 +198,41 @@ def analyze_coverage(
     request: TimeOffRequest,
     team_members: List[Employee],
     session: Session,
+    absences: Optional[TeamAbsenceWindow] = None,
+    calendar: Optional[BusinessCalendar] = None,
 ) -> CoverageAnalysis:
-    """Analyze team coverage during requested period."""
+    """
+    Analyze team coverage during requested period.
+    
+    Workdays follow the requesting employee's business calendar (work
+    schedule and location holidays) unless a calendar is given.
+    """
     daily_coverage = []
     critical_days = []
     days_below_minimum = 0
     
     minimum_required = max(1, len(team_members) // 2)  # 50% minimum
     
-    current_date = request.start_date
-    while current_date <= request.end_date:
-        is_workday = current_date.weekday() < 5
-        
-        if is_workday:
+    if absences is None:
+        absences = load_team_absences(request, team_members, session)
+    if calendar is None:
+        employee = session.get(Employee, request.employee_id)
+        calendar = BusinessCalendarService(session).get_calendar(
+            employee.location_id if employee else None,
+            employee.work_schedule_id if employee else None,
+            absences.start_date,
+            absences.end_date,
+        )
+    names_by_id = {member.id: f"{member.first_name} {member.last_name}" for member in team_members}
+    
+    # Members with approved time-off, bucketed by day
+    absent_by_day = absences.absence_buckets([member.id for member in team_members])
+    
+    for current_date, absent_ids in zip(absences.dates(), absent_by_day):
+        if calendar.is_working_day(current_date):
             # Count available team members
-            available_count = len(team_members)
-            absent_employees = []
-            
-            for member in team_members:
-                # Check if member has approved time-off
-                stmt = select(TimeOffRequest).where(
-                    TimeOffRequest.employee_id == member.id,
-                    TimeOffRequest.status == TimeOffRequestStatus.APPROVED.value,
-                    TimeOffRequest.start_date <= current_date,
-                    TimeOffRequest.end_date >= current_date,
-                )
-                is_absent = session.execute(stmt).scalars().first() is not None
-                
-                if is_absent:
-                    available_count -= 1
-                    absent_employees.append(f"{member.first_name} {member.last_name}")
+            available_count = len(team_members) - len(absent_ids)
+            absent_employees = [names_by_id[member_id] for member_id in absent_ids]
             
             # Subtract the requesting employee
             available_count -= 1
@@ -247,8 +260,6 @@ def analyze_coverage(
                 critical_functions_covered=available_count > 0,
                 absent_employees=absent_employees,
             ))
-        
-        current_date += timedelta(days=1)
     
     # Determine overall status
     overall_status = CoverageStatusEnum.ADEQUATE
@@ -478,8 +489,11 @@ async def get_approval_context(
             detail="Employee not found",
         )
     
-    # Get team members
+    # Get team members and their overlapping time-off in one query
     team_members = get_team_members(employee.manager_id or manager_id, session)
+    absences = None
+    if include_conflicts or include_coverage:
+        absences = load_team_absences(time_off_request, team_members, session)
     
     # Analyze conflicts
     conflicts = []
@@ -492,7 +506,9 @@ async def get_approval_context(
         recommendation="No conflicts detected",
     )
     if include_conflicts:
-        conflicts, conflict_summary = analyze_conflicts(time_off_request, team_members, session)
+        conflicts, conflict_summary = analyze_conflicts(
+            time_off_request, team_members, session, absences
+        )
     
     # Analyze coverage
     coverage_analysis = CoverageAnalysis(
@@ -506,7 +522,12 @@ async def get_approval_context(
         impact_assessment="Coverage analysis not performed",
     )
     if include_coverage:
-        coverage_analysis = analyze_coverage(time_off_request, team_members, session)
+        calendar = BusinessCalendarService(session).get_employee_calendar(
+            employee, time_off_request.start_date, time_off_request.end_date
+        )
+        coverage_analysis = analyze_coverage(
+            time_off_request, team_members, session, absences, calendar
+        )
     
     # Analyze policies
     policy_analysis = PolicyAnalysis(
@@ -624,8 +645,13 @@ async def get_team_calendar(
     manager = session.get(Employee, manager_id)
     team_name = f"{manager.first_name}'s Team" if manager else "Team"
     
-    # Get team members
+    # Get team members and all their requests in the range in one query
     team_members = get_team_members(manager_id, session)
+    absences = TeamAbsenceService(session).load_window(
+        [member.id for member in team_members],
+        start_date,
+        end_date,
+    )
     
     # Build team member availability
     team_availability = []
@@ -633,23 +659,8 @@ async def get_team_calendar(
     pending_entries = []
     
     for member in team_members:
-        # Get approved requests
-        approved_stmt = select(TimeOffRequest).where(
-            TimeOffRequest.employee_id == member.id,
-            TimeOffRequest.status == TimeOffRequestStatus.APPROVED.value,
-            TimeOffRequest.start_date <= end_date,
-            TimeOffRequest.end_date >= start_date,
-        )
-        approved = list(session.execute(approved_stmt).scalars().all())
-        
-        # Get pending requests
-        pending_stmt = select(TimeOffRequest).where(
-            TimeOffRequest.employee_id == member.id,
-            TimeOffRequest.status == TimeOffRequestStatus.PENDING_APPROVAL.value,
-            TimeOffRequest.start_date <= end_date,
-            TimeOffRequest.end_date >= start_date,
-        )
-        pending = list(session.execute(pending_stmt).scalars().all())
+        approved = absences.requests_for(member.id, [TimeOffRequestStatus.APPROVED.value])
+        pending = absences.requests_for(member.id, [TimeOffRequestStatus.PENDING_APPROVAL.value])
         
         # Calculate available/unavailable dates
         unavailable_dates = set()
@@ -725,17 +736,13 @@ async def get_team_calendar(
     # Build coverage by date
     coverage_by_date = {}
     if include_coverage:
-        current = start_date
-        while current <= end_date:
+        names_by_id = {avail.employee.id: avail.employee.name for avail in team_availability}
+        absent_by_day = absences.absence_buckets(list(names_by_id))
+        
+        for current, absent_ids in zip(absences.dates(), absent_by_day):
             if current.weekday() < 5:
-                available_count = 0
-                absent_list = []
-                
-                for avail in team_availability:
-                    if current in avail.dates_available:
-                        available_count += 1
-                    else:
-                        absent_list.append(avail.employee.name)
+                available_count = len(team_availability) - len(absent_ids)
+                absent_list = [names_by_id[member_id] for member_id in absent_ids]
                 
                 minimum_required = max(1, len(team_members) // 2)
                 
@@ -758,8 +765,6 @@ async def get_team_calendar(
                     critical_functions_covered=available_count > 0,
                     absent_employees=absent_list,
                 )
-            
-            current += timedelta(days=1)
     
     # Get organizational events
     org_events = get_organizational_events(start_date, end_date)
@@ -28,6 +28,7 @@ from src.schemas.approval_management import (
     PolicyConsideration,
     ConflictSeverityEnum,
 )
+from src.services.approval_rollup_service import ApprovalRollupService
 from src.utils.auth import CurrentUser, UserRole, get_mock_current_user
 
 logger = logging.getLogger(__name__)
@@ -503,6 +504,9 @@ async def approve_request(
     }
     time_off_request.balance_after = balance_impact["new_balance"]
     
+    # Count the decision in the approval analytics rollup
+    ApprovalRollupService(session).record_transition(time_off_request, decided_by=manager_id)
+    
     # Commit changes
     session.commit()
     
@@ -606,6 +610,9 @@ async def deny_request(
     time_off_request.updated_at = datetime.utcnow()
     time_off_request.updated_by = manager_id
     
+    # Count the decision in the approval analytics rollup
+    ApprovalRollupService(session).record_transition(time_off_request, decided_by=manager_id)
+    
     # Commit changes
     session.commit()
     
@@ -9,10 +9,10 @@ from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, s
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from src.database.database import get_db
+from src.database.database import DbSession, get_router_db, run_db
 from src.models.employee import Employee
-from src.models.time_off_request import TimeOffRequest, TimeOffRequestStatus, TimeOffBalance
-from src.models.time_off_policy import TimeOffPolicy, PolicyStatus
+from src.models.time_off_request import TimeOffRequest, TimeOffRequestStatus
+from src.models.time_off_policy import TimeOffPolicy
 from src.schemas.balance_inquiry import (
     EmployeeBalanceResponse,
     BalanceProjectionResponse,
@@ -28,6 +28,8 @@ from src.schemas.balance_inquiry import (
     PolicyProjection,
     ProjectionComponent,
 )
+from src.services.balance_ledger_service import BalanceLedgerService
+from src.services.batch_balance_service import AccrualEvent, BatchBalanceService, scheduled_accruals
 from src.utils.auth import CurrentUser, UserRole, get_mock_current_user
 
 logger = logging.getLogger(__name__)
@@ -140,54 +142,17 @@ def calculate_scheduled_accruals(
     to_date: date,
 ) -> List[ScheduledAccrual]:
     """Calculate scheduled accruals for a period."""
-    accruals = []
-    
-    if policy.accrual_method == "annual_lump_sum":
-        # Annual lump sum typically accrues on anniversary or Jan 1
-        next_year = date(from_date.year + 1, 1, 1)
-        if from_date <= next_year <= to_date:
-            accruals.append(ScheduledAccrual(
-                accrual_date=next_year,
-                accrual_type=AccrualTypeEnum.REGULAR,
-                amount=policy.base_accrual_rate,
-                description=f"Annual {policy.name} allocation",
-            ))
-    
-    elif policy.accrual_method == "monthly_accrual":
-        monthly_rate = policy.base_accrual_rate / 12
-        current = from_date.replace(day=1) + timedelta(days=32)
-        current = current.replace(day=1)  # First of next month
-        
-        while current <= to_date:
-            accruals.append(ScheduledAccrual(
-                accrual_date=current,
-                accrual_type=AccrualTypeEnum.REGULAR,
-                amount=monthly_rate,
-                description=f"Monthly {policy.name} accrual",
-            ))
-            current = (current + timedelta(days=32)).replace(day=1)
-    
-    elif policy.accrual_method == "pay_period_accrual":
-        # Assuming bi-weekly pay periods
-        biweekly_rate = policy.base_accrual_rate / 26
-        current = from_date
-        while current <= to_date:
-            # Find next Friday (typical pay day)
-            days_until_friday = (4 - current.weekday()) % 14
-            if days_until_friday == 0:
-                days_until_friday = 14
-            next_pay = current + timedelta(days=days_until_friday)
-            
-            if next_pay <= to_date:
-                accruals.append(ScheduledAccrual(
-                    accrual_date=next_pay,
-                    accrual_type=AccrualTypeEnum.REGULAR,
-                    amount=biweekly_rate,
-                    description=f"Pay period {policy.name} accrual",
-                ))
-            current = next_pay + timedelta(days=1)
-    
-    return accruals
+    return [to_scheduled_accrual(event) for event in scheduled_accruals(policy, from_date, to_date)]
+
+
+def to_scheduled_accrual(event: AccrualEvent) -> ScheduledAccrual:
+    """Map a service accrual event to its API schema."""
+    return ScheduledAccrual(
+        accrual_date=event.accrual_date,
+        accrual_type=AccrualTypeEnum.REGULAR,
+        amount=event.amount,
+        description=event.description,
+    )
 
 
 def get_employee_balance(
@@ -202,43 +167,32 @@ def get_employee_balance(
     current_year = as_of_date.year
     balances = []
     
-    # Get active policies
-    stmt = select(TimeOffPolicy).where(
-        TimeOffPolicy.status == PolicyStatus.ACTIVE.value
-    )
-    policies = session.execute(stmt).scalars().all()
-    
-    for policy in policies:
-        # Get balance record
-        balance_stmt = select(TimeOffBalance).where(
-            TimeOffBalance.employee_id == employee_id,
-            TimeOffBalance.balance_type == policy.policy_type,
-            TimeOffBalance.year == current_year,
+    figures = BatchBalanceService(session).get_balances([employee_id], as_of_date).get(employee_id)
+    if figures is None:
+        return balances
+    
+    # Past dates are answered from the ledger's entries for that year
+    ledger_balances = {}
+    if as_of_date < date.today() and figures.policies:
+        ledger_balances = BalanceLedgerService(session).year_balances_as_of(
+            employee_id, [p.policy.id for p in figures.policies], as_of_date
         )
-        balance_record = session.execute(balance_stmt).scalars().first()
-        
-        # Default values
-        total_allocated = policy.base_accrual_rate
-        used = 0.0
-        pending = 0.0
-        carried_over = 0.0
+    
+    for policy_figures in figures.policies:
+        policy = policy_figures.policy
+        total_allocated = policy_figures.total_allocated
+        used = policy_figures.used
+        pending = policy_figures.pending
+        carried_over = policy_figures.carried_over
         
-        if balance_record:
-            total_allocated = balance_record.total_allocated
-            used = balance_record.used
-            pending = balance_record.pending
-            carried_over = balance_record.carried_over
+        ledger_balance = ledger_balances.get(policy.id)
+        if ledger_balance is not None and ledger_balance.has_history:
+            total_allocated = ledger_balance.accrued + ledger_balance.adjusted
+            used = -ledger_balance.used
+            carried_over = ledger_balance.carried_over
         
         available = total_allocated + carried_over - used - pending
         
-        # Get pending requests
-        pending_stmt = select(TimeOffRequest).where(
-            TimeOffRequest.employee_id == employee_id,
-            TimeOffRequest.request_type == policy.policy_type,
-            TimeOffRequest.status == TimeOffRequestStatus.PENDING_APPROVAL.value,
-        )
-        pending_requests = session.execute(pending_stmt).scalars().all()
-        
         pending_request_info = [
             PendingRequestInfo(
                 request_id=req.id,
@@ -249,14 +203,10 @@ def get_employee_balance(
                 status=req.status,
                 submitted_at=req.submitted_at or req.created_at,
             )
-            for req in pending_requests
+            for req in policy_figures.pending_requests
         ]
         
-        # Calculate scheduled accruals
-        end_of_year = date(current_year, 12, 31)
-        scheduled = calculate_scheduled_accruals(
-            employee_id, policy, as_of_date, end_of_year
-        )
+        scheduled = [to_scheduled_accrual(event) for event in policy_figures.scheduled_accruals]
         
         next_accrual = scheduled[0] if scheduled else None
         
@@ -462,7 +412,7 @@ def calculate_projection(
 )
 async def get_my_balance(
     current_user: Annotated[CurrentUser, Depends(get_current_user)],
-    session: Annotated[Session, Depends(get_db)],
+    session: Annotated[DbSession, Depends(get_router_db("balances"))],
     as_of_date: Optional[date] = Query(default=None, description="Balance as of date"),
 ) -> EmployeeBalanceResponse:
     """
@@ -474,6 +424,15 @@ async def get_my_balance(
     - Pending requests
     - Available balance after pending requests
     """
+    return await run_db(session, load_my_balance, current_user, as_of_date)
+
+
+def load_my_balance(
+    session: Session,
+    current_user: CurrentUser,
+    as_of_date: Optional[date],
+) -> EmployeeBalanceResponse:
+    """Load the current user's balances."""
     employee_id = current_user.employee_id or 1
     
     # Get employee info
@@ -511,7 +470,7 @@ async def get_my_balance(
 async def get_employee_balance_by_id(
     employee_id: int,
     current_user: Annotated[CurrentUser, Depends(get_current_user)],
-    session: Annotated[Session, Depends(get_db)],
+    session: Annotated[DbSession, Depends(get_router_db("balances"))],
     as_of_date: Optional[date] = Query(default=None, description="Balance as of date"),
 ) -> EmployeeBalanceResponse:
     """
@@ -522,6 +481,16 @@ async def get_employee_balance_by_id(
     - HR/Admin can view anyone
     - Employees cannot view others' balances
     """
+    return await run_db(session, load_employee_balance, employee_id, current_user, as_of_date)
+
+
+def load_employee_balance(
+    session: Session,
+    employee_id: int,
+    current_user: CurrentUser,
+    as_of_date: Optional[date],
+) -> EmployeeBalanceResponse:
+    """Load an employee's balances after checking access."""
     # Validate access
     if not validate_access(current_user, employee_id, session):
         raise HTTPException(
@@ -563,7 +532,7 @@ async def get_employee_balance_by_id(
 )
 async def get_balance_projection(
     current_user: Annotated[CurrentUser, Depends(get_current_user)],
-    session: Annotated[Session, Depends(get_db)],
+    session: Annotated[DbSession, Depends(get_router_db("balances"))],
     projection_date: date = Query(..., description="Date to project balance to"),
     employee_id: Optional[int] = Query(default=None, description="Employee ID"),
     policy_id: Optional[int] = Query(default=None, description="Policy ID"),
@@ -578,6 +547,28 @@ async def get_balance_projection(
     - Pending requests impact
     - Running balance by date
     """
+    return await run_db(
+        session,
+        load_balance_projection,
+        current_user=current_user,
+        projection_date=projection_date,
+        employee_id=employee_id,
+        policy_id=policy_id,
+        include_pending=include_pending,
+        include_accruals=include_accruals,
+    )
+
+
+def load_balance_projection(
+    session: Session,
+    current_user: CurrentUser,
+    projection_date: date,
+    employee_id: Optional[int],
+    policy_id: Optional[int],
+    include_pending: bool,
+    include_accruals: bool,
+) -> BalanceProjectionResponse:
+    """Project balances to a date."""
     target_employee_id = employee_id or current_user.employee_id or 1
     
     # Validate access
@@ -669,13 +660,22 @@ async def get_balance_projection(
 async def calculate_balance_projection(
     request: ProjectionRequest,
     current_user: Annotated[CurrentUser, Depends(get_current_user)],
-    session: Annotated[Session, Depends(get_db)],
+    session: Annotated[DbSession, Depends(get_router_db("balances"))],
 ) -> BalanceProjectionResponse:
     """
     Calculate balance projection with scenario adjustments.
     
     Allows modeling "what-if" scenarios by adding adjustments.
     """
+    return await run_db(session, load_scenario_projection, request, current_user)
+
+
+def load_scenario_projection(
+    session: Session,
+    request: ProjectionRequest,
+    current_user: CurrentUser,
+) -> BalanceProjectionResponse:
+    """Project balances to a date with scenario adjustments."""
     target_employee_id = request.employee_id or current_user.employee_id or 1
     
     # Validate access
@@ -744,4 +744,3 @@ async def calculate_balance_projection(
         total_projected_accruals=sum(p.projected_accruals for p in projections),
         warnings=warnings,
     )
-
@@ -11,6 +11,7 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from src.database.database import get_db
+from src.infrastructure.redis.caching_service import get_cache_service
 from src.models.employee import Employee, Department
 from src.utils.auth import CurrentUser, UserRole, get_mock_current_user
 from src.utils.errors import ForbiddenError, NotFoundError, ValidationError
@@ -566,6 +567,7 @@ async def assign_employee_to_department(
         
         session.commit()
         session.refresh(employee)
+        get_cache_service().invalidate_visibility_sets()
     
     # Get reporting manager name
     reporting_manager_name = None
@@ -659,6 +661,7 @@ async def assign_head_of_department(
         session.commit()
         session.refresh(department)
         session.refresh(employee)
+        get_cache_service().invalidate_visibility_sets()
     
     return HeadOfDepartmentResponse(
         employee=build_employee_info(employee),
@@ -7,11 +7,18 @@ from typing import Annotated, Any, Dict, List, Optional
 
 from fastapi import APIRouter, Depends, Header, Query, Request
 from pydantic import BaseModel, Field
-from sqlalchemy import func, select, distinct
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from src.database.database import get_db
 from src.models.employee import Employee, Department, Location
+from src.services.directory_facet_service import (
+    TENURE_BUCKETS,
+    DirectoryFacetFilters,
+    DirectoryFacets,
+    DirectoryFacetService,
+)
+from src.services.org_analytics_service import OrgAnalytics, OrgAnalyticsService
 from src.utils.auth import CurrentUser, UserRole, get_mock_current_user
 from src.utils.errors import ForbiddenError
 
@@ -235,27 +242,17 @@ class OrganizationalAnalyticsResponse(BaseModel):
 # Helper Functions
 # =============================================================================
 
-def build_department_filter(session: Session) -> FilterDefinition:
+def build_department_filter(facets: DirectoryFacets) -> FilterDefinition:
     """Build department filter with counts."""
-    result = session.execute(
-        select(
-            Department.id,
-            Department.name,
-            func.count(Employee.id).label("count"),
+    options = [
+        FilterOption(
+            value=str(department_id),
+            label=name,
+            count=facets.count("department", department_id),
+            is_active=facets.count("department", department_id) > 0,
         )
-        .outerjoin(Employee, Employee.department_id == Department.id)
-        .where(Department.is_active == True)
-        .group_by(Department.id, Department.name)
-        .order_by(Department.name)
-    )
-    
-    options = []
-    for row in result:
-        options.append(FilterOption(
-            value=str(row.id),
-            label=row.name,
-            count=row.count or 0,
-        ))
+        for department_id, name in facets.departments
+    ]
     
     return FilterDefinition(
         id="department",
@@ -267,27 +264,17 @@ def build_department_filter(session: Session) -> FilterDefinition:
     )
 
 
-def build_location_filter(session: Session) -> FilterDefinition:
+def build_location_filter(facets: DirectoryFacets) -> FilterDefinition:
     """Build location filter with counts."""
-    result = session.execute(
-        select(
-            Location.id,
-            Location.name,
-            func.count(Employee.id).label("count"),
+    options = [
+        FilterOption(
+            value=str(location_id),
+            label=name,
+            count=facets.count("location", location_id),
+            is_active=facets.count("location", location_id) > 0,
         )
-        .outerjoin(Employee, Employee.location_id == Location.id)
-        .where(Location.is_active == True)
-        .group_by(Location.id, Location.name)
-        .order_by(Location.name)
-    )
-    
-    options = []
-    for row in result:
-        options.append(FilterOption(
-            value=str(row.id),
-            label=row.name,
-            count=row.count or 0,
-        ))
+        for location_id, name in facets.locations
+    ]
     
     return FilterDefinition(
         id="location",
@@ -299,27 +286,18 @@ def build_location_filter(session: Session) -> FilterDefinition:
     )
 
 
-def build_employment_type_filter(session: Session) -> FilterDefinition:
+def build_employment_type_filter(facets: DirectoryFacets) -> FilterDefinition:
     """Build employment type filter."""
-    result = session.execute(
-        select(
-            Employee.employment_type,
-            func.count(Employee.id).label("count"),
+    options = [
+        FilterOption(
+            value=employment_type,
+            label=employment_type.replace("_", " ").title(),
+            count=count,
         )
-        .where(Employee.is_active == True)
-        .where(Employee.employment_type.isnot(None))
-        .group_by(Employee.employment_type)
-    )
-    
-    options = []
-    for row in result:
-        if row.employment_type:
-            label = row.employment_type.replace("_", " ").title()
-            options.append(FilterOption(
-                value=row.employment_type,
-                label=label,
-                count=row.count,
-            ))
+        for employment_type, count in sorted(
+            (key, count) for key, count in facets.counts["employment_type"].items() if key
+        )
+    ]
     
     return FilterDefinition(
         id="employment_type",
@@ -331,19 +309,8 @@ def build_employment_type_filter(session: Session) -> FilterDefinition:
     )
 
 
-def build_is_manager_filter(session: Session) -> FilterDefinition:
-    """Build is manager filter."""
-    # Count managers (employees with direct reports)
-    manager_count = session.execute(
-        select(func.count(distinct(Employee.manager_id)))
-        .where(Employee.is_active == True)
-        .where(Employee.manager_id.isnot(None))
-    ).scalar() or 0
-    
-    total = session.execute(
-        select(func.count()).where(Employee.is_active == True)
-    ).scalar() or 0
-    
+def build_is_manager_filter(facets: DirectoryFacets) -> FilterDefinition:
+    """Build is manager filter (employees with active direct reports)."""
     return FilterDefinition(
         id="is_manager",
         name="Manager Status",
@@ -351,59 +318,24 @@ def build_is_manager_filter(session: Session) -> FilterDefinition:
         filter_type=FilterType.SINGLE_SELECT,
         description="Filter by whether employee has direct reports",
         options=[
-            FilterOption(value="true", label="Is a Manager", count=manager_count),
-            FilterOption(value="false", label="Not a Manager", count=total - manager_count),
+            FilterOption(value="true", label="Is a Manager", count=facets.count("is_manager", True)),
+            FilterOption(value="false", label="Not a Manager", count=facets.count("is_manager", False)),
         ],
     )
 
 
-def build_tenure_filter(session: Session) -> FilterDefinition:
-    """Build tenure range filter."""
-    # Get min and max hire dates
-    result = session.execute(
-        select(
-            func.min(Employee.hire_date),
-            func.max(Employee.hire_date),
-        ).where(Employee.is_active == True)
-    ).first()
-    
-    min_date = result[0] if result else None
-    max_date = result[1] if result else None
-    
-    today = date.today()
-    
-    # Calculate tenure buckets
-    buckets = [
-        ("0-6 months", 0, 183),
-        ("6-12 months", 184, 365),
-        ("1-2 years", 366, 730),
-        ("2-5 years", 731, 1825),
-        ("5+ years", 1826, 99999),
-    ]
-    
-    options = []
-    for label, min_days, max_days in buckets:
-        count = session.execute(
-            select(func.count())
-            .where(Employee.is_active == True)
-            .where(Employee.hire_date.isnot(None))
-            .where(func.datediff(func.current_date(), Employee.hire_date) >= min_days)
-            .where(func.datediff(func.current_date(), Employee.hire_date) <= max_days)
-        ).scalar() or 0
-        
-        options.append(FilterOption(
-            value=label.replace(" ", "_").lower(),
-            label=label,
-            count=count,
-        ))
-    
+def build_tenure_filter(facets: DirectoryFacets) -> FilterDefinition:
+    """Build tenure filter with counts per bucket."""
     return FilterDefinition(
         id="tenure",
         name="Tenure",
         category=FilterCategory.TEMPORAL,
         filter_type=FilterType.MULTI_SELECT,
         description="Filter by length of employment",
-        options=options,
+        options=[
+            FilterOption(value=value, label=label, count=facets.count("tenure", value))
+            for value, label, _ in TENURE_BUCKETS
+        ],
     )
 
 
@@ -424,7 +356,7 @@ def generate_filter_suggestions(
         ))
     
     # Suggest location for HR
-    if UserRole.HR in user.roles:
+    if UserRole.HR_MANAGER in user.roles:
         suggestions.append(FilterSuggestion(
             filter_id="location",
             reason="Analyze workforce distribution by location",
@@ -451,45 +383,22 @@ def generate_filter_suggestions(
 
 def calculate_span_of_control(
     manager_id: int,
-    session: Session,
+    analytics: OrgAnalytics,
 ) -> tuple[int, int]:
-    """Calculate direct and total reports for a manager."""
-    direct = session.execute(
-        select(func.count())
-        .where(Employee.manager_id == manager_id)
-        .where(Employee.is_active == True)
-    ).scalar() or 0
-    
-    # For total, would recursively count all reports
-    # Simplified here to direct only
-    total = direct
-    
-    return direct, total
+    """Direct and total (all levels) reports for a manager."""
+    span = analytics.managers.get(manager_id)
+    if span is None:
+        return 0, 0
+    return span.direct_reports, span.total_reports
 
 
 def analyze_department_density(
     department: Department,
-    session: Session,
+    analytics: OrgAnalytics,
 ) -> DepartmentDensity:
     """Analyze density metrics for a department."""
-    # Count employees
-    total_employees = session.execute(
-        select(func.count())
-        .where(Employee.department_id == department.id)
-        .where(Employee.is_active == True)
-    ).scalar() or 0
-    
-    # Count managers in department
-    managers_count = session.execute(
-        select(func.count(distinct(Employee.manager_id)))
-        .where(Employee.department_id == department.id)
-        .where(Employee.manager_id.isnot(None))
-        .where(Employee.is_active == True)
-    ).scalar() or 0
-    
-    # Calculate ratio
-    ratio = managers_count / total_employees if total_employees > 0 else 0
-    avg_span = total_employees / managers_count if managers_count > 0 else 0
+    headcount = analytics.headcount(department_id=department.id)
+    avg_span = headcount.average_span
     
     # Efficiency score (simplified)
     # Optimal span is 5-8, penalty for too narrow or too wide
@@ -502,11 +411,11 @@ def analyze_department_density(
     return DepartmentDensity(
         department_id=department.id,
         department_name=department.name,
-        total_employees=total_employees,
-        managers_count=managers_count,
-        manager_to_employee_ratio=round(ratio, 3),
+        total_employees=headcount.employees,
+        managers_count=headcount.managers,
+        manager_to_employee_ratio=round(headcount.manager_ratio, 3),
         average_span_of_control=round(avg_span, 1),
-        max_depth=3,  # Simplified
+        max_depth=headcount.depth,
         efficiency_score=efficiency,
     )
 
@@ -619,12 +528,22 @@ async def get_directory_filters(
     current_user: Annotated[CurrentUser, Depends(get_current_user)],
     session: Annotated[Session, Depends(get_db)],
     context: Optional[str] = Query(None, description="Context for filter suggestions"),
+    # Filters already applied, which the counts reflect
+    department_id: Optional[List[int]] = Query(None, description="Selected departments"),
+    location_id: Optional[List[int]] = Query(None, description="Selected locations"),
+    employment_type: Optional[List[str]] = Query(None, description="Selected employment types"),
+    is_manager: Optional[bool] = Query(None, description="Selected manager status"),
+    tenure: Optional[List[str]] = Query(None, description="Selected tenure buckets"),
+    hire_date_from: Optional[date] = Query(None, description="Hired on or after"),
+    hire_date_to: Optional[date] = Query(None, description="Hired on or before"),
+    is_active: Optional[bool] = Query(True, description="Active status (managers and above)"),
 ) -> FiltersResponse:
     """
     Get available filters for employee directory.
     
     - Provides demographic, employment, organizational, and geographic filters
-    - Includes counts for each filter option
+    - Includes counts for each filter option, for the filters already applied:
+      each facet counts matches of every other filter, in one query
     - Generates intelligent suggestions based on user role
     - Enforces privacy policy and access levels
     """
@@ -632,43 +551,32 @@ async def get_directory_filters(
     
     # Build filters based on access level
     access_level = "employee"
-    if UserRole.HR in current_user.roles or UserRole.ADMIN in current_user.roles:
+    if UserRole.HR_MANAGER in current_user.roles or UserRole.ADMIN in current_user.roles:
         access_level = "admin"
     elif UserRole.MANAGER in current_user.roles:
         access_level = "manager"
     
-    # Department filter
-    dept_filter = build_department_filter(session)
-    filters.append(dept_filter)
-    
-    # Location filter
-    loc_filter = build_location_filter(session)
-    filters.append(loc_filter)
-    
-    # Employment type filter
-    emp_type_filter = build_employment_type_filter(session)
-    filters.append(emp_type_filter)
-    
-    # Manager status filter
-    manager_filter = build_is_manager_filter(session)
-    filters.append(manager_filter)
-    
-    # Tenure filter (simplified without date diff function)
-    filters.append(FilterDefinition(
-        id="tenure",
-        name="Tenure",
-        category=FilterCategory.TEMPORAL,
-        filter_type=FilterType.MULTI_SELECT,
-        description="Filter by length of employment",
-        options=[
-            FilterOption(value="0_6_months", label="0-6 months", count=0),
-            FilterOption(value="6_12_months", label="6-12 months", count=0),
-            FilterOption(value="1_2_years", label="1-2 years", count=0),
-            FilterOption(value="2_5_years", label="2-5 years", count=0),
-            FilterOption(value="5_plus_years", label="5+ years", count=0),
-        ],
+    # Only managers and above can see inactive employees
+    if access_level == "employee":
+        is_active = True
+    
+    facets = DirectoryFacetService(session).get_facets(DirectoryFacetFilters(
+        department_ids=frozenset(department_id or ()),
+        location_ids=frozenset(location_id or ()),
+        employment_types=frozenset(employment_type or ()),
+        is_manager=is_manager,
+        tenure=frozenset(tenure or ()),
+        hire_date_from=hire_date_from,
+        hire_date_to=hire_date_to,
+        is_active=is_active,
     ))
     
+    filters.append(build_department_filter(facets))
+    filters.append(build_location_filter(facets))
+    filters.append(build_employment_type_filter(facets))
+    filters.append(build_is_manager_filter(facets))
+    filters.append(build_tenure_filter(facets))
+    
     # Hire date range filter
     filters.append(FilterDefinition(
         id="hire_date",
@@ -703,16 +611,11 @@ async def get_directory_filters(
     # Generate suggestions
     suggestions = generate_filter_suggestions(current_user, session)
     
-    # Get total employees
-    total = session.execute(
-        select(func.count()).where(Employee.is_active == True)
-    ).scalar() or 0
-    
     return FiltersResponse(
         filters=filters,
         categories=categories,
         suggestions=suggestions,
-        total_employees=total,
+        total_employees=facets.total,
         access_level=access_level,
     )
 
@@ -740,27 +643,16 @@ async def get_organizational_density(
     Requires HR or Admin role.
     """
     # Check permissions
-    if not any(r in current_user.roles for r in [UserRole.HR, UserRole.ADMIN]):
+    if not any(r in current_user.roles for r in [UserRole.HR_MANAGER, UserRole.ADMIN]):
         raise ForbiddenError(message="Insufficient permissions for analytics access")
     
-    # Base query conditions
-    conditions = [Employee.is_active == True]
-    if department_id:
-        conditions.append(Employee.department_id == department_id)
-    if location_id:
-        conditions.append(Employee.location_id == location_id)
-    
-    # Total employees
-    total_employees = session.execute(
-        select(func.count()).where(*conditions)
-    ).scalar() or 0
+    # Reporting tree, summarized in one pass and cached by data version
+    analytics = OrgAnalyticsService(session).get_analytics()
+    scope = analytics.headcount(department_id=department_id, location_id=location_id)
     
-    # Total managers (employees with reports)
-    total_managers = session.execute(
-        select(func.count(distinct(Employee.manager_id)))
-        .where(Employee.manager_id.isnot(None))
-        .where(*conditions)
-    ).scalar() or 0
+    # Total employees, and managers (employees with reports)
+    total_employees = scope.employees
+    total_managers = scope.managers
     
     # Total departments
     total_departments = session.execute(
@@ -773,24 +665,22 @@ async def get_organizational_density(
     ).scalar() or 0
     
     # Calculate overall ratios
-    manager_ratio = total_managers / total_employees if total_employees > 0 else 0
-    avg_span = total_employees / total_managers if total_managers > 0 else 0
+    manager_ratio = scope.manager_ratio
+    avg_span = scope.average_span
     
-    # Span of control analysis for top managers
+    # Span of control analysis for the managers of the largest organizations
     span_analysis = []
-    result = session.execute(
-        select(Employee)
-        .where(Employee.is_active == True)
-        .where(Employee.id.in_(
-            select(distinct(Employee.manager_id))
-            .where(Employee.manager_id.isnot(None))
-        ))
-        .limit(20)
-    )
-    managers = list(result.scalars())
+    spans = analytics.spans(department_id=department_id, location_id=location_id)[:20]
+    names = {
+        row.id: f"{row.first_name} {row.last_name}"
+        for row in session.execute(
+            select(Employee.id, Employee.first_name, Employee.last_name)
+            .where(Employee.id.in_([span.employee_id for span in spans]))
+        )
+    } if spans else {}
     
-    for manager in managers:
-        direct, total = calculate_span_of_control(manager.id, session)
+    for span in spans:
+        direct = span.direct_reports
         is_optimal = 4 <= direct <= 8
         recommendation = None
         if direct < 4:
@@ -799,11 +689,11 @@ async def get_organizational_density(
             recommendation = "Consider adding team lead"
         
         span_analysis.append(SpanOfControlMetric(
-            manager_id=manager.id,
-            manager_name=f"{manager.first_name} {manager.last_name}",
+            manager_id=span.employee_id,
+            manager_name=names.get(span.employee_id, ""),
             direct_reports=direct,
-            total_reports=total,
-            organizational_level=0,  # Simplified
+            total_reports=span.total_reports,
+            organizational_level=span.level,
             is_optimal=is_optimal,
             recommendation=recommendation,
         ))
@@ -816,7 +706,7 @@ async def get_organizational_density(
     departments = list(result.scalars())
     
     for dept in departments:
-        density = analyze_department_density(dept, session)
+        density = analyze_department_density(dept, analytics)
         dept_density.append(density)
     
     # Location density
@@ -827,23 +717,11 @@ async def get_organizational_density(
     locations = list(result.scalars())
     
     for loc in locations:
-        emp_count = session.execute(
-            select(func.count())
-            .where(Employee.location_id == loc.id)
-            .where(Employee.is_active == True)
-        ).scalar() or 0
-        
-        depts_count = session.execute(
-            select(func.count(distinct(Employee.department_id)))
-            .where(Employee.location_id == loc.id)
-            .where(Employee.is_active == True)
-        ).scalar() or 0
-        
         loc_density.append(LocationDensity(
             location_id=loc.id,
             location_name=loc.name,
-            total_employees=emp_count,
-            departments_represented=depts_count,
+            total_employees=analytics.headcount(location_id=loc.id).employees,
+            departments_represented=len(analytics.department_ids(location_id=loc.id)),
         ))
     
     # Tenure distribution
@@ -889,7 +767,7 @@ async def get_organizational_density(
         total_locations=total_locations,
         overall_manager_ratio=round(manager_ratio, 3),
         average_span_of_control=round(avg_span, 1),
-        average_organizational_depth=3.0,  # Simplified
+        average_organizational_depth=round(scope.average_depth, 1),
         span_of_control_analysis=span_analysis,
         department_density=dept_density,
         location_density=loc_density,
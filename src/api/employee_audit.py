@@ -9,6 +9,7 @@ from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
+from src.data.keyset_pagination import CountMode
 from src.database.database import get_db
 from src.models.employee_audit_trail import ChangeType
 from src.schemas.employee_audit import (
@@ -131,6 +132,12 @@ async def get_audit_trail(
     date_from: Annotated[Optional[datetime], Query(description="Filter from date")] = None,
     date_to: Annotated[Optional[datetime], Query(description="Filter to date")] = None,
     actor_id: Annotated[Optional[str], Query(description="Filter by actor user ID")] = None,
+    cursor: Annotated[
+        Optional[str], Query(description="next_cursor of the previous page; overrides page")
+    ] = None,
+    count: Annotated[
+        CountMode, Query(description="Total to report: exact, estimated or none")
+    ] = CountMode.EXACT,
 ) -> AuditTrailResponseWrapper:
     """
     Get audit trail for an employee.
@@ -167,6 +174,8 @@ async def get_audit_trail(
         date_from=date_from,
         date_to=date_to,
         actor_user_id=parsed_actor_id,
+        cursor=cursor,
+        count_mode=count,
     )
     
     return AuditTrailResponseWrapper(data=result)
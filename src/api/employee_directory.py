@@ -10,7 +10,7 @@ from pydantic import BaseModel, Field
 from sqlalchemy import and_, func, or_, select
 from sqlalchemy.orm import Session
 
-from src.database.database import get_db
+from src.database.database import DbSession, get_router_db, run_db
 from src.models.employee import Employee, Department, Location
 from src.schemas.employee_directory import (
     DirectoryEmployeeResponse,
@@ -269,7 +269,7 @@ employee_directory_router = APIRouter(
 )
 async def list_directory(
     current_user: Annotated[CurrentUser, Depends(get_current_user)],
-    session: Annotated[Session, Depends(get_db)],
+    session: Annotated[DbSession, Depends(get_router_db("directory"))],
     # Pagination
     page: Annotated[int, Query(ge=1)] = 1,
     page_size: Annotated[int, Query(ge=1, le=100)] = 20,
@@ -292,6 +292,38 @@ async def list_directory(
     - Supports filtering by department, location, manager, status
     - Includes contact information with privacy filtering
     """
+    return await run_db(
+        session,
+        load_directory_page,
+        current_user=current_user,
+        page=page,
+        page_size=page_size,
+        department_id=department_id,
+        location_id=location_id,
+        manager_id=manager_id,
+        employment_status=employment_status,
+        employment_type=employment_type,
+        is_active=is_active,
+        sort_by=sort_by,
+        sort_order=sort_order,
+    )
+
+
+def load_directory_page(
+    session: Session,
+    current_user: CurrentUser,
+    page: int,
+    page_size: int,
+    department_id: Optional[int],
+    location_id: Optional[int],
+    manager_id: Optional[int],
+    employment_status: Optional[str],
+    employment_type: Optional[str],
+    is_active: Optional[bool],
+    sort_by: str,
+    sort_order: str,
+) -> DirectoryListResponse:
+    """Load one page of the directory listing."""
     user_role = current_user.roles[0] if current_user.roles else UserRole.EMPLOYEE
     
     # Build base query
@@ -437,7 +469,7 @@ async def list_directory(
 async def search_directory(
     request: DirectorySearchRequest,
     current_user: Annotated[CurrentUser, Depends(get_current_user)],
-    session: Annotated[Session, Depends(get_db)],
+    session: Annotated[DbSession, Depends(get_router_db("directory"))],
 ) -> DirectorySearchResponse:
     """
     Search employee directory.
@@ -447,6 +479,15 @@ async def search_directory(
     - Returns ranked results with relevance scoring
     - Includes search suggestions and facets
     """
+    return await run_db(session, load_directory_search, request, current_user)
+
+
+def load_directory_search(
+    session: Session,
+    request: DirectorySearchRequest,
+    current_user: CurrentUser,
+) -> DirectorySearchResponse:
+    """Run a directory search with its counts, facets and suggestions."""
     import time
     start_time = time.time()
     
@@ -632,7 +673,7 @@ async def search_directory(
 async def get_employee_details(
     employee_id: int,
     current_user: Annotated[CurrentUser, Depends(get_current_user)],
-    session: Annotated[Session, Depends(get_db)],
+    session: Annotated[DbSession, Depends(get_router_db("directory"))],
 ) -> Dict[str, Any]:
     """
     Get directory entry for a specific employee.
@@ -640,6 +681,11 @@ async def get_employee_details(
     - Returns full directory information
     - Applies privacy controls
     """
+    return await run_db(session, load_employee_details, employee_id, current_user)
+
+
+def load_employee_details(session: Session, employee_id: int, current_user: CurrentUser) -> Dict[str, Any]:
+    """Load one employee's directory entry."""
     user_role = current_user.roles[0] if current_user.roles else UserRole.EMPLOYEE
     
     employee = session.get(Employee, employee_id)
@@ -680,9 +726,14 @@ async def get_employee_details(
     description="Get list of departments for filtering.",
 )
 async def list_departments(
-    session: Annotated[Session, Depends(get_db)],
+    session: Annotated[DbSession, Depends(get_router_db("directory"))],
 ) -> Dict[str, Any]:
     """Get all active departments."""
+    return await run_db(session, load_departments)
+
+
+def load_departments(session: Session) -> Dict[str, Any]:
+    """Load the active departments."""
     result = session.execute(
         select(Department).where(Department.is_active == True).order_by(Department.name)
     )
@@ -703,9 +754,14 @@ async def list_departments(
     description="Get list of locations for filtering.",
 )
 async def list_locations(
-    session: Annotated[Session, Depends(get_db)],
+    session: Annotated[DbSession, Depends(get_router_db("directory"))],
 ) -> Dict[str, Any]:
     """Get all active locations."""
+    return await run_db(session, load_locations)
+
+
+def load_locations(session: Session) -> Dict[str, Any]:
+    """Load the active locations."""
     result = session.execute(
         select(Location).where(Location.is_active == True).order_by(Location.name)
     )
@@ -718,4 +774,3 @@ async def list_locations(
         ],
         "total": len(locations),
     }
-
@@ -170,9 +170,6 @@ async def import_employees(
     if not file.filename or not file.filename.endswith(".csv"):
         raise ValidationError(message="Only CSV files are supported")
     
-    # Read file content
-    content = await file.read()
-    
     # Parse organization ID
     organization_id = uuid.uuid4()  # Default for development
     if x_organization_id:
@@ -181,9 +178,9 @@ async def import_employees(
         except ValueError:
             pass
     
-    # Create import job
+    # Create import job, streaming the spooled upload rather than reading it into memory
     result = service.create_import_job(
-        content=content,
+        content=file.file,
         filename=file.filename,
         current_user=current_user,
         organization_id=organization_id,
@@ -214,11 +211,9 @@ async def validate_import(
     - Validates business rules
     - Returns detailed error reports for invalid records
     """
-    content = await file.read()
-    
     result = service.validate_import(
         import_job_id=import_id,
-        content=content,
+        content=file.file,
         current_user=current_user,
     )
     
@@ -245,11 +240,9 @@ async def process_import(
     - Records validation errors for failed rows
     - Updates import job status
     """
-    content = await file.read()
-    
     result = service.process_import(
         import_job_id=import_id,
-        content=content,
+        content=file.file,
         current_user=current_user,
     )
     
@@ -317,7 +310,7 @@ async def export_employees(
     - Supports customizable field selection based on user permissions
     - Applies role-based access controls to field visibility
     - Supports filtering by department, location, status, etc.
-    - Returns CSV as streaming download
+    - Streams the CSV as it is read, so memory stays flat for large exports
     """
     # Build field selection
     field_selection = ExportFieldSelection(
@@ -345,19 +338,19 @@ async def export_employees(
         filename_prefix=filename_prefix,
     )
     
-    # Generate export
-    csv_content, response = service.export_employees(
+    # Stream the export; the row count is audited when the stream ends.
+    # The get_db session (cursor and audit commit) outlives the response
+    # body only on FastAPI >= 0.118, which requirements.txt pins.
+    chunks, response = service.stream_employees(
         current_user=current_user,
         request=request,
     )
     
-    # Return as streaming response
     return StreamingResponse(
-        iter([csv_content]),
+        chunks,
         media_type="text/csv",
         headers={
             "Content-Disposition": f"attachment; filename={response.filename}",
-            "X-Total-Records": str(response.total_records),
             "X-Exported-Fields": ",".join(response.exported_fields),
         },
     )
@@ -387,19 +380,17 @@ async def export_employees_post(
         filename_prefix=request.filename_prefix,
     )
     
-    # Generate export
-    csv_content, response = service.export_employees(
+    # Stream the export; the row count is audited when the stream ends
+    chunks, response = service.stream_employees(
         current_user=current_user,
         request=export_request,
     )
     
-    # Return as streaming response
     return StreamingResponse(
-        iter([csv_content]),
+        chunks,
         media_type="text/csv",
         headers={
             "Content-Disposition": f"attachment; filename={response.filename}",
-            "X-Total-Records": str(response.total_records),
             "X-Exported-Fields": ",".join(response.exported_fields),
         },
     )
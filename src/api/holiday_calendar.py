@@ -22,6 +22,7 @@ from src.schemas.holiday_calendar import (
     RequirementAdherence,
     ComplianceDeficiency,
 )
+from src.services.business_calendar_service import invalidate_business_calendars
 
 
 holiday_calendar_router = APIRouter(
@@ -209,6 +210,10 @@ async def create_holiday_calendar(
     # Calculate business impact
     business_impact = calculate_business_impact(request.holidays)
     
+    # Rebuild business-day calendars for the affected locations
+    for location_id in request.applies_to_locations or [None]:
+        invalidate_business_calendars(location_id=location_id)
+    
     # Generate calendar ID (mock)
     calendar_id = 1001
     now = datetime.utcnow()
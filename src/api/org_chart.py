@@ -8,11 +8,13 @@ from typing import Annotated, Any, Dict, List, Optional
 from fastapi import APIRouter, Depends, Header, Query, Request
 from pydantic import BaseModel, Field
 from sqlalchemy import func, select
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
-from src.database.database import get_db
+from src.data.employee_hierarchy_repository import EmployeeHierarchyRepository
+from src.database.database import DbSession, get_router_db, run_db
 from src.models.employee import Employee, Department, Location
 from src.schemas.employee_directory import OrganizationalChartNode, OrganizationalChartResponse
+from src.services.org_tree_service import OrgTreeEntry, OrgTreeService
 from src.utils.auth import CurrentUser, UserRole, get_mock_current_user
 from src.utils.errors import NotFoundError
 
@@ -199,48 +201,30 @@ def build_chart_node(
     current_level: int = 0,
     max_depth: int = 3,
 ) -> ChartNode:
-    """Recursively build chart node for employee."""
-    summary = build_employee_summary(employee)
+    """Build chart node for employee from a single subtree query."""
+    subtree = OrgTreeService(session).get_subtree(employee.id, max_depth - current_level)
     
-    # Count direct reports
-    direct_reports_count = session.execute(
-        select(func.count()).where(
-            Employee.manager_id == employee.id,
-            Employee.is_active == True,
+    def make_node(entry: OrgTreeEntry, children: List[ChartNode]) -> ChartNode:
+        level = current_level + entry.depth
+        
+        # Calculate span of control (total in subtree)
+        span = entry.direct_reports_count
+        for child in children:
+            span += child.span_of_control
+        
+        return ChartNode(
+            employee=build_employee_summary(entry.employee),
+            level=level,
+            span_of_control=span,
+            direct_reports_count=entry.direct_reports_count,
+            is_expanded=level < max_depth,
+            children=children,
         )
-    ).scalar() or 0
     
-    children = []
+    if subtree is None:
+        return make_node(OrgTreeEntry(employee=employee, depth=0), [])
     
-    # Only expand if within depth limit
-    if current_level < max_depth and direct_reports_count > 0:
-        result = session.execute(
-            select(Employee).where(
-                Employee.manager_id == employee.id,
-                Employee.is_active == True,
-            ).order_by(Employee.last_name)
-        )
-        direct_reports = list(result.scalars())
-        
-        for report in direct_reports:
-            child_node = build_chart_node(
-                report, session, current_level + 1, max_depth
-            )
-            children.append(child_node)
-    
-    # Calculate span of control (total in subtree)
-    span = direct_reports_count
-    for child in children:
-        span += child.span_of_control
-    
-    return ChartNode(
-        employee=summary,
-        level=current_level,
-        span_of_control=span,
-        direct_reports_count=direct_reports_count,
-        is_expanded=current_level < max_depth,
-        children=children,
-    )
+    return subtree.build(make_node)
 
 
 def build_department_node(
@@ -416,7 +400,7 @@ org_chart_router = APIRouter(
 )
 async def get_organizational_chart(
     current_user: Annotated[CurrentUser, Depends(get_current_user)],
-    session: Annotated[Session, Depends(get_db)],
+    session: Annotated[DbSession, Depends(get_router_db("org_chart"))],
     view_type: ChartViewType = ChartViewType.HIERARCHY,
     root_employee_id: Optional[int] = None,
     department_id: Optional[int] = None,
@@ -430,6 +414,19 @@ async def get_organizational_chart(
     - Includes span of control calculations
     - Handles matrix organizations with multiple relationships
     """
+    return await run_db(
+        session, load_organizational_chart, view_type, root_employee_id, department_id, depth_limit
+    )
+
+
+def load_organizational_chart(
+    session: Session,
+    view_type: ChartViewType,
+    root_employee_id: Optional[int],
+    department_id: Optional[int],
+    depth_limit: int,
+) -> OrgChartResponse:
+    """Build the organizational chart for a view."""
     total_employees = session.execute(
         select(func.count()).where(Employee.is_active == True)
     ).scalar() or 0
@@ -506,7 +503,7 @@ async def get_organizational_chart(
 async def get_employee_chart(
     employee_id: int,
     current_user: Annotated[CurrentUser, Depends(get_current_user)],
-    session: Annotated[Session, Depends(get_db)],
+    session: Annotated[DbSession, Depends(get_router_db("org_chart"))],
     depth_limit: int = 2,
 ) -> Dict[str, Any]:
     """
@@ -515,20 +512,30 @@ async def get_employee_chart(
     - Shows employee's position in hierarchy
     - Includes manager chain and direct reports
     """
+    return await run_db(session, load_employee_chart, employee_id, depth_limit)
+
+
+def load_employee_chart(session: Session, employee_id: int, depth_limit: int) -> Dict[str, Any]:
+    """Build an employee's manager chain and subtree."""
     employee = session.get(Employee, employee_id)
     if not employee:
         raise NotFoundError(message="Employee not found")
     
-    # Build manager chain
-    manager_chain = []
-    current = employee
-    while current.manager_id:
-        manager = session.get(Employee, current.manager_id)
-        if manager:
-            manager_chain.insert(0, build_employee_summary(manager))
-            current = manager
-        else:
-            break
+    # Build manager chain (top of chain first)
+    manager_ids = EmployeeHierarchyRepository(session).get_ancestor_ids(employee_id)
+    managers: Dict[int, Employee] = {}
+    if manager_ids:
+        result = session.execute(
+            select(Employee)
+            .options(joinedload(Employee.department), joinedload(Employee.location))
+            .where(Employee.id.in_(manager_ids))
+        )
+        managers = {m.id: m for m in result.scalars().unique()}
+    manager_chain = [
+        build_employee_summary(managers[manager_id])
+        for manager_id in reversed(manager_ids)
+        if manager_id in managers
+    ]
     
     # Build subtree
     node = build_chart_node(employee, session, 0, depth_limit)
@@ -550,7 +557,7 @@ async def get_employee_chart(
 async def explore_team(
     request: TeamExplorerRequest,
     current_user: Annotated[CurrentUser, Depends(get_current_user)],
-    session: Annotated[Session, Depends(get_db)],
+    session: Annotated[DbSession, Depends(get_router_db("org_chart"))],
 ) -> TeamExplorerResponse:
     """
     Explore team composition and relationships.
@@ -560,6 +567,11 @@ async def explore_team(
     - Identifies cross-team relationships
     - Provides optimization recommendations
     """
+    return await run_db(session, load_team, request)
+
+
+def load_team(session: Session, request: TeamExplorerRequest) -> TeamExplorerResponse:
+    """Load a team with its composition analysis."""
     team_lead = None
     team_name = "Team"
     members = []
@@ -654,9 +666,14 @@ async def explore_team(
 async def get_direct_reports(
     manager_id: int,
     current_user: Annotated[CurrentUser, Depends(get_current_user)],
-    session: Annotated[Session, Depends(get_db)],
+    session: Annotated[DbSession, Depends(get_router_db("org_chart"))],
 ) -> Dict[str, Any]:
     """Get direct reports for a manager."""
+    return await run_db(session, load_direct_reports, manager_id)
+
+
+def load_direct_reports(session: Session, manager_id: int) -> Dict[str, Any]:
+    """Load a manager's active direct reports."""
     manager = session.get(Employee, manager_id)
     if not manager:
         raise NotFoundError(message="Manager not found")
@@ -674,4 +691,3 @@ async def get_direct_reports(
         "direct_reports": [build_employee_summary(r).model_dump() for r in reports],
         "count": len(reports),
     }
-
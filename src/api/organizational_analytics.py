@@ -1,8 +1,14 @@
 """API endpoint for organizational analytics and hierarchy analysis."""
 
+import statistics
 from datetime import date, datetime
-from typing import Any, Dict, List, Optional
+from typing import Annotated, Any, Dict, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.database.database import get_db
+from src.models.employee import Department, Employee
 
 from src.schemas.organizational_analytics import (
     OrganizationalAnalyticsResponse,
@@ -23,6 +29,29 @@ from src.schemas.organizational_analytics import (
     RecommendationCategory,
     RecommendationPriority,
 )
+from src.services.org_analytics_service import Headcount, ManagerSpan, OrgAnalyticsService
+
+
+# Span of control the industry considers optimal
+OPTIMAL_SPAN_MIN = 5
+OPTIMAL_SPAN_MAX = 9
+
+# Managers per employee the industry considers typical
+INDUSTRY_BENCHMARK_RATIO = 0.15
+
+# A department is top-heavy with this many times the org-wide manager ratio
+TOP_HEAVY_FACTOR = 1.25
+
+# Overextended and underutilized managers listed, the furthest out first
+MAX_LISTED_MANAGERS = 20
+
+SPAN_RANGES = (
+    ("1-3", 1, 3),
+    ("4-6", 4, 6),
+    ("7-9", 7, 9),
+    ("10-12", 10, 12),
+    ("13+", 13, 99),
+)
 
 
 organizational_analytics_router = APIRouter(
@@ -64,6 +93,76 @@ def determine_efficiency_level(score: float) -> EfficiencyLevel:
         return EfficiencyLevel.CRITICAL
 
 
+def assess_manager_span(
+    span: ManagerSpan,
+    details: Dict[int, Any],
+    min_span_threshold: int,
+    max_span_threshold: int,
+) -> ManagerSpanMetric:
+    """Rate a manager's span against the optimal range and thresholds."""
+    direct = span.direct_reports
+    is_overextended = direct > max_span_threshold
+    is_underutilized = direct < min_span_threshold
+    
+    if OPTIMAL_SPAN_MIN <= direct <= OPTIMAL_SPAN_MAX:
+        span_efficiency = EfficiencyLevel.OPTIMAL
+    elif is_overextended or is_underutilized:
+        span_efficiency = EfficiencyLevel.NEEDS_IMPROVEMENT
+    else:
+        span_efficiency = EfficiencyLevel.GOOD
+    
+    recommendation = None
+    if is_overextended:
+        recommendation = "Consider creating team lead positions to reduce span"
+    elif is_underutilized:
+        recommendation = "Consider consolidating with another management role"
+    
+    detail = details.get(span.employee_id)
+    return ManagerSpanMetric(
+        manager_id=span.employee_id,
+        manager_name=f"{detail.first_name} {detail.last_name}" if detail else "",
+        title=(detail.job_title if detail else None) or "",
+        department=detail.department_name if detail else None,
+        direct_reports=direct,
+        total_subordinates=span.total_reports,
+        levels_below=span.levels_below,
+        span_efficiency=span_efficiency,
+        is_overextended=is_overextended,
+        is_underutilized=is_underutilized,
+        recommended_span=min(max(direct, OPTIMAL_SPAN_MIN), OPTIMAL_SPAN_MAX),
+        recommendation=recommendation,
+    )
+
+
+def assess_department_density(
+    department_id: int,
+    department_name: str,
+    headcount: Headcount,
+    org_manager_ratio: float,
+) -> DepartmentDensity:
+    """Rate a department's manager ratio against the benchmark and the org."""
+    ratio = headcount.manager_ratio
+    # 100 at the benchmark ratio, losing a point per percent away from it
+    score = max(0.0, 100 - abs(ratio - INDUSTRY_BENCHMARK_RATIO) / INDUSTRY_BENCHMARK_RATIO * 100)
+    
+    return DepartmentDensity(
+        department_id=department_id,
+        department_name=department_name,
+        total_employees=headcount.employees,
+        total_managers=headcount.managers,
+        individual_contributors=headcount.individual_contributors,
+        manager_to_employee_ratio=round(ratio, 3),
+        ic_to_manager_ratio=round(
+            headcount.individual_contributors / headcount.managers, 2
+        ) if headcount.managers else 0.0,
+        density_efficiency=determine_efficiency_level(score),
+        is_top_heavy=ratio > org_manager_ratio * TOP_HEAVY_FACTOR,
+        vs_org_average=round(
+            (ratio - org_manager_ratio) / org_manager_ratio * 100, 1
+        ) if org_manager_ratio else 0.0,
+    )
+
+
 # =============================================================================
 # Hierarchy Analytics Endpoint
 # =============================================================================
@@ -75,6 +174,7 @@ def determine_efficiency_level(score: float) -> EfficiencyLevel:
     description="Comprehensive hierarchy analysis with span metrics, density analysis, and recommendations.",
 )
 async def get_hierarchy_analytics(
+    session: Annotated[Session, Depends(get_db)],
     department_id: Optional[int] = Query(default=None, description="Filter by department"),
     include_recommendations: bool = Query(default=True, description="Include recommendations"),
     min_span_threshold: int = Query(default=3, ge=1, description="Min span for underutilized"),
@@ -105,85 +205,66 @@ async def get_hierarchy_analytics(
     # Reporting Span Metrics
     # =============================================================================
     
-    # Mock manager data
-    managers = [
-        ManagerSpanMetric(
-            manager_id=10,
-            manager_name="CEO",
-            title="Chief Executive Officer",
-            department="Executive",
-            direct_reports=6,
-            total_subordinates=250,
-            levels_below=5,
-            span_efficiency=EfficiencyLevel.GOOD,
-            is_overextended=False,
-            is_underutilized=False,
-            recommended_span=6,
-            recommendation=None,
-        ),
-        ManagerSpanMetric(
-            manager_id=20,
-            manager_name="VP Engineering",
-            title="VP of Engineering",
-            department="Engineering",
-            direct_reports=8,
-            total_subordinates=80,
-            levels_below=3,
-            span_efficiency=EfficiencyLevel.OPTIMAL,
-            is_overextended=False,
-            is_underutilized=False,
-            recommended_span=7,
-            recommendation=None,
-        ),
-        ManagerSpanMetric(
-            manager_id=30,
-            manager_name="Sales Director",
-            title="Director of Sales",
-            department="Sales",
-            direct_reports=15,
-            total_subordinates=45,
-            levels_below=2,
-            span_efficiency=EfficiencyLevel.NEEDS_IMPROVEMENT,
-            is_overextended=True,
-            is_underutilized=False,
-            recommended_span=8,
-            recommendation="Consider creating team lead positions to reduce span",
-        ),
-        ManagerSpanMetric(
-            manager_id=40,
-            manager_name="Marketing Manager",
-            title="Marketing Manager",
-            department="Marketing",
-            direct_reports=2,
-            total_subordinates=2,
-            levels_below=1,
-            span_efficiency=EfficiencyLevel.NEEDS_IMPROVEMENT,
-            is_overextended=False,
-            is_underutilized=True,
-            recommended_span=6,
-            recommendation="Consider consolidating with another management role",
-        ),
+    # Reporting tree, summarized in one pass and cached by data version
+    analytics = OrgAnalyticsService(session).get_analytics()
+    scope = analytics.headcount(department_id=department_id)
+    spans = analytics.spans(department_id=department_id)
+    span_counts = [span.direct_reports for span in spans]
+    
+    overextended_spans = sorted(
+        (span for span in spans if span.direct_reports > max_span_threshold),
+        key=lambda span: -span.direct_reports,
+    )[:MAX_LISTED_MANAGERS]
+    underutilized_spans = sorted(
+        (span for span in spans if span.direct_reports < min_span_threshold),
+        key=lambda span: span.direct_reports,
+    )[:MAX_LISTED_MANAGERS]
+    
+    listed_ids = [span.employee_id for span in overextended_spans + underutilized_spans]
+    details = {
+        row.id: row for row in session.execute(
+            select(
+                Employee.id,
+                Employee.first_name,
+                Employee.last_name,
+                Employee.job_title,
+                Department.name.label("department_name"),
+            )
+            .outerjoin(Department, Department.id == Employee.department_id)
+            .where(Employee.id.in_(listed_ids))
+        )
+    } if listed_ids else {}
+    
+    overextended = [
+        assess_manager_span(span, details, min_span_threshold, max_span_threshold)
+        for span in overextended_spans
+    ]
+    underutilized = [
+        assess_manager_span(span, details, min_span_threshold, max_span_threshold)
+        for span in underutilized_spans
     ]
     
-    overextended = [m for m in managers if m.is_overextended]
-    underutilized = [m for m in managers if m.is_underutilized]
+    span_distribution = []
+    for label, low, high in SPAN_RANGES:
+        count = sum(1 for direct in span_counts if low <= direct <= high)
+        span_distribution.append(SpanDistribution(
+            range_label=label,
+            min_span=low,
+            max_span=high,
+            count=count,
+            percentage=round(count / len(span_counts) * 100, 1) if span_counts else 0.0,
+        ))
     
     reporting_span_metrics = ReportingSpanMetrics(
-        total_managers=len(managers),
-        avg_span_of_control=7.75,
-        median_span=7.0,
-        min_span=2,
-        max_span=15,
-        std_deviation=4.2,
-        optimal_span_min=5,
-        optimal_span_max=9,
-        span_distribution=[
-            SpanDistribution(range_label="1-3", min_span=1, max_span=3, count=5, percentage=12.5),
-            SpanDistribution(range_label="4-6", min_span=4, max_span=6, count=15, percentage=37.5),
-            SpanDistribution(range_label="7-9", min_span=7, max_span=9, count=12, percentage=30.0),
-            SpanDistribution(range_label="10-12", min_span=10, max_span=12, count=6, percentage=15.0),
-            SpanDistribution(range_label="13+", min_span=13, max_span=99, count=2, percentage=5.0),
-        ],
+        total_managers=len(span_counts),
+        avg_span_of_control=round(statistics.fmean(span_counts), 2) if span_counts else 0.0,
+        median_span=float(statistics.median(span_counts)) if span_counts else 0.0,
+        min_span=min(span_counts, default=0),
+        max_span=max(span_counts, default=0),
+        std_deviation=round(statistics.pstdev(span_counts), 2) if span_counts else 0.0,
+        optimal_span_min=OPTIMAL_SPAN_MIN,
+        optimal_span_max=OPTIMAL_SPAN_MAX,
+        span_distribution=span_distribution,
         overextended_managers=overextended,
         underutilized_managers=underutilized,
     )
@@ -192,66 +273,37 @@ async def get_hierarchy_analytics(
     # Management Density Analysis
     # =============================================================================
     
+    org_manager_ratio = analytics.headcount().manager_ratio
+    department_ids = analytics.department_ids()
+    if department_id is not None:
+        department_ids = [d for d in department_ids if d == department_id]
+    department_names = {
+        row.id: row.name for row in session.execute(
+            select(Department.id, Department.name).where(Department.id.in_(department_ids))
+        )
+    } if department_ids else {}
+    
     department_densities = [
-        DepartmentDensity(
-            department_id=100,
-            department_name="Engineering",
-            total_employees=80,
-            total_managers=10,
-            individual_contributors=70,
-            manager_to_employee_ratio=0.125,
-            ic_to_manager_ratio=7.0,
-            density_efficiency=EfficiencyLevel.OPTIMAL,
-            is_top_heavy=False,
-            vs_org_average=-2.5,
-        ),
-        DepartmentDensity(
-            department_id=101,
-            department_name="Sales",
-            total_employees=50,
-            total_managers=8,
-            individual_contributors=42,
-            manager_to_employee_ratio=0.16,
-            ic_to_manager_ratio=5.25,
-            density_efficiency=EfficiencyLevel.ADEQUATE,
-            is_top_heavy=False,
-            vs_org_average=6.7,
-        ),
-        DepartmentDensity(
-            department_id=102,
-            department_name="Marketing",
-            total_employees=25,
-            total_managers=6,
-            individual_contributors=19,
-            manager_to_employee_ratio=0.24,
-            ic_to_manager_ratio=3.17,
-            density_efficiency=EfficiencyLevel.NEEDS_IMPROVEMENT,
-            is_top_heavy=True,
-            vs_org_average=60.0,
-        ),
-        DepartmentDensity(
-            department_id=103,
-            department_name="Finance",
-            total_employees=20,
-            total_managers=3,
-            individual_contributors=17,
-            manager_to_employee_ratio=0.15,
-            ic_to_manager_ratio=5.67,
-            density_efficiency=EfficiencyLevel.GOOD,
-            is_top_heavy=False,
-            vs_org_average=0.0,
-        ),
+        assess_department_density(
+            d,
+            department_names.get(d, ""),
+            analytics.headcount(department_id=d),
+            org_manager_ratio,
+        )
+        for d in department_ids
     ]
     
     management_density = ManagementDensityAnalysis(
-        total_employees=250,
-        total_managers=40,
-        total_ics=210,
-        org_manager_ratio=0.16,
-        org_ic_to_manager_ratio=5.25,
-        industry_benchmark_ratio=0.15,
+        total_employees=scope.employees,
+        total_managers=scope.managers,
+        total_ics=scope.individual_contributors,
+        org_manager_ratio=round(scope.manager_ratio, 3),
+        org_ic_to_manager_ratio=round(
+            scope.individual_contributors / scope.managers, 2
+        ) if scope.managers else 0.0,
+        industry_benchmark_ratio=INDUSTRY_BENCHMARK_RATIO,
         department_densities=department_densities,
-        top_heavy_departments=["Marketing"],
+        top_heavy_departments=[d.department_name for d in department_densities if d.is_top_heavy],
     )
     
     # =============================================================================
@@ -263,7 +315,7 @@ async def get_hierarchy_analytics(
         clear_reporting_lines_percentage=94.0,
         dual_reporting_count=8,
         matrix_structures_count=3,
-        orphan_positions_count=2,
+        orphan_positions_count=analytics.detached,
         authority_issues=[
             {"issue": "Dual reporting in Product team", "severity": "medium", "affected": 5},
             {"issue": "Unclear authority in cross-functional projects", "severity": "low", "affected": 12},
@@ -421,8 +473,8 @@ async def get_hierarchy_analytics(
             "Implement org health monitoring dashboard",
         ],
         tracking_kpis=[
-            {"kpi": "Average Span of Control", "current": 7.75, "target": 7.0},
-            {"kpi": "Management Ratio", "current": 0.16, "target": 0.14},
+            {"kpi": "Average Span of Control", "current": reporting_span_metrics.avg_span_of_control, "target": 7.0},
+            {"kpi": "Management Ratio", "current": management_density.org_manager_ratio, "target": 0.14},
             {"kpi": "Decision Time (hours)", "current": 48.0, "target": 36.0},
             {"kpi": "Employee Satisfaction", "current": 72.0, "target": 80.0},
         ],
@@ -435,9 +487,9 @@ async def get_hierarchy_analytics(
         management_effectiveness=management_effectiveness,
         recommendations=recommendations,
         performance_planning=performance_planning,
-        total_employees=250,
-        total_departments=8,
-        hierarchy_depth=5,
+        total_employees=scope.employees,
+        total_departments=len(department_ids),
+        hierarchy_depth=scope.depth,
         analysis_date=date.today(),
         generated_at=datetime.utcnow(),
     )
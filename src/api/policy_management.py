@@ -39,6 +39,7 @@ from src.schemas.policy_management import (
     AuditEntry,
     TenureTier,
 )
+from src.services.policy_rules import invalidate_compiled_policy
 from src.utils.auth import CurrentUser, UserRole, get_mock_current_user
 
 logger = logging.getLogger(__name__)
@@ -581,6 +582,7 @@ async def update_policy(
     )
     
     session.commit()
+    invalidate_compiled_policy(policy.id)
     
     # Impact analysis
     impact_analysis = {
@@ -674,6 +676,7 @@ async def deactivate_policy(
     )
     
     session.commit()
+    invalidate_compiled_policy(policy.id)
     
     # Mock counts
     employees_affected = 0
@@ -41,6 +41,18 @@ class CacheMetricsResponse(BaseModel):
     sets: int = Field(..., description="Number of cache sets")
     deletes: int = Field(..., description="Number of cache deletes")
     errors: int = Field(..., description="Number of cache errors")
+    batch_operations: int = Field(0, description="Number of get_many/set_many/delete_many calls")
+    invalidated_keys: int = Field(0, description="Keys removed through tag invalidation")
+    invalidations_by_tag: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Keys removed per tag family (IDs shown as '*')",
+    )
+    by_prefix: Dict[str, Dict[str, float]] = Field(
+        default_factory=dict,
+        description="L1/L2 hits, misses and early refreshes per key prefix",
+    )
+    l1_entries: int = Field(0, description="Entries in this worker's in-process cache")
+    l1_evictions: int = Field(0, description="LRU evictions from the in-process cache")
     hit_ratio: float = Field(..., description="Cache hit ratio percentage")
     total_operations: int = Field(..., description="Total cache operations")
 
@@ -104,6 +116,12 @@ async def get_cache_metrics() -> CacheMetricsResponse:
         sets=metrics["sets"],
         deletes=metrics["deletes"],
         errors=metrics["errors"],
+        batch_operations=metrics["batch_operations"],
+        invalidated_keys=metrics["invalidated_keys"],
+        invalidations_by_tag=metrics["invalidations_by_tag"],
+        by_prefix=metrics["by_prefix"],
+        l1_entries=metrics["l1_entries"],
+        l1_evictions=metrics["l1_evictions"],
         hit_ratio=metrics["hit_ratio"],
         total_operations=metrics["total_operations"],
     )
@@ -6,11 +6,14 @@ with ranking, pagination, and analytics.
 """
 
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, TypeVar
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
+from sqlalchemy.orm import Session
 
+from src.data.keyset_pagination import CountMode
+from src.database.database import DbSession, get_router_db, run_db
 from src.services.fulltext_search_service import (
     FullTextSearchService,
     SearchConfig,
@@ -18,11 +21,39 @@ from src.services.fulltext_search_service import (
     SearchResponse,
     SearchResult,
     SearchType,
-    get_search_service,
+    get_search_config as get_service_config,
 )
 
 router = APIRouter(prefix="/api/v1/search", tags=["Search"])
 
+T = TypeVar("T")
+
+
+def get_search_service(
+    session: DbSession = Depends(get_router_db("search")),
+    config: SearchConfig = Depends(get_service_config),
+) -> FullTextSearchService:
+    """Search service bound to the router's session, which may be async."""
+    return FullTextSearchService(db=session, config=config)
+
+
+async def run_search(
+    search_service: FullTextSearchService,
+    method: Callable[..., T],
+    *args: Any,
+    **kwargs: Any,
+) -> T:
+    """
+    Call a search service method through run_db.
+    
+    The method runs on a service bound to the sync view of the session, so
+    it works whether the router's session is sync or async.
+    """
+    def call(db: Session) -> T:
+        return method(FullTextSearchService(db=db, config=search_service.config), *args, **kwargs)
+    
+    return await run_db(search_service.db, call)
+
 
 # =============================================================================
 # Request/Response Models
@@ -42,6 +73,13 @@ class SearchRequest(BaseModel):
     # Pagination
     page: int = Field(default=1, ge=1, description="Page number")
     page_size: int = Field(default=20, ge=1, le=100, description="Results per page")
+    cursor: Optional[str] = Field(
+        None, description="Employee search: next_cursor of the previous page; overrides page"
+    )
+    count: CountMode = Field(
+        default=CountMode.EXACT,
+        description="Employee search total: exact, estimated or none",
+    )
     
     # Search options
     use_phrase_search: bool = Field(default=False, description="Enable phrase search with quotes")
@@ -76,10 +114,13 @@ class SearchResponseModel(BaseModel):
     # Pagination
     page: int
     page_size: int
-    total_results: int
-    total_pages: int
+    total_results: Optional[int]
+    total_pages: Optional[int]
     has_next: bool
     has_previous: bool
+    next_cursor: Optional[str] = None
+    total_is_estimate: bool = False
+    results_truncated: bool = False
     
     # Performance
     execution_time_ms: int
@@ -165,9 +206,11 @@ async def execute_search(
         include_partial_matches=request.include_partial_matches,
         highlight=request.highlight,
         min_score=request.min_score,
+        cursor=request.cursor,
+        count_mode=request.count,
     )
     
-    response = search_service.search(query)
+    response = await run_search(search_service, FullTextSearchService.search, query)
     
     # Check execution time
     if response.execution_time_ms > 500:
@@ -201,6 +244,9 @@ async def execute_search(
         total_pages=response.total_pages,
         has_next=response.has_next,
         has_previous=response.has_previous,
+        next_cursor=response.next_cursor,
+        total_is_estimate=response.total_is_estimate,
+        results_truncated=response.results_truncated,
         execution_time_ms=response.execution_time_ms,
         parsed_query=response.parsed_query,
         suggestions=response.suggestions,
@@ -219,6 +265,8 @@ async def search_employees(
     page_size: int = Query(20, ge=1, le=100),
     department_id: Optional[int] = Query(None),
     is_active: Optional[bool] = Query(None),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    count: CountMode = Query(CountMode.EXACT, description="Total: exact, estimated or none"),
     search_service: FullTextSearchService = Depends(get_search_service),
 ) -> SearchResponseModel:
     """Quick employee search endpoint."""
@@ -229,6 +277,8 @@ async def search_employees(
         is_active=is_active,
         page=page,
         page_size=page_size,
+        cursor=cursor,
+        count=count,
     )
     return await execute_search(request, search_service)
 
@@ -267,7 +317,9 @@ async def track_click(
     search_service: FullTextSearchService = Depends(get_search_service),
 ) -> Dict[str, Any]:
     """Track a click on a search result for analytics."""
-    search_service.track_click(
+    await run_search(
+        search_service,
+        FullTextSearchService.track_click,
         search_id=request.search_id,
         result_type=request.result_type,
         result_id=request.result_id,
@@ -301,7 +353,9 @@ async def get_popular_searches(
         except ValueError:
             pass
     
-    popular = search_service.get_popular_searches(
+    popular = await run_search(
+        search_service,
+        FullTextSearchService.get_popular_searches,
         search_type=type_filter,
         days=days,
         limit=limit,
@@ -336,7 +390,7 @@ async def get_search_metrics(
     if not start_date:
         start_date = end_date - timedelta(days=30)
     
-    metrics = search_service.get_search_metrics(start_date, end_date)
+    metrics = await run_search(search_service, FullTextSearchService.get_search_metrics, start_date, end_date)
     
     return SearchMetricsResponse(
         total_searches=metrics["total_searches"],
@@ -362,7 +416,7 @@ async def get_suggestions(
     search_service: FullTextSearchService = Depends(get_search_service),
 ) -> List[str]:
     """Get query suggestions for autocomplete."""
-    return search_service.get_query_suggestions(q, limit)
+    return await run_search(search_service, FullTextSearchService.get_query_suggestions, q, limit)
 
 
 @router.get(
@@ -22,6 +22,11 @@ from src.schemas.sick_leave_schedule import (
     AlternativeSchedule,
     ImpactAnalysis,
 )
+from src.services.business_calendar_service import (
+    BusinessCalendar,
+    get_static_calendar,
+    week_hours_for_days,
+)
 
 
 sick_leave_schedule_router = APIRouter(
@@ -70,16 +75,57 @@ def is_work_day(d: date, work_days: List[str]) -> bool:
     return get_day_of_week(d) in work_days
 
 
+# Mock holidays
+COMPANY_HOLIDAYS = [
+    date(2025, 1, 1),   # New Year's Day
+    date(2025, 7, 4),   # Independence Day
+    date(2025, 12, 25), # Christmas
+    date(2025, 12, 26), # Day after Christmas
+]
+
+
 def is_company_holiday(d: date) -> bool:
     """Check if date is a company holiday."""
-    # Mock holidays
-    holidays = [
-        date(2025, 1, 1),   # New Year's Day
-        date(2025, 7, 4),   # Independence Day
-        date(2025, 12, 25), # Christmas
-        date(2025, 12, 26), # Day after Christmas
-    ]
-    return d in holidays
+    return d in COMPANY_HOLIDAYS
+
+
+def get_schedule_calendar(
+    schedule: WorkScheduleInfo,
+    start_date: date,
+    end_date: date,
+) -> BusinessCalendar:
+    """Get the business calendar for a work schedule and the company holidays."""
+    return get_static_calendar(
+        start_date,
+        end_date,
+        week_hours=week_hours_for_days(schedule.work_days, schedule.standard_hours_per_day),
+        holidays=COMPANY_HOLIDAYS,
+    )
+
+
+def get_sick_leave_hours(
+    d: date,
+    request: DurationCalculationRequest,
+    schedule: WorkScheduleInfo,
+) -> float:
+    """Sick leave hours on a work day, trimmed for partial start and end days."""
+    scheduled_hours = schedule.standard_hours_per_day
+    
+    if request.start_time and d == request.start_date:
+        # Partial start day
+        start_minutes = request.start_time.hour * 60 + request.start_time.minute
+        schedule_start_minutes = schedule.start_time.hour * 60 + schedule.start_time.minute if schedule.start_time else 540
+        hours_before = max(0, (start_minutes - schedule_start_minutes) / 60)
+        scheduled_hours = schedule.standard_hours_per_day - hours_before
+    
+    if request.end_time and d == request.end_date:
+        # Partial end day
+        end_minutes = request.end_time.hour * 60 + request.end_time.minute
+        schedule_end_minutes = schedule.end_time.hour * 60 + schedule.end_time.minute if schedule.end_time else 1020
+        hours_after = max(0, (schedule_end_minutes - end_minutes) / 60)
+        scheduled_hours -= hours_after
+    
+    return max(0, scheduled_hours)
 
 
 def is_blackout_period(d: date) -> bool:
@@ -148,43 +194,35 @@ async def calculate_sick_leave_duration(
     # Get employee schedule
     schedule = get_employee_schedule(request.employee_id)
     
-    # Calculate day-by-day breakdown
-    day_breakdown = []
-    total_hours = 0.0
-    total_days = 0.0
-    work_days_count = 0
+    # Totals come from the calendar's prefix sums; only the partial
+    # start and end days are adjusted individually
+    calendar = get_schedule_calendar(schedule, request.start_date, request.end_date)
+    total_hours = calendar.working_hours(request.start_date, request.end_date)
+    work_days_count = calendar.business_days(request.start_date, request.end_date)
     
+    if request.start_date <= request.end_date:
+        for endpoint in {request.start_date, request.end_date}:
+            if calendar.is_working_day(endpoint):
+                total_hours += (
+                    get_sick_leave_hours(endpoint, request, schedule)
+                    - schedule.standard_hours_per_day
+                )
+    total_days = total_hours / schedule.standard_hours_per_day
+    
+    # Day-by-day breakdown, only when requested
+    day_breakdown = []
     current_date = request.start_date
-    while current_date <= request.end_date:
+    while request.include_schedule_details and current_date <= request.end_date:
         day_name = get_day_of_week(current_date)
         is_work = is_work_day(current_date, schedule.work_days)
-        is_holiday = is_company_holiday(current_date)
+        is_holiday = calendar.is_holiday(current_date)
         is_blackout = is_blackout_period(current_date)
         
         # Calculate hours for this day
-        if is_work and not is_holiday:
-            scheduled_hours = schedule.standard_hours_per_day
-            
-            # Handle partial day requests
-            if request.start_time and current_date == request.start_date:
-                # Partial start day
-                start_minutes = request.start_time.hour * 60 + request.start_time.minute
-                schedule_start_minutes = schedule.start_time.hour * 60 + schedule.start_time.minute if schedule.start_time else 540
-                hours_before = max(0, (start_minutes - schedule_start_minutes) / 60)
-                scheduled_hours = schedule.standard_hours_per_day - hours_before
-            
-            if request.end_time and current_date == request.end_date:
-                # Partial end day
-                end_minutes = request.end_time.hour * 60 + request.end_time.minute
-                schedule_end_minutes = schedule.end_time.hour * 60 + schedule.end_time.minute if schedule.end_time else 1020
-                hours_after = max(0, (schedule_end_minutes - end_minutes) / 60)
-                scheduled_hours -= hours_after
-            
-            sick_hours = max(0, scheduled_hours)
+        if calendar.is_working_day(current_date):
+            sick_hours = get_sick_leave_hours(current_date, request, schedule)
             sick_days = sick_hours / schedule.standard_hours_per_day
-            work_days_count += 1
         else:
-            scheduled_hours = 0.0
             sick_hours = 0.0
             sick_days = 0.0
         
@@ -209,8 +247,6 @@ async def calculate_sick_leave_duration(
             notes=notes,
         ))
         
-        total_hours += sick_hours
-        total_days += sick_days
         current_date += timedelta(days=1)
     
     calendar_days = (request.end_date - request.start_date).days + 1
@@ -274,7 +310,7 @@ async def calculate_sick_leave_duration(
         total_days=round(total_days, 2),
         work_days_count=work_days_count,
         calendar_days_count=calendar_days,
-        day_breakdown=day_breakdown if request.include_schedule_details else [],
+        day_breakdown=day_breakdown,
         allocation_recommendation=allocation_recommendation,
         policy_compliance=policy_compliance,
         regulatory_notes=regulatory_notes,
@@ -384,12 +420,8 @@ async def detect_schedule_conflicts(
             ))
     
     # Check for holidays
-    current_date = start_date
-    holiday_dates = []
-    while current_date <= end_date:
-        if is_company_holiday(current_date):
-            holiday_dates.append(current_date)
-        current_date += timedelta(days=1)
+    calendar = get_schedule_calendar(get_employee_schedule(employee_id), start_date, end_date)
+    holiday_dates = calendar.holidays_between(start_date, end_date)
     
     if holiday_dates:
         conflict_counter += 1
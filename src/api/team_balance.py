@@ -1,8 +1,14 @@
 """API endpoints for team and department balance management."""
 
+import statistics
 from datetime import date, datetime, timedelta
 from typing import Any, Dict, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.database.database import DbSession, get_router_db, run_db
+from src.models.employee import Department, Employee
 
 from src.schemas.team_balance import (
     TeamBalanceResponse,
@@ -24,6 +30,8 @@ from src.schemas.team_balance import (
     SortOrder,
 )
 from src.schemas.balance_inquiry import BalanceStatusEnum
+from src.api.balance_inquiry import get_balance_status
+from src.services.batch_balance_service import BatchBalanceService, EmployeeBalanceFigures
 
 
 team_balance_router = APIRouter(prefix="/api/time-off/balances", tags=["Team & Department Balances"])
@@ -74,6 +82,62 @@ def validate_department_access(user: Dict[str, Any], department_id: int) -> bool
     return False
 
 
+def to_team_member(figures: EmployeeBalanceFigures, include_upcoming_accruals: bool) -> TeamMemberBalance:
+    """Build a team member's balance summary from its batch figures."""
+    status_val, status_msg = get_balance_status(figures.total_available, figures.total_allocated, None)
+    next_accrual = figures.next_accrual if include_upcoming_accruals else None
+    
+    return TeamMemberBalance(
+        employee_id=figures.employee_id,
+        employee_name=figures.employee_name,
+        job_title=figures.job_title,
+        department=figures.department,
+        total_available=figures.total_available,
+        total_pending=figures.total_pending,
+        total_used_ytd=figures.total_used,
+        policy_balances=[
+            {
+                "policy_id": p.policy.id,
+                "policy_name": p.policy.name,
+                "available": p.available,
+                "pending": p.pending,
+            }
+            for p in figures.policies
+        ],
+        balance_status=status_val,
+        status_message=status_msg,
+        upcoming_time_off=[
+            {
+                "start_date": req.start_date.isoformat(),
+                "end_date": req.end_date.isoformat(),
+                "days": req.total_days,
+                "type": req.request_type,
+            }
+            for req in figures.upcoming_time_off
+        ],
+        pending_requests=[
+            {
+                "request_id": req.id,
+                "days_requested": req.total_days,
+                "submitted_at": (req.submitted_at or req.created_at).isoformat(),
+            }
+            for req in figures.pending_requests
+        ],
+        next_accrual_date=next_accrual.accrual_date if next_accrual else None,
+        next_accrual_amount=next_accrual.amount if next_accrual else 0,
+    )
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Linear-interpolated percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
 def calculate_coverage_risk(
     team_members: List[TeamMemberBalance],
     analysis_days: int,
@@ -190,6 +254,7 @@ async def get_team_balances(
     sort_by: SortField = Query(default=SortField.EMPLOYEE_NAME, description="Sort field"),
     sort_order: SortOrder = Query(default=SortOrder.ASC, description="Sort order"),
     include_upcoming_accruals: bool = Query(default=True, description="Include accrual information"),
+    session: DbSession = Depends(get_router_db("balances")),
 ):
     """
     Get team balance summary for the current manager.
@@ -202,6 +267,34 @@ async def get_team_balances(
     
     **Access Control**: Only managers can access this endpoint for their direct reports.
     """
+    return await run_db(
+        session,
+        load_team_balances,
+        policy_id=policy_id,
+        balance_status=balance_status,
+        has_pending_requests=has_pending_requests,
+        min_available_balance=min_available_balance,
+        max_available_balance=max_available_balance,
+        coverage_analysis_days=coverage_analysis_days,
+        sort_by=sort_by,
+        sort_order=sort_order,
+        include_upcoming_accruals=include_upcoming_accruals,
+    )
+
+
+def load_team_balances(
+    session: Session,
+    policy_id: Optional[int],
+    balance_status: Optional[BalanceStatusEnum],
+    has_pending_requests: Optional[bool],
+    min_available_balance: Optional[float],
+    max_available_balance: Optional[float],
+    coverage_analysis_days: int,
+    sort_by: SortField,
+    sort_order: SortOrder,
+    include_upcoming_accruals: bool,
+) -> TeamBalanceResponse:
+    """Build the manager's team balance summary."""
     current_user = get_current_user()
     
     # Validate manager role
@@ -219,67 +312,14 @@ async def get_team_balances(
             detail="No direct reports found for this manager",
         )
     
-    # Mock team member data
-    team_members = []
-    for i, emp_id in enumerate(direct_report_ids):
-        available = 15.0 - (i * 2)
-        pending = 2.0 if i % 2 == 0 else 0.0
-        used = 5.0 + i
-        
-        # Determine status
-        if available >= 10:
-            status_val = BalanceStatusEnum.HEALTHY
-            status_msg = "Balance is healthy"
-        elif available >= 5:
-            status_val = BalanceStatusEnum.LOW
-            status_msg = "Balance is getting low"
-        else:
-            status_val = BalanceStatusEnum.CRITICAL
-            status_msg = "Balance is critically low"
-        
-        member = TeamMemberBalance(
-            employee_id=emp_id,
-            employee_name=f"Employee {emp_id}",
-            job_title=f"Software Engineer {i + 1}",
-            department="Engineering",
-            total_available=available,
-            total_pending=pending,
-            total_used_ytd=used,
-            policy_balances=[
-                {
-                    "policy_id": 1,
-                    "policy_name": "PTO",
-                    "available": available * 0.6,
-                    "pending": pending * 0.6,
-                },
-                {
-                    "policy_id": 2,
-                    "policy_name": "Sick Leave",
-                    "available": available * 0.4,
-                    "pending": pending * 0.4,
-                },
-            ],
-            balance_status=status_val,
-            status_message=status_msg,
-            upcoming_time_off=[
-                {
-                    "start_date": (date.today() + timedelta(days=10 + i * 5)).isoformat(),
-                    "end_date": (date.today() + timedelta(days=12 + i * 5)).isoformat(),
-                    "days": 2,
-                    "type": "PTO",
-                }
-            ] if i % 2 == 0 else [],
-            pending_requests=[
-                {
-                    "request_id": 1000 + i,
-                    "days_requested": pending,
-                    "submitted_at": datetime.utcnow().isoformat(),
-                }
-            ] if pending > 0 else [],
-            next_accrual_date=date.today() + timedelta(days=30) if include_upcoming_accruals else None,
-            next_accrual_amount=1.25 if include_upcoming_accruals else 0,
-        )
-        team_members.append(member)
+    # All direct reports' balances in a fixed number of queries
+    figures = BatchBalanceService(session).get_balances(
+        direct_report_ids, policy_ids=[policy_id] if policy_id else None
+    )
+    team_members = [
+        to_team_member(member_figures, include_upcoming_accruals)
+        for member_figures in figures.values()
+    ]
     
     # Apply filters
     if balance_status:
@@ -378,6 +418,7 @@ async def get_department_balances(
     include_trends: bool = Query(default=True, description="Include trend analysis"),
     include_comparisons: bool = Query(default=True, description="Include comparative metrics"),
     usage_pattern_granularity: str = Query(default="monthly", description="Pattern granularity: monthly, quarterly"),
+    session: DbSession = Depends(get_router_db("balances")),
 ):
     """
     Get department-level balance analytics.
@@ -392,6 +433,30 @@ async def get_department_balances(
     
     **Access Control**: HR personnel and senior managers can access this endpoint.
     """
+    return await run_db(
+        session,
+        load_department_balances,
+        department_id=department_id,
+        year=year,
+        include_sub_departments=include_sub_departments,
+        policy_ids=policy_ids,
+        include_trends=include_trends,
+        include_comparisons=include_comparisons,
+        usage_pattern_granularity=usage_pattern_granularity,
+    )
+
+
+def load_department_balances(
+    session: Session,
+    department_id: int,
+    year: Optional[int],
+    include_sub_departments: bool,
+    policy_ids: Optional[str],
+    include_trends: bool,
+    include_comparisons: bool,
+    usage_pattern_granularity: str,
+) -> DepartmentBalanceResponse:
+    """Build the department balance analytics."""
     current_user = get_current_user()
     
     # Validate access
@@ -415,77 +480,116 @@ async def get_department_balances(
     # Default to current year
     data_year = year or date.today().year
     
-    # Mock department data
-    department_name = f"Department {department_id}"
-    department_code = f"DEPT-{department_id}"
+    department = session.get(Department, department_id)
+    if not department:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Department {department_id} not found",
+        )
+    
+    department_ids = [department_id]
+    sub_departments = []
+    if include_sub_departments:
+        sub_departments = session.execute(
+            select(Department).where(Department.parent_department_id == department_id)
+        ).scalars().all()
+        department_ids += [sub.id for sub in sub_departments]
+    
+    employee_ids = session.execute(
+        select(Employee.id).where(
+            Employee.department_id.in_(department_ids),
+            Employee.is_active == True,
+        ).order_by(Employee.id)
+    ).scalars().all()
+    
+    # Every employee's balances in a fixed number of queries; past years
+    # are reported as of their last day
+    as_of_date = date(data_year, 12, 31) if data_year < date.today().year else date.today()
+    figures = list(BatchBalanceService(session).get_balances(
+        employee_ids, as_of_date=as_of_date, policy_ids=filter_policy_ids,
+    ).values())
+    
+    statuses = [
+        get_balance_status(f.total_available, f.total_allocated, None)[0]
+        for f in figures
+    ]
+    total_employees = len(figures)
+    total_available = sum(f.total_available for f in figures)
+    total_allocated = sum(f.total_allocated for f in figures)
+    total_used = sum(f.total_used for f in figures)
     
-    # Mock summary
-    total_employees = 50
     summary = DepartmentBalanceSummary(
         total_employees=total_employees,
-        total_available_balance=625.0,
-        average_available_balance=12.5,
-        total_pending_days=45.0,
-        total_used_ytd=280.0,
-        employees_healthy_balance=35,
-        employees_low_balance=10,
-        employees_critical_balance=5,
-        total_upcoming_accruals=62.5,
-        average_accrual_utilization=0.72,
+        total_available_balance=total_available,
+        average_available_balance=total_available / total_employees if total_employees else 0,
+        total_pending_days=sum(f.total_pending for f in figures),
+        total_used_ytd=total_used,
+        employees_healthy_balance=statuses.count(BalanceStatusEnum.HEALTHY),
+        employees_low_balance=statuses.count(BalanceStatusEnum.LOW),
+        employees_critical_balance=statuses.count(BalanceStatusEnum.CRITICAL),
+        total_upcoming_accruals=sum(f.next_accrual.amount for f in figures if f.next_accrual),
+        average_accrual_utilization=total_used / total_allocated if total_allocated else 0,
     )
     
-    # Mock policy metrics
-    policy_metrics = [
-        PolicyUsageMetric(
-            policy_id=1,
-            policy_name="Paid Time Off",
-            policy_code="PTO",
-            total_allocated=750.0,
-            total_used=200.0,
-            total_available=520.0,
-            total_pending=30.0,
-            utilization_rate=26.7,
-            accrual_utilization_rate=0.68,
-            employees_enrolled=48,
-            employees_used=35,
-            effectiveness_score=85.5,
-        ),
-        PolicyUsageMetric(
-            policy_id=2,
-            policy_name="Sick Leave",
-            policy_code="SICK",
-            total_allocated=250.0,
-            total_used=80.0,
-            total_available=155.0,
-            total_pending=15.0,
-            utilization_rate=32.0,
-            accrual_utilization_rate=0.78,
-            employees_enrolled=50,
-            employees_used=25,
-            effectiveness_score=92.0,
-        ),
-    ]
-    
-    # Filter by policy IDs if specified
-    if filter_policy_ids:
-        policy_metrics = [pm for pm in policy_metrics if pm.policy_id in filter_policy_ids]
+    # Per-policy totals across the department
+    policy_metrics = []
+    policy_count = len(figures[0].policies) if figures else 0
+    for index in range(policy_count):
+        rows = [f.policies[index] for f in figures]
+        policy = rows[0].policy
+        allocated = sum(r.total_allocated + r.carried_over for r in rows)
+        used = sum(r.used for r in rows)
+        enrolled = sum(1 for r in rows if r.has_balance_record)
+        healthy = sum(
+            1 for r in rows
+            if get_balance_status(r.available, r.total_allocated + r.carried_over, policy.max_balance)[0]
+            == BalanceStatusEnum.HEALTHY
+        )
+        policy_metrics.append(PolicyUsageMetric(
+            policy_id=policy.id,
+            policy_name=policy.name,
+            policy_code=policy.code,
+            total_allocated=allocated,
+            total_used=used,
+            total_available=sum(r.available for r in rows),
+            total_pending=sum(r.pending for r in rows),
+            utilization_rate=round(used / allocated * 100, 1) if allocated else 0,
+            accrual_utilization_rate=round(used / allocated, 2) if allocated else 0,
+            employees_enrolled=enrolled,
+            employees_used=sum(1 for r in rows if r.used > 0),
+            effectiveness_score=round(healthy / len(rows) * 100, 1),
+        ))
     
-    # Mock balance distribution
+    # Balance distribution across employees
+    balances = sorted(f.total_available for f in figures)
+    bucket_counts = {"0-5": 0, "5-10": 0, "10-15": 0, "15-20": 0, "20+": 0}
+    for balance in balances:
+        if balance < 5:
+            bucket_counts["0-5"] += 1
+        elif balance < 10:
+            bucket_counts["5-10"] += 1
+        elif balance < 15:
+            bucket_counts["10-15"] += 1
+        elif balance < 20:
+            bucket_counts["15-20"] += 1
+        else:
+            bucket_counts["20+"] += 1
     balance_distribution = BalanceDistribution(
-        min_balance=2.0,
-        max_balance=25.0,
-        mean_balance=12.5,
-        median_balance=11.0,
-        std_deviation=4.2,
-        percentile_25=8.5,
-        percentile_75=16.0,
-        percentile_90=20.0,
+        min_balance=balances[0] if balances else 0,
+        max_balance=balances[-1] if balances else 0,
+        mean_balance=statistics.fmean(balances) if balances else 0,
+        median_balance=statistics.median(balances) if balances else 0,
+        std_deviation=statistics.pstdev(balances) if balances else 0,
+        percentile_25=percentile(balances, 0.25),
+        percentile_75=percentile(balances, 0.75),
+        percentile_90=percentile(balances, 0.90),
         distribution_buckets=[
-            {"range": "0-5", "count": 8, "percentage": 16.0},
-            {"range": "5-10", "count": 12, "percentage": 24.0},
-            {"range": "10-15", "count": 18, "percentage": 36.0},
-            {"range": "15-20", "count": 9, "percentage": 18.0},
-            {"range": "20+", "count": 3, "percentage": 6.0},
+            {
+                "range": label,
+                "count": count,
+                "percentage": round(count / len(balances) * 100, 1) if balances else 0,
+            }
+            for label, count in bucket_counts.items()
         ],
     )
     
@@ -590,30 +694,25 @@ async def get_department_balances(
             ),
         ]
     
-    # Mock sub-department summaries
+    # Sub-department rollups from the same figures
     sub_department_summaries = []
-    if include_sub_departments:
-        sub_department_summaries = [
-            {
-                "department_id": department_id * 10 + 1,
-                "department_name": f"Sub-Department {department_id}-A",
-                "employee_count": 20,
-                "total_available": 250.0,
-                "utilization_rate": 28.5,
-            },
-            {
-                "department_id": department_id * 10 + 2,
-                "department_name": f"Sub-Department {department_id}-B",
-                "employee_count": 30,
-                "total_available": 375.0,
-                "utilization_rate": 25.2,
-            },
-        ]
+    for sub in sub_departments:
+        sub_figures = [f for f in figures if f.department_id == sub.id]
+        sub_allocated = sum(f.total_allocated for f in sub_figures)
+        sub_department_summaries.append({
+            "department_id": sub.id,
+            "department_name": sub.name,
+            "employee_count": len(sub_figures),
+            "total_available": sum(f.total_available for f in sub_figures),
+            "utilization_rate": round(
+                sum(f.total_used for f in sub_figures) / sub_allocated * 100, 1
+            ) if sub_allocated else 0,
+        })
     
     return DepartmentBalanceResponse(
         department_id=department_id,
-        department_name=department_name,
-        department_code=department_code,
+        department_name=department.name,
+        department_code=department.code,
         summary=summary,
         policy_metrics=policy_metrics,
         balance_distribution=balance_distribution,
@@ -625,5 +724,3 @@ async def get_department_balances(
         as_of_date=date.today(),
         retrieved_at=datetime.utcnow(),
     )
-
-
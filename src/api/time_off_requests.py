@@ -11,8 +11,14 @@ from pydantic import BaseModel, Field, field_validator
 from sqlalchemy import and_, or_, select
 from sqlalchemy.orm import Session
 
+from src.data.keyset_pagination import CountMode, decode_cursor, encode_cursor
 from src.database.database import get_db
 from src.models.employee import Employee
+from src.services.business_calendar_service import (
+    BusinessCalendar,
+    BusinessCalendarService,
+    get_static_calendar,
+)
 from src.utils.auth import CurrentUser, UserRole, get_mock_current_user
 from src.utils.errors import ForbiddenError, NotFoundError, ValidationError
 
@@ -192,9 +198,10 @@ class TimeOffRequestListResponse(BaseModel):
     """List of time-off requests."""
     
     requests: List[TimeOffRequestResponse]
-    total: int
+    total: Optional[int] = Field(None, description="Matching requests, or None when not counted")
     page: int = Field(default=1)
     page_size: int = Field(default=20)
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page")
 
 
 # =============================================================================
@@ -218,20 +225,23 @@ def get_next_request_id() -> int:
 # Helper Functions
 # =============================================================================
 
-def calculate_business_days(start: date, end: date) -> float:
-    """Calculate business days between two dates."""
+def calculate_business_days(
+    start: date,
+    end: date,
+    calendar: Optional[BusinessCalendar] = None,
+) -> float:
+    """
+    Calculate business days between two dates.
+    
+    Uses the employee's business calendar when given (schedule and
+    location holidays), otherwise a Monday-to-Friday week.
+    """
     if start > end:
         return 0
     
-    days = 0
-    current = start
-    while current <= end:
-        # Skip weekends (5 = Saturday, 6 = Sunday)
-        if current.weekday() < 5:
-            days += 1
-        current += timedelta(days=1)
-    
-    return float(days)
+    if calendar is None or not calendar.covers(start, end):
+        calendar = get_static_calendar(start, end)
+    return float(calendar.business_days(start, end))
 
 
 def get_employee_balance(
@@ -465,8 +475,13 @@ async def create_time_off_request(
             field_errors=[{"field": "employee_id", "message": error_msg}],
         )
     
-    # Calculate total days
-    total_days = calculate_business_days(request.start_date, request.end_date)
+    # Calculate total days on the employee's schedule and holiday calendar
+    calendar = BusinessCalendarService(session).get_employee_calendar(
+        session.get(Employee, request.employee_id),
+        request.start_date,
+        request.end_date,
+    )
+    total_days = calculate_business_days(request.start_date, request.end_date, calendar)
     if request.is_half_day:
         total_days = 0.5
     
@@ -673,11 +688,30 @@ async def list_time_off_requests(
     start_date: Optional[date] = Query(None, description="Filter by start date"),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; overrides page"),
+    count: CountMode = Query(CountMode.EXACT, description="Total to report: exact or none"),
 ) -> TimeOffRequestListResponse:
-    """List time-off requests with access controls."""
+    """
+    List time-off requests with access controls.
+    
+    Requests are listed in id order. A cursor resumes after the previous
+    page's last request; with count=none the scan stops as soon as the
+    page (plus one request to detect a next page) is filled.
+    """
+    after_id = decode_cursor(cursor, "time_off_requests", 1)[0] if cursor else None
+    skip = 0 if cursor else (page - 1) * page_size
+    counting = count != CountMode.NONE
+    total = 0
     results = []
     
+    # Ids are issued in increasing order, so insertion order is id order
     for req_id, req in _requests.items():
+        if not counting:
+            if len(results) > skip + page_size:
+                break
+            if after_id is not None and req_id <= after_id:
+                continue
+        
         # Apply filters
         if employee_id and req["employee_id"] != employee_id:
             continue
@@ -697,7 +731,11 @@ async def list_time_off_requests(
             if employee and employee.manager_id == current_user.employee_id:
                 can_view = True
         
-        if can_view:
+        if not can_view:
+            continue
+        
+        total += 1
+        if after_id is None or req_id > after_id:
             results.append(TimeOffRequestResponse(
                 id=req["id"],
                 employee_id=req["employee_id"],
@@ -720,15 +758,16 @@ async def list_time_off_requests(
             ))
     
     # Paginate
-    total = len(results)
-    start_idx = (page - 1) * page_size
-    end_idx = start_idx + page_size
-    paged_results = results[start_idx:end_idx]
+    paged_results = results[skip:skip + page_size]
+    next_cursor = None
+    if len(results) > skip + page_size:
+        next_cursor = encode_cursor("time_off_requests", [paged_results[-1].id])
     
     return TimeOffRequestListResponse(
         requests=paged_results,
-        total=total,
+        total=total if counting else None,
         page=page,
         page_size=page_size,
+        next_cursor=next_cursor,
     )
 
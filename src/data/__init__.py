@@ -1,6 +1,6 @@
 """Data access layer package."""
 
+from src.data.employee_hierarchy_repository import EmployeeHierarchyRepository
 from src.data.employee_repository import EmployeeRepository
 
-__all__ = ["EmployeeRepository"]
-
+__all__ = ["EmployeeHierarchyRepository", "EmployeeRepository"]
@@ -0,0 +1,146 @@
+"""Repository for closure-table lookups over the manager hierarchy."""
+
+from typing import List, Optional
+
+from sqlalchemy import delete, exists, literal, select, text
+from sqlalchemy.orm import Session
+
+from src.models.employee_hierarchy import EmployeeHierarchy
+
+
+# Recursive rebuild of the closure table from employee.manager_id.
+# Used to repair the index; normal maintenance happens in the
+# trigger_employee_hierarchy_sync database trigger.
+REBUILD_HIERARCHY_SQL = """
+INSERT INTO employee_hierarchy (ancestor_id, descendant_id, depth)
+WITH RECURSIVE closure AS (
+    SELECT id AS ancestor_id, id AS descendant_id, 0 AS depth
+    FROM employee
+    UNION ALL
+    SELECT c.ancestor_id, e.id, c.depth + 1
+    FROM closure c
+    JOIN employee e ON e.manager_id = c.descendant_id
+    WHERE c.depth < :max_depth
+)
+SELECT ancestor_id, descendant_id, depth FROM closure
+"""
+
+
+class EmployeeHierarchyRepository:
+    """
+    Repository for reporting hierarchy queries.
+
+    Every lookup is a single indexed query against the employee_hierarchy
+    closure table, regardless of how deep or wide the subtree is.
+    """
+
+    def __init__(self, session: Session):
+        """Initialize repository with database session."""
+        self.session = session
+
+    def get_descendant_ids(
+        self,
+        ancestor_id: int,
+        max_depth: Optional[int] = None,
+    ) -> List[int]:
+        """
+        Get all direct and indirect reports of an employee.
+
+        Args:
+            ancestor_id: Manager whose subtree to fetch
+            max_depth: Optional number of reporting levels to include
+
+        Returns:
+            Employee IDs ordered by depth (direct reports first)
+        """
+        stmt = (
+            select(EmployeeHierarchy.descendant_id)
+            .where(EmployeeHierarchy.ancestor_id == ancestor_id)
+            .where(EmployeeHierarchy.depth > 0)
+        )
+        if max_depth is not None:
+            stmt = stmt.where(EmployeeHierarchy.depth <= max_depth)
+        stmt = stmt.order_by(EmployeeHierarchy.depth, EmployeeHierarchy.descendant_id)
+
+        return list(self.session.execute(stmt).scalars().all())
+
+    def get_ancestor_ids(
+        self,
+        employee_id: int,
+        max_depth: Optional[int] = None,
+    ) -> List[int]:
+        """
+        Get the manager chain of an employee.
+
+        Args:
+            employee_id: Employee whose managers to fetch
+            max_depth: Optional number of levels to walk up
+
+        Returns:
+            Manager IDs ordered from direct manager to top of the chain
+        """
+        stmt = (
+            select(EmployeeHierarchy.ancestor_id)
+            .where(EmployeeHierarchy.descendant_id == employee_id)
+            .where(EmployeeHierarchy.depth > 0)
+        )
+        if max_depth is not None:
+            stmt = stmt.where(EmployeeHierarchy.depth <= max_depth)
+        stmt = stmt.order_by(EmployeeHierarchy.depth)
+
+        return list(self.session.execute(stmt).scalars().all())
+
+    def is_ancestor(
+        self,
+        ancestor_id: int,
+        descendant_id: int,
+        max_depth: Optional[int] = None,
+    ) -> bool:
+        """
+        Check whether one employee is above another in the reporting chain.
+
+        Args:
+            ancestor_id: Potential manager
+            descendant_id: Potential (direct or indirect) report
+            max_depth: Optional number of levels the two may be apart
+
+        Returns:
+            True if ancestor_id manages descendant_id directly or indirectly
+        """
+        conditions = [
+            EmployeeHierarchy.ancestor_id == ancestor_id,
+            EmployeeHierarchy.descendant_id == descendant_id,
+            EmployeeHierarchy.depth > 0,
+        ]
+        if max_depth is not None:
+            conditions.append(EmployeeHierarchy.depth <= max_depth)
+
+        stmt = select(literal(True)).where(exists().where(*conditions))
+        return bool(self.session.execute(stmt).scalar())
+
+    def get_depth(self, employee_id: int) -> int:
+        """Get the number of managers above an employee (0 for top of org)."""
+        stmt = (
+            select(EmployeeHierarchy.depth)
+            .where(EmployeeHierarchy.descendant_id == employee_id)
+            .order_by(EmployeeHierarchy.depth.desc())
+            .limit(1)
+        )
+        return self.session.execute(stmt).scalar() or 0
+
+    def rebuild(self, max_depth: int = 100) -> int:
+        """
+        Rebuild the closure table from employee.manager_id.
+
+        Intended for repairs and initial backfill; the database trigger
+        keeps the table current during normal operation.
+
+        Returns:
+            Number of closure rows written
+        """
+        self.session.execute(delete(EmployeeHierarchy))
+        result = self.session.execute(
+            text(REBUILD_HIERARCHY_SQL), {"max_depth": max_depth}
+        )
+        self.session.flush()
+        return result.rowcount or 0
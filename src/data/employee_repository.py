@@ -4,9 +4,19 @@ from dataclasses import dataclass
 from datetime import date
 from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-from sqlalchemy import and_, func, or_, select, text
+from sqlalchemy import Integer, and_, any_, bindparam, func, or_, select, text
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Session, joinedload
 
+from src.data.employee_hierarchy_repository import EmployeeHierarchyRepository
+from src.data.keyset_pagination import (
+    CountMode,
+    KeysetPage,
+    SortKey,
+    attribute_key,
+    fetch_keyset_page,
+)
+from src.infrastructure.redis.caching_service import CachingService
 from src.models.employee import Department, Employee, Location
 
 
@@ -46,6 +56,30 @@ class SearchFilters:
     is_active: Optional[bool] = None
 
 
+# Keyset orderings for the directory's sort fields. Each ends in the
+# primary key so the order is total; name columns break ties first so
+# people sharing a title or start date still list alphabetically.
+_NAME_KEYS: Tuple[SortKey, ...] = (
+    attribute_key(Employee.last_name),
+    attribute_key(Employee.first_name),
+    attribute_key(Employee.id),
+)
+
+DIRECTORY_SORT_KEYS: Dict[str, Tuple[SortKey, ...]] = {
+    "last_name": _NAME_KEYS,
+    "first_name": (
+        attribute_key(Employee.first_name),
+        attribute_key(Employee.last_name),
+        attribute_key(Employee.id),
+    ),
+    "email": (attribute_key(Employee.email), attribute_key(Employee.id)),
+    "employee_id": (attribute_key(Employee.employee_id), attribute_key(Employee.id)),
+    "job_title": (attribute_key(Employee.job_title, nullable=True),) + _NAME_KEYS,
+    "hire_date": (attribute_key(Employee.hire_date),) + _NAME_KEYS,
+    "department": (attribute_key(Employee.department_id, nullable=True),) + _NAME_KEYS,
+}
+
+
 @dataclass
 class SearchResult:
     """Search result with relevance score."""
@@ -61,9 +95,17 @@ class EmployeeRepository:
     Provides methods for querying, searching, and filtering employee data.
     """
     
-    def __init__(self, session: Session):
-        """Initialize repository with database session."""
+    def __init__(self, session: Session, cache: Optional[CachingService] = None):
+        """
+        Initialize repository with database session.
+        
+        Args:
+            session: Database session
+            cache: Optional cache for per-user visibility sets
+        """
         self.session = session
+        self.hierarchy = EmployeeHierarchyRepository(session)
+        self.cache = cache
     
     # =========================================================================
     # Directory/List Operations
@@ -75,18 +117,27 @@ class EmployeeRepository:
         sort: SortParams,
         filters: SearchFilters,
         visible_employee_ids: Optional[List[int]] = None,
-    ) -> Tuple[Sequence[Employee], int]:
+        cursor: Optional[str] = None,
+        count_mode: CountMode = CountMode.EXACT,
+    ) -> KeysetPage:
         """
         Get paginated employee directory.
         
+        Rows come in keyset order on the sort field plus tie-breakers ending
+        in the primary key, so pages are stable and every page carries a
+        cursor for the next one. A cursor seeks past the previous page
+        instead of skipping ``pagination.offset`` rows.
+        
         Args:
-            pagination: Pagination parameters
+            pagination: Pagination parameters (page is ignored with a cursor)
             sort: Sort parameters
             filters: Search filters
             visible_employee_ids: Optional list of employee IDs the user can view
+            cursor: Cursor from the previous page's next_cursor
+            count_mode: How to compute the total
         
         Returns:
-            Tuple of (employees, total_count)
+            KeysetPage of employees, with the total and next cursor
         """
         # Base query with eager loading
         stmt = (
@@ -102,22 +153,23 @@ class EmployeeRepository:
         stmt = self._apply_filters(stmt, filters)
         
         # Apply visibility restrictions
-        if visible_employee_ids is not None:
-            stmt = stmt.where(Employee.id.in_(visible_employee_ids))
-        
-        # Get total count before pagination
-        count_stmt = select(func.count()).select_from(stmt.subquery())
-        total_count = self.session.execute(count_stmt).scalar() or 0
-        
-        # Apply sorting
-        stmt = self._apply_sorting(stmt, sort)
-        
-        # Apply pagination
-        stmt = stmt.offset(pagination.offset).limit(pagination.page_size)
-        
-        employees = self.session.execute(stmt).scalars().unique().all()
-        
-        return employees, total_count
+        stmt = self._apply_visibility(stmt, visible_employee_ids)
+        
+        field = sort.field if sort.field in DIRECTORY_SORT_KEYS else "last_name"
+        descending = sort.order.lower() == "desc"
+        
+        return fetch_keyset_page(
+            self.session,
+            stmt,
+            keys=DIRECTORY_SORT_KEYS[field],
+            scope=f"directory:{field}:{'desc' if descending else 'asc'}",
+            page_size=pagination.page_size,
+            cursor=cursor,
+            descending=descending,
+            offset=pagination.offset,
+            count_mode=count_mode,
+            cache=self.cache,
+        )
     
     # =========================================================================
     # Search Operations
@@ -163,8 +215,7 @@ class EmployeeRepository:
         stmt = self._apply_filters(stmt, filters)
         
         # Apply visibility restrictions
-        if visible_employee_ids is not None:
-            stmt = stmt.where(Employee.id.in_(visible_employee_ids))
+        stmt = self._apply_visibility(stmt, visible_employee_ids)
         
         # Limit results
         stmt = stmt.limit(limit * 2)  # Get extra for scoring/ranking
@@ -222,8 +273,7 @@ class EmployeeRepository:
             .where(Employee.is_active == True)
         )
         
-        if visible_employee_ids is not None:
-            stmt = stmt.where(Employee.id.in_(visible_employee_ids))
+        stmt = self._apply_visibility(stmt, visible_employee_ids)
         
         stmt = stmt.order_by(Employee.last_name, Employee.first_name).limit(limit)
         
@@ -248,19 +298,39 @@ class EmployeeRepository:
             max_hierarchy_depth: Maximum depth to traverse in hierarchy
         
         Returns:
-            List of visible employee IDs, or None if user can see all
+            Sorted list of visible employee IDs, or None if user can see all
         """
         # Admin roles can see all employees
         admin_roles = {"admin", "hr_manager", "hr_admin"}
         if any(role in admin_roles for role in user_roles):
             return None
         
+        version = None
+        if self.cache is not None:
+            cached, version = self.cache.get_visibility_set(user_employee_id, max_hierarchy_depth)
+            if cached is not None:
+                return cached
+        
+        visible_ids = sorted(
+            self._compute_visible_employee_ids(user_employee_id, max_hierarchy_depth)
+        )
+        
+        if self.cache is not None:
+            self.cache.set_visibility_set(user_employee_id, max_hierarchy_depth, visible_ids, version)
+        
+        return visible_ids
+    
+    def _compute_visible_employee_ids(
+        self,
+        user_employee_id: Optional[int],
+        max_hierarchy_depth: int,
+    ) -> set:
+        """Compute the set of employee IDs visible to a non-admin user."""
         # If user is not an employee, they can only see basic directory
         if user_employee_id is None:
             # Return only active employees (public directory view)
             stmt = select(Employee.id).where(Employee.is_active == True)
-            result = self.session.execute(stmt).scalars().all()
-            return list(result)
+            return set(self.session.execute(stmt).scalars().all())
         
         # Get employees visible based on organizational hierarchy
         visible_ids = set()
@@ -284,49 +354,23 @@ class EmployeeRepository:
         dept_employees = self._get_department_employees(user_employee_id)
         visible_ids.update(dept_employees)
         
-        return list(visible_ids)
+        return visible_ids
     
     def _get_all_reports(
         self,
         manager_id: int,
         max_depth: int,
-        current_depth: int = 0,
     ) -> List[int]:
-        """Recursively get all direct and indirect reports."""
-        if current_depth >= max_depth:
-            return []
-        
-        stmt = select(Employee.id).where(Employee.manager_id == manager_id)
-        direct_reports = list(self.session.execute(stmt).scalars().all())
-        
-        all_reports = list(direct_reports)
-        for report_id in direct_reports:
-            all_reports.extend(
-                self._get_all_reports(report_id, max_depth, current_depth + 1)
-            )
-        
-        return all_reports
+        """Get all direct and indirect reports from the hierarchy index."""
+        return self.hierarchy.get_descendant_ids(manager_id, max_depth=max_depth)
     
     def _get_manager_chain(
         self,
         employee_id: int,
         max_depth: int,
     ) -> List[int]:
-        """Get the chain of managers up to max_depth."""
-        managers = []
-        current_id = employee_id
-        
-        for _ in range(max_depth):
-            stmt = select(Employee.manager_id).where(Employee.id == current_id)
-            manager_id = self.session.execute(stmt).scalar_one_or_none()
-            
-            if manager_id is None:
-                break
-            
-            managers.append(manager_id)
-            current_id = manager_id
-        
-        return managers
+        """Get the chain of managers up to max_depth from the hierarchy index."""
+        return self.hierarchy.get_ancestor_ids(employee_id, max_depth=max_depth)
     
     def _get_peers(self, employee_id: int) -> List[int]:
         """Get employees with the same manager."""
@@ -366,6 +410,24 @@ class EmployeeRepository:
     # Helper Methods
     # =========================================================================
     
+    def _apply_visibility(self, stmt, visible_employee_ids: Optional[List[int]]):
+        """
+        Restrict a query to visible employees.
+        
+        The IDs are sent as one array parameter (``id = ANY(:ids)``) rather
+        than an IN list, so statement size and planning cost stay flat
+        however large the visibility set is.
+        """
+        if visible_employee_ids is None:
+            return stmt
+        
+        visible = bindparam(
+            "visible_employee_ids",
+            value=list(visible_employee_ids),
+            type_=ARRAY(Integer),
+        )
+        return stmt.where(Employee.id == any_(visible))
+    
     def _apply_filters(self, stmt, filters: SearchFilters):
         """Apply search filters to query."""
         conditions = []
@@ -399,28 +461,6 @@ class EmployeeRepository:
         
         return stmt
     
-    def _apply_sorting(self, stmt, sort: SortParams):
-        """Apply sorting to query."""
-        # Map field names to columns
-        sort_columns = {
-            "last_name": Employee.last_name,
-            "first_name": Employee.first_name,
-            "email": Employee.email,
-            "employee_id": Employee.employee_id,
-            "job_title": Employee.job_title,
-            "hire_date": Employee.hire_date,
-            "department": Employee.department_id,
-        }
-        
-        column = sort_columns.get(sort.field, Employee.last_name)
-        
-        if sort.order.lower() == "desc":
-            column = column.desc()
-        else:
-            column = column.asc()
-        
-        return stmt.order_by(column)
-    
     def _build_search_conditions(self, query: str, fuzzy: bool):
         """Build search conditions for query."""
         conditions = []
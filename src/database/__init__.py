@@ -2,17 +2,29 @@
 
 from src.database.database import (
     DatabaseConfig,
+    DbSession,
+    get_async_db,
+    get_async_engine,
+    get_async_session_factory,
     get_db,
     get_engine,
+    get_router_db,
     get_session_factory,
     init_db,
+    run_db,
 )
 
 __all__ = [
     "DatabaseConfig",
+    "DbSession",
+    "get_async_db",
+    "get_async_engine",
+    "get_async_session_factory",
     "get_db",
     "get_engine",
+    "get_router_db",
     "get_session_factory",
     "init_db",
+    "run_db",
 ]
 
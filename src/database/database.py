@@ -1,17 +1,24 @@
 """Database connection and session management."""
 
 import os
-from contextlib import contextmanager
-from dataclasses import dataclass
-from typing import Generator, Optional
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, AsyncGenerator, Callable, FrozenSet, Generator, Optional, TypeVar, Union
 
 from sqlalchemy import create_engine
 from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from src.models.base import Base
 
 
+# Read-heavy routers served from the async engine unless DB_ASYNC_ROUTERS
+# says otherwise
+DEFAULT_ASYNC_ROUTERS = frozenset({"directory", "balances", "org_chart", "search"})
+
+
 @dataclass
 class DatabaseConfig:
     """Database configuration settings."""
@@ -24,6 +31,8 @@ class DatabaseConfig:
     pool_size: int = 5
     max_overflow: int = 10
     echo: bool = False
+    # Routers whose hot reads run on the async (asyncpg) engine
+    async_routers: FrozenSet[str] = field(default_factory=lambda: DEFAULT_ASYNC_ROUTERS)
     
     @classmethod
     def from_env(cls) -> "DatabaseConfig":
@@ -37,17 +46,42 @@ class DatabaseConfig:
             pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
             max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
             echo=os.getenv("DB_ECHO", "false").lower() == "true",
+            async_routers=parse_router_names(os.getenv("DB_ASYNC_ROUTERS")),
         )
     
     @property
     def url(self) -> str:
         """Generate SQLAlchemy database URL."""
         return f"postgresql://{self.username}:{self.password}@{self.host}:{self.port}/{self.database}"
+    
+    @property
+    def async_url(self) -> str:
+        """Generate SQLAlchemy database URL for the asyncpg driver."""
+        return f"postgresql+asyncpg://{self.username}:{self.password}@{self.host}:{self.port}/{self.database}"
+
+
+def parse_router_names(value: Optional[str]) -> FrozenSet[str]:
+    """
+    Parse a comma-separated router list such as DB_ASYNC_ROUTERS.
+    
+    Unset means the defaults; an empty string means no async routers.
+    """
+    if value is None:
+        return DEFAULT_ASYNC_ROUTERS
+    return frozenset(name.strip() for name in value.split(",") if name.strip())
 
 
 # Module-level engine and session factory (initialized lazily)
 _engine: Optional[Engine] = None
 _session_factory: Optional[sessionmaker[Session]] = None
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+_async_routers: Optional[FrozenSet[str]] = None
+
+# Either session a router dependency can provide
+DbSession = Union[Session, AsyncSession]
+
+T = TypeVar("T")
 
 
 def get_engine(config: Optional[DatabaseConfig] = None) -> Engine:
@@ -113,6 +147,124 @@ def get_db() -> Generator[Session, None, None]:
         session.close()
 
 
+def get_async_engine(config: Optional[DatabaseConfig] = None) -> AsyncEngine:
+    """
+    Get or create the async (asyncpg) engine.
+    
+    Uses singleton pattern like get_engine, with its own connection pool.
+    """
+    global _async_engine
+    
+    if _async_engine is None:
+        if config is None:
+            config = DatabaseConfig.from_env()
+        
+        _async_engine = create_async_engine(
+            config.async_url,
+            pool_size=config.pool_size,
+            max_overflow=config.max_overflow,
+            echo=config.echo,
+            pool_pre_ping=True,
+        )
+    
+    return _async_engine
+
+
+def get_async_session_factory(config: Optional[DatabaseConfig] = None) -> async_sessionmaker[AsyncSession]:
+    """Get or create the async session factory."""
+    global _async_session_factory
+    
+    if _async_session_factory is None:
+        _async_session_factory = async_sessionmaker(
+            bind=get_async_engine(config),
+            autoflush=False,
+            expire_on_commit=False,
+        )
+    
+    return _async_session_factory
+
+
+@asynccontextmanager
+async def get_async_db_context() -> AsyncGenerator[AsyncSession, None]:
+    """Async counterpart of get_db_context."""
+    session = get_async_session_factory()()
+    
+    try:
+        yield session
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency that provides an async database session.
+    
+    Awaiting its queries yields the event loop instead of blocking it.
+    Commits on success, rolls back on exception.
+    """
+    async with get_async_db_context() as session:
+        yield session
+
+
+def set_async_routers(routers: Optional[FrozenSet[str]]) -> None:
+    """
+    Choose which routers use the async engine.
+    
+    None re-reads DB_ASYNC_ROUTERS on next use.
+    """
+    global _async_routers
+    _async_routers = routers
+
+
+def is_async_router(router: str) -> bool:
+    """Whether a router's sessions come from the async engine."""
+    global _async_routers
+    
+    if _async_routers is None:
+        _async_routers = DatabaseConfig.from_env().async_routers
+    
+    return router in _async_routers
+
+
+@lru_cache(maxsize=None)
+def get_router_db(router: str) -> Callable[[], AsyncGenerator[DbSession, None]]:
+    """
+    Dependency factory for a router's database session.
+    
+    The session is async for routers listed in DB_ASYNC_ROUTERS and sync
+    otherwise, decided per request so a router can be switched without
+    touching its endpoints. Endpoints pass their database work to run_db,
+    which works with either. Cached, so every endpoint of a router shares
+    one dependency and FastAPI opens one session per request.
+    """
+    async def dependency() -> AsyncGenerator[DbSession, None]:
+        if is_async_router(router):
+            async with get_async_db_context() as session:
+                yield session
+        else:
+            with get_db_context() as session:
+                yield session
+    
+    return dependency
+
+
+async def run_db(session: DbSession, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run synchronous database code against either kind of session.
+    
+    With an AsyncSession the function runs through run_sync: it gets a
+    regular Session (lazy loads included) whose I/O goes through asyncpg
+    and yields the event loop. With a Session it is simply called.
+    """
+    if isinstance(session, AsyncSession):
+        return await session.run_sync(fn, *args, **kwargs)
+    return fn(session, *args, **kwargs)
+
+
 @contextmanager
 def get_db_context() -> Generator[Session, None, None]:
     """
@@ -157,3 +309,13 @@ def dispose_engine() -> None:
         _engine = None
         _session_factory = None
 
+
+async def dispose_async_engine() -> None:
+    """Dispose of the async engine and reset its module state."""
+    global _async_engine, _async_session_factory
+    
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_session_factory = None
+
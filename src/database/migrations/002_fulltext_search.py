@@ -19,37 +19,68 @@ ADD COLUMN IF NOT EXISTS search_vector tsvector;
 CREATE INDEX IF NOT EXISTS idx_employee_search_gin 
 ON employee USING GIN (search_vector);
 
+-- The stored column replaces the expression index from migration 001,
+-- which searches never matched and every write had to maintain
+DROP INDEX IF EXISTS idx_employee_fulltext_search;
+
+-- Weighted search document: names rank above job title, job title above
+-- email, and the employee number last
+CREATE OR REPLACE FUNCTION employee_search_document(
+    first_name TEXT, last_name TEXT, preferred_name TEXT,
+    job_title TEXT, email TEXT, employee_number TEXT
+) RETURNS tsvector AS $$
+    SELECT
+        setweight(to_tsvector('english', COALESCE(first_name, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(last_name, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(preferred_name, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(job_title, '')), 'B') ||
+        setweight(to_tsvector('english', COALESCE(email, '')), 'C') ||
+        setweight(to_tsvector('english', COALESCE(employee_number, '')), 'D')
+$$ LANGUAGE sql IMMUTABLE;
+
 -- Create function to update employee search vector
 CREATE OR REPLACE FUNCTION update_employee_search_vector() 
 RETURNS trigger AS $$
 BEGIN
-    NEW.search_vector := 
-        setweight(to_tsvector('english', COALESCE(NEW.first_name, '')), 'A') ||
-        setweight(to_tsvector('english', COALESCE(NEW.last_name, '')), 'A') ||
-        setweight(to_tsvector('english', COALESCE(NEW.preferred_name, '')), 'A') ||
-        setweight(to_tsvector('english', COALESCE(NEW.email, '')), 'B') ||
-        setweight(to_tsvector('english', COALESCE(NEW.job_title, '')), 'B') ||
-        setweight(to_tsvector('english', COALESCE(NEW.employee_id, '')), 'C');
+    NEW.search_vector := employee_search_document(
+        NEW.first_name, NEW.last_name, NEW.preferred_name,
+        NEW.job_title, NEW.email, NEW.employee_id
+    );
     RETURN NEW;
 END;
 $$ LANGUAGE plpgsql;
 
--- Create trigger to automatically update search vector
+-- Create triggers to keep the search vector current. Updates only
+-- recompute it when a searched column actually changed, so status,
+-- manager and salary updates leave the vector and its GIN entries alone.
 DROP TRIGGER IF EXISTS employee_search_vector_update ON employee;
+DROP TRIGGER IF EXISTS employee_search_vector_insert ON employee;
+CREATE TRIGGER employee_search_vector_insert
+    BEFORE INSERT
+    ON employee
+    FOR EACH ROW
+    EXECUTE FUNCTION update_employee_search_vector();
 CREATE TRIGGER employee_search_vector_update
-    BEFORE INSERT OR UPDATE OF first_name, last_name, preferred_name, email, job_title, employee_id
+    BEFORE UPDATE OF first_name, last_name, preferred_name, email, job_title, employee_id
     ON employee
     FOR EACH ROW
+    WHEN (
+        OLD.first_name IS DISTINCT FROM NEW.first_name
+        OR OLD.last_name IS DISTINCT FROM NEW.last_name
+        OR OLD.preferred_name IS DISTINCT FROM NEW.preferred_name
+        OR OLD.email IS DISTINCT FROM NEW.email
+        OR OLD.job_title IS DISTINCT FROM NEW.job_title
+        OR OLD.employee_id IS DISTINCT FROM NEW.employee_id
+    )
     EXECUTE FUNCTION update_employee_search_vector();
 
--- Update existing records
-UPDATE employee SET search_vector = 
-    setweight(to_tsvector('english', COALESCE(first_name, '')), 'A') ||
-    setweight(to_tsvector('english', COALESCE(last_name, '')), 'A') ||
-    setweight(to_tsvector('english', COALESCE(preferred_name, '')), 'A') ||
-    setweight(to_tsvector('english', COALESCE(email, '')), 'B') ||
-    setweight(to_tsvector('english', COALESCE(job_title, '')), 'B') ||
-    setweight(to_tsvector('english', COALESCE(employee_id, '')), 'C');
+-- Update existing records; rows already current are not rewritten
+UPDATE employee SET search_vector = employee_search_document(
+    first_name, last_name, preferred_name, job_title, email, employee_id
+)
+WHERE search_vector IS DISTINCT FROM employee_search_document(
+    first_name, last_name, preferred_name, job_title, email, employee_id
+);
 """
 
 # Create document search table and indexes
@@ -8,12 +8,23 @@ from src.infrastructure.redis.redis_client import (
     redis_health_check,
 )
 
+from src.infrastructure.redis.codec import (
+    CacheCodec,
+    CacheSerializer,
+    CodecError,
+    TypedJSONCodec,
+    register_codec,
+)
+from src.infrastructure.redis.local_cache import LocalCache, SingleFlight
+
 from src.infrastructure.redis.caching_service import (
     CachingService,
     SessionManager,
     CachePrefix,
+    CacheTag,
     CacheTTL,
     CacheMetrics,
+    PrefixMetrics,
     get_cache_service,
     get_session_manager,
     cached,
@@ -38,11 +49,20 @@ __all__ = [
     "CachingService",
     "SessionManager",
     "CachePrefix",
+    "CacheTag",
     "CacheTTL",
     "CacheMetrics",
+    "PrefixMetrics",
     "get_cache_service",
     "get_session_manager",
     "cached",
+    "LocalCache",
+    "SingleFlight",
+    "CacheCodec",
+    "CacheSerializer",
+    "CodecError",
+    "TypedJSONCodec",
+    "register_codec",
     # Celery
     "CeleryConfig",
     "create_celery_app",
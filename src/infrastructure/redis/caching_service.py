@@ -5,17 +5,29 @@ High-performance caching layer for balance calculations, session management,
 and general-purpose caching with TTL management and cache invalidation.
 """
 
+import base64
 import hashlib
 import json
 import logging
+import math
+import random
+import sys
+import threading
 import time
+import uuid
+import zlib
+from array import array
 from datetime import datetime, timedelta, timezone
 from enum import Enum
 from functools import wraps
-from typing import Any, Callable, Dict, List, Optional, TypeVar, Union
+from itertools import accumulate
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union
 
 from pydantic import BaseModel, Field
+from sqlalchemy import event
 
+from src.infrastructure.redis.codec import CacheSerializer, CodecError
+from src.infrastructure.redis.local_cache import LocalCache, SingleFlight
 from src.infrastructure.redis.redis_client import get_redis_client, get_redis_manager
 
 logger = logging.getLogger(__name__)
@@ -58,12 +70,83 @@ class CacheTTL:
     # Employee data
     EMPLOYEE_PROFILE = 300  # 5 minutes
     EMPLOYEE_PERMISSIONS = 600  # 10 minutes
+    EMPLOYEE_VISIBILITY = 600  # 10 minutes
     
     # Validation cache
     VALIDATION_RESULT = 1800  # 30 minutes
     
     # Short-lived
     TEMPORARY = 60  # 1 minute
+    
+    # Tag index sets - must outlive every entry registered in them
+    TAG_INDEX = 86400  # 24 hours
+    
+    # In-process (L1) copies - bounded staleness if an invalidation is missed
+    L1_POLICY = 60  # 1 minute
+    L1_EMPLOYEE = 30  # 30 seconds
+    L1_VALIDATION = 30  # 30 seconds
+    
+    # Single-flight recompute lock held across workers
+    RECOMPUTE_LOCK = 30  # 30 seconds
+
+
+# Prefixes served from the in-process L1 tier, with their L1 TTLs
+DEFAULT_L1_TTLS: Dict["CachePrefix", int] = {
+    CachePrefix.POLICY: CacheTTL.L1_POLICY,
+    CachePrefix.EMPLOYEE: CacheTTL.L1_EMPLOYEE,
+    CachePrefix.VALIDATION: CacheTTL.L1_VALIDATION,
+}
+
+
+class CacheTag:
+    """
+    Invalidation tag names.
+    
+    Cached entries register their keys in one Redis set per tag, so an
+    invalidation only touches the keys it owns instead of scanning the
+    keyspace.
+    """
+    
+    @staticmethod
+    def employee(employee_id: int) -> str:
+        """Everything cached for an employee."""
+        return f"employee:{employee_id}"
+    
+    @staticmethod
+    def balance(employee_id: int) -> str:
+        """Balance summaries, details and projections for an employee."""
+        return f"employee:{employee_id}:balance"
+    
+    @staticmethod
+    def policy(policy_id: int) -> str:
+        """Everything cached for a policy."""
+        return f"policy:{policy_id}"
+    
+    @staticmethod
+    def org(scope: Union[int, str] = "all") -> str:
+        """Organizational structure data, optionally for one department."""
+        return f"org:{scope}"
+    
+    @staticmethod
+    def family(tag: str) -> str:
+        """Tag with IDs replaced by '*', used to bucket metrics."""
+        return ":".join("*" if part.isdigit() else part for part in tag.split(":"))
+
+
+class PrefixMetrics(BaseModel):
+    """Two-tier cache metrics for one key prefix."""
+    
+    l1_hits: int = 0
+    l1_misses: int = 0
+    l2_hits: int = 0
+    l2_misses: int = 0
+    early_refreshes: int = 0
+    
+    @property
+    def l1_hit_ratio(self) -> float:
+        """Share of lookups answered from the in-process tier."""
+        total = self.l1_hits + self.l1_misses
+        return self.l1_hits / total if total > 0 else 0.0
 
 
 class CacheMetrics(BaseModel):
@@ -74,6 +157,17 @@ class CacheMetrics(BaseModel):
     sets: int = 0
     deletes: int = 0
     errors: int = 0
+    batch_operations: int = 0
+    invalidated_keys: int = 0
+    invalidations_by_tag: Dict[str, int] = Field(default_factory=dict)
+    by_prefix: Dict[str, PrefixMetrics] = Field(default_factory=dict)
+    
+    def for_prefix(self, cache_type: "CachePrefix") -> PrefixMetrics:
+        """Get (creating if needed) the metrics for a prefix."""
+        metrics = self.by_prefix.get(cache_type.value)
+        if metrics is None:
+            metrics = self.by_prefix[cache_type.value] = PrefixMetrics()
+        return metrics
     
     @property
     def hit_ratio(self) -> float:
@@ -82,6 +176,32 @@ class CacheMetrics(BaseModel):
         return self.hits / total if total > 0 else 0.0
 
 
+def pack_id_set(ids: List[int]) -> str:
+    """
+    Pack a set of integer IDs into a compact string.
+    
+    IDs are sorted, delta-encoded as little-endian uint32, zlib-compressed
+    and base64-encoded, so dense ID ranges cost well under a byte per ID.
+    """
+    sorted_ids = sorted(set(ids))
+    deltas = array("I", (b - a for a, b in zip([0] + sorted_ids, sorted_ids)))
+    if sys.byteorder != "little":
+        deltas.byteswap()
+    return base64.b64encode(zlib.compress(deltas.tobytes(), 1)).decode("ascii")
+
+
+def unpack_id_set(packed: str) -> List[int]:
+    """Unpack a string produced by pack_id_set into a sorted ID list."""
+    deltas = array("I")
+    deltas.frombytes(zlib.decompress(base64.b64decode(packed)))
+    if sys.byteorder != "little":
+        deltas.byteswap()
+    return list(accumulate(deltas))
+
+
+_L1_MISSING = object()
+
+
 # =============================================================================
 # Caching Service
 # =============================================================================
@@ -90,33 +210,185 @@ class CachingService:
     """
     High-performance caching service with TTL management,
     cache invalidation, and performance monitoring.
+    
+    Entries can be registered under invalidation tags (see CacheTag);
+    invalidating a tag UNLINKs exactly the keys registered under it.
+    
+    Prefixes listed in ``l1_ttls`` are also kept in a bounded in-process
+    LRU. Writes and invalidations are broadcast over Redis pub/sub so every
+    worker evicts its L1 copy; L1 is only served while this worker's
+    subscription is alive. L1 holds the encoded value, so every hit
+    decodes a copy the caller is free to modify.
     """
     
-    def __init__(self, prefix: str = "embi"):
+    # Keys per UNLINK command and per SCAN page
+    UNLINK_BATCH_SIZE = 500
+    MGET_BATCH_SIZE = 500
+    SCAN_COUNT = 1000
+    
+    # Poll interval while another worker recomputes a missing entry
+    RECOMPUTE_POLL_SECONDS = 0.05
+    
+    def __init__(
+        self,
+        prefix: str = "embi",
+        legacy_scan_fallback: bool = False,
+        l1_ttls: Optional[Dict[CachePrefix, int]] = None,
+        l1_max_entries: int = 10000,
+        serializer: Optional[CacheSerializer] = None,
+    ):
+        """
+        Initialize the caching service.
+        
+        Args:
+            prefix: Namespace for all keys
+            legacy_scan_fallback: Also SCAN for untagged keys written before
+                tag registration existed when invalidating domain caches
+            l1_ttls: L1 TTL per prefix (defaults to DEFAULT_L1_TTLS; pass
+                an empty dict to disable the in-process tier)
+            l1_max_entries: Maximum entries held in the in-process tier
+            serializer: Value encoding (defaults to typed JSON with
+                compression of large values)
+        """
         self.prefix = prefix
+        self.legacy_scan_fallback = legacy_scan_fallback
+        self.serializer = serializer or CacheSerializer()
         self._metrics = CacheMetrics()
         self._metrics_key = f"{prefix}:cache:metrics"
+        
+        self.l1_ttls = DEFAULT_L1_TTLS if l1_ttls is None else l1_ttls
+        self._l1 = LocalCache(max_entries=l1_max_entries)
+        self._invalidation_channel = f"{prefix}:cache:invalidate"
+        self._listener = None
+        self._listener_lock = threading.Lock()
+        self._single_flight = SingleFlight()
     
     @property
     def redis(self):
         """Get Redis client."""
         return get_redis_client()
     
+    # =========================================================================
+    # L1 Tier and Cross-Worker Invalidation
+    # =========================================================================
+    
+    def _l1_enabled(self, cache_type: CachePrefix) -> bool:
+        """Check whether L1 may serve a prefix right now."""
+        return cache_type in self.l1_ttls and self._ensure_listener()
+    
+    def _ensure_listener(self) -> bool:
+        """
+        Start the invalidation subscriber if it is not running.
+        
+        Returns:
+            True if L1 is safe to use, i.e. invalidations are being received
+        """
+        listener = self._listener
+        if listener is not None and listener.is_alive():
+            return True
+        
+        with self._listener_lock:
+            if self._listener is not None and self._listener.is_alive():
+                return True
+            
+            # Anything cached while unsubscribed may have missed invalidations
+            self._evict_local(clear=True)
+            
+            try:
+                pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(**{self._invalidation_channel: self._on_invalidation})
+                self._listener = pubsub.run_in_thread(
+                    sleep_time=1.0,
+                    daemon=True,
+                    exception_handler=self._on_listener_error,
+                )
+                return True
+            except Exception as e:
+                self._listener = None
+                logger.warning(f"Cache invalidation listener unavailable, L1 disabled: {str(e)}")
+                return False
+    
+    def _on_listener_error(self, error: Exception, pubsub: Any, thread: Any) -> None:
+        """Stop serving L1 when the subscription drops; it restarts on next use."""
+        logger.warning(f"Cache invalidation listener failed: {str(error)}")
+        self._evict_local(clear=True)
+        thread.stop()
+        pubsub.close()
+    
+    def _on_invalidation(self, message: Dict[str, Any]) -> None:
+        """Apply an invalidation broadcast by any worker."""
+        try:
+            payload = json.loads(message["data"])
+        except (KeyError, TypeError, json.JSONDecodeError):
+            return
+        
+        self._evict_local(
+            keys=payload.get("keys", []),
+            pattern=payload.get("pattern"),
+            clear=payload.get("clear", False),
+        )
+    
+    def _evict_local(
+        self,
+        keys: Optional[List[str]] = None,
+        pattern: Optional[str] = None,
+        clear: bool = False,
+    ) -> None:
+        """
+        Evict entries from this worker's L1.
+        
+        Each eviction advances the L1 generation under the L1 lock, so
+        in-flight L2 reads don't repopulate evicted keys.
+        """
+        if clear:
+            self._l1.clear()
+            return
+        if keys:
+            self._l1.delete(*keys)
+        if pattern:
+            self._l1.delete_matching(pattern)
+    
+    def _broadcast_invalidation(self, target: Any = None, **payload: Any) -> None:
+        """
+        Evict locally and tell other workers to evict.
+        
+        Args:
+            target: Redis client or pipeline to PUBLISH on (defaults to client)
+            payload: ``keys``, ``pattern`` or ``clear``
+        """
+        self._evict_local(**payload)
+        (target or self.redis).publish(self._invalidation_channel, json.dumps(payload))
+    
+    def _has_l1_prefix(self, keys: List[str]) -> bool:
+        """Check whether any full key belongs to an L1-cached prefix."""
+        prefixes = tuple(f"{self.prefix}:{cache_type.value}:" for cache_type in self.l1_ttls)
+        return bool(prefixes) and any(key.startswith(prefixes) for key in keys)
+    
     def _make_key(self, cache_type: CachePrefix, key: str) -> str:
         """Generate a cache key with proper namespace."""
         return f"{self.prefix}:{cache_type.value}:{key}"
     
+    def _tag_key(self, tag: str) -> str:
+        """Generate the key of a tag's index set."""
+        return f"{self.prefix}:tag:{tag}"
+    
     def _serialize(self, value: Any) -> str:
         """Serialize value for storage."""
-        if isinstance(value, BaseModel):
-            return value.model_dump_json()
-        return json.dumps(value, default=str)
+        return self.serializer.encode(value)
     
     def _deserialize(self, data: str) -> Any:
-        """Deserialize stored value."""
+        """
+        Deserialize stored value.
+        
+        Raises:
+            CodecError: If the value was written in an unsupported format
+        """
         try:
-            return json.loads(data)
-        except (json.JSONDecodeError, TypeError):
+            return self.serializer.decode(data)
+        except CodecError:
+            raise
+        except (ValueError, TypeError):
+            # Plain strings written outside this service
             return data
     
     # =========================================================================
@@ -141,14 +413,31 @@ class CachingService:
             Cached value or default
         """
         full_key = self._make_key(cache_type, key)
+        prefix_metrics = self._metrics.for_prefix(cache_type)
+        use_l1 = self._l1_enabled(cache_type)
+        
+        if use_l1:
+            data = self._l1.get(full_key, _L1_MISSING)
+            if data is not _L1_MISSING:
+                prefix_metrics.l1_hits += 1
+                self._metrics.hits += 1
+                return self._deserialize(data)
+            prefix_metrics.l1_misses += 1
         
         try:
+            generation = self._l1.generation
             data = self.redis.get(full_key)
             
             if data is not None:
+                value = self._deserialize(data)
+                prefix_metrics.l2_hits += 1
                 self._metrics.hits += 1
-                return self._deserialize(data)
+                # Skipped if an invalidation landed while we were reading
+                if use_l1:
+                    self._l1.set(full_key, data, self.l1_ttls[cache_type], generation)
+                return value
             
+            prefix_metrics.l2_misses += 1
             self._metrics.misses += 1
             return default
             
@@ -163,6 +452,7 @@ class CachingService:
         key: str,
         value: Any,
         ttl_seconds: Optional[int] = None,
+        tags: Optional[List[str]] = None,
     ) -> bool:
         """
         Set a value in cache.
@@ -172,6 +462,7 @@ class CachingService:
             key: Cache key
             value: Value to cache
             ttl_seconds: Time-to-live in seconds
+            tags: Invalidation tags to register the key under
         
         Returns:
             True if successful
@@ -181,10 +472,19 @@ class CachingService:
         try:
             serialized = self._serialize(value)
             
+            # Value, tag registrations and L1 eviction go out in one round trip
+            pipe = self.redis.pipeline(transaction=False)
             if ttl_seconds:
-                result = self.redis.setex(full_key, ttl_seconds, serialized)
+                pipe.setex(full_key, ttl_seconds, serialized)
             else:
-                result = self.redis.set(full_key, serialized)
+                pipe.set(full_key, serialized)
+            for tag in tags or []:
+                tag_key = self._tag_key(tag)
+                pipe.sadd(tag_key, full_key)
+                pipe.expire(tag_key, CacheTTL.TAG_INDEX)
+            if cache_type in self.l1_ttls:
+                self._broadcast_invalidation(pipe, keys=[full_key])
+            result = pipe.execute()[0]
             
             self._metrics.sets += 1
             return bool(result)
@@ -199,7 +499,11 @@ class CachingService:
         full_key = self._make_key(cache_type, key)
         
         try:
-            result = self.redis.delete(full_key)
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.delete(full_key)
+            if cache_type in self.l1_ttls:
+                self._broadcast_invalidation(pipe, keys=[full_key])
+            result = pipe.execute()[0]
             self._metrics.deletes += 1
             return result > 0
             
@@ -217,10 +521,348 @@ class CachingService:
         except Exception:
             return False
     
+    # =========================================================================
+    # Batch Cache Operations
+    # =========================================================================
+    
+    def get_many(self, cache_type: CachePrefix, keys: List[str]) -> Dict[str, Any]:
+        """
+        Get several values in one round trip.
+        
+        L1-cached prefixes are answered locally where possible; the rest
+        are read with MGET (chunked by MGET_BATCH_SIZE in one pipeline).
+        Hits and misses are counted per key.
+        
+        Args:
+            cache_type: Type of cached data
+            keys: Cache keys
+        
+        Returns:
+            Mapping of key to value for the keys that were found
+        """
+        found: Dict[str, Any] = {}
+        if not keys:
+            return found
+        
+        keys = list(dict.fromkeys(keys))
+        prefix_metrics = self._metrics.for_prefix(cache_type)
+        use_l1 = self._l1_enabled(cache_type)
+        self._metrics.batch_operations += 1
+        
+        remaining: List[str] = []
+        for key in keys:
+            if use_l1:
+                data = self._l1.get(self._make_key(cache_type, key), _L1_MISSING)
+                if data is not _L1_MISSING:
+                    found[key] = self._deserialize(data)
+                    continue
+            remaining.append(key)
+        
+        if use_l1:
+            prefix_metrics.l1_hits += len(found)
+            prefix_metrics.l1_misses += len(remaining)
+        self._metrics.hits += len(found)
+        
+        if not remaining:
+            return found
+        
+        full_keys = [self._make_key(cache_type, key) for key in remaining]
+        
+        try:
+            generation = self._l1.generation
+            pipe = self.redis.pipeline(transaction=False)
+            for start in range(0, len(full_keys), self.MGET_BATCH_SIZE):
+                pipe.mget(full_keys[start:start + self.MGET_BATCH_SIZE])
+            values = [data for chunk in pipe.execute() for data in chunk]
+            
+            for key, full_key, data in zip(remaining, full_keys, values):
+                if data is None:
+                    continue
+                try:
+                    value = self._deserialize(data)
+                except CodecError as e:
+                    self._metrics.errors += 1
+                    logger.warning(f"Cache decode error for {full_key}: {str(e)}")
+                    continue
+                found[key] = value
+                # Skipped if an invalidation landed while we were reading
+                if use_l1:
+                    self._l1.set(full_key, data, self.l1_ttls[cache_type], generation)
+            
+            l2_hits = len(found) - (len(keys) - len(remaining))
+            prefix_metrics.l2_hits += l2_hits
+            prefix_metrics.l2_misses += len(remaining) - l2_hits
+            self._metrics.hits += l2_hits
+            self._metrics.misses += len(remaining) - l2_hits
+            return found
+            
+        except Exception as e:
+            self._metrics.errors += 1
+            logger.error(f"Cache get_many error for {cache_type.value} ({len(keys)} keys): {str(e)}")
+            return found
+    
+    def set_many(
+        self,
+        cache_type: CachePrefix,
+        items: Dict[str, Any],
+        ttl_seconds: Optional[int] = None,
+        tags: Optional[Dict[str, List[str]]] = None,
+    ) -> bool:
+        """
+        Set several values in one pipelined round trip.
+        
+        Args:
+            cache_type: Type of cached data
+            items: Mapping of cache key to value
+            ttl_seconds: Time-to-live in seconds, shared by every key
+            tags: Invalidation tags per cache key
+        
+        Returns:
+            True if every value was stored
+        """
+        if not items:
+            return True
+        
+        tags = tags or {}
+        
+        try:
+            full_keys = []
+            tag_members: Dict[str, List[str]] = {}
+            pipe = self.redis.pipeline(transaction=False)
+            for key, value in items.items():
+                full_key = self._make_key(cache_type, key)
+                full_keys.append(full_key)
+                serialized = self._serialize(value)
+                if ttl_seconds:
+                    pipe.setex(full_key, ttl_seconds, serialized)
+                else:
+                    pipe.set(full_key, serialized)
+                for tag in tags.get(key, []):
+                    tag_members.setdefault(tag, []).append(full_key)
+            for tag, members in tag_members.items():
+                tag_key = self._tag_key(tag)
+                pipe.sadd(tag_key, *members)
+                pipe.expire(tag_key, CacheTTL.TAG_INDEX)
+            if cache_type in self.l1_ttls:
+                self._broadcast_invalidation(pipe, keys=full_keys)
+            results = pipe.execute()[:len(full_keys)]
+            
+            self._metrics.sets += len(full_keys)
+            self._metrics.batch_operations += 1
+            return all(results)
+            
+        except Exception as e:
+            self._metrics.errors += 1
+            logger.error(f"Cache set_many error for {cache_type.value} ({len(items)} keys): {str(e)}")
+            return False
+    
+    def delete_many(self, cache_type: CachePrefix, keys: List[str]) -> int:
+        """
+        Delete several values in one pipelined round trip.
+        
+        Returns:
+            Number of keys deleted
+        """
+        if not keys:
+            return 0
+        
+        full_keys = [self._make_key(cache_type, key) for key in keys]
+        
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            batches = range(0, len(full_keys), self.UNLINK_BATCH_SIZE)
+            for start in batches:
+                pipe.unlink(*full_keys[start:start + self.UNLINK_BATCH_SIZE])
+            if cache_type in self.l1_ttls:
+                self._broadcast_invalidation(pipe, keys=full_keys)
+            count = sum(pipe.execute()[:len(batches)])
+            
+            self._metrics.deletes += count
+            self._metrics.batch_operations += 1
+            return count
+            
+        except Exception as e:
+            self._metrics.errors += 1
+            logger.error(f"Cache delete_many error for {cache_type.value} ({len(keys)} keys): {str(e)}")
+            return 0
+    
+    def get_or_set(
+        self,
+        cache_type: CachePrefix,
+        key: str,
+        compute: Callable[[], T],
+        ttl_seconds: int,
+        tags: Optional[List[str]] = None,
+        beta: float = 1.0,
+    ) -> T:
+        """
+        Get a value, computing and caching it on a miss.
+        
+        Misses are single-flight: within a worker concurrent callers share
+        one computation, and across workers a short Redis lock lets one
+        worker compute while the others wait for its result. Entries are
+        refreshed early with probability rising as expiry approaches
+        (XFetch), scaled by how long the value took to compute, so hot keys
+        are rebuilt before they expire instead of all at once after.
+        
+        Args:
+            cache_type: Type of cached data
+            key: Cache key
+            compute: Zero-argument function producing the value
+            ttl_seconds: Time-to-live in seconds
+            tags: Invalidation tags to register the key under
+            beta: Early-refresh aggressiveness (0 disables, >1 refreshes earlier)
+        
+        Returns:
+            Cached or freshly computed value
+        """
+        envelope = self._unwrap(self.get(cache_type, key))
+        if envelope is not None:
+            if not self._should_refresh_early(envelope, beta):
+                return envelope["v"]
+            self._metrics.for_prefix(cache_type).early_refreshes += 1
+        
+        full_key = self._make_key(cache_type, key)
+        return self._single_flight.do(
+            full_key,
+            lambda: self._recompute(cache_type, key, compute, ttl_seconds, tags, envelope),
+        )
+    
+    @staticmethod
+    def _unwrap(cached_value: Any) -> Optional[Dict[str, Any]]:
+        """Return a get_or_set envelope, or None if the value is not one."""
+        if isinstance(cached_value, dict) and cached_value.keys() == {"v", "d", "x"}:
+            return cached_value
+        return None
+    
+    @staticmethod
+    def _should_refresh_early(envelope: Dict[str, Any], beta: float) -> bool:
+        """XFetch: refresh if now - delta * beta * ln(rand) passes the expiry."""
+        if beta <= 0:
+            return False
+        jitter = envelope["d"] * beta * math.log(random.random() or 1e-12)
+        return time.time() - jitter >= envelope["x"]
+    
+    def _recompute(
+        self,
+        cache_type: CachePrefix,
+        key: str,
+        compute: Callable[[], T],
+        ttl_seconds: int,
+        tags: Optional[List[str]],
+        stale: Optional[Dict[str, Any]],
+    ) -> T:
+        """Compute and store a value while holding the cross-worker lock."""
+        lock_key = self._make_key(cache_type, f"{key}:recompute")
+        token = uuid.uuid4().hex
+        
+        try:
+            acquired = self.redis.set(lock_key, token, nx=True, ex=CacheTTL.RECOMPUTE_LOCK)
+        except Exception as e:
+            logger.error(f"Cache lock error for {lock_key}: {str(e)}")
+            acquired = True  # Redis is unavailable; just compute
+        
+        if not acquired:
+            # Another worker is refreshing: serve the stale value meanwhile
+            if stale is not None:
+                return stale["v"]
+            
+            deadline = time.monotonic() + CacheTTL.RECOMPUTE_LOCK
+            while time.monotonic() < deadline:
+                time.sleep(self.RECOMPUTE_POLL_SECONDS)
+                envelope = self._unwrap(self.get(cache_type, key))
+                if envelope is not None:
+                    return envelope["v"]
+                if not self.exists(cache_type, f"{key}:recompute"):
+                    break
+        
+        try:
+            started = time.time()
+            value = compute()
+            finished = time.time()
+            
+            self.set(
+                cache_type,
+                key,
+                {"v": value, "d": finished - started, "x": finished + ttl_seconds},
+                ttl_seconds,
+                tags=tags,
+            )
+            return value
+        finally:
+            if acquired:
+                self._release_lock(lock_key, token)
+    
+    def _release_lock(self, lock_key: str, token: str) -> None:
+        """Release a recompute lock if this caller still owns it."""
+        try:
+            if self.redis.get(lock_key) == token:
+                self.redis.delete(lock_key)
+        except Exception as e:
+            logger.error(f"Cache lock release error for {lock_key}: {str(e)}")
+    
+    def invalidate_tags(self, *tags: str) -> int:
+        """
+        Invalidate every key registered under the given tags.
+        
+        Tag sets are read and their members UNLINKed in two pipelined
+        round trips, independent of keyspace size.
+        
+        Args:
+            tags: Tags to invalidate (see CacheTag)
+        
+        Returns:
+            Number of keys invalidated
+        """
+        if not tags:
+            return 0
+        
+        tag_keys = [self._tag_key(tag) for tag in tags]
+        
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for tag_key in tag_keys:
+                pipe.smembers(tag_key)
+            members_by_tag = pipe.execute()
+            
+            # Remember which UNLINK results belong to which tag
+            pipe = self.redis.pipeline(transaction=False)
+            commands_by_tag = []
+            all_members: List[str] = []
+            for tag_key, members in zip(tag_keys, members_by_tag):
+                members = list(members or [])
+                all_members.extend(members)
+                batches = range(0, len(members), self.UNLINK_BATCH_SIZE)
+                for start in batches:
+                    pipe.unlink(*members[start:start + self.UNLINK_BATCH_SIZE])
+                pipe.unlink(tag_key)
+                commands_by_tag.append(len(batches))
+            if self._has_l1_prefix(all_members):
+                self._broadcast_invalidation(pipe, keys=all_members)
+            results = pipe.execute()
+            
+            total = 0
+            position = 0
+            for tag, command_count in zip(tags, commands_by_tag):
+                removed = sum(results[position:position + command_count])
+                position += command_count + 1  # Skip the tag set's own UNLINK
+                self._record_invalidation(tag, removed)
+                total += removed
+            
+            return total
+            
+        except Exception as e:
+            self._metrics.errors += 1
+            logger.error(f"Cache invalidate tags error for {tags}: {str(e)}")
+            return 0
+    
     def invalidate_pattern(self, cache_type: CachePrefix, pattern: str) -> int:
         """
         Invalidate all keys matching a pattern.
         
+        Walks the keyspace with SCAN rather than KEYS so Redis is never
+        blocked; prefer invalidate_tags() for anything on a hot path.
+        
         Args:
             cache_type: Type of cached data
             pattern: Key pattern (supports * wildcard)
@@ -231,15 +873,35 @@ class CachingService:
         full_pattern = self._make_key(cache_type, pattern)
         
         try:
-            keys = self.redis.keys(full_pattern)
-            if keys:
-                return self.redis.delete(*keys)
-            return 0
+            count = 0
+            batch: List[str] = []
+            for key in self.redis.scan_iter(match=full_pattern, count=self.SCAN_COUNT):
+                batch.append(key)
+                if len(batch) >= self.UNLINK_BATCH_SIZE:
+                    count += self.redis.unlink(*batch)
+                    batch = []
+            if batch:
+                count += self.redis.unlink(*batch)
+            
+            if cache_type in self.l1_ttls:
+                self._broadcast_invalidation(pattern=full_pattern)
+            
+            self._metrics.deletes += count
+            return count
             
         except Exception as e:
+            self._metrics.errors += 1
             logger.error(f"Cache invalidate pattern error: {str(e)}")
             return 0
     
+    def _record_invalidation(self, tag: str, count: int) -> None:
+        """Record keys invalidated through a tag."""
+        family = CacheTag.family(tag)
+        by_tag = self._metrics.invalidations_by_tag
+        by_tag[family] = by_tag.get(family, 0) + count
+        self._metrics.invalidated_keys += count
+        self._metrics.deletes += count
+    
     # =========================================================================
     # Balance Cache Operations
     # =========================================================================
@@ -268,19 +930,45 @@ class CachingService:
             f"summary:{employee_id}",
             balance_data,
             ttl_seconds,
+            tags=[CacheTag.employee(employee_id), CacheTag.balance(employee_id)],
+        )
+    
+    def get_balances(self, employee_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Get cached balance summaries for several employees in one round trip."""
+        found = self.get_many(
+            CachePrefix.BALANCE,
+            [f"summary:{employee_id}" for employee_id in employee_ids],
+        )
+        return {int(key.split(":", 1)[1]): value for key, value in found.items()}
+    
+    def set_balances(
+        self,
+        balances: Dict[int, Dict[str, Any]],
+        ttl_seconds: int = CacheTTL.BALANCE_SUMMARY,
+    ) -> bool:
+        """Cache balance summaries for several employees in one round trip."""
+        return self.set_many(
+            CachePrefix.BALANCE,
+            {f"summary:{employee_id}": data for employee_id, data in balances.items()},
+            ttl_seconds,
+            tags={
+                f"summary:{employee_id}": [CacheTag.employee(employee_id), CacheTag.balance(employee_id)]
+                for employee_id in balances
+            },
         )
     
     def invalidate_balance(self, employee_id: int) -> bool:
         """Invalidate all balance cache for an employee."""
-        patterns = [
-            f"summary:{employee_id}",
-            f"detail:{employee_id}*",
-            f"projection:{employee_id}*",
-        ]
+        count = self.invalidate_tags(CacheTag.balance(employee_id))
         
-        count = 0
-        for pattern in patterns:
-            count += self.invalidate_pattern(CachePrefix.BALANCE, pattern)
+        if self.legacy_scan_fallback:
+            patterns = [
+                f"summary:{employee_id}",
+                f"detail:{employee_id}*",
+                f"projection:{employee_id}*",
+            ]
+            for pattern in patterns:
+                count += self.invalidate_pattern(CachePrefix.BALANCE, pattern)
         
         logger.info(f"Invalidated {count} balance cache entries for employee {employee_id}")
         return count > 0
@@ -303,7 +991,42 @@ class CachingService:
     ) -> bool:
         """Cache balance projection."""
         key = f"projection:{employee_id}:{projection_key}"
-        return self.set(CachePrefix.BALANCE, key, projection_data, ttl_seconds)
+        return self.set(
+            CachePrefix.BALANCE,
+            key,
+            projection_data,
+            ttl_seconds,
+            tags=[CacheTag.employee(employee_id), CacheTag.balance(employee_id)],
+        )
+    
+    def get_balance_projections(
+        self,
+        employee_ids: List[int],
+        projection_key: str,
+    ) -> Dict[int, Dict[str, Any]]:
+        """Get one cached projection for several employees in one round trip."""
+        keys = {f"projection:{employee_id}:{projection_key}": employee_id for employee_id in employee_ids}
+        found = self.get_many(CachePrefix.BALANCE, list(keys))
+        return {keys[key]: value for key, value in found.items()}
+    
+    def set_balance_projections(
+        self,
+        projection_key: str,
+        projections: Dict[int, Dict[str, Any]],
+        ttl_seconds: int = CacheTTL.BALANCE_PROJECTION,
+    ) -> bool:
+        """Cache one projection for several employees in one round trip."""
+        items = {}
+        tags = {}
+        for employee_id, data in projections.items():
+            key = f"projection:{employee_id}:{projection_key}"
+            items[key] = data
+            tags[key] = [CacheTag.employee(employee_id), CacheTag.balance(employee_id)]
+        return self.set_many(CachePrefix.BALANCE, items, ttl_seconds, tags=tags)
+    
+    def invalidate_employee(self, employee_id: int) -> int:
+        """Invalidate everything cached for an employee."""
+        return self.invalidate_tags(CacheTag.employee(employee_id))
     
     # =========================================================================
     # Policy Cache Operations
@@ -325,11 +1048,125 @@ class CachingService:
             f"constraints:{policy_id}",
             constraints,
             ttl_seconds,
+            tags=[CacheTag.policy(policy_id)],
         )
     
     def invalidate_policy(self, policy_id: int) -> bool:
         """Invalidate all cache for a policy."""
-        return self.invalidate_pattern(CachePrefix.POLICY, f"*:{policy_id}*") > 0
+        count = self.invalidate_tags(CacheTag.policy(policy_id))
+        
+        if self.legacy_scan_fallback:
+            count += self.invalidate_pattern(CachePrefix.POLICY, f"*:{policy_id}")
+            count += self.invalidate_pattern(CachePrefix.POLICY, f"*:{policy_id}:*")
+        
+        return count > 0
+    
+    # =========================================================================
+    # Employee Visibility Cache
+    # =========================================================================
+    
+    def _get_visibility_version(self) -> Optional[str]:
+        """Get the current org-structure version used in visibility keys."""
+        try:
+            version = self.redis.get(self._make_key(CachePrefix.EMPLOYEE, "visibility:version"))
+            return str(version or 0)
+        except Exception as e:
+            self._metrics.errors += 1
+            logger.error(f"Cache get error for visibility version: {str(e)}")
+            return None
+    
+    def get_visibility_set(
+        self,
+        employee_id: Optional[int],
+        max_depth: int,
+    ) -> Tuple[Optional[List[int]], Optional[str]]:
+        """
+        Get the cached sorted list of employee IDs visible to an employee.
+        
+        The org-structure version is read once and returned with the
+        result; pass it to set_visibility_set() on a miss, so a set computed
+        while the hierarchy changed is stored under the superseded version
+        and never served.
+        
+        Args:
+            employee_id: Viewing employee, or None for the public directory
+            max_depth: Hierarchy depth the set was computed with
+        
+        Returns:
+            Tuple of (sorted employee IDs or None on a cache miss, version
+            the lookup used or None when the cache is unavailable)
+        """
+        version = self._get_visibility_version()
+        if version is None:
+            return None, None
+        
+        scope = employee_id if employee_id is not None else "public"
+        packed = self.get(CachePrefix.EMPLOYEE, f"visibility:{version}:{scope}:{max_depth}")
+        if packed is None:
+            return None, version
+        
+        try:
+            return unpack_id_set(packed), version
+        except (ValueError, TypeError, zlib.error) as e:
+            logger.warning(f"Discarding corrupt visibility set for {scope}: {str(e)}")
+            return None, version
+    
+    def set_visibility_set(
+        self,
+        employee_id: Optional[int],
+        max_depth: int,
+        visible_ids: List[int],
+        version: Optional[str],
+        ttl_seconds: int = CacheTTL.EMPLOYEE_VISIBILITY,
+    ) -> bool:
+        """
+        Cache the set of employee IDs visible to an employee.
+        
+        Sets are keyed by the org-structure version get_visibility_set()
+        returned before the set was computed, so invalidate_visibility_sets()
+        retires all of them at once.
+        """
+        if version is None:
+            return False
+        
+        scope = employee_id if employee_id is not None else "public"
+        return self.set(
+            CachePrefix.EMPLOYEE,
+            f"visibility:{version}:{scope}:{max_depth}",
+            pack_id_set(visible_ids),
+            ttl_seconds,
+        )
+    
+    def invalidate_visibility_sets(self) -> bool:
+        """
+        Invalidate every cached visibility set.
+        
+        Called from write paths that change reporting lines, department
+        membership or active status. Bumps the version embedded in
+        visibility keys; superseded entries expire through their TTL.
+        """
+        try:
+            self.redis.incr(self._make_key(CachePrefix.EMPLOYEE, "visibility:version"))
+            self._metrics.deletes += 1
+            return True
+        except Exception as e:
+            self._metrics.errors += 1
+            logger.error(f"Cache invalidate error for visibility sets: {str(e)}")
+            return False
+    
+    def invalidate_visibility_sets_on_commit(self, session: Any) -> None:
+        """
+        Invalidate every cached visibility set once a session commits.
+        
+        Invalidating before the commit lets a concurrent reader cache a set
+        computed from the old hierarchy under the new version.
+        """
+        event.listen(
+            session,
+            "after_commit",
+            lambda _session: self.invalidate_visibility_sets(),
+            once=True,
+        )
     
     # =========================================================================
     # Validation Cache
@@ -350,10 +1187,11 @@ class CachingService:
         validation_key: str,
         result: Dict[str, Any],
         ttl_seconds: int = CacheTTL.VALIDATION_RESULT,
+        tags: Optional[List[str]] = None,
     ) -> bool:
-        """Cache validation result."""
+        """Cache validation result, optionally under invalidation tags."""
         key = f"{validation_type}:{validation_key}"
-        return self.set(CachePrefix.VALIDATION, key, result, ttl_seconds)
+        return self.set(CachePrefix.VALIDATION, key, result, ttl_seconds, tags=tags)
     
     # =========================================================================
     # Performance Metrics
@@ -371,6 +1209,18 @@ class CachingService:
             "sets": self._metrics.sets,
             "deletes": self._metrics.deletes,
             "errors": self._metrics.errors,
+            "batch_operations": self._metrics.batch_operations,
+            "invalidated_keys": self._metrics.invalidated_keys,
+            "invalidations_by_tag": dict(self._metrics.invalidations_by_tag),
+            "by_prefix": {
+                prefix: {
+                    **metrics.model_dump(),
+                    "l1_hit_ratio": round(metrics.l1_hit_ratio * 100, 2),
+                }
+                for prefix, metrics in self._metrics.by_prefix.items()
+            },
+            "l1_entries": len(self._l1),
+            "l1_evictions": self._l1.evictions,
             "hit_ratio": round(self._metrics.hit_ratio * 100, 2),
             "total_operations": (
                 self._metrics.hits +
@@ -618,6 +1468,7 @@ def cached(
     cache_type: CachePrefix,
     ttl_seconds: int = 300,
     key_builder: Optional[Callable[..., str]] = None,
+    tag_builder: Optional[Callable[..., List[str]]] = None,
 ):
     """
     Decorator for caching function results.
@@ -626,16 +1477,19 @@ def cached(
         cache_type: Type of cache to use
         ttl_seconds: Cache TTL
         key_builder: Optional function to build cache key from args
+        tag_builder: Optional function to build invalidation tags from args
     
     Example:
-        @cached(CachePrefix.BALANCE, ttl_seconds=300)
+        @cached(
+            CachePrefix.BALANCE,
+            ttl_seconds=300,
+            tag_builder=lambda employee_id: [CacheTag.balance(employee_id)],
+        )
         def get_employee_balance(employee_id: int):
             # ... expensive calculation
             return balance
     """
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
-        cache_service = CachingService()
-        
         @wraps(func)
         def wrapper(*args, **kwargs) -> T:
             # Build cache key
@@ -647,16 +1501,15 @@ def cached(
                 key_parts.extend(f"{k}={v}" for k, v in sorted(kwargs.items()))
                 cache_key = ":".join(key_parts)
             
-            # Try to get from cache
-            cached_value = cache_service.get(cache_type, cache_key)
-            if cached_value is not None:
-                return cached_value
-            
-            # Call function and cache result
-            result = func(*args, **kwargs)
-            cache_service.set(cache_type, cache_key, result, ttl_seconds)
-            
-            return result
+            # Single-flight on miss, early refresh near expiry
+            tags = tag_builder(*args, **kwargs) if tag_builder else None
+            return get_cache_service().get_or_set(
+                cache_type,
+                cache_key,
+                lambda: func(*args, **kwargs),
+                ttl_seconds,
+                tags=tags,
+            )
         
         return wrapper
     return decorator
@@ -11,10 +11,12 @@ from typing import Any, Dict, List, Optional
 
 try:
     from celery import Celery
+    from celery.schedules import crontab
     from celery.signals import task_failure, task_success, task_retry
     from kombu import Exchange, Queue
 except ImportError:
     Celery = None
+    crontab = None
     task_failure = None
     task_success = None
     task_retry = None
@@ -168,6 +170,10 @@ CELERY_TASK_ROUTES = {
     "tasks.calculate_balance": {"queue": "balance_calc"},
     "tasks.refresh_balance_cache": {"queue": "balance_calc"},
     "tasks.calculate_projections": {"queue": "balance_calc"},
+    "tasks.run_accruals": {"queue": "balance_calc"},
+    "tasks.calculate_accrual_shard": {"queue": "balance_calc"},
+    "tasks.finalize_accrual_run": {"queue": "balance_calc"},
+    "tasks.compact_balance_ledger": {"queue": "balance_calc"},
     
     # Notification tasks
     "tasks.send_email": {"queue": "notifications"},
@@ -385,6 +391,22 @@ def configure_beat_schedule(app: Any) -> None:
         return
     
     app.conf.beat_schedule = {
+        # Accruals just after midnight UTC, sharded across balance_calc
+        # workers; each run also catches up on boundary days since the
+        # last completed run, so a late or missed run loses no period
+        "run-accruals-daily": {
+            "task": "tasks.run_accruals",
+            "schedule": crontab(hour=0, minute=5),
+            "options": {"queue": "balance_calc"},
+        },
+        
+        # Balance ledger snapshots through the end of last month
+        "compact-balance-ledger-daily": {
+            "task": "tasks.compact_balance_ledger",
+            "schedule": timedelta(hours=24),
+            "options": {"queue": "balance_calc"},
+        },
+        
         # Balance cache refresh
         "refresh-balance-cache-daily": {
             "task": "tasks.refresh_all_balance_caches",
@@ -399,6 +421,13 @@ def configure_beat_schedule(app: Any) -> None:
             "options": {"queue": "default"},
         },
         
+        # Keeps the unfolded change rows data version reads count few
+        "fold-data-versions": {
+            "task": "tasks.fold_data_versions",
+            "schedule": timedelta(minutes=5),
+            "options": {"queue": "default"},
+        },
+        
         # Cache metrics collection
         "collect-cache-metrics": {
             "task": "tasks.collect_cache_metrics",
@@ -0,0 +1,230 @@
+"""
+Cache Codecs
+
+Encoding of cached values into the text stored in Redis. Values carry a
+short header naming the format version, codec and compression so the
+encoding can change without flushing the cache:
+
+    @1j:{"available": {"$dec": "12.50"}}     typed JSON
+    @1jz:eJyrVkrOz0nNTS0uTi1S...             typed JSON, zlib + base64
+
+Values without a header are legacy plain JSON and still decode.
+"""
+
+import base64
+import json
+import zlib
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+from pydantic import BaseModel
+
+
+FORMAT_VERSION = "1"
+
+# Compressors by header flag: (compress, decompress)
+COMPRESSORS: Dict[str, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    "z": (lambda data: zlib.compress(data, 1), zlib.decompress),
+}
+if lz4_frame is not None:
+    COMPRESSORS["l"] = (lz4_frame.compress, lz4_frame.decompress)
+
+DEFAULT_COMPRESSION = "l" if lz4_frame is not None else "z"
+
+
+class CodecError(ValueError):
+    """Raised when a cached value cannot be decoded."""
+
+
+# =============================================================================
+# Codecs
+# =============================================================================
+
+class CacheCodec:
+    """
+    Converts values to and from text.
+
+    Subclasses set a single-character codec_id, which is written into the
+    value header, and register themselves with register_codec().
+    """
+
+    codec_id: str = ""
+
+    def dumps(self, value: Any) -> str:
+        raise NotImplementedError
+
+    def loads(self, data: str) -> Any:
+        raise NotImplementedError
+
+
+def _encode_extension(obj: Any) -> Any:
+    """Encode types JSON has no representation for as one-key marker objects."""
+    if isinstance(obj, datetime):
+        return {"$dt": obj.isoformat()}
+    if isinstance(obj, date):
+        return {"$date": obj.isoformat()}
+    if isinstance(obj, time):
+        return {"$time": obj.isoformat()}
+    if isinstance(obj, Decimal):
+        return {"$dec": str(obj)}
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    return str(obj)
+
+
+_EXTENSION_DECODERS: Dict[str, Callable[[str], Any]] = {
+    "$dt": datetime.fromisoformat,
+    "$date": date.fromisoformat,
+    "$time": time.fromisoformat,
+    "$dec": Decimal,
+}
+
+
+def _decode_extension(obj: Dict[str, Any]) -> Any:
+    """Revive marker objects written by _encode_extension."""
+    if len(obj) == 1:
+        key, value = next(iter(obj.items()))
+        decoder = _EXTENSION_DECODERS.get(key)
+        if decoder is not None and isinstance(value, str):
+            return decoder(value)
+    return obj
+
+
+class TypedJSONCodec(CacheCodec):
+    """
+    JSON that round-trips dates, datetimes, times and Decimals.
+
+    Uses orjson when installed and the standard library otherwise; both
+    produce the same text. Only payloads containing marker objects pay
+    for the object hook on decode.
+    """
+
+    codec_id = "j"
+
+    if orjson is not None:
+        _OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+        def dumps(self, value: Any) -> str:
+            return orjson.dumps(value, default=_encode_extension, option=self._OPTIONS).decode()
+
+        def _loads_plain(self, data: str) -> Any:
+            return orjson.loads(data)
+    else:
+        def dumps(self, value: Any) -> str:
+            return json.dumps(value, default=_encode_extension, separators=(",", ":"))
+
+        def _loads_plain(self, data: str) -> Any:
+            return json.loads(data)
+
+    def loads(self, data: str) -> Any:
+        if '"$' in data:
+            return json.loads(data, object_hook=_decode_extension)
+        return self._loads_plain(data)
+
+
+_CODECS: Dict[str, CacheCodec] = {}
+
+
+def register_codec(codec: CacheCodec) -> CacheCodec:
+    """Make a codec available for decoding by its codec_id."""
+    if len(codec.codec_id) != 1 or codec.codec_id in COMPRESSORS:
+        raise ValueError(f"Invalid codec id: {codec.codec_id!r}")
+    _CODECS[codec.codec_id] = codec
+    return codec
+
+
+register_codec(TypedJSONCodec())
+
+
+# =============================================================================
+# Serializer
+# =============================================================================
+
+class CacheSerializer:
+    """
+    Encodes cache values with a codec, compressing large ones.
+
+    Compressed payloads are base64-encoded because the Redis client
+    decodes responses as text; they are only kept when smaller than the
+    uncompressed text.
+    """
+
+    def __init__(
+        self,
+        codec: Optional[CacheCodec] = None,
+        compress_threshold: int = 1024,
+        compression: str = DEFAULT_COMPRESSION,
+    ):
+        """
+        Args:
+            codec: Codec used for new values (defaults to typed JSON)
+            compress_threshold: Minimum encoded size, in characters, to
+                attempt compression (0 disables compression)
+            compression: Compressor flag from COMPRESSORS
+        """
+        self.codec = codec or _CODECS[TypedJSONCodec.codec_id]
+        if self.codec.codec_id not in _CODECS:
+            register_codec(self.codec)
+        if compression not in COMPRESSORS:
+            raise ValueError(f"Unknown compression: {compression!r}")
+        self.compress_threshold = compress_threshold
+        self.compression = compression
+
+    def encode(self, value: Any) -> str:
+        """Encode a value with its header."""
+        if isinstance(value, BaseModel):
+            value = value.model_dump()
+
+        body = self.codec.dumps(value)
+        header = f"@{FORMAT_VERSION}{self.codec.codec_id}"
+
+        if self.compress_threshold and len(body) >= self.compress_threshold:
+            compress = COMPRESSORS[self.compression][0]
+            packed = base64.b64encode(compress(body.encode())).decode("ascii")
+            if len(packed) < len(body):
+                return f"{header}{self.compression}:{packed}"
+
+        return f"{header}:{body}"
+
+    def decode(self, data: str) -> Any:
+        """
+        Decode a value written by encode(), or a legacy plain JSON value.
+
+        Raises:
+            CodecError: If the header names an unknown version, codec or
+                compressor, or the payload is corrupt
+        """
+        if not data.startswith("@"):
+            return json.loads(data)
+
+        colon = data.find(":", 0, 8)
+        header = data[1:colon]
+        if colon < 0 or header[:1] != FORMAT_VERSION:
+            raise CodecError(f"Unsupported cache value header: {data[:8]!r}")
+
+        codec = _CODECS.get(header[1:2])
+        compression = header[2:]
+        if codec is None or (compression and compression not in COMPRESSORS):
+            raise CodecError(f"Unsupported cache value header: {data[:8]!r}")
+
+        body = data[colon + 1:]
+        try:
+            if compression:
+                decompress = COMPRESSORS[compression][1]
+                body = decompress(base64.b64decode(body)).decode()
+            return codec.loads(body)
+        except (ValueError, zlib.error) as e:
+            raise CodecError(f"Corrupt cache value: {str(e)}") from e
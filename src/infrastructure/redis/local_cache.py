@@ -0,0 +1,165 @@
+"""
+Local Cache
+
+In-process LRU/TTL cache used as an L1 tier in front of Redis, and a
+single-flight helper that collapses concurrent cache misses into one
+computation.
+"""
+
+import fnmatch
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+_MISSING = object()
+
+
+class LocalCache:
+    """
+    Thread-safe, size-bounded LRU cache with per-entry TTL.
+
+    Values are stored as-is and returned by reference, so any caller that
+    hands them out must copy them first. CachingService's L1 does this by
+    storing the encoded payload and decoding a fresh copy on every hit;
+    other callers that store objects directly must treat them as read-only.
+
+    ``generation`` advances on every delete or clear. A caller that reads
+    the generation before loading a value and passes it to ``set`` skips
+    the store if an invalidation landed in between.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self.evictions = 0
+        self.generation = 0
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a value, or default if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def contains(self, key: str) -> bool:
+        """Check whether a live entry exists."""
+        return self.get(key, _MISSING) is not _MISSING
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl_seconds: float,
+        generation: Optional[int] = None,
+    ) -> bool:
+        """
+        Store a value, evicting the least recently used entries if full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl_seconds: Time to live
+            generation: Store only if no delete or clear has happened since
+                this generation was read
+
+        Returns:
+            True if the value was stored
+        """
+        if ttl_seconds <= 0 or self.max_entries <= 0:
+            return False
+
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return False
+
+            self._data[key] = (time.monotonic() + ttl_seconds, value)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+            return True
+
+    def delete(self, *keys: str) -> int:
+        """Remove entries, returning how many existed."""
+        with self._lock:
+            self.generation += 1
+            return sum(1 for key in keys if self._data.pop(key, None) is not None)
+
+    def delete_matching(self, pattern: str) -> int:
+        """Remove entries whose key matches a glob pattern."""
+        with self._lock:
+            self.generation += 1
+            matched = [key for key in self._data if fnmatch.fnmatchcase(key, pattern)]
+            for key in matched:
+                del self._data[key]
+            return len(matched)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self.generation += 1
+            self._data.clear()
+
+
+class _Call:
+    """An in-flight computation shared by concurrent callers."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls for the same key into one execution.
+
+    The first caller for a key runs the function; callers arriving while
+    it runs wait and receive the same result (or exception).
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, func: Callable[[], T]) -> T:
+        """Run func for key unless a call for key is already in flight."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
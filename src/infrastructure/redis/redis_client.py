@@ -8,7 +8,7 @@ and cluster support for high availability.
 import logging
 import os
 from contextlib import contextmanager
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Set, Union
 from urllib.parse import urlparse
 
 try:
@@ -319,6 +319,7 @@ class MockRedisClient:
     def __init__(self):
         self._data: Dict[str, Any] = {}
         self._expiry: Dict[str, float] = {}
+        self._subscribers: Dict[str, List[Any]] = {}
     
     def ping(self) -> bool:
         return True
@@ -359,6 +360,11 @@ class MockRedisClient:
     def setex(self, key: str, seconds: int, value: Any) -> bool:
         return self.set(key, value, ex=seconds)
     
+    def mget(self, keys: Any, *args: str) -> List[Optional[str]]:
+        if isinstance(keys, str):
+            keys = [keys]
+        return [self.get(key) for key in [*keys, *args]]
+    
     def delete(self, *keys: str) -> int:
         count = 0
         for key in keys:
@@ -368,6 +374,9 @@ class MockRedisClient:
                 count += 1
         return count
     
+    def unlink(self, *keys: str) -> int:
+        return self.delete(*keys)
+    
     def exists(self, *keys: str) -> int:
         return sum(1 for key in keys if key in self._data)
     
@@ -433,10 +442,43 @@ class MockRedisClient:
                 count += 1
         return count
     
+    def sadd(self, name: str, *values: Any) -> int:
+        if name not in self._data or not isinstance(self._data[name], set):
+            self._data[name] = set()
+        
+        before = len(self._data[name])
+        self._data[name].update(str(v) for v in values)
+        return len(self._data[name]) - before
+    
+    def srem(self, name: str, *values: Any) -> int:
+        members = self._data.get(name)
+        if not isinstance(members, set):
+            return 0
+        
+        count = 0
+        for value in values:
+            if str(value) in members:
+                members.discard(str(value))
+                count += 1
+        return count
+    
+    def smembers(self, name: str) -> Set[str]:
+        import time
+        if name in self._expiry and time.time() > self._expiry[name]:
+            self.delete(name)
+        members = self._data.get(name)
+        return set(members) if isinstance(members, set) else set()
+    
     def keys(self, pattern: str = "*") -> List[str]:
         import fnmatch
         return [k for k in self._data.keys() if fnmatch.fnmatch(k, pattern)]
     
+    def scan_iter(self, match: str = "*", count: Optional[int] = None) -> Iterator[str]:
+        import fnmatch
+        for key in list(self._data.keys()):
+            if fnmatch.fnmatch(key, match):
+                yield key
+    
     def flushdb(self) -> bool:
         self._data.clear()
         self._expiry.clear()
@@ -451,6 +493,15 @@ class MockRedisClient:
     def pipeline(self, transaction: bool = True) -> "MockPipeline":
         return MockPipeline(self)
     
+    def pubsub(self, **kwargs) -> "MockPubSub":
+        return MockPubSub(self)
+    
+    def publish(self, channel: str, message: Any) -> int:
+        handlers = list(self._subscribers.get(channel, []))
+        for handler in handlers:
+            handler({"type": "message", "channel": channel, "data": message})
+        return len(handlers)
+    
     def close(self) -> None:
         pass
 
@@ -472,27 +523,101 @@ class MockPipeline:
         self._commands.append(("get", key))
         return self
     
+    def mget(self, keys: Any, *args: str) -> "MockPipeline":
+        self._commands.append(("mget", keys, args))
+        return self
+    
     def set(self, key: str, value: Any, **kwargs) -> "MockPipeline":
         self._commands.append(("set", key, value, kwargs))
         return self
     
+    def setex(self, key: str, seconds: int, value: Any) -> "MockPipeline":
+        self._commands.append(("set", key, value, {"ex": seconds}))
+        return self
+    
     def delete(self, *keys: str) -> "MockPipeline":
         self._commands.append(("delete", keys))
         return self
     
+    def unlink(self, *keys: str) -> "MockPipeline":
+        self._commands.append(("delete", keys))
+        return self
+    
+    def expire(self, key: str, seconds: int) -> "MockPipeline":
+        self._commands.append(("expire", key, seconds))
+        return self
+    
+    def sadd(self, name: str, *values: Any) -> "MockPipeline":
+        self._commands.append(("sadd", name, values))
+        return self
+    
+    def smembers(self, name: str) -> "MockPipeline":
+        self._commands.append(("smembers", name))
+        return self
+    
+    def publish(self, channel: str, message: Any) -> "MockPipeline":
+        self._commands.append(("publish", channel, message))
+        return self
+    
     def execute(self) -> List[Any]:
         results = []
         for cmd in self._commands:
             if cmd[0] == "get":
                 results.append(self._client.get(cmd[1]))
+            elif cmd[0] == "mget":
+                results.append(self._client.mget(cmd[1], *cmd[2]))
             elif cmd[0] == "set":
                 results.append(self._client.set(cmd[1], cmd[2], **cmd[3]))
             elif cmd[0] == "delete":
                 results.append(self._client.delete(*cmd[1]))
+            elif cmd[0] == "expire":
+                results.append(self._client.expire(cmd[1], cmd[2]))
+            elif cmd[0] == "sadd":
+                results.append(self._client.sadd(cmd[1], *cmd[2]))
+            elif cmd[0] == "smembers":
+                results.append(self._client.smembers(cmd[1]))
+            elif cmd[0] == "publish":
+                results.append(self._client.publish(cmd[1], cmd[2]))
         self._commands.clear()
         return results
 
 
+class MockPubSub:
+    """Mock Redis pub/sub; handlers run synchronously on publish."""
+    
+    def __init__(self, client: MockRedisClient):
+        self._client = client
+        self._channels: Dict[str, Any] = {}
+    
+    def subscribe(self, **handlers: Any) -> None:
+        for channel, handler in handlers.items():
+            self._client._subscribers.setdefault(channel, []).append(handler)
+            self._channels[channel] = handler
+    
+    def run_in_thread(self, **kwargs) -> "MockPubSubThread":
+        return MockPubSubThread(self)
+    
+    def close(self) -> None:
+        for channel, handler in self._channels.items():
+            self._client._subscribers.get(channel, []).remove(handler)
+        self._channels.clear()
+
+
+class MockPubSubThread:
+    """Stand-in for redis-py's PubSubWorkerThread."""
+    
+    def __init__(self, pubsub: MockPubSub):
+        self._pubsub = pubsub
+        self._running = True
+    
+    def is_alive(self) -> bool:
+        return self._running
+    
+    def stop(self) -> None:
+        self._running = False
+        self._pubsub.close()
+
+
 # =============================================================================
 # Convenience Functions
 # =============================================================================
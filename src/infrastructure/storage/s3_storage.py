@@ -532,6 +532,28 @@ class S3StorageService:
             metadata=metadata,
         )
     
+    def open_stream(self, key: str, bucket: Optional[str] = None) -> Optional[BinaryIO]:
+        """
+        Open a stored file for incremental reading.
+        
+        Returns the object's streaming body (read it in chunks and close it
+        when done), or None if the file does not exist or S3 is unavailable.
+        """
+        bucket = bucket or self.config.bucket_name
+        
+        if not self._client:
+            return None
+        
+        try:
+            response = self._client.get_object(Bucket=bucket, Key=key)
+            return response["Body"]
+            
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                return None
+            logger.error(f"Failed to open stream: {str(e)}")
+            raise
+    
     def get_file_metadata(self, key: str, bucket: Optional[str] = None) -> Optional[FileMetadata]:
         """Get metadata for a stored file."""
         bucket = bucket or self.config.bucket_name
@@ -54,7 +54,7 @@ from src.api.envelope_management import envelope_router
 from src.api.balance_analytics import balance_analytics_router
 from src.api.work_schedule_management import work_schedule_router
 from src.api.setup_wizard_estimation import setup_wizard_estimation_router
-from src.database.database import DatabaseConfig, dispose_engine, get_engine
+from src.database.database import DatabaseConfig, dispose_async_engine, dispose_engine, get_engine
 from src.routes.api import api_error_handler, api_router
 from src.utils.errors import APIError, ValidationError
 
@@ -92,6 +92,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Shutdown
     logger.info("Shutting down Employee Management API...")
     dispose_engine()
+    await dispose_async_engine()
     logger.info("Application shutdown complete")
 
 
@@ -15,6 +15,7 @@ from src.middleware.caching import (
     invalidate_employee_cache,
     invalidate_org_cache,
     invalidate_policy_cache,
+    invalidate_tags,
     CacheTTL,
 )
 
@@ -44,6 +45,7 @@ __all__ = [
     "invalidate_employee_cache",
     "invalidate_org_cache",
     "invalidate_policy_cache",
+    "invalidate_tags",
     "CacheTTL",
     # Rate Limiting
     "rate_limit",
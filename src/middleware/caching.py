@@ -1,11 +1,12 @@
 """Redis caching middleware for API performance optimization."""
 
+import fnmatch
 import hashlib
 import json
 import time
 from datetime import datetime, timedelta
 from functools import wraps
-from typing import Any, Callable, Dict, Optional, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Union
 
 # Mock Redis client for development (would use real redis in production)
 class MockRedisClient:
@@ -54,6 +55,40 @@ class MockRedisClient:
                 deleted += 1
         return deleted
     
+    def unlink(self, *keys: str) -> int:
+        """Delete keys from cache (non-blocking in Redis)."""
+        return self.delete(*keys)
+    
+    def sadd(self, key: str, *members: str) -> int:
+        """Add members to a set."""
+        members_set = self.smembers(key)
+        before = len(members_set)
+        members_set.update(members)
+        
+        if key in self._store:
+            self._store[key]["value"] = members_set
+        else:
+            self.set(key, members_set)
+        return len(members_set) - before
+    
+    def smembers(self, key: str) -> Set[str]:
+        """Get all members of a set."""
+        value = self.get(key)
+        return set(value) if isinstance(value, set) else set()
+    
+    def expire(self, key: str, seconds: int) -> bool:
+        """Set expiration on an existing key."""
+        if key not in self._store:
+            return False
+        self._store[key]["expires_at"] = datetime.utcnow() + timedelta(seconds=seconds)
+        return True
+    
+    def scan_iter(self, match: str = "*", count: Optional[int] = None) -> Iterator[str]:
+        """Iterate keys matching a glob pattern without blocking."""
+        for key in list(self._store.keys()):
+            if fnmatch.fnmatch(key, match):
+                yield key
+    
     def keys(self, pattern: str = "*") -> list:
         """Get keys matching pattern."""
         if pattern == "*":
@@ -158,6 +193,92 @@ class CacheTTL:
     
     # Configuration data - long TTL
     CONFIGURATION = 7200  # 2 hours
+    
+    # Tag index sets - must outlive every entry registered in them
+    TAG_INDEX = 86400  # 24 hours
+
+
+# =============================================================================
+# Invalidation Tags
+# =============================================================================
+
+# Also SCAN for untagged keys written before tag registration existed
+LEGACY_SCAN_FALLBACK = False
+
+# Keys removed per tag family since startup
+_invalidation_stats: Dict[str, int] = {}
+
+
+def tag_key(tag: str) -> str:
+    """Get the key of a tag's index set."""
+    return f"tag:{tag}"
+
+
+# Key segments that name an entity, e.g. "employee:123" in "profile:employee:123"
+ENTITY_TAG_TYPES = ("employee", "policy")
+
+
+def default_tags(cache_key: str) -> List[str]:
+    """
+    Tags every entry gets from its key.
+    
+    The key root, e.g. "org:all" for "org:...", plus "employee:{id}" or
+    "policy:{id}" for each entity the key names, so profile, balance and
+    validation entries all fall under invalidate_employee_cache().
+    """
+    parts = cache_key.split(":")
+    tags = [f"{parts[0]}:all"]
+    for entity, value in zip(parts, parts[1:]):
+        if entity in ENTITY_TAG_TYPES and value.isdigit():
+            tags.append(f"{entity}:{value}")
+    return tags
+
+
+def set_tagged(
+    cache_key: str,
+    value: str,
+    ttl: int,
+    tags: Optional[List[str]] = None,
+) -> None:
+    """
+    Store a value and register its key under invalidation tags.
+    
+    Args:
+        cache_key: Key to store
+        value: Serialized value
+        ttl: Time to live in seconds
+        tags: Extra tags (e.g. "employee:123") besides the key root tag
+    """
+    cache = get_cache_client()
+    cache.set(cache_key, value, ex=ttl)
+    for tag in dict.fromkeys(default_tags(cache_key) + list(tags or [])):
+        cache.sadd(tag_key(tag), cache_key)
+        cache.expire(tag_key(tag), CacheTTL.TAG_INDEX)
+
+
+def invalidate_tags(*tags: str) -> int:
+    """
+    Invalidate every key registered under the given tags.
+    
+    Args:
+        tags: Tags to invalidate
+        
+    Returns:
+        Number of keys deleted
+    """
+    cache = get_cache_client()
+    total_deleted = 0
+    
+    for tag in tags:
+        members = list(cache.smembers(tag_key(tag)))
+        deleted = cache.unlink(*members) if members else 0
+        cache.unlink(tag_key(tag))
+        
+        family = ":".join("*" if part.isdigit() else part for part in tag.split(":"))
+        _invalidation_stats[family] = _invalidation_stats.get(family, 0) + deleted
+        total_deleted += deleted
+    
+    return total_deleted
 
 
 # =============================================================================
@@ -168,6 +289,7 @@ def cached(
     prefix: str,
     ttl: int = CacheTTL.BALANCE_CALCULATION,
     key_builder: Optional[Callable] = None,
+    tag_builder: Optional[Callable[..., List[str]]] = None,
 ):
     """
     Decorator for caching function results.
@@ -176,6 +298,7 @@ def cached(
         prefix: Cache key prefix
         ttl: Time to live in seconds
         key_builder: Optional function to build cache key from args
+        tag_builder: Optional function to build invalidation tags from args
     """
     def decorator(func: Callable) -> Callable:
         @wraps(func)
@@ -198,7 +321,8 @@ def cached(
             
             # Store in cache
             if result is not None:
-                cache.set(cache_key, json.dumps(result, default=str), ex=ttl)
+                tags = tag_builder(*args, **kwargs) if tag_builder else None
+                set_tagged(cache_key, json.dumps(result, default=str), ttl, tags)
             
             return result
         
@@ -222,7 +346,8 @@ def cached(
             
             # Store in cache
             if result is not None:
-                cache.set(cache_key, json.dumps(result, default=str), ex=ttl)
+                tags = tag_builder(*args, **kwargs) if tag_builder else None
+                set_tagged(cache_key, json.dumps(result, default=str), ttl, tags)
             
             return result
         
@@ -243,6 +368,9 @@ def invalidate_cache(pattern: str) -> int:
     """
     Invalidate cache entries matching pattern.
     
+    Walks keys with SCAN instead of KEYS; prefer invalidate_tags() on hot
+    paths.
+    
     Args:
         pattern: Key pattern to match (e.g., "balance:employee:123:*")
         
@@ -250,35 +378,42 @@ def invalidate_cache(pattern: str) -> int:
         Number of keys deleted
     """
     cache = get_cache_client()
-    keys = cache.keys(pattern)
+    keys = list(cache.scan_iter(match=pattern, count=1000))
     if keys:
-        return cache.delete(*keys)
+        return cache.unlink(*keys)
     return 0
 
 
 def invalidate_employee_cache(employee_id: int) -> int:
     """Invalidate all cache entries for an employee."""
-    patterns = [
-        f"balance:employee:{employee_id}:*",
-        f"profile:employee:{employee_id}",
-        f"validation:employee:{employee_id}:*",
-    ]
+    total_deleted = invalidate_tags(f"employee:{employee_id}")
     
-    total_deleted = 0
-    for pattern in patterns:
-        total_deleted += invalidate_cache(pattern)
+    if LEGACY_SCAN_FALLBACK:
+        patterns = [
+            f"balance:employee:{employee_id}:*",
+            f"profile:employee:{employee_id}",
+            f"validation:employee:{employee_id}:*",
+        ]
+        for pattern in patterns:
+            total_deleted += invalidate_cache(pattern)
     
     return total_deleted
 
 
 def invalidate_policy_cache() -> int:
     """Invalidate all policy-related cache entries."""
-    return invalidate_cache("policy:*")
+    total_deleted = invalidate_tags("policy:all")
+    if LEGACY_SCAN_FALLBACK:
+        total_deleted += invalidate_cache("policy:*")
+    return total_deleted
 
 
 def invalidate_org_cache() -> int:
     """Invalidate all organizational structure cache entries."""
-    return invalidate_cache("org:*")
+    total_deleted = invalidate_tags("org:all")
+    if LEGACY_SCAN_FALLBACK:
+        total_deleted += invalidate_cache("org:*")
+    return total_deleted
 
 
 # =============================================================================
@@ -297,9 +432,8 @@ def cache_balance(
     ttl: int = CacheTTL.BALANCE_CALCULATION,
 ) -> None:
     """Cache balance calculation result."""
-    cache = get_cache_client()
     key = get_balance_cache_key(employee_id, balance_type)
-    cache.set(key, json.dumps(balance_data, default=str), ex=ttl)
+    set_tagged(key, json.dumps(balance_data, default=str), ttl, [f"employee:{employee_id}"])
 
 
 def get_cached_balance(
@@ -325,9 +459,8 @@ def cache_validation_result(
     ttl: int = CacheTTL.VALIDATION_RESULT,
 ) -> None:
     """Cache validation result for identical requests."""
-    cache = get_cache_client()
     key = f"validation:{request_hash}"
-    cache.set(key, json.dumps(result, default=str), ex=ttl)
+    set_tagged(key, json.dumps(result, default=str), ttl)
 
 
 def get_cached_validation(request_hash: str) -> Optional[Dict[str, Any]]:
@@ -355,9 +488,8 @@ def cache_policy_data(
     ttl: int = CacheTTL.POLICY_DATA,
 ) -> None:
     """Cache policy constraint data."""
-    cache = get_cache_client()
     key = f"policy:{policy_id}"
-    cache.set(key, json.dumps(policy_data, default=str), ex=ttl)
+    set_tagged(key, json.dumps(policy_data, default=str), ttl, [key])
 
 
 def get_cached_policy(policy_id: str) -> Optional[Dict[str, Any]]:
@@ -377,11 +509,12 @@ def get_cached_policy(policy_id: str) -> Optional[Dict[str, Any]]:
 def get_cache_stats() -> Dict[str, Any]:
     """Get cache statistics."""
     cache = get_cache_client()
-    all_keys = cache.keys("*")
+    all_keys = list(cache.scan_iter(match="*"))
     
     stats = {
         "total_keys": len(all_keys),
         "by_prefix": {},
+        "invalidations_by_tag": dict(_invalidation_stats),
     }
     
     for key in all_keys:
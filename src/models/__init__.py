@@ -10,6 +10,7 @@ from src.models.employee_field_permission import (
     ViewPermissionLevel,
     VisibilityLevel,
 )
+from src.models.employee_hierarchy import EmployeeHierarchy
 from src.models.employee_self_audit import (
     AuditSeverity,
     EmployeeSelfAuditLog,
@@ -27,6 +28,7 @@ from src.models.employee_update_request import (
     RequestType,
 )
 from src.models.field_mapping import DataType, FieldMappingRule
+from src.models.holiday_calendar import Holiday, HolidayCalendar, HolidayType
 from src.models.import_audit import ActionType, ActorRole, ImportAuditLog
 from src.models.import_job import ImportJob, ImportJobStatus
 from src.models.import_rollback import (
@@ -56,6 +58,7 @@ __all__ = [
     "EditPermissionLevel",
     "EmployeeAuditTrail",
     "EmployeeFieldPermission",
+    "EmployeeHierarchy",
     "FieldCategory",
     "EmployeeSelfAuditLog",
     "EmployeeSelfService",
@@ -63,6 +66,9 @@ __all__ = [
     "ErrorType",
     "FieldCategoryType",
     "FieldMappingRule",
+    "Holiday",
+    "HolidayCalendar",
+    "HolidayType",
     "ImportAuditLog",
     "ImportJob",
     "ImportJobStatus",
@@ -0,0 +1,132 @@
+"""AccrualRun and AccrualRunShard models for sharded, checkpointed accrual runs."""
+
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Date, DateTime, Float, ForeignKey, Index, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from src.models.base import Base
+
+
+class AccrualRunStatus(str, Enum):
+    """Status of an accrual run or one of its shards."""
+    PENDING = "pending"
+    RUNNING = "running"
+    RETRYING = "retrying"
+    COMPLETED = "completed"
+    PARTIAL = "partial"      # Run only: some shards failed
+    FAILED = "failed"
+
+
+class AccrualRun(Base):
+    """
+    One accrual date processed across shards.
+
+    The coordinator splits the active population into fixed-size ranges of
+    employee ids, one AccrualRunShard each, and the finished run keeps the
+    aggregated report of shard throughput and failures.
+    """
+
+    __tablename__ = "accrual_run"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+
+    accrual_date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
+    status: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        default=AccrualRunStatus.PENDING.value,
+    )
+
+    shard_size: Mapped[int] = mapped_column(Integer, nullable=False)
+    shard_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_employees: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    # Aggregated once every shard has finished
+    report: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+
+    started_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    shards: Mapped[List["AccrualRunShard"]] = relationship(
+        "AccrualRunShard",
+        back_populates="run",
+        cascade="all, delete-orphan",
+        order_by="AccrualRunShard.shard_index",
+    )
+
+    def __repr__(self) -> str:
+        return f"<AccrualRun(id={self.id}, accrual_date={self.accrual_date}, status={self.status})>"
+
+
+class AccrualRunShard(Base):
+    """
+    A contiguous range of employee ids within an accrual run.
+
+    checkpoint_employee_id is the last employee whose accruals are
+    committed, so a retried shard resumes after it. Balances themselves
+    are guarded by last_accrual_date, so work repeated after a crash
+    between a write and its checkpoint is still applied only once.
+    """
+
+    __tablename__ = "accrual_run_shard"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+
+    run_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("accrual_run.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    shard_index: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    # Inclusive employee id range and the active employees in it at planning time
+    first_employee_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    last_employee_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    employee_count: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    status: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        default=AccrualRunStatus.PENDING.value,
+    )
+    checkpoint_employee_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    # Progress accumulated across attempts
+    employees_processed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    employees_accrued: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    elapsed_seconds: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    policy_totals: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
+    run: Mapped["AccrualRun"] = relationship("AccrualRun", back_populates="shards")
+
+    __table_args__ = (
+        Index("uq_accrual_run_shard_run_index", "run_id", "shard_index", unique=True),
+    )
+
+    @property
+    def employees_per_second(self) -> float:
+        """Shard throughput over the time spent processing it."""
+        return self.employees_processed / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"<AccrualRunShard(run_id={self.run_id}, shard_index={self.shard_index}, "
+            f"status={self.status}, checkpoint={self.checkpoint_employee_id})>"
+        )
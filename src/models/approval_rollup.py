@@ -0,0 +1,69 @@
+"""Daily approval decision rollups for approval analytics."""
+
+from datetime import date, datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import Date, DateTime, Index, Integer, String, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import Base
+
+
+# Key value for requests with no department or no manager; the key columns
+# are part of the primary key, so they cannot be NULL
+UNASSIGNED = 0
+
+
+class ApprovalRollup(Base):
+    """
+    Decisions on time-off requests for one (day, department, manager, type).
+
+    Maintained incrementally: each approve, deny or cancel transition adds
+    itself to its bucket in the same transaction as the status change, so
+    analytics for any range merge buckets instead of scanning requests.
+    Decision latency (submission to decision) is kept as a mergeable
+    DDSketch, so percentiles over any range carry the sketch's error bound.
+    Cancellations are counted but are not decisions and have no latency.
+    """
+
+    __tablename__ = "approval_rollup"
+
+    decision_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    department_id: Mapped[int] = mapped_column(Integer, primary_key=True, default=UNASSIGNED)
+    manager_id: Mapped[int] = mapped_column(Integer, primary_key=True, default=UNASSIGNED)
+    request_type: Mapped[str] = mapped_column(String(50), primary_key=True)
+
+    approved_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    denied_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    cancelled_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    # Decisions made within the SLA target in force when they were recorded
+    within_sla_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    # DDSketch.to_dict() of the decision latencies in hours; also carries
+    # their exact count, sum, min and max
+    latency_sketch: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
+    __table_args__ = (
+        # Manager dashboards over a date range
+        Index("idx_approval_rollup_manager_date", "manager_id", "decision_date"),
+    )
+
+    @property
+    def decision_count(self) -> int:
+        return self.approved_count + self.denied_count
+
+    def __repr__(self) -> str:
+        return (
+            f"<ApprovalRollup({self.decision_date} department={self.department_id} "
+            f"manager={self.manager_id} {self.request_type}: "
+            f"{self.approved_count}/{self.denied_count}/{self.cancelled_count})>"
+        )
@@ -0,0 +1,125 @@
+"""Append-only balance ledger and its periodic snapshots."""
+
+from datetime import date, datetime
+from enum import Enum
+from typing import Optional
+
+from sqlalchemy import BigInteger, Date, DateTime, Float, ForeignKey, Index, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import Base
+
+
+class LedgerEntryType(str, Enum):
+    """Kind of balance movement."""
+    ACCRUAL = "accrual"
+    USAGE = "usage"
+    ADJUSTMENT = "adjustment"
+    CARRYOVER = "carryover"
+
+
+class BalanceLedgerEntry(Base):
+    """
+    One signed movement of an employee's balance under a policy.
+
+    Entries are never updated or deleted; corrections are new adjustment
+    entries. Usage is recorded as a negative amount, so a balance is the
+    sum of the amounts effective on or before a date.
+    """
+
+    __tablename__ = "balance_ledger_entry"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+
+    employee_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("employee.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    policy_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("time_off_policy.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    entry_type: Mapped[str] = mapped_column(String(20), nullable=False)
+    amount: Mapped[float] = mapped_column(Float, nullable=False)
+    effective_date: Mapped[date] = mapped_column(Date, nullable=False)
+
+    # What produced the entry, e.g. ("time_off_request", 42)
+    source_type: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    source_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+
+    __table_args__ = (
+        # As-of reads: the tail after a snapshot for one (employee, policy)
+        Index(
+            "idx_balance_ledger_entry_key_effective",
+            "employee_id", "policy_id", "effective_date",
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<BalanceLedgerEntry(employee_id={self.employee_id}, policy_id={self.policy_id}, "
+            f"{self.entry_type} {self.amount} on {self.effective_date})>"
+        )
+
+
+class BalanceLedgerSnapshot(Base):
+    """
+    Running totals of an (employee, policy) ledger through a date.
+
+    A snapshot covers every entry effective on or before as_of_date.
+    Appending an entry dated on or before an existing snapshot deletes
+    that snapshot, so snapshots never miss backdated entries.
+    """
+
+    __tablename__ = "balance_ledger_snapshot"
+
+    employee_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("employee.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    policy_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("time_off_policy.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    as_of_date: Mapped[date] = mapped_column(Date, primary_key=True)
+
+    # Totals per entry type; used is negative like the usage entries
+    accrued: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    used: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    adjusted: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    carried_over: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    entry_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+
+    __table_args__ = (
+        # Finds the snapshots a backdated write invalidates
+        Index("idx_balance_ledger_snapshot_as_of_date", "as_of_date"),
+    )
+
+    @property
+    def balance(self) -> float:
+        """Balance through as_of_date."""
+        return self.accrued + self.used + self.adjusted + self.carried_over
+
+    def __repr__(self) -> str:
+        return (
+            f"<BalanceLedgerSnapshot(employee_id={self.employee_id}, policy_id={self.policy_id}, "
+            f"as_of_date={self.as_of_date}, balance={self.balance})>"
+        )
@@ -0,0 +1,83 @@
+"""DataVersion counters that change whenever a group of tables is written."""
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, String, func, select
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import ColumnElement
+
+from src.models.base import Base
+
+
+# Bumped by writes to employee, department and location
+DIRECTORY = "directory"
+
+# Bumped by writes to holiday, holiday_calendar, location and work_schedule
+CALENDAR = "calendar"
+
+
+class DataVersion(Base):
+    """
+    A version number for a group of tables, for keying derived caches.
+
+    The statement-level ``trigger_*_data_version`` triggers
+    (db/migrations/008_create_data_version.sql and later) record each
+    writing transaction as a DataVersionChange row, so a cache entry keyed
+    by the version it was computed at (see ``current_version``) is retired
+    by the next committed write, whichever code path makes it.
+    """
+
+    __tablename__ = "data_version"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+
+    def __repr__(self) -> str:
+        return f"<DataVersion({self.name}={self.version})>"
+
+
+class DataVersionChange(Base):
+    """
+    A transaction that wrote to a group, not yet folded into its version.
+
+    Each writer inserts its own row, so writers never wait on each other;
+    ``fold_data_version_changes()`` (db/migrations/012_data_version_change_log.sql)
+    moves committed rows into DataVersion.version.
+    """
+
+    __tablename__ = "data_version_change"
+
+    name: Mapped[str] = mapped_column(
+        String(50),
+        ForeignKey("data_version.name"),
+        primary_key=True,
+    )
+    xid: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+
+    def __repr__(self) -> str:
+        return f"<DataVersionChange({self.name}@{self.xid})>"
+
+
+def current_version(name: str) -> ColumnElement:
+    """
+    Scalar subquery for a group's version, None before the group is set up.
+
+    Folded changes are in DataVersion.version and the rest are still
+    change rows, so their sum only ever grows and a fold leaves it as is.
+    """
+    changes = (
+        select(func.count())
+        .select_from(DataVersionChange)
+        .where(DataVersionChange.name == name)
+        .scalar_subquery()
+    )
+    return (
+        select(DataVersion.version + changes)
+        .where(DataVersion.name == name)
+        .scalar_subquery()
+    )
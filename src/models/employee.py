@@ -15,8 +15,8 @@ from sqlalchemy import (
     String,
     Text,
 )
-from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import Mapped, deferred, mapped_column, relationship
 from sqlalchemy.sql import func
 
 from src.models.base import Base
@@ -464,6 +464,10 @@ class Employee(Base):
         DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
     )
     
+    # Weighted full-text document, maintained by the triggers and GIN
+    # index from migration 002; only read inside search queries
+    search_vector: Mapped[Optional[str]] = deferred(mapped_column(TSVECTOR, nullable=True))
+    
     # Relationships
     department: Mapped[Optional["Department"]] = relationship(
         "Department", back_populates="employees", foreign_keys=[department_id]
@@ -483,7 +487,8 @@ class Employee(Base):
     
     # Composite indexes for common query patterns
     __table_args__ = (
-        Index("idx_employee_name", "last_name", "first_name"),
+        # id makes the name order total for keyset pagination
+        Index("idx_employee_name", "last_name", "first_name", "id"),
     )
     
     def __repr__(self) -> str:
@@ -13,6 +13,7 @@ from sqlalchemy import (
     Integer,
     String,
     Text,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
@@ -103,7 +104,13 @@ class EmployeeAuditTrail(Base):
     
     # Composite indexes for common query patterns
     __table_args__ = (
-        Index("idx_audit_employee_timestamp", "employee_id", "change_timestamp"),
+        # Newest first; id makes the timestamp order total for keyset pagination
+        Index(
+            "idx_audit_employee_timestamp",
+            "employee_id",
+            text("change_timestamp DESC"),
+            text("id DESC"),
+        ),
     )
     
     def __repr__(self) -> str:
@@ -0,0 +1,50 @@
+"""EmployeeHierarchy closure table for the manager reporting hierarchy."""
+
+from sqlalchemy import ForeignKey, Index, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import Base
+
+
+class EmployeeHierarchy(Base):
+    """
+    Closure table over ``employee.manager_id``.
+
+    Stores one row for every (ancestor, descendant) pair in the reporting
+    hierarchy, including a depth-0 self row for each employee. Subtree,
+    manager-chain and "is X above Y" lookups become a single indexed query.
+
+    Rows are maintained by the ``trigger_employee_hierarchy_sync`` trigger
+    (db/migrations/003_create_employee_hierarchy.sql) on every insert and
+    manager change, so application write paths do not need to touch it.
+    """
+
+    __tablename__ = "employee_hierarchy"
+
+    ancestor_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("employee.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    descendant_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("employee.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    # Number of reporting levels between ancestor and descendant (0 = self)
+    depth: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index("idx_employee_hierarchy_ancestor_depth", "ancestor_id", "depth"),
+        Index("idx_employee_hierarchy_descendant_depth", "descendant_id", "depth"),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<EmployeeHierarchy("
+            f"ancestor_id={self.ancestor_id}, "
+            f"descendant_id={self.descendant_id}, "
+            f"depth={self.depth}"
+            f")>"
+        )
@@ -117,6 +117,13 @@ class ImportJob(Base):
         nullable=False,
         default=0,
     )
+    # All validation errors found; validation_errors keeps only the first
+    # MAX_REPORTED_ERRORS of them
+    validation_error_count: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        default=0,
+    )
     
     # JSONB fields for flexible data storage
     validation_errors: Mapped[Optional[List[Dict[str, Any]]]] = mapped_column(
@@ -4,7 +4,7 @@ from datetime import date, datetime
 from enum import Enum
 from typing import Optional
 
-from sqlalchemy import Boolean, Date, DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy import Boolean, Date, DateTime, Float, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.models.base import Base
@@ -122,7 +122,7 @@ class TimeOffRequest(Base):
     employee: Mapped["Employee"] = relationship(
         "Employee",
         foreign_keys=[employee_id],
-        back_populates="time_off_requests",
+        backref="time_off_requests",
     )
     current_approver: Mapped[Optional["Employee"]] = relationship(
         "Employee",
@@ -200,13 +200,16 @@ class TimeOffBalance(Base):
     year: Mapped[int] = mapped_column(Integer, nullable=False)
     
     # Balance values
-    total_allocated: Mapped[float] = mapped_column(Integer, nullable=False, default=0)
-    used: Mapped[float] = mapped_column(Integer, nullable=False, default=0)
-    pending: Mapped[float] = mapped_column(Integer, nullable=False, default=0)
-    available: Mapped[float] = mapped_column(Integer, nullable=False, default=0)
+    total_allocated: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    used: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    pending: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    available: Mapped[float] = mapped_column(Float, nullable=False, default=0)
     
     # Carryover
-    carried_over: Mapped[float] = mapped_column(Integer, nullable=False, default=0)
+    carried_over: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    
+    # Date of the most recent accrual applied, so re-runs are no-ops
+    last_accrual_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
     
     # Timestamps
     last_updated: Mapped[datetime] = mapped_column(
@@ -215,4 +218,15 @@ class TimeOffBalance(Base):
         server_default=func.now(),
         onupdate=func.now(),
     )
+    
+    __table_args__ = (
+        # One balance per employee, type and year; target of accrual upserts
+        Index(
+            "uq_time_off_balance_employee_type_year",
+            "employee_id",
+            "balance_type",
+            "year",
+            unique=True,
+        ),
+    )
 
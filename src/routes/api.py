@@ -9,6 +9,7 @@ from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
+from src.data.keyset_pagination import CountMode
 from src.database.database import get_db
 from src.employees.models import EmployeeCreateRequest, EmployeeUpdateRequest
 from src.services.employee_service import EmployeeService
@@ -143,6 +144,12 @@ async def get_employee_directory(
     status: Annotated[Optional[str], Query(description="Employment status filter")] = "active",
     sort_by: Annotated[str, Query(description="Sort field")] = "last_name",
     sort_order: Annotated[str, Query(description="Sort order (asc/desc)")] = "asc",
+    cursor: Annotated[
+        Optional[str], Query(description="next_cursor of the previous page; overrides page")
+    ] = None,
+    count: Annotated[
+        CountMode, Query(description="Total to report: exact, cached, estimated or none")
+    ] = CountMode.EXACT,
 ) -> DirectoryResponse:
     """
     Get paginated employee directory.
@@ -151,6 +158,7 @@ async def get_employee_directory(
     - Shows only employees the user is authorized to view
     - Supports filtering by department, location, and status
     - Supports sorting by various fields
+    - Supports cursor pagination via next_cursor
     """
     result = service.get_directory(
         current_user=current_user,
@@ -162,6 +170,8 @@ async def get_employee_directory(
         status=status,
         sort_by=sort_by,
         sort_order=sort_order,
+        cursor=cursor,
+        count=count,
     )
     return DirectoryResponse(data=result["data"], pagination=result["pagination"])
 
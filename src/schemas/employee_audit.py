@@ -48,7 +48,12 @@ class AuditTrailResponse(BaseModel):
     """Response for audit trail endpoint."""
     
     employee_id: int = Field(..., description="ID of the employee")
-    total_entries: int = Field(..., description="Total number of audit entries")
+    total_entries: Optional[int] = Field(
+        ..., description="Total number of audit entries, or None when not counted"
+    )
+    total_is_estimate: bool = Field(
+        default=False, description="Whether total_entries is a planner estimate"
+    )
     entries: List[AuditTrailEntry] = Field(
         default_factory=list,
         description="List of audit trail entries"
@@ -56,6 +61,9 @@ class AuditTrailResponse(BaseModel):
     page: int = Field(default=1, description="Current page number")
     page_size: int = Field(default=50, description="Number of entries per page")
     has_more: bool = Field(default=False, description="Whether there are more entries")
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor for the next page, or None on the last page"
+    )
 
 
 class AuditTrailSummary(BaseModel):
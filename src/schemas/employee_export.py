@@ -121,7 +121,10 @@ class ExportResponse(BaseModel):
         default="text/csv",
         description="MIME type of the exported file"
     )
-    total_records: int = Field(..., description="Number of records exported")
+    total_records: Optional[int] = Field(
+        ...,
+        description="Number of records exported; None for a streamed export, counted as it streams"
+    )
     exported_fields: List[str] = Field(
         default_factory=list,
         description="Fields included in the export"
@@ -103,9 +103,17 @@ class ImportStatusResponse(BaseModel):
         default_factory=list,
         description="List of validation errors found during import"
     )
+    validation_error_count: int = Field(
+        default=0,
+        description="Total validation errors found, including those not listed"
+    )
+    validation_errors_truncated: bool = Field(
+        default=False,
+        description="Whether validation_errors lists only the first of the errors found"
+    )
     error_summary: Optional[Dict[str, int]] = Field(
         None,
-        description="Summary of error counts by error type"
+        description="Summary of error counts by error type, over the listed errors"
     )
     started_at: Optional[datetime] = Field(None, description="When processing started")
     completed_at: Optional[datetime] = Field(None, description="When processing completed")
@@ -445,6 +445,46 @@ class EnvelopeResponse(BaseModel):
         json_encoders = {datetime: lambda v: v.isoformat()}
 
 
+class EnvelopeSummary(BaseModel):
+    """Envelope as listed: status and progress, without recipients or fields."""
+    id: int = Field(..., description="Envelope ID")
+    external_id: str = Field(..., description="External reference ID")
+    subject: str = Field(..., description="Subject")
+    status: EnvelopeStatusEnum = Field(..., description="Current status")
+    status_description: str = Field(..., description="Human-readable status")
+    
+    # Sender
+    sender_email: str = Field(..., description="Sender email")
+    sender_name: str = Field(..., description="Sender name")
+    sender_employee_id: Optional[int] = Field(default=None, description="Sender employee ID")
+    
+    # Related Entity
+    related_entity_type: Optional[str] = Field(default=None, description="Related entity type")
+    related_entity_id: Optional[int] = Field(default=None, description="Related entity ID")
+    
+    # Workflow
+    routing_order_enabled: bool = Field(..., description="Sequential routing enabled")
+    workflow_status: WorkflowStatus = Field(..., description="Current workflow status")
+    
+    # Completion
+    completed_count: int = Field(..., description="Recipients who completed")
+    total_recipients: int = Field(..., description="Total recipients")
+    completion_percentage: float = Field(..., description="Overall completion percentage")
+    fields_total: int = Field(default=0, description="Total fields")
+    fields_completed: int = Field(default=0, description="Completed fields")
+    
+    # Timestamps
+    created_at: datetime = Field(..., description="Creation timestamp")
+    updated_at: Optional[datetime] = Field(default=None, description="Last update")
+    sent_at: Optional[datetime] = Field(default=None, description="When sent")
+    completed_at: Optional[datetime] = Field(default=None, description="When completed")
+    expiration_date: Optional[datetime] = Field(default=None, description="Expiration date")
+    voided_at: Optional[datetime] = Field(default=None, description="When voided")
+
+    class Config:
+        json_encoders = {datetime: lambda v: v.isoformat()}
+
+
 class EnvelopeCreateResponse(BaseModel):
     """Response for envelope creation."""
     envelope_id: int = Field(..., description="Created envelope ID")
@@ -477,7 +517,7 @@ class EnvelopeStatusUpdateResponse(BaseModel):
 
 class EnvelopeListResponse(BaseModel):
     """Response for envelope list."""
-    envelopes: List[EnvelopeResponse] = Field(..., description="List of envelopes")
+    envelopes: List[EnvelopeSummary] = Field(..., description="List of envelopes")
     total: int = Field(..., description="Total count")
     page: int = Field(default=1, description="Current page")
     page_size: int = Field(default=20, description="Page size")
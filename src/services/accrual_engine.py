@@ -0,0 +1,581 @@
+"""Columnar accrual engine for calculating accruals across many employees at once."""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from sqlalchemy import Date, Float, Integer, String, any_, bindparam, delete, func, literal, or_, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.orm import Session
+
+from src.models.balance_ledger import BalanceLedgerEntry, BalanceLedgerSnapshot, LedgerEntryType
+from src.models.employee import Employee, WorkSchedule
+from src.models.time_off_policy import AccrualMethod, PolicyStatus, TimeOffPolicy
+from src.models.time_off_request import TimeOffBalance
+from src.services.policy_rules import DAYS_PER_YEAR, CompiledPolicy, get_compiled_policy
+
+logger = logging.getLogger(__name__)
+
+
+# Accrual periods per year by policy accrual_frequency
+PERIODS_PER_YEAR = {
+    "annually": 1,
+    "semi-monthly": 24,
+    "monthly": 12,
+    "bi-weekly": 26,
+    "weekly": 52,
+}
+
+# Periods per year when a policy has no accrual_frequency
+METHOD_DEFAULT_PERIODS = {
+    AccrualMethod.MONTHLY_ACCRUAL.value: 12,
+    AccrualMethod.PAY_PERIOD_ACCRUAL.value: 26,
+    AccrualMethod.HOURS_WORKED.value: 26,
+}
+
+# A pay Friday that fixes which Fridays end a bi-weekly pay period
+PAY_PERIOD_ANCHOR = date(2024, 1, 5)
+
+STANDARD_HOURS_PER_WEEK = 40.0
+
+# source_type of the ledger entries accrual runs write
+LEDGER_SOURCE_TYPE = "accrual_run"
+
+# Marks "never accrued" in the last-accrual ordinal column
+NEVER = -1
+
+
+def accrual_periods(policy: TimeOffPolicy) -> int:
+    """Accrual periods per year of a policy."""
+    if policy.accrual_method == AccrualMethod.ANNUAL_LUMP_SUM.value:
+        return 1
+    return PERIODS_PER_YEAR.get(
+        policy.accrual_frequency,
+        METHOD_DEFAULT_PERIODS.get(policy.accrual_method, 12),
+    )
+
+
+def is_accrual_date(policy: TimeOffPolicy, accrual_date: date) -> bool:
+    """
+    Whether a policy's accrual period ends on a date.
+
+    Each run accrues one period's amount, so a policy only accrues on its
+    period boundaries: Jan 1 for annual policies and lump sums, the 1st
+    (and 16th when semi-monthly) of the month, every Friday when weekly and
+    every other Friday from PAY_PERIOD_ANCHOR when bi-weekly. A missed
+    boundary is accrued by running the engine for that date.
+    """
+    periods = accrual_periods(policy)
+    if periods == 1:
+        return (accrual_date.month, accrual_date.day) == (1, 1)
+    if periods == 12:
+        return accrual_date.day == 1
+    if periods == 24:
+        return accrual_date.day in (1, 16)
+    if periods == 52:
+        return accrual_date.weekday() == PAY_PERIOD_ANCHOR.weekday()
+    return (accrual_date - PAY_PERIOD_ANCHOR).days % 14 == 0
+
+
+@dataclass
+class EmployeeColumns:
+    """
+    Accrual inputs for a set of employees, one sequence per attribute.
+
+    rows keeps the loaded rows for the few policies whose eligibility
+    rules have to be checked per employee.
+    """
+
+    ids: List[int]
+    hire_ordinals: List[int]
+    fte: List[float]
+    rows: List[Any]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+@dataclass
+class PolicyAccrual:
+    """Accrual totals for one policy in a run."""
+
+    policy_id: int
+    balance_type: str
+    employees_eligible: int = 0
+    employees_capped: int = 0
+    total_accrued: float = 0.0
+
+
+@dataclass
+class AccrualRunResult:
+    """Outcome of an accrual run."""
+
+    accrual_date: date
+    employees: int = 0
+    policies: List[PolicyAccrual] = field(default_factory=list)
+    accrued_employee_ids: List[int] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def employees_per_second(self) -> float:
+        """Employees processed per second of wall time."""
+        return self.employees / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+@dataclass(frozen=True)
+class AccrualParameters:
+    """Scalar inputs of one policy's accrual for one date."""
+
+    accrual_ordinal: int
+    waiting_period_days: int
+    base_rate: float
+    periods: int
+    cap: Optional[float]
+    prorate_year: Optional[int]
+    days_in_year: int
+
+
+class AccrualEngine:
+    """
+    Calculates accruals for whole populations in columns.
+
+    Employees, FTE and current balances are loaded once into columns;
+    tenure tiers, waiting periods, caps and amounts are then computed
+    for every employee of a policy together (with NumPy when installed)
+    and written back with one upsert per policy.
+    """
+
+    def __init__(self, session: Session, use_numpy: Optional[bool] = None):
+        """
+        Args:
+            session: Database session
+            use_numpy: Force the NumPy (True) or pure-Python (False)
+                kernel; defaults to NumPy when installed
+        """
+        self.session = session
+        self.use_numpy = np is not None if use_numpy is None else use_numpy
+        if self.use_numpy and np is None:
+            raise ValueError("NumPy is not installed")
+
+    # =========================================================================
+    # Loading
+    # =========================================================================
+
+    def load_employees(self, employee_ids: Optional[Sequence[int]] = None) -> EmployeeColumns:
+        """Load active employees' hire dates, FTE and rule attributes."""
+        stmt = (
+            select(
+                Employee.id,
+                Employee.hire_date,
+                Employee.location_id,
+                Employee.department_id,
+                Employee.employment_type,
+                WorkSchedule.hours_per_week,
+            )
+            .outerjoin(WorkSchedule, WorkSchedule.id == Employee.work_schedule_id)
+            .where(Employee.is_active == True)
+            .order_by(Employee.id)
+        )
+        params = {}
+        if employee_ids is not None:
+            stmt = stmt.where(Employee.id == any_(bindparam("employee_ids", type_=ARRAY(Integer))))
+            params["employee_ids"] = list(employee_ids)
+
+        rows = self.session.execute(stmt, params).all()
+        return EmployeeColumns(
+            ids=[row.id for row in rows],
+            hire_ordinals=[row.hire_date.toordinal() for row in rows],
+            fte=[
+                float(row.hours_per_week) / STANDARD_HOURS_PER_WEEK
+                if row.hours_per_week is not None
+                else 1.0
+                for row in rows
+            ],
+            rows=rows,
+        )
+
+    def load_policies(
+        self,
+        accrual_date: date,
+        policy_ids: Optional[Sequence[int]] = None,
+    ) -> List[TimeOffPolicy]:
+        """Load active accruing policies in effect on a date whose accrual period ends on it."""
+        stmt = select(TimeOffPolicy).where(
+            TimeOffPolicy.status == PolicyStatus.ACTIVE.value,
+            TimeOffPolicy.accrual_method != AccrualMethod.NONE.value,
+        ).order_by(TimeOffPolicy.id)
+        if policy_ids is not None:
+            stmt = stmt.where(TimeOffPolicy.id.in_(policy_ids))
+
+        return [
+            policy
+            for policy in self.session.execute(stmt).scalars().all()
+            if not (policy.effective_date and policy.effective_date.date() > accrual_date)
+            and not (policy.expiry_date and policy.expiry_date.date() < accrual_date)
+            and is_accrual_date(policy, accrual_date)
+        ]
+
+    def load_balances(
+        self,
+        columns: EmployeeColumns,
+        balance_types: Sequence[str],
+        year: int,
+        employee_ids: Optional[Sequence[int]] = None,
+    ) -> Dict[str, Tuple[List[float], List[int]]]:
+        """
+        Load current balances aligned with the employee columns.
+
+        Returns:
+            Per balance type, (available, last accrual ordinal) columns;
+            employees without a balance row get 0 and NEVER
+        """
+        stmt = select(
+            TimeOffBalance.employee_id,
+            TimeOffBalance.balance_type,
+            TimeOffBalance.available,
+            TimeOffBalance.last_accrual_date,
+        ).where(
+            TimeOffBalance.year == year,
+            TimeOffBalance.balance_type.in_(balance_types),
+        )
+        params = {}
+        if employee_ids is not None:
+            stmt = stmt.where(
+                TimeOffBalance.employee_id == any_(bindparam("employee_ids", type_=ARRAY(Integer)))
+            )
+            params["employee_ids"] = list(employee_ids)
+
+        position = {employee_id: i for i, employee_id in enumerate(columns.ids)}
+        balances = {
+            balance_type: ([0.0] * len(columns), [NEVER] * len(columns))
+            for balance_type in balance_types
+        }
+        for row in self.session.execute(stmt, params):
+            i = position.get(row.employee_id)
+            if i is None:
+                continue
+            available, last_accrual = balances[row.balance_type]
+            available[i] = float(row.available or 0)
+            if row.last_accrual_date is not None:
+                last_accrual[i] = row.last_accrual_date.toordinal()
+
+        return balances
+
+    # =========================================================================
+    # Calculation
+    # =========================================================================
+
+    def parameters(self, policy: TimeOffPolicy, accrual_date: date) -> AccrualParameters:
+        """Scalar accrual inputs for a policy on a date."""
+        caps = [cap for cap in (policy.accrual_cap, policy.max_balance) if cap is not None]
+        lump_sum = policy.accrual_method == AccrualMethod.ANNUAL_LUMP_SUM.value
+        # Lump sums accrue on January 1, so the first one an employee gets
+        # follows their hire year and is prorated by the days they worked in it
+        prorate_year = accrual_date.year - 1 if lump_sum and policy.prorate_first_year else None
+        return AccrualParameters(
+            accrual_ordinal=accrual_date.toordinal(),
+            waiting_period_days=policy.waiting_period_days or 0,
+            base_rate=float(policy.base_accrual_rate or 0),
+            periods=accrual_periods(policy),
+            cap=min(caps) if caps else None,
+            prorate_year=prorate_year,
+            days_in_year=date(prorate_year or accrual_date.year, 12, 31).timetuple().tm_yday,
+        )
+
+    def rule_mask(
+        self,
+        columns: EmployeeColumns,
+        compiled: CompiledPolicy,
+        accrual_date: date,
+    ) -> Optional[List[bool]]:
+        """Eligibility rule results per employee, or None when the policy has no rules."""
+        if not compiled.rules:
+            return None
+        return [compiled.check_rules(row, accrual_date)[0] for row in columns.rows]
+
+    def compute(
+        self,
+        columns: EmployeeColumns,
+        compiled: CompiledPolicy,
+        params: AccrualParameters,
+        available: List[float],
+        last_accrual: List[int],
+        mask: Optional[List[bool]] = None,
+    ) -> Tuple[List[int], List[float], int]:
+        """
+        Calculate one policy's accrual for every employee.
+
+        Returns:
+            Tuple of (indexes of employees accruing, amounts accrued,
+            number of those held back by the cap)
+        """
+        if self.use_numpy:
+            return self._compute_numpy(columns, compiled, params, available, last_accrual, mask)
+        return self._compute_python(columns, compiled, params, available, last_accrual, mask)
+
+    def _compute_python(self, columns, compiled, params, available, last_accrual, mask):
+        tiers = compiled.tiers
+        indexes: List[int] = []
+        amounts: List[float] = []
+        capped = 0
+
+        for i, hire in enumerate(columns.hire_ordinals):
+            days_employed = params.accrual_ordinal - hire
+            if (
+                days_employed < params.waiting_period_days
+                or days_employed < 0
+                or last_accrual[i] >= params.accrual_ordinal
+                or (mask is not None and not mask[i])
+            ):
+                continue
+
+            rate = params.base_rate
+            if tiers is not None:
+                tier = tiers.find(days_employed / DAYS_PER_YEAR)
+                if tier is not None and tiers.tiers[tier].accrual_rate is not None:
+                    rate = tiers.tiers[tier].accrual_rate
+
+            amount = rate * columns.fte[i] / params.periods
+            if params.prorate_year is not None and date.fromordinal(hire).year == params.prorate_year:
+                year_end = date(params.prorate_year, 12, 31).toordinal()
+                amount *= (year_end - hire + 1) / params.days_in_year
+
+            if params.cap is not None and available[i] + amount > params.cap:
+                amount = max(params.cap - available[i], 0.0)
+                capped += 1
+
+            indexes.append(i)
+            amounts.append(amount)
+
+        return indexes, amounts, capped
+
+    def _compute_numpy(self, columns, compiled, params, available, last_accrual, mask):
+        hire = np.asarray(columns.hire_ordinals, dtype=np.int64)
+        fte = np.asarray(columns.fte, dtype=np.float64)
+        current = np.asarray(available, dtype=np.float64)
+        days_employed = params.accrual_ordinal - hire
+
+        eligible = (
+            (days_employed >= params.waiting_period_days)
+            & (days_employed >= 0)
+            & (np.asarray(last_accrual, dtype=np.int64) < params.accrual_ordinal)
+        )
+        if mask is not None:
+            eligible &= np.asarray(mask, dtype=bool)
+
+        rate = np.full(len(hire), params.base_rate)
+        tiers = compiled.tiers
+        if tiers is not None and tiers.tiers:
+            tenure = days_employed / DAYS_PER_YEAR
+            tier_rates = np.array([
+                params.base_rate if tier.accrual_rate is None else tier.accrual_rate
+                for tier in tiers.tiers
+            ])
+            if tiers.disjoint:
+                maxes = np.array([
+                    np.inf if tier.max_years is None else tier.max_years for tier in tiers.tiers
+                ])
+                index = np.searchsorted(np.asarray(tiers.bounds, dtype=np.float64), tenure, side="right") - 1
+                clipped = np.clip(index, 0, None)
+                in_tier = (index >= 0) & (tenure < maxes[clipped])
+            else:
+                found = [tiers.find(years) for years in tenure.tolist()]
+                in_tier = np.array([tier is not None for tier in found])
+                clipped = np.array([tier or 0 for tier in found])
+            rate = np.where(in_tier, tier_rates[clipped], rate)
+
+        amount = rate * fte / params.periods
+        if params.prorate_year is not None:
+            year_start = date(params.prorate_year, 1, 1).toordinal()
+            year_end = date(params.prorate_year, 12, 31).toordinal()
+            hired_in_year = (hire >= year_start) & (hire <= year_end)
+            amount = np.where(
+                hired_in_year,
+                amount * (year_end - hire + 1) / params.days_in_year,
+                amount,
+            )
+
+        capped = 0
+        if params.cap is not None:
+            over_cap = eligible & (current + amount > params.cap)
+            capped = int(over_cap.sum())
+            amount = np.where(over_cap, np.maximum(params.cap - current, 0.0), amount)
+
+        indexes = np.flatnonzero(eligible)
+        return indexes.tolist(), amount[indexes].tolist(), capped
+
+    # =========================================================================
+    # Writing
+    # =========================================================================
+
+    def write(
+        self,
+        columns: EmployeeColumns,
+        policy_id: int,
+        balance_type: str,
+        accrual_date: date,
+        indexes: List[int],
+        amounts: List[float],
+    ) -> None:
+        """
+        Apply one policy's accruals with a single statement.
+
+        Balances are upserted, and every balance actually updated gets an
+        accrual entry in the balance ledger. Any ledger snapshot the entry
+        lands before is dropped. Balances already accrued on or after the
+        accrual date are left untouched, so a repeated run is a no-op.
+        """
+        if not indexes:
+            return
+
+        # Employee ids and amounts travel as two array parameters and are
+        # unnested server-side: one round trip and a fixed-size statement
+        # whatever the population size. The insert targets the table, as
+        # the ORM would treat the array parameters as bulk rows.
+        source = select(
+            func.unnest(bindparam("employee_ids", type_=ARRAY(Integer))).label("employee_id"),
+            func.unnest(bindparam("amounts", type_=ARRAY(Float))).label("amount"),
+        ).subquery()
+
+        stmt = insert(TimeOffBalance.__table__).from_select(
+            [
+                "employee_id", "balance_type", "year", "total_allocated", "used",
+                "pending", "available", "carried_over", "last_accrual_date",
+            ],
+            select(
+                source.c.employee_id,
+                literal(balance_type, String),
+                literal(accrual_date.year, Integer),
+                source.c.amount,
+                literal(0.0, Float),
+                literal(0.0, Float),
+                source.c.amount,
+                literal(0.0, Float),
+                literal(accrual_date, Date),
+            ),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["employee_id", "balance_type", "year"],
+            set_={
+                "total_allocated": TimeOffBalance.total_allocated + stmt.excluded.total_allocated,
+                "available": TimeOffBalance.available + stmt.excluded.available,
+                "last_accrual_date": stmt.excluded.last_accrual_date,
+                "last_updated": func.now(),
+            },
+            where=or_(
+                TimeOffBalance.last_accrual_date.is_(None),
+                TimeOffBalance.last_accrual_date < stmt.excluded.last_accrual_date,
+            ),
+        )
+        accrued = stmt.returning(TimeOffBalance.__table__.c.employee_id).cte("accrued")
+
+        # Usually deletes nothing: only a backdated run lands before a snapshot
+        stale_snapshots = (
+            delete(BalanceLedgerSnapshot.__table__)
+            .where(
+                BalanceLedgerSnapshot.policy_id == policy_id,
+                BalanceLedgerSnapshot.as_of_date >= accrual_date,
+                BalanceLedgerSnapshot.employee_id.in_(select(accrued.c.employee_id)),
+            )
+            .cte("stale_snapshots")
+        )
+
+        ledger = insert(BalanceLedgerEntry.__table__).from_select(
+            ["employee_id", "policy_id", "entry_type", "amount", "effective_date", "source_type"],
+            select(
+                source.c.employee_id,
+                literal(policy_id, Integer),
+                literal(LedgerEntryType.ACCRUAL.value, String),
+                source.c.amount,
+                literal(accrual_date, Date),
+                literal(LEDGER_SOURCE_TYPE, String),
+            )
+            .select_from(source.join(accrued, accrued.c.employee_id == source.c.employee_id))
+            .where(source.c.amount != 0),
+        ).add_cte(accrued, stale_snapshots, nest_here=True)
+
+        self.session.execute(ledger, {
+            "employee_ids": [columns.ids[i] for i in indexes],
+            "amounts": list(amounts),
+        })
+
+    # =========================================================================
+    # Runs
+    # =========================================================================
+
+    def run(
+        self,
+        accrual_date: date,
+        employee_ids: Optional[Sequence[int]] = None,
+        policy_ids: Optional[Sequence[int]] = None,
+    ) -> AccrualRunResult:
+        """
+        Calculate and apply accruals for employees on a date.
+
+        Args:
+            accrual_date: Date the accrual is for
+            employee_ids: Employees to process (defaults to all active)
+            policy_ids: Policies to process (defaults to all accruing)
+        """
+        started = time.perf_counter()
+        result = AccrualRunResult(accrual_date=accrual_date)
+
+        columns = self.load_employees(employee_ids)
+        policies = self.load_policies(accrual_date, policy_ids)
+        result.employees = len(columns)
+        if not columns.ids or not policies:
+            result.elapsed_seconds = time.perf_counter() - started
+            return result
+
+        balances = self.load_balances(
+            columns,
+            sorted({policy.policy_type for policy in policies}),
+            accrual_date.year,
+            employee_ids,
+        )
+
+        accrued = set()
+        for policy in policies:
+            compiled = get_compiled_policy(policy)
+            params = self.parameters(policy, accrual_date)
+            available, last_accrual = balances[policy.policy_type]
+
+            indexes, amounts, capped = self.compute(
+                columns,
+                compiled,
+                params,
+                available,
+                last_accrual,
+                self.rule_mask(columns, compiled, accrual_date),
+            )
+            self.write(columns, policy.id, policy.policy_type, accrual_date, indexes, amounts)
+
+            # A balance accrues once per date, as the upsert guard enforces,
+            # so later policies of the same balance type skip these employees
+            for i in indexes:
+                last_accrual[i] = params.accrual_ordinal
+            accrued.update(indexes)
+
+            result.policies.append(PolicyAccrual(
+                policy_id=policy.id,
+                balance_type=policy.policy_type,
+                employees_eligible=len(indexes),
+                employees_capped=capped,
+                total_accrued=sum(amounts),
+            ))
+
+        result.accrued_employee_ids = [columns.ids[i] for i in sorted(accrued)]
+        result.elapsed_seconds = time.perf_counter() - started
+        logger.info(
+            f"Accrual run for {accrual_date}: {result.employees} employees, "
+            f"{len(policies)} policies in {result.elapsed_seconds:.2f}s "
+            f"({result.employees_per_second:.0f} employees/s)"
+        )
+        return result
@@ -0,0 +1,348 @@
+"""Planning, checkpointed execution and reporting of sharded accrual runs."""
+
+import logging
+import statistics
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from src.models.accrual_run import AccrualRun, AccrualRunShard, AccrualRunStatus
+from src.models.employee import Employee
+from src.services.accrual_engine import AccrualEngine, AccrualRunResult
+
+logger = logging.getLogger(__name__)
+
+
+# Active employees per shard task
+ACCRUAL_SHARD_SIZE = 5000
+
+# Employees accrued and committed between checkpoints within a shard
+ACCRUAL_CHECKPOINT_SIZE = 1000
+
+FINISHED_SHARD_STATUSES = (AccrualRunStatus.COMPLETED.value, AccrualRunStatus.FAILED.value)
+
+# Furthest back a scheduled run catches up on missed accrual dates
+ACCRUAL_CATCH_UP_DAYS = 31
+
+# Runs whose date a scheduled run plans again
+RETRIED_RUN_STATUSES = (AccrualRunStatus.PARTIAL.value, AccrualRunStatus.FAILED.value)
+
+
+class AccrualRunService:
+    """
+    Splits an accrual date into shards and runs them resumably.
+
+    A shard commits its accruals together with its checkpoint every
+    ACCRUAL_CHECKPOINT_SIZE employees, so a retry after a timeout or a
+    lost worker continues after the last committed employee instead of
+    starting the range again.
+    """
+
+    def __init__(self, session: Session):
+        """
+        Args:
+            session: Database session; shards commit it at each checkpoint
+        """
+        self.session = session
+
+    # =========================================================================
+    # Planning
+    # =========================================================================
+
+    def dates_to_run(self, through: date, max_days: int = ACCRUAL_CATCH_UP_DAYS) -> List[date]:
+        """
+        Accrual dates a scheduled run should process, oldest first.
+
+        Accrual only happens on period boundary days, so a late or missed
+        run must not lose one: dates are taken from the day after the
+        latest completed run (at most max_days back; just ``through``
+        before any run has completed). Dates with a pending, running or
+        completed run are left out, partial and failed ones are planned
+        again (already accrued employees are skipped), and only dates on
+        which some policy's accrual period ends are kept.
+        """
+        last_completed = self.session.execute(
+            select(func.max(AccrualRun.accrual_date))
+            .where(AccrualRun.status == AccrualRunStatus.COMPLETED.value)
+        ).scalar()
+        start = through
+        if last_completed is not None:
+            start = max(last_completed + timedelta(days=1), through - timedelta(days=max_days - 1))
+        if start > through:
+            return []
+
+        planned = set(self.session.execute(
+            select(AccrualRun.accrual_date).where(
+                AccrualRun.accrual_date.between(start, through),
+                AccrualRun.status.notin_(RETRIED_RUN_STATUSES),
+            )
+        ).scalars())
+
+        engine = AccrualEngine(self.session)
+        candidates = (start + timedelta(days=n) for n in range((through - start).days + 1))
+        return [
+            accrual_date
+            for accrual_date in candidates
+            if accrual_date not in planned and engine.load_policies(accrual_date)
+        ]
+
+    def plan_run(self, accrual_date: date, shard_size: int = ACCRUAL_SHARD_SIZE) -> AccrualRun:
+        """
+        Create a run and its shards over the active population.
+
+        Shards are contiguous ranges of employee ids holding shard_size
+        active employees each.
+        """
+        if shard_size < 1:
+            raise ValueError("shard_size must be positive")
+
+        employee_ids = self.session.execute(
+            select(Employee.id).where(Employee.is_active == True).order_by(Employee.id)
+        ).scalars().all()
+
+        run = AccrualRun(
+            accrual_date=accrual_date,
+            status=AccrualRunStatus.PENDING.value,
+            shard_size=shard_size,
+            total_employees=len(employee_ids),
+        )
+        for shard_index, start in enumerate(range(0, len(employee_ids), shard_size)):
+            chunk = employee_ids[start:start + shard_size]
+            run.shards.append(AccrualRunShard(
+                shard_index=shard_index,
+                first_employee_id=chunk[0],
+                last_employee_id=chunk[-1],
+                employee_count=len(chunk),
+                status=AccrualRunStatus.PENDING.value,
+                attempts=0,
+                employees_processed=0,
+                employees_accrued=0,
+                elapsed_seconds=0.0,
+            ))
+        run.shard_count = len(run.shards)
+
+        self.session.add(run)
+        self.session.commit()
+
+        logger.info(
+            f"Planned accrual run {run.id} for {accrual_date}: "
+            f"{run.total_employees} employees in {run.shard_count} shards"
+        )
+        return run
+
+    # =========================================================================
+    # Shards
+    # =========================================================================
+
+    def run_shard(
+        self,
+        shard_id: int,
+        checkpoint_size: int = ACCRUAL_CHECKPOINT_SIZE,
+        max_attempts: int = 1,
+        on_checkpoint: Optional[Callable[[AccrualRunResult], None]] = None,
+    ) -> AccrualRunShard:
+        """
+        Accrue a shard from its checkpoint to the end of its range.
+
+        Args:
+            shard_id: Shard to run
+            checkpoint_size: Employees per committed checkpoint
+            max_attempts: Attempts after which a failure is recorded as
+                final instead of raised for a retry
+            on_checkpoint: Called with each committed chunk's result
+
+        Returns:
+            The shard, completed or failed
+
+        Raises:
+            The chunk's error, after recording it, while attempts remain
+        """
+        shard = self.session.get(AccrualRunShard, shard_id)
+        if shard is None:
+            raise ValueError(f"Accrual run shard {shard_id} not found")
+        if shard.status in FINISHED_SHARD_STATUSES:
+            return shard  # Redelivered after it finished
+
+        shard.attempts += 1
+        shard.status = AccrualRunStatus.RUNNING.value
+        shard.error = None
+        if shard.run.status == AccrualRunStatus.PENDING.value:
+            shard.run.status = AccrualRunStatus.RUNNING.value
+        accrual_date = shard.run.accrual_date
+        self.session.commit()
+
+        engine = AccrualEngine(self.session)
+        try:
+            while True:
+                employee_ids = self._next_chunk(shard, checkpoint_size)
+                if not employee_ids:
+                    break
+                result = engine.run(accrual_date, employee_ids)
+                self._record_checkpoint(shard, employee_ids[-1], result)
+                self.session.commit()
+                if on_checkpoint is not None:
+                    on_checkpoint(result)
+
+            shard.status = AccrualRunStatus.COMPLETED.value
+            self.session.commit()
+
+        except Exception as e:
+            self.session.rollback()
+            shard.error = f"{type(e).__name__}: {e}"
+            final = shard.attempts >= max_attempts
+            shard.status = (AccrualRunStatus.FAILED if final else AccrualRunStatus.RETRYING).value
+            self.session.commit()
+
+            logger.error(
+                f"Accrual shard {shard.shard_index} of run {shard.run_id} failed "
+                f"after employee {shard.checkpoint_employee_id} "
+                f"(attempt {shard.attempts}/{max_attempts}): {e}"
+            )
+            if not final:
+                raise
+
+        return shard
+
+    def _next_chunk(self, shard: AccrualRunShard, checkpoint_size: int) -> List[int]:
+        """Active employee ids of the shard after its checkpoint."""
+        stmt = (
+            select(Employee.id)
+            .where(
+                Employee.is_active == True,
+                Employee.id.between(shard.first_employee_id, shard.last_employee_id),
+            )
+            .order_by(Employee.id)
+            .limit(checkpoint_size)
+        )
+        if shard.checkpoint_employee_id is not None:
+            stmt = stmt.where(Employee.id > shard.checkpoint_employee_id)
+        return self.session.execute(stmt).scalars().all()
+
+    def _record_checkpoint(
+        self,
+        shard: AccrualRunShard,
+        last_employee_id: int,
+        result: AccrualRunResult,
+    ) -> None:
+        """Advance the checkpoint and fold a chunk's result into the shard."""
+        shard.checkpoint_employee_id = last_employee_id
+        shard.employees_processed += result.employees
+        shard.employees_accrued += len(result.accrued_employee_ids)
+        shard.elapsed_seconds += result.elapsed_seconds
+
+        totals = dict(shard.policy_totals or {})  # Reassigned so the JSONB change is flushed
+        for policy in result.policies:
+            entry = dict(totals.get(str(policy.policy_id)) or {
+                "balance_type": policy.balance_type,
+                "employees_accrued": 0,
+                "employees_capped": 0,
+                "total_accrued": 0.0,
+            })
+            entry["employees_accrued"] += policy.employees_eligible
+            entry["employees_capped"] += policy.employees_capped
+            entry["total_accrued"] += policy.total_accrued
+            totals[str(policy.policy_id)] = entry
+        shard.policy_totals = totals
+
+    # =========================================================================
+    # Reporting
+    # =========================================================================
+
+    def finalize_run(self, run_id: int) -> AccrualRun:
+        """Aggregate shard throughput and failures into the run report."""
+        run = self.session.get(AccrualRun, run_id)
+        if run is None:
+            raise ValueError(f"Accrual run {run_id} not found")
+
+        completed_at = datetime.now(timezone.utc)
+        run.report = build_run_report(run, completed_at)
+        run.completed_at = completed_at
+
+        failed = run.report["shards_failed"]
+        if not failed:
+            run.status = AccrualRunStatus.COMPLETED.value
+        elif failed < run.shard_count:
+            run.status = AccrualRunStatus.PARTIAL.value
+        else:
+            run.status = AccrualRunStatus.FAILED.value
+        self.session.commit()
+
+        logger.info(
+            f"Accrual run {run.id} for {run.accrual_date} {run.status}: "
+            f"{run.report['employees_processed']}/{run.total_employees} employees, "
+            f"{failed} failed shards, {run.report['employees_per_second']:.0f} employees/s"
+        )
+        return run
+
+
+def build_run_report(run: AccrualRun, completed_at: datetime) -> Dict[str, Any]:
+    """
+    Summarize a run's shards.
+
+    Throughput is reported both over the run's wall time, which includes
+    queueing and parallelism across workers, and per shard over the time
+    spent accruing.
+    """
+    shards = run.shards
+    unfinished = [s for s in shards if s.status != AccrualRunStatus.COMPLETED.value]
+    processed = sum(s.employees_processed for s in shards)
+    wall_seconds = (completed_at - run.started_at).total_seconds() if run.started_at else 0.0
+    shard_rates = [s.employees_per_second for s in shards if s.elapsed_seconds]
+
+    policies: Dict[str, Dict[str, Any]] = {}
+    for shard in shards:
+        for policy_id, totals in (shard.policy_totals or {}).items():
+            entry = policies.setdefault(policy_id, {
+                "balance_type": totals["balance_type"],
+                "employees_accrued": 0,
+                "employees_capped": 0,
+                "total_accrued": 0.0,
+            })
+            entry["employees_accrued"] += totals["employees_accrued"]
+            entry["employees_capped"] += totals["employees_capped"]
+            entry["total_accrued"] += totals["total_accrued"]
+
+    return {
+        "accrual_date": run.accrual_date.isoformat(),
+        "shards": len(shards),
+        "shards_completed": len(shards) - len(unfinished),
+        "shards_failed": len(unfinished),
+        "shards_retried": sum(1 for s in shards if s.attempts > 1),
+        "employees_planned": run.total_employees,
+        "employees_processed": processed,
+        "employees_accrued": sum(s.employees_accrued for s in shards),
+        "wall_seconds": round(wall_seconds, 3),
+        "employees_per_second": round(processed / wall_seconds, 1) if wall_seconds > 0 else 0.0,
+        "shard_seconds": round(sum(s.elapsed_seconds for s in shards), 3),
+        "shard_employees_per_second": {
+            "min": round(min(shard_rates), 1),
+            "median": round(statistics.median(shard_rates), 1),
+            "max": round(max(shard_rates), 1),
+        } if shard_rates else None,
+        "policies": policies,
+        "shard_details": [
+            {
+                "shard_index": s.shard_index,
+                "status": s.status,
+                "attempts": s.attempts,
+                "employees_processed": s.employees_processed,
+                "elapsed_seconds": round(s.elapsed_seconds, 3),
+                "employees_per_second": round(s.employees_per_second, 1),
+            }
+            for s in shards
+        ],
+        "failures": [
+            {
+                "shard_index": s.shard_index,
+                "first_employee_id": s.first_employee_id,
+                "last_employee_id": s.last_employee_id,
+                "checkpoint_employee_id": s.checkpoint_employee_id,
+                "status": s.status,
+                "attempts": s.attempts,
+                "error": s.error,
+            }
+            for s in unfinished
+        ],
+    }
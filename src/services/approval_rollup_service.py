@@ -0,0 +1,483 @@
+"""
+Approval decision rollups, maintained on each transition and merged for analytics.
+
+Each approve, deny or cancel adds one decision to its (day, department,
+manager, request type) bucket in the same transaction as the status change.
+Analytics for any date range read the buckets in the range, a few per
+manager per day, and merge them: counts add, and the latency sketches merge
+exactly, so percentiles keep the sketch's relative error bound (1% by
+default) however many buckets are combined.
+"""
+
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from sqlalchemy import Date, Integer, case, cast, delete, func, insert, literal_column, select, true, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from src.models.approval_rollup import UNASSIGNED, ApprovalRollup
+from src.models.employee import Employee
+from src.models.time_off_request import TimeOffRequest, TimeOffRequestStatus
+from src.utils.quantile_sketch import DEFAULT_RELATIVE_ACCURACY, DDSketch
+
+logger = logging.getLogger(__name__)
+
+
+# Hours from submission to decision that meet the approval SLA
+SLA_TARGET_HOURS = 48.0
+
+# Bucket counter for each transition that is recorded
+TRANSITION_COUNTERS = {
+    TimeOffRequestStatus.APPROVED.value: "approved_count",
+    TimeOffRequestStatus.REJECTED.value: "denied_count",
+    TimeOffRequestStatus.CANCELLED.value: "cancelled_count",
+}
+
+# Rows per fetch while rebuilding from request history
+REBUILD_BATCH_SIZE = 5000
+
+BucketKey = Tuple[date, int, int, str]
+
+
+def transition_time(request: TimeOffRequest, status: str) -> Optional[datetime]:
+    """When the request entered a recorded status."""
+    if status == TimeOffRequestStatus.APPROVED.value:
+        return request.approved_at
+    if status == TimeOffRequestStatus.REJECTED.value:
+        return request.rejected_at
+    if status == TimeOffRequestStatus.CANCELLED.value:
+        return request.cancelled_at
+    return None
+
+
+def latency_hours(submitted_at: Optional[datetime], decided_at: datetime) -> float:
+    """Hours from submission to decision; never negative."""
+    if submitted_at is None:
+        return 0.0
+    return max((decided_at - submitted_at).total_seconds() / 3600, 0.0)
+
+
+@dataclass
+class RollupTotals:
+    """Merged counts and decision latencies of some buckets."""
+
+    approved: int = 0
+    denied: int = 0
+    cancelled: int = 0
+    within_sla: int = 0
+
+    # Exact latency statistics, in hours
+    latency_count: int = 0
+    latency_sum: float = 0.0
+    latency_min: Optional[float] = None
+    latency_max: Optional[float] = None
+
+    # Latency distribution, when merged for these totals
+    latency: Optional[DDSketch] = None
+
+    @property
+    def decisions(self) -> int:
+        return self.approved + self.denied
+
+    @property
+    def total(self) -> int:
+        """Requests that left the queue: decisions plus cancellations."""
+        return self.decisions + self.cancelled
+
+    @property
+    def over_sla(self) -> int:
+        return self.decisions - self.within_sla
+
+    @property
+    def approval_rate(self) -> float:
+        return round(self.approved / self.total * 100, 1) if self.total else 0.0
+
+    @property
+    def denial_rate(self) -> float:
+        return round(self.denied / self.total * 100, 1) if self.total else 0.0
+
+    @property
+    def sla_compliance(self) -> float:
+        return round(self.within_sla / self.decisions * 100, 1) if self.decisions else 100.0
+
+    @property
+    def average_hours(self) -> float:
+        return round(self.latency_sum / self.latency_count, 1) if self.latency_count else 0.0
+
+    def percentile_hours(self, q: float) -> Optional[float]:
+        """
+        Latency at quantile q, within the sketch's relative accuracy.
+
+        None when the distribution was not merged for these totals.
+        """
+        if self.latency is None:
+            return None
+        return round(self.latency.quantile(q) or 0.0, 1)
+
+
+@dataclass
+class RollupSummary:
+    """Buckets of a date range merged overall and along each dimension."""
+
+    overall: RollupTotals = field(default_factory=RollupTotals)
+    by_weekday: Dict[int, RollupTotals] = field(default_factory=lambda: defaultdict(RollupTotals))
+    by_week: Dict[date, RollupTotals] = field(default_factory=lambda: defaultdict(RollupTotals))
+    by_request_type: Dict[str, RollupTotals] = field(default_factory=lambda: defaultdict(RollupTotals))
+    by_department: Dict[int, RollupTotals] = field(default_factory=lambda: defaultdict(RollupTotals))
+    by_manager: Dict[int, RollupTotals] = field(default_factory=lambda: defaultdict(RollupTotals))
+
+    def group(self, dimension: Optional[str], key: Any) -> RollupTotals:
+        """Totals for one value of a dimension; the overall totals for None."""
+        if dimension is None:
+            return self.overall
+        if dimension == "weekday":
+            key = int(key) - 1  # ISO day of week to date.weekday()
+        return getattr(self, f"by_{dimension}")[key]
+
+
+# Breakdowns of a summary, each one grouping set of the summary queries.
+# No bound parameters: they would differ between the SELECT list and GROUP BY
+# under positional drivers.
+DIMENSIONS = {
+    "weekday": func.extract("isodow", ApprovalRollup.decision_date),
+    "week": cast(func.date_trunc(literal_column("'week'"), ApprovalRollup.decision_date), Date),
+    "request_type": ApprovalRollup.request_type,
+    "department": ApprovalRollup.department_id,
+    "manager": ApprovalRollup.manager_id,
+}
+
+
+def _group_of(names: Sequence[str], values: Sequence[Any]) -> Tuple[Optional[str], Any]:
+    """The grouping set a row belongs to: its one non-NULL dimension, if any."""
+    for name, value in zip(names, values):
+        if value is not None:
+            return name, value
+    return None, None
+
+
+class ApprovalRollupService:
+    """Records approval transitions into rollup buckets and reads them back."""
+
+    def __init__(self, session: Session, sla_target_hours: float = SLA_TARGET_HOURS):
+        self.session = session
+        self.sla_target_hours = sla_target_hours
+
+    # =========================================================================
+    # Recording
+    # =========================================================================
+
+    def record_transition(
+        self,
+        request: TimeOffRequest,
+        decided_by: Optional[int] = None,
+    ) -> Optional[ApprovalRollup]:
+        """
+        Add a request's transition to its rollup bucket.
+
+        Call after setting the request's new status and its timestamp, in the
+        transaction that makes the change, so the rollup commits or rolls
+        back with it. Other statuses are ignored.
+
+        Args:
+            request: The request, already in its new status
+            decided_by: Employee id of the deciding manager; defaults to the
+                request's current approver, then the employee's manager
+
+        Returns:
+            The updated bucket, or None if the status is not recorded
+        """
+        counter = TRANSITION_COUNTERS.get(request.status)
+        if counter is None:
+            return None
+
+        decided_at = transition_time(request, request.status) or datetime.utcnow()
+        employee = self.session.get(Employee, request.employee_id)
+        department_id = employee.department_id if employee else None
+        manager_id = decided_by or request.current_approver_id or (
+            employee.manager_id if employee else None
+        )
+
+        bucket = self._lock_bucket((
+            decided_at.date(),
+            department_id or UNASSIGNED,
+            manager_id or UNASSIGNED,
+            request.request_type,
+        ))
+        setattr(bucket, counter, getattr(bucket, counter) + 1)
+
+        if request.status != TimeOffRequestStatus.CANCELLED.value:
+            hours = latency_hours(request.submitted_at or request.created_at, decided_at)
+            sketch = (
+                DDSketch.from_dict(bucket.latency_sketch)
+                if bucket.latency_sketch else DDSketch()
+            )
+            sketch.add(hours)
+            bucket.latency_sketch = sketch.to_dict()
+            if hours <= self.sla_target_hours:
+                bucket.within_sla_count += 1
+
+        self.session.flush()
+        return bucket
+
+    def _lock_bucket(self, key: BucketKey) -> ApprovalRollup:
+        """
+        The bucket for a key, created if missing and locked for update.
+
+        Inserting with DO NOTHING first means concurrent transitions into a
+        new bucket both find the row, and the row lock then serialises them.
+        """
+        decision_date, department_id, manager_id, request_type = key
+        values = dict(
+            decision_date=decision_date,
+            department_id=department_id,
+            manager_id=manager_id,
+            request_type=request_type,
+        )
+        self.session.execute(
+            pg_insert(ApprovalRollup).values(**values).on_conflict_do_nothing()
+        )
+        return self.session.execute(
+            select(ApprovalRollup)
+            .filter_by(**values)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        ).scalar_one()
+
+    def rebuild(self, start_date: date, end_date: date) -> int:
+        """
+        Recompute the buckets of a date range from request history.
+
+        For backfilling and repair; normal operation records each transition
+        as it happens. Streams the requests decided in the range once.
+
+        Returns:
+            Number of buckets written
+        """
+        status = TimeOffRequest.status
+        decided_at = case(
+            (status == TimeOffRequestStatus.APPROVED.value, TimeOffRequest.approved_at),
+            (status == TimeOffRequestStatus.REJECTED.value, TimeOffRequest.rejected_at),
+            else_=TimeOffRequest.cancelled_at,
+        )
+        # Same attribution as record_transition: the decider, else the
+        # approver the request was waiting on
+        manager_id = case(
+            (status == TimeOffRequestStatus.CANCELLED.value,
+             func.coalesce(TimeOffRequest.current_approver_id, Employee.manager_id)),
+            else_=func.coalesce(
+                TimeOffRequest.updated_by, TimeOffRequest.current_approver_id, Employee.manager_id,
+            ),
+        )
+        rows = self.session.execute(
+            select(
+                status,
+                TimeOffRequest.request_type,
+                decided_at,
+                func.coalesce(TimeOffRequest.submitted_at, TimeOffRequest.created_at),
+                Employee.department_id,
+                manager_id,
+            )
+            .join(Employee, Employee.id == TimeOffRequest.employee_id)
+            .where(
+                status.in_(TRANSITION_COUNTERS),
+                decided_at >= start_date,
+                decided_at < end_date + timedelta(days=1),
+            )
+            .execution_options(yield_per=REBUILD_BATCH_SIZE)
+        )
+
+        buckets: Dict[BucketKey, RollupTotals] = defaultdict(RollupTotals)
+        for row_status, request_type, row_decided_at, submitted_at, department, manager in rows:
+            totals = buckets[(
+                row_decided_at.date(), department or UNASSIGNED, manager or UNASSIGNED, request_type,
+            )]
+            if row_status == TimeOffRequestStatus.CANCELLED.value:
+                totals.cancelled += 1
+                continue
+            if row_status == TimeOffRequestStatus.APPROVED.value:
+                totals.approved += 1
+            else:
+                totals.denied += 1
+            hours = latency_hours(submitted_at, row_decided_at)
+            if totals.latency is None:
+                totals.latency = DDSketch()
+            totals.latency.add(hours)
+            if hours <= self.sla_target_hours:
+                totals.within_sla += 1
+
+        self.session.execute(
+            delete(ApprovalRollup).where(ApprovalRollup.decision_date.between(start_date, end_date))
+        )
+        if buckets:
+            self.session.execute(insert(ApprovalRollup), [
+                {
+                    "decision_date": decision_date,
+                    "department_id": department_id,
+                    "manager_id": manager,
+                    "request_type": request_type,
+                    "approved_count": totals.approved,
+                    "denied_count": totals.denied,
+                    "cancelled_count": totals.cancelled,
+                    "within_sla_count": totals.within_sla,
+                    "latency_sketch": totals.latency.to_dict() if totals.latency else None,
+                }
+                for (decision_date, department_id, manager, request_type), totals in buckets.items()
+            ])
+        logger.info(
+            "Rebuilt %d approval rollup buckets for %s to %s", len(buckets), start_date, end_date,
+        )
+        return len(buckets)
+
+    # =========================================================================
+    # Reading
+    # =========================================================================
+
+    def summarize(
+        self,
+        start_date: date,
+        end_date: date,
+        department_id: Optional[int] = None,
+        manager_id: Optional[int] = None,
+        request_type: Optional[str] = None,
+        percentiles_by: Sequence[str] = (),
+    ) -> RollupSummary:
+        """
+        Merge the buckets of a date range (inclusive), optionally filtered.
+
+        Postgres does the merging, with GROUPING SETS for the whole range and
+        every value of every dimension, so rows come back one per group
+        rather than one per bucket. Counts and exact latency statistics are
+        merged for every group; latency distributions (the sketches' bins)
+        for the whole range and for the dimensions in ``percentiles_by``.
+
+        Args:
+            start_date: First decision day
+            end_date: Last decision day
+            department_id: Only this department's buckets
+            manager_id: Only this manager's buckets
+            request_type: Only this request type's buckets
+            percentiles_by: Names from DIMENSIONS whose groups also need
+                percentiles
+        """
+        rollup = ApprovalRollup
+        filters = [rollup.decision_date.between(start_date, end_date)]
+        if department_id is not None:
+            filters.append(rollup.department_id == department_id)
+        if manager_id is not None:
+            filters.append(rollup.manager_id == manager_id)
+        if request_type is not None:
+            filters.append(rollup.request_type == request_type)
+
+        dimensions = list(DIMENSIONS.values())
+        sketch = rollup.latency_sketch
+        summary = RollupSummary()
+        headers: Dict[Tuple[Optional[str], Any], Dict[str, Any]] = {}
+
+        for row in self.session.execute(
+            select(
+                *dimensions,
+                func.sum(rollup.approved_count),
+                func.sum(rollup.denied_count),
+                func.sum(rollup.cancelled_count),
+                func.sum(rollup.within_sla_count),
+                func.sum(sketch["count"].as_integer()),
+                func.sum(sketch["zero"].as_integer()),
+                func.sum(sketch["sum"].as_float()),
+                func.min(sketch["min"].as_float()),
+                func.max(sketch["max"].as_float()),
+            )
+            .where(*filters)
+            .group_by(func.grouping_sets(
+                tuple_(), *(tuple_(dimension) for dimension in dimensions)
+            ))
+        ):
+            group = _group_of(list(DIMENSIONS), row[:len(dimensions)])
+            approved, denied, cancelled, within_sla, count, zero, total, low, high = row[len(dimensions):]
+            totals = summary.group(*group)
+            totals.approved = int(approved or 0)
+            totals.denied = int(denied or 0)
+            totals.cancelled = int(cancelled or 0)
+            totals.within_sla = int(within_sla or 0)
+            totals.latency_count = int(count or 0)
+            totals.latency_sum = total or 0.0
+            totals.latency_min = low
+            totals.latency_max = high
+            if count and group[0] in (None, *percentiles_by):
+                headers[group] = {
+                    "alpha": DEFAULT_RELATIVE_ACCURACY,
+                    "zero": int(zero),
+                    "count": int(count),
+                    "sum": total,
+                    "min": low,
+                    "max": high,
+                }
+
+        if not headers:
+            return summary
+
+        bins = func.jsonb_each_text(sketch["bins"]).table_valued("key", "value")
+        index = cast(bins.c.key, Integer)
+        bin_counts: Dict[Tuple[Optional[str], Any], Dict[int, int]] = defaultdict(dict)
+        by = [DIMENSIONS[name] for name in percentiles_by]
+        for row in self.session.execute(
+            select(*by, index, func.sum(cast(bins.c.value, Integer)))
+            .select_from(rollup)
+            .join(bins, true())
+            .where(*filters)
+            .group_by(func.grouping_sets(
+                tuple_(index), *(tuple_(dimension, index) for dimension in by)
+            ))
+        ):
+            bin_counts[_group_of(percentiles_by, row[:-2])][row[-2]] = int(row[-1])
+
+        for group, header in headers.items():
+            summary.group(*group).latency = DDSketch.from_dict({**header, "bins": bin_counts[group]})
+        return summary
+
+    def pending_counts(
+        self,
+        department_id: Optional[int] = None,
+        manager_id: Optional[int] = None,
+        request_type: Optional[str] = None,
+        now: Optional[datetime] = None,
+    ) -> Dict[Tuple[int, int], Tuple[int, int]]:
+        """
+        Requests waiting on a decision, by (department, manager).
+
+        The pending queue is live state rather than history, so it is counted
+        directly; it is small next to the decided requests the rollup covers.
+
+        Returns:
+            (department_id, manager_id) -> (pending, over the SLA target)
+        """
+        overdue_before = (now or datetime.utcnow()) - timedelta(hours=self.sla_target_hours)
+        submitted_at = func.coalesce(TimeOffRequest.submitted_at, TimeOffRequest.created_at)
+        department = func.coalesce(Employee.department_id, UNASSIGNED)
+        manager = func.coalesce(TimeOffRequest.current_approver_id, Employee.manager_id, UNASSIGNED)
+
+        stmt = (
+            select(
+                department,
+                manager,
+                func.count(),
+                func.count().filter(submitted_at < overdue_before),
+            )
+            .join(Employee, Employee.id == TimeOffRequest.employee_id)
+            .where(TimeOffRequest.status == TimeOffRequestStatus.PENDING_APPROVAL.value)
+            .group_by(department, manager)
+        )
+        if department_id is not None:
+            stmt = stmt.where(department == department_id)
+        if manager_id is not None:
+            stmt = stmt.where(manager == manager_id)
+        if request_type is not None:
+            stmt = stmt.where(TimeOffRequest.request_type == request_type)
+
+        return {
+            (row_department, row_manager): (pending, overdue)
+            for row_department, row_manager, pending, overdue in self.session.execute(stmt)
+        }
@@ -8,6 +8,7 @@ from uuid import UUID
 from sqlalchemy import and_, func, select
 from sqlalchemy.orm import Session
 
+from src.data.keyset_pagination import CountMode, attribute_key, fetch_keyset_page
 from src.models.employee_audit_trail import ChangeType, EmployeeAuditTrail
 from src.schemas.employee_audit import (
     AuditTrailEntry,
@@ -51,6 +52,13 @@ FIELD_DISPLAY_NAMES = {
 }
 
 
+# Newest first; id breaks ties between changes saved in the same instant
+AUDIT_TRAIL_SORT_KEYS = (
+    attribute_key(EmployeeAuditTrail.change_timestamp),
+    attribute_key(EmployeeAuditTrail.id),
+)
+
+
 class AuditTrailService:
     """
     Service for retrieving and processing employee audit trail data.
@@ -80,11 +88,15 @@ class AuditTrailService:
         date_from: Optional[datetime] = None,
         date_to: Optional[datetime] = None,
         actor_user_id: Optional[UUID] = None,
+        cursor: Optional[str] = None,
+        count_mode: CountMode = CountMode.EXACT,
     ) -> AuditTrailResponse:
         """
         Get audit trail for an employee.
         
         Returns chronological change history with pagination and filtering.
+        Passing back ``next_cursor`` continues after the previous page
+        instead of skipping ``page`` pages of history.
         """
         # Check permissions
         self._check_audit_view_permission(employee_id, current_user)
@@ -115,31 +127,29 @@ class AuditTrailService:
         if conditions:
             stmt = stmt.where(and_(*conditions))
         
-        # Get total count
-        count_stmt = select(func.count()).select_from(stmt.subquery())
-        total = self.session.execute(count_stmt).scalar() or 0
-        
-        # Apply pagination and ordering
         offset = (page - 1) * page_size
-        stmt = (
-            stmt
-            .order_by(EmployeeAuditTrail.change_timestamp.desc())
-            .limit(page_size)
-            .offset(offset)
+        result = fetch_keyset_page(
+            self.session,
+            stmt,
+            keys=AUDIT_TRAIL_SORT_KEYS,
+            scope=f"audit:{employee_id}",
+            page_size=page_size,
+            cursor=cursor,
+            descending=True,
+            offset=offset,
+            count_mode=count_mode,
         )
         
-        # Execute query
-        result = self.session.execute(stmt)
-        entries = list(result.scalars())
-        
         # Build response
         return AuditTrailResponse(
             employee_id=employee_id,
-            total_entries=total,
-            entries=[self._to_audit_entry(e) for e in entries],
+            total_entries=result.total,
+            total_is_estimate=result.total_is_estimate,
+            entries=[self._to_audit_entry(e) for e in result.items],
             page=page,
             page_size=page_size,
-            has_more=(offset + len(entries)) < total,
+            has_more=result.has_more,
+            next_cursor=result.next_cursor,
         )
     
     def get_audit_summary(
@@ -39,6 +39,7 @@ from src.schemas.balance_analytics import (
     TrendIdentification,
     UtilizationMetric,
 )
+from src.services.balance_reconciliation import BalanceDiff, BalanceReconciler, ReconciliationScope
 from src.utils.auth import CurrentUser
 
 logger = logging.getLogger(__name__)
@@ -632,60 +633,59 @@ class BalanceAnalyticsService:
         """
         Perform balance reconciliation with discrepancy identification.
         
-        Processes corrections and maintains audit trail.
+        Stored balances are diffed against the balance ledger in one
+        set-based query (see BalanceReconciler) and the discrepancies are
+        streamed back in pages. Auto-corrections move the stored balances
+        to the ledger's allocations and carryover with a single upsert, and
+        record stored usage the ledger is missing as USAGE entries (see
+        BalanceReconciler.apply_corrections).
         """
         reconciliation_id = str(uuid.uuid4())[:8].upper()
         as_of_date = request.as_of_date or date.today()
+        detected_at = datetime.utcnow()
 
-        # Get scope
-        employees_analyzed = 0
-        discrepancies: List[BalanceDiscrepancy] = []
-        corrections: List[ReconciliationCorrection] = []
-
-        # Query employees based on scope
-        emp_stmt = select(Employee).where(Employee.is_active == True)
+        scope = ReconciliationScope()
         if request.scope == "department" and request.scope_ids:
-            emp_stmt = emp_stmt.where(Employee.department_id.in_(request.scope_ids))
+            scope = ReconciliationScope(department_ids=request.scope_ids)
         elif request.scope == "employee" and request.scope_ids:
-            emp_stmt = emp_stmt.where(Employee.id.in_(request.scope_ids))
+            scope = ReconciliationScope(employee_ids=request.scope_ids)
+        elif request.scope == "policy" and request.scope_ids:
+            scope = ReconciliationScope(policy_ids=request.scope_ids)
 
-        employees = self.session.execute(emp_stmt).scalars().all()
-        employees_analyzed = len(employees)
+        reconciler = BalanceReconciler(self.session)
+        employees_analyzed = reconciler.count_employees(scope)
 
-        # Get policies
-        policy_stmt = select(TimeOffPolicy).where(TimeOffPolicy.status == PolicyStatus.ACTIVE.value)
-        if request.scope == "policy" and request.scope_ids:
-            policy_stmt = policy_stmt.where(TimeOffPolicy.id.in_(request.scope_ids))
-        policies = self.session.execute(policy_stmt).scalars().all()
-
-        # Check each employee's balances
-        for employee in employees:
-            for policy in policies:
-                # Check for discrepancies (mock logic)
-                discrepancy = self._check_balance_discrepancy(
-                    employee, policy, as_of_date
-                )
-                
-                if discrepancy:
-                    discrepancies.append(discrepancy)
-                    
-                    # Auto-correct if enabled and within threshold
-                    if (request.auto_correct and 
+        discrepancies: List[BalanceDiscrepancy] = []
+        corrections: List[ReconciliationCorrection] = []
+        to_correct: List[BalanceDiff] = []
+
+        for page in reconciler.discrepancies(as_of_date, scope):
+            for diff in page:
+                discrepancy = self._to_discrepancy(diff, as_of_date, detected_at)
+                discrepancies.append(discrepancy)
+
+                # Auto-correct if enabled and within threshold
+                if (request.auto_correct and
                         abs(discrepancy.difference) <= request.correction_threshold):
-                        correction = ReconciliationCorrection(
-                            employee_id=employee.id,
-                            policy_id=policy.id,
-                            correction_type="automatic",
-                            amount=discrepancy.difference,
-                            effective_date=as_of_date,
-                            reason=f"Auto-correction for {discrepancy.discrepancy_type.value}",
-                            notes=f"Reconciliation {reconciliation_id}",
-                        )
-                        corrections.append(correction)
+                    to_correct.append(diff)
+                    corrections.append(ReconciliationCorrection(
+                        employee_id=diff.employee_id,
+                        policy_id=diff.policy_id,
+                        correction_type="automatic",
+                        amount=discrepancy.difference,
+                        effective_date=as_of_date,
+                        reason=f"Auto-correction for {discrepancy.discrepancy_type.value}",
+                        notes=f"Reconciliation {reconciliation_id}",
+                    ))
+
+        if to_correct:
+            reconciler.apply_corrections(
+                to_correct, as_of_date, f"Reconciliation {reconciliation_id} auto-correction"
+            )
 
         # Calculate totals
         total_discrepancy = sum(abs(d.difference) for d in discrepancies)
-        corrections_applied = len([c for c in corrections])
+        corrections_applied = len(corrections)
         corrections_pending = len([
             d for d in discrepancies 
             if abs(d.difference) > request.require_approval_above
@@ -730,60 +730,55 @@ class BalanceAnalyticsService:
             discrepancies=discrepancies,
             applied_corrections=corrections,
             initiated_by=f"Employee {current_user.employee_id}",
-            initiated_at=datetime.utcnow(),
+            initiated_at=detected_at,
             completed_at=datetime.utcnow(),
             summary=summary,
             recommendations=recommendations,
         )
 
-    def _check_balance_discrepancy(
+    def _to_discrepancy(
         self,
-        employee: Employee,
-        policy: TimeOffPolicy,
+        diff: BalanceDiff,
         as_of_date: date,
-    ) -> Optional[BalanceDiscrepancy]:
-        """Check for balance discrepancy for an employee/policy."""
-        # Mock: Generate random discrepancies for demonstration
-        import random
-        random.seed(hash((employee.id, policy.id, as_of_date.toordinal())))
-        
-        # 10% chance of discrepancy
-        if random.random() > 0.10:
-            return None
-        
-        # Generate mock discrepancy
-        expected = policy.base_accrual_rate * 0.5  # Mock expected
-        actual = expected + random.uniform(-2, 2)  # Mock actual with variance
-        difference = actual - expected
-        
-        if abs(difference) < 0.1:
-            return None
-        
-        discrepancy_types = [
-            DiscrepancyTypeEnum.ACCRUAL_ERROR,
-            DiscrepancyTypeEnum.USAGE_MISMATCH,
-            DiscrepancyTypeEnum.CARRYOVER_ERROR,
-        ]
-        disc_type = random.choice(discrepancy_types)
-        
+        detected_at: datetime,
+    ) -> BalanceDiscrepancy:
+        """Describe a stored-vs-ledger difference as a discrepancy."""
+        if not diff.has_ledger:
+            disc_type = DiscrepancyTypeEnum.DATA_MIGRATION
+            probable_cause = "Stored balance has no ledger history"
+        elif not diff.has_stored:
+            disc_type = DiscrepancyTypeEnum.SYSTEM_ERROR
+            probable_cause = "Ledger entries have no stored balance"
+        else:
+            # Attribute the difference to the component that is furthest off
+            components = [
+                (diff.stored_allocated - diff.expected_allocated, DiscrepancyTypeEnum.ACCRUAL_ERROR),
+                (diff.stored_used - diff.expected_used, DiscrepancyTypeEnum.USAGE_MISMATCH),
+                (diff.stored_carried_over - diff.expected_carried_over,
+                 DiscrepancyTypeEnum.CARRYOVER_ERROR),
+            ]
+            _, disc_type = max(components, key=lambda c: abs(c[0]))
+            probable_cause = f"Possible {disc_type.value.replace('_', ' ')}"
+
+        difference = diff.difference
         severity = "low"
         if abs(difference) > 2:
             severity = "high"
         elif abs(difference) > 1:
             severity = "medium"
-        
+
         return BalanceDiscrepancy(
-            discrepancy_id=f"DISC-{employee.id}-{policy.id}",
-            employee_id=employee.id,
-            employee_name=f"{employee.first_name} {employee.last_name}",
-            policy_id=policy.id,
-            policy_name=policy.name,
+            discrepancy_id=f"DISC-{diff.employee_id}-{diff.policy_id}",
+            employee_id=diff.employee_id,
+            employee_name=diff.employee_name,
+            policy_id=diff.policy_id,
+            policy_name=diff.policy_name,
             discrepancy_type=disc_type,
-            expected_balance=round(expected, 2),
-            actual_balance=round(actual, 2),
+            expected_balance=round(diff.expected_balance, 2),
+            actual_balance=round(diff.actual_balance, 2),
             difference=round(difference, 2),
-            detected_at=datetime.utcnow(),
-            probable_cause=f"Possible {disc_type.value.replace('_', ' ')}",
+            detected_at=detected_at,
+            probable_cause=probable_cause,
             affected_period=f"Q{(as_of_date.month - 1) // 3 + 1} {as_of_date.year}",
             severity=severity,
             requires_immediate_action=severity == "high",
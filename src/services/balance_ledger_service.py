@@ -0,0 +1,385 @@
+"""Append-only balance ledger with snapshot-accelerated as-of reads."""
+
+import logging
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Date, Integer, and_, bindparam, delete, func, insert, literal, or_, select, true
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from src.models.balance_ledger import BalanceLedgerEntry, BalanceLedgerSnapshot, LedgerEntryType
+
+logger = logging.getLogger(__name__)
+
+
+# Snapshot total column for each entry type
+TOTAL_COLUMNS = {
+    LedgerEntryType.ACCRUAL.value: "accrued",
+    LedgerEntryType.USAGE.value: "used",
+    LedgerEntryType.ADJUSTMENT.value: "adjusted",
+    LedgerEntryType.CARRYOVER.value: "carried_over",
+}
+
+# Employees per compaction statement
+COMPACTION_BATCH_SIZE = 5000
+
+
+def _build_balances_as_of():
+    """
+    Per policy, a LATERAL probe of the snapshot primary key for the latest
+    snapshot on or before :as_of_date, and a LATERAL sum of the entries
+    between that snapshot and the date.
+    """
+    snapshot = BalanceLedgerSnapshot
+    entry = BalanceLedgerEntry
+    employee_id = bindparam("employee_id", type_=Integer)
+    as_of_date = bindparam("as_of_date", type_=Date)
+    policies = func.unnest(
+        bindparam("policy_ids", type_=ARRAY(Integer))
+    ).table_valued("policy_id").render_derived()
+
+    latest = (
+        select(snapshot.as_of_date, *[snapshot.__table__.c[column] for column in TOTAL_COLUMNS.values()])
+        .where(
+            snapshot.employee_id == employee_id,
+            snapshot.policy_id == policies.c.policy_id,
+            snapshot.as_of_date <= as_of_date,
+        )
+        .order_by(snapshot.as_of_date.desc())
+        .limit(1)
+        .lateral("latest")
+    )
+    tail = (
+        select(
+            *[
+                func.coalesce(
+                    func.sum(entry.amount).filter(entry.entry_type == entry_type), 0.0
+                ).label(column)
+                for entry_type, column in TOTAL_COLUMNS.items()
+            ],
+            func.count().label("entries"),
+        )
+        .where(
+            entry.employee_id == employee_id,
+            entry.policy_id == policies.c.policy_id,
+            entry.effective_date > func.coalesce(latest.c.as_of_date, date.min),
+            entry.effective_date <= as_of_date,
+        )
+        .lateral("tail")
+    )
+    return (
+        select(
+            policies.c.policy_id,
+            latest.c.as_of_date,
+            *[
+                (func.coalesce(latest.c[column], 0.0) + tail.c[column]).label(column)
+                for column in TOTAL_COLUMNS.values()
+            ],
+            tail.c.entries,
+        )
+        .select_from(policies)
+        .outerjoin(latest, true())
+        .join(tail, true())
+    )
+
+
+# Built once: constructing it and deriving its cache key cost several
+# times more than running it
+BALANCES_AS_OF = _build_balances_as_of()
+
+
+@dataclass(frozen=True)
+class LedgerPosting:
+    """A balance movement to append to the ledger."""
+
+    employee_id: int
+    policy_id: int
+    entry_type: LedgerEntryType
+    amount: float
+    effective_date: date
+    source_type: Optional[str] = None
+    source_id: Optional[int] = None
+    description: Optional[str] = None
+
+
+@dataclass
+class LedgerBalance:
+    """An (employee, policy) balance through a date, by entry type."""
+
+    employee_id: int
+    policy_id: int
+    as_of_date: date
+    accrued: float = 0.0
+    used: float = 0.0
+    adjusted: float = 0.0
+    carried_over: float = 0.0
+    snapshot_date: Optional[date] = None
+    tail_entries: int = 0
+
+    @property
+    def balance(self) -> float:
+        """Net balance; usage totals are negative."""
+        return self.accrued + self.used + self.adjusted + self.carried_over
+
+    @property
+    def has_history(self) -> bool:
+        """Whether any ledger entry is effective by as_of_date."""
+        return self.snapshot_date is not None or self.tail_entries > 0
+
+
+class BalanceLedgerService:
+    """
+    Records balance movements and answers "balance as of" queries.
+
+    An as-of read takes the latest snapshot on or before the date from
+    the snapshot primary key and adds the entries effective after it from
+    the (employee_id, policy_id, effective_date) index, so its cost is two
+    index lookups plus the tail since the last snapshot, however long the
+    ledger grows. Snapshots are written in bulk by compact().
+    """
+
+    def __init__(self, session: Session):
+        """
+        Args:
+            session: Database session
+        """
+        self.session = session
+
+    # =========================================================================
+    # Appending
+    # =========================================================================
+
+    def append(self, postings: Sequence[LedgerPosting]) -> int:
+        """
+        Append entries and drop the snapshots they make stale.
+
+        Returns:
+            Number of entries appended
+        """
+        if not postings:
+            return 0
+
+        self.session.execute(
+            insert(BalanceLedgerEntry),
+            [
+                {
+                    "employee_id": posting.employee_id,
+                    "policy_id": posting.policy_id,
+                    "entry_type": LedgerEntryType(posting.entry_type).value,
+                    "amount": posting.amount,
+                    "effective_date": posting.effective_date,
+                    "source_type": posting.source_type,
+                    "source_id": posting.source_id,
+                    "description": posting.description,
+                }
+                for posting in postings
+            ],
+        )
+
+        earliest: Dict[Tuple[int, int], date] = {}
+        for posting in postings:
+            key = (posting.employee_id, posting.policy_id)
+            if key not in earliest or posting.effective_date < earliest[key]:
+                earliest[key] = posting.effective_date
+        self._invalidate_snapshots(earliest)
+
+        return len(postings)
+
+    def _invalidate_snapshots(self, earliest: Dict[Tuple[int, int], date]) -> None:
+        """Delete snapshots dated on or after each key's earliest new entry."""
+        keys = func.unnest(
+            bindparam("employee_ids", type_=ARRAY(Integer)),
+            bindparam("policy_ids", type_=ARRAY(Integer)),
+            bindparam("effective_dates", type_=ARRAY(Date)),
+        ).table_valued("employee_id", "policy_id", "effective_date").render_derived()
+
+        stmt = delete(BalanceLedgerSnapshot).where(
+            BalanceLedgerSnapshot.employee_id == keys.c.employee_id,
+            BalanceLedgerSnapshot.policy_id == keys.c.policy_id,
+            BalanceLedgerSnapshot.as_of_date >= keys.c.effective_date,
+        ).execution_options(synchronize_session=False)
+
+        self.session.execute(stmt, {
+            "employee_ids": [employee_id for employee_id, _ in earliest],
+            "policy_ids": [policy_id for _, policy_id in earliest],
+            "effective_dates": list(earliest.values()),
+        })
+
+    # =========================================================================
+    # As-of Reads
+    # =========================================================================
+
+    def balances_as_of(
+        self,
+        employee_id: int,
+        policy_ids: Sequence[int],
+        as_of_date: date,
+    ) -> Dict[int, LedgerBalance]:
+        """
+        An employee's ledger balances under several policies through a date.
+
+        Runs BALANCES_AS_OF, so the read is one round trip whatever the
+        number of policies.
+
+        Returns:
+            LedgerBalance per policy id, zero for policies without entries
+        """
+        balances = {
+            policy_id: LedgerBalance(employee_id, policy_id, as_of_date)
+            for policy_id in policy_ids
+        }
+        if not balances:
+            return balances
+
+        rows = self.session.execute(BALANCES_AS_OF, {
+            "employee_id": employee_id,
+            "policy_ids": list(balances),
+            "as_of_date": as_of_date,
+        }).all()
+
+        for row in rows:
+            balance = balances[row.policy_id]
+            balance.snapshot_date = row.as_of_date
+            balance.tail_entries = row.entries
+            for column in TOTAL_COLUMNS.values():
+                setattr(balance, column, getattr(row, column))
+
+        return balances
+
+    def year_balances_as_of(
+        self,
+        employee_id: int,
+        policy_ids: Sequence[int],
+        as_of_date: date,
+    ) -> Dict[int, LedgerBalance]:
+        """
+        An employee's ledger balances for as_of_date's year through the date.
+
+        Totals count only entries effective from January 1 of that year, as
+        a year's stored balance is reconciled against: the as-of totals
+        less those through the end of the previous year, so both reads
+        still start from a snapshot.
+
+        Returns:
+            LedgerBalance per policy id; snapshot and tail details are
+            those of the as-of read
+        """
+        balances = self.balances_as_of(employee_id, policy_ids, as_of_date)
+        if not balances:
+            return balances
+
+        prior = self.balances_as_of(employee_id, policy_ids, date(as_of_date.year - 1, 12, 31))
+        for policy_id, balance in balances.items():
+            for column in TOTAL_COLUMNS.values():
+                setattr(balance, column, getattr(balance, column) - getattr(prior[policy_id], column))
+
+        return balances
+
+    def balance_as_of(self, employee_id: int, policy_id: int, as_of_date: date) -> LedgerBalance:
+        """An employee's ledger balance under one policy through a date."""
+        return self.balances_as_of(employee_id, [policy_id], as_of_date)[policy_id]
+
+    # =========================================================================
+    # Compaction
+    # =========================================================================
+
+    def compact(
+        self,
+        snapshot_date: date,
+        first_employee_id: Optional[int] = None,
+        last_employee_id: Optional[int] = None,
+        min_tail_entries: int = 1,
+    ) -> int:
+        """
+        Write snapshots through snapshot_date in one statement.
+
+        Each (employee, policy) with at least min_tail_entries entries
+        after its latest snapshot gets a new snapshot: that snapshot's
+        totals plus the entries since. Existing snapshots for the date are
+        left alone, so re-running is a no-op.
+
+        Args:
+            snapshot_date: Date the new snapshots cover through
+            first_employee_id: Lowest employee id to compact (inclusive)
+            last_employee_id: Highest employee id to compact (inclusive)
+            min_tail_entries: Shortest tail worth snapshotting
+
+        Returns:
+            Number of snapshots written
+        """
+        snapshot = BalanceLedgerSnapshot
+        entry = BalanceLedgerEntry
+
+        latest_stmt = (
+            select(snapshot)
+            .where(snapshot.as_of_date <= snapshot_date)
+            .order_by(snapshot.employee_id, snapshot.policy_id, snapshot.as_of_date.desc())
+            .distinct(snapshot.employee_id, snapshot.policy_id)
+        )
+        tail_filters = [entry.effective_date <= snapshot_date]
+        if first_employee_id is not None:
+            latest_stmt = latest_stmt.where(snapshot.employee_id >= first_employee_id)
+            tail_filters.append(entry.employee_id >= first_employee_id)
+        if last_employee_id is not None:
+            latest_stmt = latest_stmt.where(snapshot.employee_id <= last_employee_id)
+            tail_filters.append(entry.employee_id <= last_employee_id)
+        latest = latest_stmt.cte("latest")
+
+        tail = (
+            select(
+                entry.employee_id,
+                entry.policy_id,
+                *[
+                    func.coalesce(
+                        func.sum(entry.amount).filter(entry.entry_type == entry_type), 0.0
+                    ).label(column)
+                    for entry_type, column in TOTAL_COLUMNS.items()
+                ],
+                func.count().label("entry_count"),
+            )
+            .select_from(entry)
+            .outerjoin(latest, and_(
+                latest.c.employee_id == entry.employee_id,
+                latest.c.policy_id == entry.policy_id,
+            ))
+            .where(
+                *tail_filters,
+                or_(latest.c.as_of_date.is_(None), entry.effective_date > latest.c.as_of_date),
+            )
+            .group_by(entry.employee_id, entry.policy_id)
+            .having(func.count() >= min_tail_entries)
+            .cte("tail")
+        )
+
+        source = (
+            select(
+                tail.c.employee_id,
+                tail.c.policy_id,
+                literal(snapshot_date, Date),
+                *[
+                    (tail.c[column] + func.coalesce(latest.c[column], 0.0)).label(column)
+                    for column in TOTAL_COLUMNS.values()
+                ],
+                (tail.c.entry_count + func.coalesce(latest.c.entry_count, 0)).label("entry_count"),
+            )
+            .select_from(tail)
+            .outerjoin(latest, and_(
+                latest.c.employee_id == tail.c.employee_id,
+                latest.c.policy_id == tail.c.policy_id,
+            ))
+        )
+
+        stmt = pg_insert(snapshot.__table__).from_select(
+            ["employee_id", "policy_id", "as_of_date", *TOTAL_COLUMNS.values(), "entry_count"],
+            source,
+        ).on_conflict_do_nothing()
+
+        written = self.session.execute(stmt).rowcount
+        logger.info(
+            f"Compacted balance ledger through {snapshot_date} for employees "
+            f"{first_employee_id or 'min'}..{last_employee_id or 'max'}: {written} snapshots"
+        )
+        return written
@@ -0,0 +1,353 @@
+"""Set-based reconciliation of stored balances against the balance ledger."""
+
+import logging
+from dataclasses import dataclass
+from datetime import date
+from typing import Iterator, List, Optional, Sequence
+
+from sqlalchemy import Float, Integer, Select, String, and_, bindparam, func, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.orm import Session
+
+from src.models.balance_ledger import BalanceLedgerEntry, LedgerEntryType
+from src.models.employee import Employee
+from src.models.time_off_policy import PolicyStatus, TimeOffPolicy
+from src.models.time_off_request import TimeOffBalance
+from src.services.balance_ledger_service import BalanceLedgerService, LedgerPosting
+
+logger = logging.getLogger(__name__)
+
+
+# Differences below this many days are rounding, not discrepancies
+DISCREPANCY_TOLERANCE = 0.01
+
+# Discrepancies fetched per round trip from the server-side cursor
+RECONCILIATION_PAGE_SIZE = 5000
+
+# source_type of the ledger usage entries corrections write
+CORRECTION_SOURCE_TYPE = "reconciliation"
+
+
+@dataclass(frozen=True)
+class ReconciliationScope:
+    """Which employees and policies a reconciliation covers."""
+
+    department_ids: Optional[Sequence[int]] = None
+    employee_ids: Optional[Sequence[int]] = None
+    policy_ids: Optional[Sequence[int]] = None
+
+
+@dataclass(frozen=True)
+class BalanceDiff:
+    """
+    Stored vs. ledger balance of one (employee, balance type) for a year.
+
+    Components follow TimeOffBalance: allocated is accruals plus
+    adjustments, used is positive.
+    """
+
+    employee_id: int
+    employee_name: str
+    policy_id: int
+    policy_name: str
+    balance_type: str
+    has_stored: bool
+    has_ledger: bool
+    expected_allocated: float
+    expected_used: float
+    expected_carried_over: float
+    stored_allocated: float
+    stored_used: float
+    stored_carried_over: float
+
+    @property
+    def expected_balance(self) -> float:
+        return self.expected_allocated + self.expected_carried_over - self.expected_used
+
+    @property
+    def actual_balance(self) -> float:
+        return self.stored_allocated + self.stored_carried_over - self.stored_used
+
+    @property
+    def difference(self) -> float:
+        """actual - expected, as BalanceDiscrepancy reports it."""
+        return self.actual_balance - self.expected_balance
+
+
+class BalanceReconciler:
+    """
+    Diffs every stored balance in scope against the ledger in one query.
+
+    Expected balances are the year's ledger entries (carryover, accruals,
+    usage and adjustments up to the reconciliation date) grouped by
+    employee and balance type. Stored balances are the year's
+    time_off_balance rows. A full outer join of the two catches balances
+    missing on either side. Only the pairs that differ come back, streamed
+    from a server-side cursor, so memory is bounded by the page size and
+    not by the number of pairs.
+    """
+
+    def __init__(self, session: Session):
+        """
+        Args:
+            session: Database session
+        """
+        self.session = session
+
+    def count_employees(self, scope: ReconciliationScope) -> int:
+        """Active employees in scope."""
+        employees = self._employees(scope).subquery()
+        return self.session.execute(select(func.count()).select_from(employees)).scalar_one()
+
+    def discrepancies(
+        self,
+        as_of_date: date,
+        scope: ReconciliationScope = ReconciliationScope(),
+        tolerance: float = DISCREPANCY_TOLERANCE,
+        page_size: int = RECONCILIATION_PAGE_SIZE,
+    ) -> Iterator[List[BalanceDiff]]:
+        """
+        Stream the pairs whose stored and ledger balances differ.
+
+        Yields:
+            Pages of up to page_size BalanceDiff, ordered by employee and
+            policy
+        """
+        stmt = self.diff_query(as_of_date, scope, tolerance).execution_options(yield_per=page_size)
+        for page in self.session.execute(stmt).partitions():
+            yield [
+                BalanceDiff(
+                    employee_id=row.employee_id,
+                    employee_name=f"{row.first_name} {row.last_name}",
+                    policy_id=row.policy_id,
+                    policy_name=row.policy_name,
+                    balance_type=row.balance_type,
+                    has_stored=row.has_stored,
+                    has_ledger=row.has_ledger,
+                    expected_allocated=row.expected_allocated,
+                    expected_used=row.expected_used,
+                    expected_carried_over=row.expected_carried_over,
+                    stored_allocated=row.stored_allocated,
+                    stored_used=row.stored_used,
+                    stored_carried_over=row.stored_carried_over,
+                )
+                for row in page
+            ]
+
+    def diff_query(
+        self,
+        as_of_date: date,
+        scope: ReconciliationScope = ReconciliationScope(),
+        tolerance: float = DISCREPANCY_TOLERANCE,
+    ) -> Select:
+        """The joined stored-vs-ledger diff, one row per differing pair."""
+        year_start = date(as_of_date.year, 1, 1)
+        entry = BalanceLedgerEntry
+
+        employees = self._employees(scope).cte("employees")
+
+        # One reporting policy per balance type: the lowest active id
+        policies_stmt = (
+            select(
+                TimeOffPolicy.id.label("policy_id"),
+                TimeOffPolicy.name.label("policy_name"),
+                TimeOffPolicy.policy_type,
+            )
+            .where(TimeOffPolicy.status == PolicyStatus.ACTIVE.value)
+            .order_by(TimeOffPolicy.policy_type, TimeOffPolicy.id)
+            .distinct(TimeOffPolicy.policy_type)
+        )
+        if scope.policy_ids:
+            policies_stmt = policies_stmt.where(TimeOffPolicy.id.in_(scope.policy_ids))
+        policies = policies_stmt.cte("policies")
+
+        # Sum per (employee, policy) first: a hash aggregate over the
+        # year's entries, before the few resulting rows meet the policies
+        per_policy_stmt = (
+            select(
+                entry.employee_id,
+                entry.policy_id,
+                *[
+                    func.sum(entry.amount)
+                    .filter(entry.entry_type == entry_type.value)
+                    .label(entry_type.value)
+                    for entry_type in LedgerEntryType
+                ],
+            )
+            .where(entry.effective_date.between(year_start, as_of_date))
+            .group_by(entry.employee_id, entry.policy_id)
+        )
+        stored_stmt = select(
+            TimeOffBalance.employee_id,
+            TimeOffBalance.balance_type,
+            TimeOffBalance.total_allocated.label("allocated"),
+            TimeOffBalance.used,
+            TimeOffBalance.carried_over,
+        ).where(TimeOffBalance.year == as_of_date.year)
+        if scope.department_ids or scope.employee_ids:
+            # Scoped runs aggregate only their employees' rows
+            per_policy_stmt = per_policy_stmt.where(entry.employee_id.in_(select(employees.c.id)))
+            stored_stmt = stored_stmt.where(TimeOffBalance.employee_id.in_(select(employees.c.id)))
+        per_policy = per_policy_stmt.subquery("per_policy")
+
+        def ledger_sum(entry_type: LedgerEntryType):
+            return func.coalesce(func.sum(per_policy.c[entry_type.value]), 0.0)
+
+        expected = (
+            select(
+                per_policy.c.employee_id,
+                TimeOffPolicy.policy_type.label("balance_type"),
+                (ledger_sum(LedgerEntryType.ACCRUAL) + ledger_sum(LedgerEntryType.ADJUSTMENT))
+                .label("allocated"),
+                (-ledger_sum(LedgerEntryType.USAGE)).label("used"),
+                ledger_sum(LedgerEntryType.CARRYOVER).label("carried_over"),
+            )
+            .join(TimeOffPolicy, TimeOffPolicy.id == per_policy.c.policy_id)
+            .group_by(per_policy.c.employee_id, TimeOffPolicy.policy_type)
+            .cte("expected")
+        )
+        stored = stored_stmt.cte("stored")
+
+        pairs = (
+            select(
+                func.coalesce(stored.c.employee_id, expected.c.employee_id).label("employee_id"),
+                func.coalesce(stored.c.balance_type, expected.c.balance_type).label("balance_type"),
+                stored.c.employee_id.is_not(None).label("has_stored"),
+                expected.c.employee_id.is_not(None).label("has_ledger"),
+                func.coalesce(expected.c.allocated, 0.0).label("expected_allocated"),
+                func.coalesce(expected.c.used, 0.0).label("expected_used"),
+                func.coalesce(expected.c.carried_over, 0.0).label("expected_carried_over"),
+                func.coalesce(stored.c.allocated, 0.0).label("stored_allocated"),
+                func.coalesce(stored.c.used, 0.0).label("stored_used"),
+                func.coalesce(stored.c.carried_over, 0.0).label("stored_carried_over"),
+            )
+            .select_from(stored)
+            .join(
+                expected,
+                and_(
+                    expected.c.employee_id == stored.c.employee_id,
+                    expected.c.balance_type == stored.c.balance_type,
+                ),
+                full=True,
+            )
+            .subquery("pairs")
+        )
+
+        difference = (
+            (pairs.c.stored_allocated + pairs.c.stored_carried_over - pairs.c.stored_used)
+            - (pairs.c.expected_allocated + pairs.c.expected_carried_over - pairs.c.expected_used)
+        )
+        return (
+            select(
+                pairs,
+                employees.c.first_name,
+                employees.c.last_name,
+                policies.c.policy_id,
+                policies.c.policy_name,
+            )
+            .join(employees, employees.c.id == pairs.c.employee_id)
+            .join(policies, policies.c.policy_type == pairs.c.balance_type)
+            .where(func.abs(difference) >= tolerance)
+            .order_by(pairs.c.employee_id, policies.c.policy_id)
+        )
+
+    def apply_corrections(
+        self,
+        diffs: Sequence[BalanceDiff],
+        effective_date: date,
+        reason: str,
+    ) -> int:
+        """
+        Correct each pair toward the side that is authoritative for it.
+
+        The ledger is authoritative for allocations and carryover: every
+        accrual and adjustment is written there, so stored total_allocated
+        and carried_over are reset to the ledger's values (and available
+        recomputed) with one upsert, which also creates missing balance
+        rows. Usage is only recorded on the stored balance, so a used
+        amount the ledger is missing is appended to it as a usage entry
+        instead, with the reason as its description.
+
+        Args:
+            diffs: Pairs to correct, all for effective_date's year
+            effective_date: Date of the ledger entries written
+            reason: Description recorded on the ledger entries
+
+        Returns:
+            Number of pairs corrected
+        """
+        if not diffs:
+            return 0
+
+        self._reset_stored_allocations(diffs, effective_date.year)
+        BalanceLedgerService(self.session).append([
+            LedgerPosting(
+                employee_id=diff.employee_id,
+                policy_id=diff.policy_id,
+                entry_type=LedgerEntryType.USAGE,
+                amount=-(diff.stored_used - diff.expected_used),
+                effective_date=effective_date,
+                source_type=CORRECTION_SOURCE_TYPE,
+                description=reason,
+            )
+            for diff in diffs
+            if diff.has_stored and abs(diff.stored_used - diff.expected_used) >= DISCREPANCY_TOLERANCE
+        ])
+        return len(diffs)
+
+    def _reset_stored_allocations(self, diffs: Sequence[BalanceDiff], year: int) -> None:
+        """Upsert stored allocations and carryover to the ledger's values in one statement."""
+        source = select(
+            func.unnest(bindparam("employee_ids", type_=ARRAY(Integer))).label("employee_id"),
+            func.unnest(bindparam("balance_types", type_=ARRAY(String))).label("balance_type"),
+            func.unnest(bindparam("allocated", type_=ARRAY(Float))).label("allocated"),
+            func.unnest(bindparam("used", type_=ARRAY(Float))).label("used"),
+            func.unnest(bindparam("carried_over", type_=ARRAY(Float))).label("carried_over"),
+        ).subquery()
+
+        stmt = insert(TimeOffBalance.__table__).from_select(
+            [
+                "employee_id", "balance_type", "year", "total_allocated", "used",
+                "pending", "available", "carried_over",
+            ],
+            select(
+                source.c.employee_id,
+                source.c.balance_type,
+                literal(year, Integer),
+                source.c.allocated,
+                source.c.used,
+                literal(0.0, Float),
+                source.c.allocated + source.c.carried_over - source.c.used,
+                source.c.carried_over,
+            ),
+        )
+        balance = TimeOffBalance.__table__.c
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["employee_id", "balance_type", "year"],
+            set_={
+                "total_allocated": stmt.excluded.total_allocated,
+                "carried_over": stmt.excluded.carried_over,
+                "available": (
+                    stmt.excluded.total_allocated + stmt.excluded.carried_over
+                    - balance.used - balance.pending
+                ),
+                "last_updated": func.now(),
+            },
+        )
+        self.session.execute(stmt, {
+            "employee_ids": [diff.employee_id for diff in diffs],
+            "balance_types": [diff.balance_type for diff in diffs],
+            "allocated": [diff.expected_allocated for diff in diffs],
+            "used": [diff.expected_used for diff in diffs],
+            "carried_over": [diff.expected_carried_over for diff in diffs],
+        })
+
+    def _employees(self, scope: ReconciliationScope) -> Select:
+        stmt = select(Employee.id, Employee.first_name, Employee.last_name).where(
+            Employee.is_active == True
+        )
+        if scope.department_ids:
+            stmt = stmt.where(Employee.department_id.in_(scope.department_ids))
+        if scope.employee_ids:
+            stmt = stmt.where(Employee.id.in_(scope.employee_ids))
+        return stmt
@@ -0,0 +1,284 @@
+"""Per-policy balances for many employees in a constant number of queries."""
+
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Session
+
+from src.models.employee import Department, Employee
+from src.models.time_off_policy import PolicyStatus, TimeOffPolicy
+from src.models.time_off_request import TimeOffBalance, TimeOffRequest, TimeOffRequestStatus
+
+logger = logging.getLogger(__name__)
+
+
+# Days ahead that count as upcoming approved time off
+UPCOMING_TIME_OFF_DAYS = 30
+
+
+@dataclass(frozen=True)
+class AccrualEvent:
+    """A scheduled accrual under a policy."""
+
+    accrual_date: date
+    amount: float
+    description: str
+
+
+def scheduled_accruals(policy: TimeOffPolicy, from_date: date, to_date: date) -> List[AccrualEvent]:
+    """
+    Accruals a policy schedules between two dates.
+
+    The schedule depends only on the policy, so batch callers compute it
+    once per policy and share it across employees.
+    """
+    accruals = []
+
+    if policy.accrual_method == "annual_lump_sum":
+        # Annual lump sum typically accrues on anniversary or Jan 1
+        next_year = date(from_date.year + 1, 1, 1)
+        if from_date <= next_year <= to_date:
+            accruals.append(AccrualEvent(
+                next_year, policy.base_accrual_rate, f"Annual {policy.name} allocation",
+            ))
+
+    elif policy.accrual_method == "monthly_accrual":
+        monthly_rate = policy.base_accrual_rate / 12
+        current = from_date.replace(day=1) + timedelta(days=32)
+        current = current.replace(day=1)  # First of next month
+
+        while current <= to_date:
+            accruals.append(AccrualEvent(current, monthly_rate, f"Monthly {policy.name} accrual"))
+            current = (current + timedelta(days=32)).replace(day=1)
+
+    elif policy.accrual_method == "pay_period_accrual":
+        # Assuming bi-weekly pay periods
+        biweekly_rate = policy.base_accrual_rate / 26
+        current = from_date
+        while current <= to_date:
+            # Find next Friday (typical pay day)
+            days_until_friday = (4 - current.weekday()) % 14
+            if days_until_friday == 0:
+                days_until_friday = 14
+            next_pay = current + timedelta(days=days_until_friday)
+
+            if next_pay <= to_date:
+                accruals.append(AccrualEvent(
+                    next_pay, biweekly_rate, f"Pay period {policy.name} accrual",
+                ))
+            current = next_pay + timedelta(days=1)
+
+    return accruals
+
+
+@dataclass
+class PolicyBalanceFigures:
+    """One employee's balance under one policy."""
+
+    policy: TimeOffPolicy
+    total_allocated: float
+    used: float
+    pending: float
+    carried_over: float
+    has_balance_record: bool
+    pending_requests: List[TimeOffRequest] = field(default_factory=list)
+    scheduled_accruals: List[AccrualEvent] = field(default_factory=list)
+
+    @property
+    def available(self) -> float:
+        return self.total_allocated + self.carried_over - self.used - self.pending
+
+    @property
+    def next_accrual(self) -> Optional[AccrualEvent]:
+        return self.scheduled_accruals[0] if self.scheduled_accruals else None
+
+
+@dataclass
+class EmployeeBalanceFigures:
+    """An employee's balances under every policy in scope."""
+
+    employee_id: int
+    employee_name: str
+    job_title: Optional[str]
+    department_id: Optional[int]
+    department: Optional[str]
+    policies: List[PolicyBalanceFigures] = field(default_factory=list)
+    upcoming_time_off: List[TimeOffRequest] = field(default_factory=list)
+
+    @property
+    def total_allocated(self) -> float:
+        return sum(p.total_allocated + p.carried_over for p in self.policies)
+
+    @property
+    def total_available(self) -> float:
+        return sum(p.available for p in self.policies)
+
+    @property
+    def total_pending(self) -> float:
+        return sum(p.pending for p in self.policies)
+
+    @property
+    def total_used(self) -> float:
+        return sum(p.used for p in self.policies)
+
+    @property
+    def pending_requests(self) -> List[TimeOffRequest]:
+        return [request for p in self.policies for request in p.pending_requests]
+
+    @property
+    def next_accrual(self) -> Optional[AccrualEvent]:
+        """Earliest scheduled accrual, with every policy's amount on that date."""
+        events = [p.next_accrual for p in self.policies if p.next_accrual is not None]
+        if not events:
+            return None
+        first = min(event.accrual_date for event in events)
+        return AccrualEvent(
+            first,
+            sum(event.amount for event in events if event.accrual_date == first),
+            "Next accrual",
+        )
+
+
+class BatchBalanceService:
+    """
+    Balance figures for a list of employees in four queries.
+
+    Employees, active policies, the year's balance rows and the relevant
+    time-off requests (pending, or approved and starting soon) are each
+    loaded once for the whole list and joined in memory, so the query count
+    does not grow with the number of employees or policies.
+    """
+
+    def __init__(self, session: Session):
+        """
+        Args:
+            session: Database session
+        """
+        self.session = session
+
+    def get_balances(
+        self,
+        employee_ids: Sequence[int],
+        as_of_date: Optional[date] = None,
+        policy_ids: Optional[Sequence[int]] = None,
+        upcoming_days: int = UPCOMING_TIME_OFF_DAYS,
+    ) -> Dict[int, EmployeeBalanceFigures]:
+        """
+        Per-policy balances of the given employees.
+
+        Args:
+            employee_ids: Employees to load; unknown ids are skipped
+            as_of_date: Date the figures are for (defaults to today); sets
+                the balance year and where scheduled accruals start
+            policy_ids: Restrict to these active policies
+            upcoming_days: Window for upcoming approved time off
+
+        Returns:
+            EmployeeBalanceFigures by employee id, in employee_ids order
+        """
+        as_of_date = as_of_date or date.today()
+        employee_ids = list(dict.fromkeys(employee_ids))
+        if not employee_ids:
+            return {}
+
+        employees = self.session.execute(
+            select(
+                Employee.id,
+                Employee.first_name,
+                Employee.last_name,
+                Employee.job_title,
+                Employee.department_id,
+                Department.name.label("department_name"),
+            )
+            .outerjoin(Department, Department.id == Employee.department_id)
+            .where(Employee.id.in_(employee_ids))
+        ).all()
+
+        policy_stmt = (
+            select(TimeOffPolicy)
+            .where(TimeOffPolicy.status == PolicyStatus.ACTIVE.value)
+            .order_by(TimeOffPolicy.id)
+        )
+        if policy_ids:
+            policy_stmt = policy_stmt.where(TimeOffPolicy.id.in_(policy_ids))
+        policies = self.session.execute(policy_stmt).scalars().all()
+
+        balances = {
+            (row.employee_id, row.balance_type): row
+            for row in self.session.execute(
+                select(
+                    TimeOffBalance.employee_id,
+                    TimeOffBalance.balance_type,
+                    func.sum(TimeOffBalance.total_allocated).label("total_allocated"),
+                    func.sum(TimeOffBalance.used).label("used"),
+                    func.sum(TimeOffBalance.pending).label("pending"),
+                    func.sum(TimeOffBalance.carried_over).label("carried_over"),
+                )
+                .where(
+                    TimeOffBalance.employee_id.in_(employee_ids),
+                    TimeOffBalance.year == as_of_date.year,
+                )
+                .group_by(TimeOffBalance.employee_id, TimeOffBalance.balance_type)
+            ).all()
+        }
+
+        pending_requests = defaultdict(list)
+        upcoming = defaultdict(list)
+        for request in self.session.execute(
+            select(TimeOffRequest)
+            .where(
+                TimeOffRequest.employee_id.in_(employee_ids),
+                or_(
+                    TimeOffRequest.status == TimeOffRequestStatus.PENDING_APPROVAL.value,
+                    and_(
+                        TimeOffRequest.status == TimeOffRequestStatus.APPROVED.value,
+                        TimeOffRequest.end_date >= as_of_date,
+                        TimeOffRequest.start_date <= as_of_date + timedelta(days=upcoming_days),
+                    ),
+                ),
+            )
+            .order_by(TimeOffRequest.start_date, TimeOffRequest.id)
+        ).scalars():
+            if request.status == TimeOffRequestStatus.PENDING_APPROVAL.value:
+                pending_requests[(request.employee_id, request.request_type)].append(request)
+            else:
+                upcoming[request.employee_id].append(request)
+
+        end_of_year = date(as_of_date.year, 12, 31)
+        schedules = {policy.id: scheduled_accruals(policy, as_of_date, end_of_year) for policy in policies}
+
+        by_id = {row.id: row for row in employees}
+        results: Dict[int, EmployeeBalanceFigures] = {}
+        for employee_id in employee_ids:
+            row = by_id.get(employee_id)
+            if row is None:
+                continue
+
+            figures = EmployeeBalanceFigures(
+                employee_id=row.id,
+                employee_name=f"{row.first_name} {row.last_name}",
+                job_title=row.job_title,
+                department_id=row.department_id,
+                department=row.department_name,
+                upcoming_time_off=upcoming[row.id],
+            )
+            for policy in policies:
+                balance = balances.get((row.id, policy.policy_type))
+                figures.policies.append(PolicyBalanceFigures(
+                    policy=policy,
+                    # Without a balance row the policy's base allocation applies
+                    total_allocated=balance.total_allocated if balance else policy.base_accrual_rate,
+                    used=balance.used if balance else 0.0,
+                    pending=balance.pending if balance else 0.0,
+                    carried_over=balance.carried_over if balance else 0.0,
+                    has_balance_record=balance is not None,
+                    pending_requests=pending_requests[(row.id, policy.policy_type)],
+                    scheduled_accruals=schedules[policy.id],
+                ))
+            results[employee_id] = figures
+
+        return results
@@ -0,0 +1,356 @@
+"""Service for business-day and working-hour calculations over holiday calendars."""
+
+from array import array
+from datetime import date, timedelta
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.infrastructure.redis.local_cache import LocalCache
+from src.models.data_version import CALENDAR, current_version
+from src.models.employee import Employee, Location, WorkSchedule
+from src.models.holiday_calendar import Holiday, HolidayCalendar
+
+
+WEEKDAY_NAMES = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+# Monday to Friday, 8 hours a day
+STANDARD_WEEK_HOURS: Tuple[float, ...] = (8.0, 8.0, 8.0, 8.0, 8.0, 0.0, 0.0)
+
+# Years built around the requested range, so nearby lookups reuse the calendar
+YEARS_BEFORE = 1
+YEARS_AFTER = 2
+
+# Built calendars are kept per process, keyed by the calendar data version
+# so writes from any process retire them; invalidate_business_calendars()
+# also drops them from the writing process at once
+CALENDAR_TTL_SECONDS = 3600
+_calendars = LocalCache(max_entries=1000)
+
+# Day flags
+WORKING = 1
+HOLIDAY = 2
+
+
+class BusinessCalendar:
+    """
+    Working days and hours for one location and work schedule, precomputed
+    over whole years.
+
+    Each day holds a flags byte (working day, holiday), and two prefix-sum
+    arrays hold the running count of working days and working hours, so
+    counting over any range inside the calendar is two array lookups.
+    """
+
+    def __init__(
+        self,
+        start_year: int,
+        end_year: int,
+        week_hours: Sequence[float] = STANDARD_WEEK_HOURS,
+        holidays: Iterable[date] = (),
+    ):
+        """
+        Args:
+            start_year: First year covered
+            end_year: Last year covered (inclusive)
+            week_hours: Scheduled hours for Monday to Sunday; days with
+                zero hours are non-working days
+            holidays: Dates that are not worked regardless of schedule
+        """
+        if len(week_hours) != 7:
+            raise ValueError("week_hours must have one entry per weekday")
+
+        self.start = date(start_year, 1, 1)
+        self.end = date(end_year, 12, 31)
+        self.week_hours = tuple(float(hours) for hours in week_hours)
+
+        num_days = (self.end - self.start).days + 1
+        first_weekday = self.start.weekday()
+        flags = bytearray(
+            WORKING if self.week_hours[(first_weekday + offset) % 7] > 0 else 0
+            for offset in range(num_days)
+        )
+        for holiday in holidays:
+            offset = (holiday - self.start).days
+            if 0 <= offset < num_days:
+                flags[offset] = HOLIDAY
+
+        day_counts = array("l", bytes(array("l").itemsize * (num_days + 1)))
+        hour_sums = array("d", bytes(array("d").itemsize * (num_days + 1)))
+        days = 0
+        hours = 0.0
+        for offset, flag in enumerate(flags):
+            if flag & WORKING:
+                days += 1
+                hours += self.week_hours[(first_weekday + offset) % 7]
+            day_counts[offset + 1] = days
+            hour_sums[offset + 1] = hours
+
+        self._flags = flags
+        self._day_counts = day_counts
+        self._hour_sums = hour_sums
+
+    def __repr__(self) -> str:
+        return f"BusinessCalendar({self.start.year}-{self.end.year})"
+
+    def covers(self, start: date, end: date) -> bool:
+        """Check whether a date range lies inside the calendar."""
+        return self.start <= start and end <= self.end
+
+    def _offsets(self, start: date, end: date) -> Tuple[int, int]:
+        """Prefix-sum bounds for an inclusive date range."""
+        if not self.covers(start, end):
+            raise ValueError(
+                f"Range {start} to {end} is outside calendar {self.start} to {self.end}"
+            )
+        return (start - self.start).days, (end - self.start).days + 1
+
+    def _flag(self, day: date) -> int:
+        offset = (day - self.start).days
+        if not 0 <= offset < len(self._flags):
+            raise ValueError(f"{day} is outside calendar {self.start} to {self.end}")
+        return self._flags[offset]
+
+    def is_working_day(self, day: date) -> bool:
+        """Check whether a day is scheduled and not a holiday."""
+        return bool(self._flag(day) & WORKING)
+
+    def is_holiday(self, day: date) -> bool:
+        """Check whether a day is a holiday."""
+        return bool(self._flag(day) & HOLIDAY)
+
+    def scheduled_hours(self, day: date) -> float:
+        """Scheduled hours on a day (zero on holidays and days off)."""
+        return self.week_hours[day.weekday()] if self.is_working_day(day) else 0.0
+
+    def business_days(self, start: date, end: date) -> int:
+        """Count working days in an inclusive range."""
+        if start > end:
+            return 0
+        lo, hi = self._offsets(start, end)
+        return self._day_counts[hi] - self._day_counts[lo]
+
+    def working_hours(self, start: date, end: date) -> float:
+        """Sum scheduled hours over working days in an inclusive range."""
+        if start > end:
+            return 0.0
+        lo, hi = self._offsets(start, end)
+        return self._hour_sums[hi] - self._hour_sums[lo]
+
+    def holidays_between(self, start: date, end: date) -> List[date]:
+        """List holidays in an inclusive range."""
+        if start > end:
+            return []
+        lo, hi = self._offsets(start, end)
+        return [
+            self.start + timedelta(days=offset)
+            for offset in range(lo, hi)
+            if self._flags[offset] & HOLIDAY
+        ]
+
+    def working_dates(self, start: date, end: date) -> Iterator[date]:
+        """Iterate working days in an inclusive range."""
+        if start > end:
+            return
+        lo, hi = self._offsets(start, end)
+        for offset in range(lo, hi):
+            if self._flags[offset] & WORKING:
+                yield self.start + timedelta(days=offset)
+
+
+def week_hours_for_schedule(schedule: Optional[WorkSchedule]) -> Tuple[float, ...]:
+    """
+    Scheduled hours per weekday for a work schedule.
+
+    Uses the daily schedules in schedule_pattern when present; otherwise
+    spreads hours_per_week evenly over the first days_per_week weekdays.
+    """
+    if schedule is None:
+        return STANDARD_WEEK_HOURS
+
+    days_per_week = min(max(schedule.days_per_week or 5, 1), 7)
+    daily_hours = float(schedule.hours_per_week or 40) / days_per_week
+
+    daily_schedules = (schedule.schedule_pattern or {}).get("daily_schedules") or []
+    if daily_schedules:
+        hours = [0.0] * 7
+        for day in daily_schedules:
+            name = str(day.get("day", "")).lower()
+            if name in WEEKDAY_NAMES and day.get("is_working_day", True):
+                day_hours = day.get("hours")
+                hours[WEEKDAY_NAMES.index(name)] = float(
+                    daily_hours if day_hours is None else day_hours
+                )
+        return tuple(hours)
+
+    return tuple(daily_hours if i < days_per_week else 0.0 for i in range(7))
+
+
+def week_hours_for_days(work_days: Iterable[str], hours_per_day: float) -> Tuple[float, ...]:
+    """Scheduled hours per weekday for a list of working day names."""
+    names = {name.lower() for name in work_days}
+    return tuple(hours_per_day if name in names else 0.0 for name in WEEKDAY_NAMES)
+
+
+def _get_or_build(
+    key: str,
+    start: date,
+    end: date,
+    build: Callable[[int, int], BusinessCalendar],
+) -> BusinessCalendar:
+    """
+    Get a cached calendar covering a range, or build one.
+
+    A new calendar spans the cached years and the requested ones, with a
+    margin either side so nearby lookups reuse it.
+    """
+    calendar = _calendars.get(key)
+    if calendar is not None and calendar.covers(start, end):
+        return calendar
+
+    start_year = min(start, end).year - YEARS_BEFORE
+    end_year = max(start, end).year + YEARS_AFTER
+    if calendar is not None:
+        start_year = min(start_year, calendar.start.year)
+        end_year = max(end_year, calendar.end.year)
+
+    calendar = build(start_year, end_year)
+    _calendars.set(key, calendar, CALENDAR_TTL_SECONDS)
+    return calendar
+
+
+def get_static_calendar(
+    start: date,
+    end: date,
+    week_hours: Sequence[float] = STANDARD_WEEK_HOURS,
+    holidays: Iterable[date] = (),
+) -> BusinessCalendar:
+    """Get a cached calendar for a fixed weekly schedule and holiday list."""
+    week_hours = tuple(float(hours) for hours in week_hours)
+    holidays = sorted(set(holidays))
+    return _get_or_build(
+        f"static:{week_hours}:{','.join(day.isoformat() for day in holidays)}",
+        start,
+        end,
+        lambda start_year, end_year: BusinessCalendar(start_year, end_year, week_hours, holidays),
+    )
+
+
+def invalidate_business_calendars(
+    location_id: Optional[int] = None,
+    work_schedule_id: Optional[int] = None,
+) -> int:
+    """
+    Drop built calendars after holidays, locations or schedules change.
+
+    With no arguments every calendar is dropped. Returns the number of
+    calendars removed.
+    """
+    location = "*" if location_id is None else location_id
+    schedule = "*" if work_schedule_id is None else work_schedule_id
+    return _calendars.delete_matching(f"loc:{location}:ws:{schedule}:*")
+
+
+class BusinessCalendarService:
+    """Service for building and caching business calendars."""
+
+    def __init__(self, session: Session):
+        """Initialize with database session."""
+        self.session = session
+
+    def data_version(self) -> Optional[int]:
+        """Current calendar data version, None before it is set up."""
+        return self.session.execute(select(current_version(CALENDAR))).scalar()
+
+    def get_calendar(
+        self,
+        location_id: Optional[int],
+        work_schedule_id: Optional[int],
+        start: date,
+        end: date,
+    ) -> BusinessCalendar:
+        """
+        Get the calendar for a location and work schedule covering a range.
+
+        Calendars are cached per process under the calendar data version,
+        read before the calendar is built, so a write to holidays,
+        locations or schedules from any process retires them. A cache hit
+        costs one read of the version and its unfolded changes.
+        """
+        return _get_or_build(
+            f"loc:{location_id}:ws:{work_schedule_id}:v{self.data_version()}",
+            start,
+            end,
+            lambda start_year, end_year: self.build_calendar(
+                location_id, work_schedule_id, start_year, end_year
+            ),
+        )
+
+    def get_employee_calendar(self, employee: Employee, start: date, end: date) -> BusinessCalendar:
+        """Get the calendar for an employee's location and work schedule."""
+        return self.get_calendar(employee.location_id, employee.work_schedule_id, start, end)
+
+    def build_calendar(
+        self,
+        location_id: Optional[int],
+        work_schedule_id: Optional[int],
+        start_year: int,
+        end_year: int,
+    ) -> BusinessCalendar:
+        """Build an uncached calendar from the database."""
+        schedule = (
+            self.session.get(WorkSchedule, work_schedule_id)
+            if work_schedule_id is not None
+            else None
+        )
+        return BusinessCalendar(
+            start_year,
+            end_year,
+            week_hours=week_hours_for_schedule(schedule),
+            holidays=self.load_holidays(location_id, start_year, end_year),
+        )
+
+    def load_holidays(self, location_id: Optional[int], start_year: int, end_year: int) -> Set[date]:
+        """
+        Load holiday dates for a location.
+
+        Holidays come from every active calendar for the country and region
+        of the location's assigned calendar. Years without a calendar of
+        their own repeat that calendar set's recurring holidays.
+        """
+        if location_id is None:
+            return set()
+
+        assigned = self.session.execute(
+            select(HolidayCalendar.country, HolidayCalendar.region)
+            .join(Location, Location.holiday_calendar_id == HolidayCalendar.id)
+            .where(Location.id == location_id)
+        ).first()
+        if assigned is None:
+            return set()
+
+        rows = self.session.execute(
+            select(HolidayCalendar.calendar_year, Holiday.date, Holiday.is_recurring)
+            .join(Holiday, Holiday.calendar_id == HolidayCalendar.id)
+            .where(
+                HolidayCalendar.country == assigned.country,
+                HolidayCalendar.region.is_not_distinct_from(assigned.region),
+                HolidayCalendar.is_active == True,
+            )
+        ).all()
+
+        holidays = {row.date for row in rows if start_year <= row.date.year <= end_year}
+        calendar_years = {row.calendar_year for row in rows}
+        recurring = {(row.date.month, row.date.day) for row in rows if row.is_recurring}
+
+        for year in range(start_year, end_year + 1):
+            if year in calendar_years:
+                continue
+            for month, day in recurring:
+                try:
+                    holidays.add(date(year, month, day))
+                except ValueError:
+                    continue  # February 29 outside a leap year
+
+        return holidays
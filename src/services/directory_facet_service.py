@@ -0,0 +1,251 @@
+"""
+Faceted counts for the employee directory.
+
+Every facet's option counts for a filtered directory come from one
+GROUPING SETS query: one scan of the employees, one grouping set per
+facet. Each facet is counted with every filter applied except its own, so
+with a department selected the department facet still shows how many
+employees match in each of the others, while every other facet is narrowed
+to the selection.
+
+Results are cached per process by filter signature and directory data
+version. The version is bumped by triggers on every employee, department
+and location write, and read in the same statement as the counts, so a
+cached result is never served after a write has committed.
+"""
+
+import json
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from sqlalchemy import and_, case, func, literal, null, select, tuple_
+from sqlalchemy.orm import Session
+
+from src.infrastructure.redis.local_cache import LocalCache
+from src.models.data_version import DIRECTORY, current_version
+from src.models.employee import Department, Employee, Location
+
+
+# Tenure buckets: option value, label, and the fewest days since hire
+TENURE_BUCKETS: Tuple[Tuple[str, str, int], ...] = (
+    ("0_6_months", "0-6 months", 0),
+    ("6_12_months", "6-12 months", 184),
+    ("1_2_years", "1-2 years", 366),
+    ("2_5_years", "2-5 years", 731),
+    ("5_plus_years", "5+ years", 1826),
+)
+
+FACETS = ("department", "location", "employment_type", "is_manager", "tenure")
+
+# Results are keyed by data version, so the TTL only bounds memory held for
+# filter combinations nobody asks for again
+FACET_TTL_SECONDS = 600
+_facets = LocalCache(max_entries=2000)
+
+
+@dataclass(frozen=True)
+class DirectoryFacetFilters:
+    """Filters applied to the directory, each an OR over its values."""
+
+    department_ids: FrozenSet[int] = frozenset()
+    location_ids: FrozenSet[int] = frozenset()
+    employment_types: FrozenSet[str] = frozenset()
+    is_manager: Optional[bool] = None
+    tenure: FrozenSet[str] = frozenset()
+    hire_date_from: Optional[date] = None
+    hire_date_to: Optional[date] = None
+    is_active: Optional[bool] = True
+
+    def signature(self) -> str:
+        """Canonical form of the filters, the same for equal filters."""
+        return json.dumps({
+            "department": sorted(self.department_ids),
+            "location": sorted(self.location_ids),
+            "employment_type": sorted(self.employment_types),
+            "is_manager": self.is_manager,
+            "tenure": sorted(self.tenure),
+            "hire_date": [
+                self.hire_date_from and self.hire_date_from.isoformat(),
+                self.hire_date_to and self.hire_date_to.isoformat(),
+            ],
+            "is_active": self.is_active,
+        }, separators=(",", ":"))
+
+
+@dataclass
+class DirectoryFacets:
+    """Counts for every facet option, for one set of filters."""
+
+    # Employees matching every filter
+    total: int = 0
+
+    # Facet name -> option value -> employees matching every other filter
+    counts: Dict[str, Dict[Any, int]] = field(
+        default_factory=lambda: {facet: {} for facet in FACETS}
+    )
+
+    # Active departments and locations as (id, name), by name
+    departments: List[Tuple[int, str]] = field(default_factory=list)
+    locations: List[Tuple[int, str]] = field(default_factory=list)
+
+    # Directory data version the counts were taken at
+    version: Optional[int] = None
+
+    def count(self, facet: str, value: Any) -> int:
+        return self.counts[facet].get(value, 0)
+
+
+def tenure_bucket(hire_date, as_of: date):
+    """SQL expression for the tenure option an employee falls in on a day."""
+    return case(
+        (hire_date.is_(None), null()),
+        *(
+            (hire_date >= as_of - timedelta(days=next_min_days - 1), value)
+            for (value, _, _), (_, _, next_min_days) in zip(TENURE_BUCKETS, TENURE_BUCKETS[1:])
+        ),
+        else_=TENURE_BUCKETS[-1][0],
+    )
+
+
+class DirectoryFacetService:
+    """Computes and caches faceted counts over the employee directory."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def data_version(self) -> Optional[int]:
+        """Current directory data version, None before it is set up."""
+        return self.session.execute(select(current_version(DIRECTORY))).scalar()
+
+    def get_facets(
+        self,
+        filters: DirectoryFacetFilters,
+        as_of: Optional[date] = None,
+    ) -> DirectoryFacets:
+        """
+        Facet counts for the filtered directory, cached.
+
+        A cache hit costs one read of the data version and its unfolded changes.
+
+        Args:
+            filters: Filters currently applied
+            as_of: Day tenure is measured to; defaults to today
+        """
+        as_of = as_of or date.today()
+        suffix = f"{as_of.isoformat()}:{filters.signature()}"
+
+        version = self.data_version()
+        if version is not None:
+            cached = _facets.get(f"{version}:{suffix}")
+            if cached is not None:
+                return cached
+
+        facets = self.count_facets(filters, as_of)
+        if facets.version is not None:
+            _facets.set(f"{facets.version}:{suffix}", facets, FACET_TTL_SECONDS)
+        return facets
+
+    def count_facets(self, filters: DirectoryFacetFilters, as_of: date) -> DirectoryFacets:
+        """Count every facet in one grouping query, uncached."""
+        managers = (
+            select(Employee.manager_id)
+            .where(Employee.is_active == True, Employee.manager_id.isnot(None))
+            .group_by(Employee.manager_id)
+            .subquery("managers")
+        )
+        values = {
+            "department": Employee.department_id,
+            "location": Employee.location_id,
+            "employment_type": Employee.employment_type,
+            "is_manager": managers.c.manager_id.isnot(None),
+            "tenure": tenure_bucket(Employee.hire_date, as_of),
+        }
+        selected = {
+            "department": filters.department_ids,
+            "location": filters.location_ids,
+            "employment_type": filters.employment_types,
+            "tenure": filters.tenure,
+        }
+
+        # Per-employee match of each facet filter that is applied
+        matches = {
+            facet: values[facet].in_(sorted(options))
+            for facet, options in selected.items() if options
+        }
+        if filters.is_manager is not None:
+            matches["is_manager"] = values["is_manager"] == filters.is_manager
+
+        conditions = []
+        if filters.is_active is not None:
+            conditions.append(Employee.is_active == filters.is_active)
+        if filters.hire_date_from:
+            conditions.append(Employee.hire_date >= filters.hire_date_from)
+        if filters.hire_date_to:
+            conditions.append(Employee.hire_date <= filters.hire_date_to)
+        if len(matches) > 1:
+            # Rows failing two facet filters count in no facet
+            conditions.append(sum(
+                (case((match, 0), else_=1) for match in matches.values()), literal(0)
+            ) <= 1)
+
+        rows = (
+            select(
+                *(value.label(facet) for facet, value in values.items()),
+                *(
+                    func.coalesce(match, False).label(f"matches_{facet}")
+                    for facet, match in matches.items()
+                ),
+            )
+            .select_from(Employee)
+            .outerjoin(managers, managers.c.manager_id == Employee.id)
+            .where(*conditions)
+            .subquery("faceted")
+        )
+
+        def matching(*excluded: str):
+            terms = [rows.c[f"matches_{facet}"] for facet in matches if facet not in excluded]
+            return func.count().filter(and_(*terms)) if terms else func.count()
+
+        columns = [rows.c[facet] for facet in FACETS]
+        version = current_version(DIRECTORY)
+        facets = DirectoryFacets()
+        for row in self.session.execute(
+            select(
+                func.grouping(*columns),
+                *columns,
+                matching(),
+                *(matching(facet) for facet in FACETS),
+                version,
+            )
+            .group_by(func.grouping_sets(tuple_(), *(tuple_(column) for column in columns)))
+        ):
+            grouping, keys = row[0], row[1:1 + len(FACETS)]
+            counts = row[1 + len(FACETS):-1]
+            facets.version = row[-1]
+            if grouping == (1 << len(FACETS)) - 1:
+                facets.total = counts[0]
+                continue
+            # One bit per column, the first facet highest; the grouped
+            # column's bit is the one clear
+            index = next(
+                i for i in range(len(FACETS))
+                if not grouping & (1 << (len(FACETS) - 1 - i))
+            )
+            facets.counts[FACETS[index]][keys[index]] = counts[1 + index]
+
+        facets.departments = [
+            (row.id, row.name) for row in self.session.execute(
+                select(Department.id, Department.name)
+                .where(Department.is_active == True)
+                .order_by(Department.name)
+            )
+        ]
+        facets.locations = [
+            (row.id, row.name) for row in self.session.execute(
+                select(Location.id, Location.name)
+                .where(Location.is_active == True)
+                .order_by(Location.name)
+            )
+        ]
+        return facets
@@ -3,9 +3,9 @@
 import logging
 import time
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, Iterator, List, Optional, Set
 
-from sqlalchemy import and_, or_, select
+from sqlalchemy import Select, and_, or_, select
 from sqlalchemy.orm import Session, joinedload
 
 from src.config.settings import get_settings
@@ -20,7 +20,7 @@ from src.schemas.employee_export import (
 )
 from src.utils.audit_logger import ImportExportAuditContext, ImportExportAuditLogger
 from src.utils.auth import CurrentUser, ROLE_VIEWABLE_FIELDS, UserRole
-from src.utils.csv_parser import generate_csv_content
+from src.utils.csv_parser import generate_csv_content, iter_csv_chunks
 
 
 logger = logging.getLogger(__name__)
@@ -62,6 +62,9 @@ FIELD_METADATA: Dict[str, Dict[str, Any]] = {
     "updated_at": {"display_name": "Updated At", "data_type": "datetime", "is_sensitive": False},
 }
 
+# Rows fetched per round trip from the server-side cursor of a streamed export
+EXPORT_STREAM_BATCH_SIZE = 1000
+
 # Default fields to export if none specified
 DEFAULT_EXPORT_FIELDS = [
     "employee_id",
@@ -209,6 +212,117 @@ class EmployeeExportService:
             )
             raise
     
+    def stream_employees(
+        self,
+        current_user: CurrentUser,
+        request: ExportRequest,
+        batch_size: int = EXPORT_STREAM_BATCH_SIZE,
+    ) -> tuple[Iterator[bytes], ExportResponse]:
+        """
+        Export employees to CSV as a stream of chunks.
+        
+        Selects only the exported columns and reads them through a
+        server-side cursor, ``batch_size`` rows at a time, rendering CSV as
+        the chunks are consumed; memory stays flat however many employees
+        match. The query is opened here, so errors in it surface before any
+        content is sent. The export is audited as completed (with the number
+        of records streamed) or failed when the stream ends.
+        
+        Returns:
+            Tuple of (CSV chunk iterator, export response metadata without
+            a record count)
+        """
+        start_time = time.time()
+        
+        audit_context = ImportExportAuditContext(
+            user_id=current_user.id,
+            operation_type="export",
+            ip_address=current_user.ip_address,
+            user_agent=current_user.user_agent,
+        )
+        
+        filters_dict = request.filters.model_dump() if request.filters else None
+        fields_list = request.field_selection.fields if request.field_selection else None
+        
+        self.audit_logger.log_export_started(
+            context=audit_context,
+            filters=filters_dict,
+            fields=fields_list,
+        )
+        
+        try:
+            export_fields = self._determine_export_fields(
+                current_user=current_user,
+                field_selection=request.field_selection,
+            )
+            
+            columns = [Employee.__table__.c[field] for field in export_fields] or [Employee.id]
+            stmt = self._filter_employees(
+                select(*columns),
+                current_user=current_user,
+                filters=request.filters,
+            )
+            result = self.session.execute(stmt.execution_options(yield_per=batch_size))
+        except Exception as e:
+            self.audit_logger.log_export_failed(
+                context=audit_context,
+                error_message=str(e),
+            )
+            raise
+        
+        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        filename = f"{request.filename_prefix}_{timestamp}.csv"
+        
+        def chunks() -> Iterator[bytes]:
+            total_records = 0
+            
+            def rows() -> Iterator[Any]:
+                nonlocal total_records
+                for row in result:
+                    total_records += 1
+                    yield row[:len(export_fields)]
+            
+            try:
+                yield from iter_csv_chunks(
+                    rows(),
+                    fields=export_fields,
+                    include_headers=request.include_headers,
+                    delimiter=request.delimiter,
+                )
+            except GeneratorExit:
+                self.audit_logger.log_export_failed(
+                    context=audit_context,
+                    error_message=f"Export stream closed after {total_records} records",
+                )
+                raise
+            except Exception as e:
+                self.audit_logger.log_export_failed(
+                    context=audit_context,
+                    error_message=str(e),
+                )
+                raise
+            else:
+                self.audit_logger.log_export_completed(
+                    context=audit_context,
+                    total_records=total_records,
+                    filename=filename,
+                    duration_seconds=time.time() - start_time,
+                )
+            finally:
+                result.close()
+        
+        response = ExportResponse(
+            filename=filename,
+            content_type="text/csv",
+            total_records=None,
+            exported_fields=export_fields,
+            filters_applied=filters_dict,
+            generated_at=datetime.utcnow(),
+            generated_by_user_id=current_user.id,
+        )
+        
+        return chunks(), response
+    
     def _determine_export_fields(
         self,
         current_user: CurrentUser,
@@ -258,12 +372,28 @@ class EmployeeExportService:
         """
         Query employees with filters and access controls.
         """
-        stmt = select(Employee).options(
-            joinedload(Employee.department),
-            joinedload(Employee.location),
-            joinedload(Employee.manager),
+        stmt = self._filter_employees(
+            select(Employee).options(
+                joinedload(Employee.department),
+                joinedload(Employee.location),
+                joinedload(Employee.manager),
+            ),
+            current_user=current_user,
+            filters=filters,
         )
         
+        result = self.session.execute(stmt)
+        return list(result.scalars().unique())
+    
+    def _filter_employees(
+        self,
+        stmt: Select,
+        current_user: CurrentUser,
+        filters: Optional[ExportFilters],
+    ) -> Select:
+        """
+        Apply export filters, access controls and ordering to a query.
+        """
         # Build filter conditions
         conditions = []
         
@@ -316,8 +446,7 @@ class EmployeeExportService:
         # Order by name for consistent exports
         stmt = stmt.order_by(Employee.last_name, Employee.first_name)
         
-        result = self.session.execute(stmt)
-        return list(result.scalars().unique())
+        return stmt
     
     def _employee_to_dict(
         self,
@@ -1,15 +1,19 @@
 """Service for employee CSV import operations."""
 
+import io
 import secrets
 import uuid
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
-from sqlalchemy import select
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import Session
 
 from src.config.settings import get_settings
+from src.infrastructure.redis.caching_service import get_cache_service
 from src.models.employee import Employee
 from src.models.import_job import ImportJob, ImportJobStatus
 from src.models.import_row import ImportRow, ValidationStatus
@@ -26,11 +30,12 @@ from src.schemas.employee_import import (
 from src.utils.audit_logger import ImportExportAuditContext, ImportExportAuditLogger
 from src.utils.auth import CurrentUser, UserRole
 from src.utils.csv_parser import (
+    EMPLOYEE_FIELDS,
     REQUIRED_FIELDS,
-    ParseResult,
-    compute_file_checksum,
-    parse_csv_content,
-    suggest_field_mapping,
+    CsvSource,
+    CsvStream,
+    ParsedRow,
+    to_json_compatible,
 )
 from src.utils.errors import (
     NotFoundError,
@@ -39,6 +44,40 @@ from src.utils.errors import (
 )
 
 
+# Rows validated and written per database round trip
+IMPORT_BATCH_SIZE = 1000
+
+# Maximum uploaded file size
+MAX_IMPORT_FILE_SIZE = 100 * 1024 * 1024  # 100MB
+
+# Row-level errors kept for API responses; every error is still counted
+MAX_REPORTED_ERRORS = 1000
+
+# Employee columns populated from import files
+IMPORTABLE_EMPLOYEE_FIELDS = tuple(EMPLOYEE_FIELDS)
+
+
+def _source_size(source: CsvSource) -> Optional[int]:
+    """Size of a CSV source in bytes, or None if it cannot be determined cheaply."""
+    if isinstance(source, bytes):
+        return len(source)
+    try:
+        position = source.tell()
+        size = source.seek(0, io.SEEK_END)
+        source.seek(position)
+        return size - position
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+@dataclass
+class BatchWriteResult:
+    """Outcome of writing one import batch."""
+    
+    written: List[ParsedRow] = field(default_factory=list)
+    failed: List[Tuple[ParsedRow, DBAPIError]] = field(default_factory=list)
+
+
 class EmployeeImportService:
     """
     Service for handling employee CSV import operations.
@@ -69,7 +108,7 @@ class EmployeeImportService:
     
     def create_import_job(
         self,
-        content: bytes,
+        content: CsvSource,
         filename: str,
         current_user: CurrentUser,
         organization_id: uuid.UUID,
@@ -81,32 +120,29 @@ class EmployeeImportService:
         Create a new import job from uploaded CSV content.
         
         This validates the file format and creates an import job record,
-        but does not process the actual data yet.
+        but does not process the actual data yet. The content is streamed
+        once to count rows and compute the checksum.
         """
-        # Validate file size
-        file_size = len(content)
-        max_size = 100 * 1024 * 1024  # 100MB
-        if file_size > max_size:
-            raise ValidationError(
-                message=f"File size ({file_size} bytes) exceeds maximum allowed ({max_size} bytes)"
-            )
-        
-        if file_size < 1:
-            raise ValidationError(message="File is empty")
+        # Validate file size before reading when the source can tell us
+        file_size = _source_size(content)
+        if file_size is not None:
+            self._validate_file_size(file_size)
         
-        # Compute checksum
-        file_checksum = compute_file_checksum(content)
-        
-        # Parse CSV to validate format and get row count
+        # Stream the CSV to validate format, count rows and checksum it
         try:
-            parse_result = parse_csv_content(
-                content=content,
+            stream = CsvStream(
+                content,
                 delimiter=delimiter,
                 custom_mappings=custom_mappings,
             )
+            total_rows = stream.count_rows()
         except Exception as e:
             raise ValidationError(message=f"Failed to parse CSV file: {str(e)}")
         
+        file_size = stream.bytes_read
+        self._validate_file_size(file_size)
+        file_checksum = stream.checksum
+        
         # Create import job
         import_job = ImportJob(
             import_reference_id=self._generate_reference_id(),
@@ -116,8 +152,8 @@ class EmployeeImportService:
             file_size_bytes=file_size,
             file_checksum=file_checksum,
             status=ImportJobStatus.PENDING,
-            total_rows=parse_result.total_rows,
-            field_mappings=custom_mappings or parse_result.suggested_mappings,
+            total_rows=total_rows,
+            field_mappings=custom_mappings or stream.suggested_mappings,
             mapping_config={
                 "allow_partial_import": allow_partial_import,
                 "delimiter": delimiter,
@@ -157,7 +193,7 @@ class EmployeeImportService:
     def validate_import(
         self,
         import_job_id: uuid.UUID,
-        content: bytes,
+        content: CsvSource,
         current_user: CurrentUser,
     ) -> ImportValidationResult:
         """
@@ -167,6 +203,11 @@ class EmployeeImportService:
         - Format validation (proper CSV structure)
         - Data type checking (dates, numbers, etc.)
         - Business rule validation (required fields, unique constraints)
+        
+        Rows are streamed and checked in batches of IMPORT_BATCH_SIZE, so
+        memory stays flat apart from the employee_ids seen so far (needed
+        for duplicate detection). At most MAX_REPORTED_ERRORS row errors
+        are returned; all of them are counted and stored.
         """
         # Get import job
         import_job = self._get_import_job(import_job_id)
@@ -180,48 +221,52 @@ class EmployeeImportService:
         delimiter = config.get("delimiter", ",")
         field_mappings = import_job.field_mappings
         
-        # Parse and validate
-        parse_result = parse_csv_content(
-            content=content,
+        stream = CsvStream(
+            content,
             delimiter=delimiter,
             custom_mappings=field_mappings,
         )
         
-        # Build validation result with detailed errors
         errors: List[ImportRecordError] = []
+        error_count = 0
+        total_rows = 0
+        valid_rows = 0
+        invalid_rows = 0
+        seen_employee_ids: Dict[str, int] = {}
         
-        for row in parse_result.rows:
-            if not row.is_valid:
-                record_error = ImportRecordError(
-                    row_number=row.row_number,
-                    employee_id=row.data.get("employee_id"),
-                    field_errors=row.errors,
-                    is_valid=False,
-                )
-                errors.append(record_error)
-                
-                # Store validation error in database
-                for field_error in row.errors:
-                    validation_error = ImportValidationError(
-                        import_job_id=import_job.id,
-                        error_type=ErrorType.DATA_TYPE,
-                        severity=Severity.ERROR,
-                        error_code=field_error.code,
-                        error_message=field_error.message,
-                        field_name=field_error.field,
-                        field_value=field_error.value,
-                        suggested_correction=field_error.suggestion,
-                    )
-                    self.session.add(validation_error)
+        def report(record: ImportRecordError) -> None:
+            nonlocal error_count
+            error_count += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append(record)
         
-        # Check for duplicate employee_ids within the file
-        seen_employee_ids: Dict[str, int] = {}
-        for row in parse_result.rows:
-            emp_id = row.data.get("employee_id")
-            if emp_id:
+        for batch in stream.batches(IMPORT_BATCH_SIZE):
+            total_rows += len(batch)
+            new_employee_ids: Dict[str, int] = {}
+            stored_errors: List[Dict[str, Any]] = []
+            
+            for row in batch:
+                if row.is_valid:
+                    valid_rows += 1
+                else:
+                    invalid_rows += 1
+                    report(ImportRecordError(
+                        row_number=row.row_number,
+                        employee_id=row.data.get("employee_id"),
+                        field_errors=row.errors,
+                        is_valid=False,
+                    ))
+                    stored_errors.extend(
+                        self._validation_error_values(import_job.id, field_error)
+                        for field_error in row.errors
+                    )
+                
+                # Check for duplicate employee_ids within the file
+                emp_id = row.data.get("employee_id")
+                if not emp_id:
+                    continue
                 if emp_id in seen_employee_ids:
-                    # Add duplicate error
-                    dup_error = ImportRecordError(
+                    report(ImportRecordError(
                         row_number=row.row_number,
                         employee_id=emp_id,
                         field_errors=[ImportFieldError(
@@ -232,34 +277,40 @@ class EmployeeImportService:
                             suggestion="Each employee_id must be unique",
                         )],
                         is_valid=False,
-                    )
-                    errors.append(dup_error)
+                    ))
                 else:
                     seen_employee_ids[emp_id] = row.row_number
-        
-        # Check for existing employee_ids in database
-        existing_ids = self._check_existing_employee_ids(list(seen_employee_ids.keys()))
-        for emp_id, row_num in seen_employee_ids.items():
-            if emp_id in existing_ids:
-                db_error = ImportRecordError(
-                    row_number=row_num,
-                    employee_id=emp_id,
-                    field_errors=[ImportFieldError(
-                        field="employee_id",
-                        value=emp_id,
-                        message=f"Employee with ID '{emp_id}' already exists in the database",
-                        code="duplicate",
-                        suggestion="Use a different employee_id or update the existing record",
-                    )],
-                    is_valid=False,
-                )
-                errors.append(db_error)
+                    new_employee_ids[emp_id] = row.row_number
+            
+            # Check this batch's new employee_ids against the database
+            existing_ids = self._check_existing_employee_ids(list(new_employee_ids))
+            for emp_id, row_num in new_employee_ids.items():
+                if emp_id in existing_ids:
+                    report(ImportRecordError(
+                        row_number=row_num,
+                        employee_id=emp_id,
+                        field_errors=[ImportFieldError(
+                            field="employee_id",
+                            value=emp_id,
+                            message=f"Employee with ID '{emp_id}' already exists in the database",
+                            code="duplicate",
+                            suggestion="Use a different employee_id or update the existing record",
+                        )],
+                        is_valid=False,
+                    ))
+            
+            # Store this batch's validation errors in one round trip
+            if stored_errors:
+                self.session.execute(insert(ImportValidationError), stored_errors)
+            self.session.flush()
         
         # Update import job with validation results
+        import_job.total_rows = total_rows
         import_job.validation_errors = [
             {"row": e.row_number, "errors": [fe.model_dump() for fe in e.field_errors]}
             for e in errors
         ]
+        import_job.validation_error_count = error_count
         import_job.status = ImportJobStatus.MAPPING  # Ready for processing
         
         # Log validation completion
@@ -272,33 +323,35 @@ class EmployeeImportService:
         self.audit_logger.log_import_validated(
             import_job_id=import_job.id,
             context=audit_context,
-            total_rows=parse_result.total_rows,
-            valid_rows=parse_result.valid_rows,
-            error_rows=parse_result.error_rows + len(errors),
+            total_rows=total_rows,
+            valid_rows=valid_rows,
+            error_rows=invalid_rows + error_count,
         )
         
         self.session.flush()
         
         return ImportValidationResult(
-            is_valid=len(errors) == 0,
-            total_rows=parse_result.total_rows,
-            valid_rows=parse_result.valid_rows,
-            error_rows=parse_result.error_rows + len(errors),
+            is_valid=error_count == 0,
+            total_rows=total_rows,
+            valid_rows=valid_rows,
+            error_rows=invalid_rows + error_count,
             errors=errors,
-            detected_columns=parse_result.headers,
-            suggested_mappings=parse_result.suggested_mappings,
+            detected_columns=stream.headers,
+            suggested_mappings=stream.suggested_mappings,
         )
     
     def process_import(
         self,
         import_job_id: uuid.UUID,
-        content: bytes,
+        content: CsvSource,
         current_user: CurrentUser,
     ) -> ImportStatusResponse:
         """
         Process the import by creating employee records.
         
         Supports partial imports - valid records are imported even if some fail.
+        Rows are streamed in batches of IMPORT_BATCH_SIZE, written with
+        write_employee_batch(), and job progress is updated once per batch.
         """
         import_job = self._get_import_job(import_job_id)
         
@@ -319,9 +372,8 @@ class EmployeeImportService:
         allow_partial = config.get("allow_partial_import", True)
         field_mappings = import_job.field_mappings
         
-        # Parse CSV
-        parse_result = parse_csv_content(
-            content=content,
+        stream = CsvStream(
+            content,
             delimiter=delimiter,
             custom_mappings=field_mappings,
         )
@@ -336,84 +388,68 @@ class EmployeeImportService:
         self.audit_logger.log_import_processing_started(
             import_job_id=import_job.id,
             context=audit_context,
-            total_rows=parse_result.total_rows,
+            total_rows=import_job.total_rows,
         )
         
         # Process rows
         successful_rows = 0
         error_rows = 0
         validation_errors: List[ImportRecordError] = []
+        error_summary: Dict[str, int] = {}
+        
+        def report(record: ImportRecordError) -> None:
+            for field_error in record.field_errors:
+                error_summary[field_error.code] = error_summary.get(field_error.code, 0) + 1
+            if len(validation_errors) < MAX_REPORTED_ERRORS:
+                validation_errors.append(record)
         
-        for row in parse_result.rows:
-            import_job.processed_rows += 1
+        for batch in stream.batches(IMPORT_BATCH_SIZE):
+            valid_rows: List[ParsedRow] = []
+            batch_errors = 0
             
-            if not row.is_valid:
-                error_rows += 1
-                import_job.error_rows += 1
-                validation_errors.append(ImportRecordError(
+            for row in batch:
+                if row.is_valid:
+                    valid_rows.append(row)
+                    continue
+                batch_errors += 1
+                report(ImportRecordError(
                     row_number=row.row_number,
                     employee_id=row.data.get("employee_id"),
                     field_errors=row.errors,
                     is_valid=False,
                 ))
-                continue
             
-            # Try to create employee
-            try:
-                employee = self._create_employee_from_row(row.data, import_job.id)
-                successful_rows += 1
-                import_job.successful_rows += 1
-                
-                # Create import row record for rollback support
-                import_row = ImportRow(
-                    import_job_id=import_job.id,
-                    row_number=row.row_number,
-                    source_data=row.data,
-                    mapped_data=row.data,
-                    validation_status=ValidationStatus.VALID,
-                    is_processed=True,
-                )
-                self.session.add(import_row)
-                
-            except IntegrityError as e:
-                error_rows += 1
-                import_job.error_rows += 1
-                self.session.rollback()
-                
-                validation_errors.append(ImportRecordError(
+            write_result = self.write_employee_batch(import_job.id, valid_rows)
+            
+            for row, error in write_result.failed:
+                batch_errors += 1
+                report(ImportRecordError(
                     row_number=row.row_number,
                     employee_id=row.data.get("employee_id"),
                     field_errors=[ImportFieldError(
                         field="employee_id",
                         value=row.data.get("employee_id"),
-                        message=f"Database constraint violation: {str(e.orig)}",
+                        message=f"Database constraint violation: {str(error.orig)}",
                         code="database_error",
                     )],
                     is_valid=False,
                 ))
-                
-                if not allow_partial:
-                    import_job.status = ImportJobStatus.FAILED
-                    self.session.flush()
-                    raise ValidationError(
-                        message="Import failed due to database error. Partial import not allowed."
-                    )
             
-            except Exception as e:
-                error_rows += 1
-                import_job.error_rows += 1
-                
-                validation_errors.append(ImportRecordError(
-                    row_number=row.row_number,
-                    employee_id=row.data.get("employee_id"),
-                    field_errors=[ImportFieldError(
-                        field="unknown",
-                        value=None,
-                        message=f"Unexpected error: {str(e)}",
-                        code="unknown_error",
-                    )],
-                    is_valid=False,
-                ))
+            # Progress is updated once per batch
+            batch_successful = len(write_result.written)
+            successful_rows += batch_successful
+            error_rows += batch_errors
+            import_job.processed_rows += len(batch)
+            import_job.successful_rows += batch_successful
+            import_job.error_rows += batch_errors
+            self.session.flush()
+            
+            if write_result.failed and not allow_partial:
+                import_job.status = ImportJobStatus.FAILED
+                self.session.flush()
+                raise ValidationError(
+                    message="Import failed due to database error. Partial import not allowed."
+                )
         
         # Update final status
         import_job.completed_at = datetime.utcnow()
@@ -438,12 +474,8 @@ class EmployeeImportService:
         
         self.session.flush()
         
-        # Build error summary
-        error_summary: Dict[str, int] = {}
-        for record in validation_errors:
-            for field_error in record.field_errors:
-                error_code = field_error.code
-                error_summary[error_code] = error_summary.get(error_code, 0) + 1
+        if successful_rows > 0:
+            get_cache_service().invalidate_visibility_sets_on_commit(self.session)
         
         return ImportStatusResponse(
             import_id=import_job.id,
@@ -457,6 +489,8 @@ class EmployeeImportService:
                 completion_percentage=100.0,
             ),
             validation_errors=validation_errors,
+            validation_error_count=error_rows,
+            validation_errors_truncated=error_rows > len(validation_errors),
             error_summary=error_summary if error_summary else None,
             started_at=import_job.started_at,
             completed_at=import_job.completed_at,
@@ -490,7 +524,10 @@ class EmployeeImportService:
                     is_valid=False,
                 ))
         
-        # Build error summary
+        # Only the first MAX_REPORTED_ERRORS errors are stored on the job
+        error_count = max(import_job.validation_error_count or 0, len(validation_errors))
+        
+        # Build error summary (over the reported errors only)
         error_summary: Dict[str, int] = {}
         for record in validation_errors:
             for field_error in record.field_errors:
@@ -521,6 +558,8 @@ class EmployeeImportService:
                 estimated_completion_time=estimated_completion,
             ),
             validation_errors=validation_errors,
+            validation_error_count=error_count,
+            validation_errors_truncated=error_count > len(validation_errors),
             error_summary=error_summary if error_summary else None,
             started_at=import_job.started_at,
             completed_at=import_job.completed_at,
@@ -535,6 +574,60 @@ class EmployeeImportService:
             raise create_not_found_error("Import Job", str(import_job_id))
         return import_job
     
+    def _validate_file_size(self, file_size: int) -> None:
+        """Reject empty or oversized uploads."""
+        if file_size > MAX_IMPORT_FILE_SIZE:
+            raise ValidationError(
+                message=(
+                    f"File size ({file_size} bytes) exceeds maximum allowed "
+                    f"({MAX_IMPORT_FILE_SIZE} bytes)"
+                )
+            )
+        
+        if file_size < 1:
+            raise ValidationError(message="File is empty")
+    
+    def _validation_error_values(
+        self,
+        import_job_id: uuid.UUID,
+        field_error: ImportFieldError,
+    ) -> Dict[str, Any]:
+        """Column values for an ImportValidationError row."""
+        return {
+            "import_job_id": import_job_id,
+            "error_type": ErrorType.DATA_TYPE,
+            "severity": Severity.ERROR,
+            "error_code": field_error.code,
+            "error_message": field_error.message,
+            "field_name": field_error.field,
+            "field_value": field_error.value,
+            "suggested_correction": field_error.suggestion,
+        }
+    
+    def _import_row_values(self, import_job_id: uuid.UUID, row: ParsedRow) -> Dict[str, Any]:
+        """Column values for the ImportRow of a successfully imported row."""
+        data = to_json_compatible(row.data)
+        return {
+            "import_job_id": import_job_id,
+            "row_number": row.row_number,
+            "source_data": data,
+            "mapped_data": data,
+            "validation_status": ValidationStatus.VALID,
+            "is_processed": True,
+        }
+    
+    def _import_row_upsert(self):
+        """INSERT for ImportRows that marks rows stored during validation processed."""
+        stmt = pg_insert(ImportRow)
+        return stmt.on_conflict_do_update(
+            index_elements=["import_job_id", "row_number"],
+            set_={
+                "mapped_data": stmt.excluded.mapped_data,
+                "validation_status": stmt.excluded.validation_status,
+                "is_processed": True,
+            },
+        )
+    
     def _check_existing_employee_ids(self, employee_ids: List[str]) -> set:
         """Check which employee_ids already exist in the database."""
         if not employee_ids:
@@ -546,45 +639,60 @@ class EmployeeImportService:
         result = self.session.execute(stmt)
         return {row[0] for row in result}
     
-    def _create_employee_from_row(
+    def write_employee_batch(
         self,
-        row_data: Dict[str, Any],
         import_job_id: uuid.UUID,
-    ) -> Employee:
-        """Create an Employee record from parsed row data."""
-        employee = Employee(
-            employee_id=row_data.get("employee_id"),
-            email=row_data.get("email"),
-            first_name=row_data.get("first_name"),
-            middle_name=row_data.get("middle_name"),
-            last_name=row_data.get("last_name"),
-            preferred_name=row_data.get("preferred_name"),
-            date_of_birth=row_data.get("date_of_birth"),
-            gender=row_data.get("gender"),
-            personal_email=row_data.get("personal_email"),
-            phone_number=row_data.get("phone_number"),
-            mobile_number=row_data.get("mobile_number"),
-            address_line1=row_data.get("address_line1"),
-            address_line2=row_data.get("address_line2"),
-            city=row_data.get("city"),
-            state_province=row_data.get("state_province"),
-            postal_code=row_data.get("postal_code"),
-            country=row_data.get("country"),
-            department_id=row_data.get("department_id"),
-            manager_id=row_data.get("manager_id"),
-            location_id=row_data.get("location_id"),
-            work_schedule_id=row_data.get("work_schedule_id"),
-            job_title=row_data.get("job_title"),
-            employment_type=row_data.get("employment_type"),
-            employment_status=row_data.get("employment_status", "active"),
-            hire_date=row_data.get("hire_date"),
-            termination_date=row_data.get("termination_date"),
-            salary=row_data.get("salary"),
-            hourly_rate=row_data.get("hourly_rate"),
-        )
-        
-        self.session.add(employee)
-        self.session.flush()
+        rows: List[ParsedRow],
+    ) -> BatchWriteResult:
+        """
+        Insert employees and their ImportRows for a batch of valid rows.
+        
+        The batch is written with two multi-row INSERTs inside a SAVEPOINT.
+        ImportRows already stored by validation are upserted on
+        (import_job_id, row_number) and marked processed rather than
+        duplicated.
+        If the database rejects it, the savepoint is rolled back and the
+        batch is bisected until the offending rows are isolated, so one bad
+        row costs O(log n) extra round trips and never discards rows
+        written earlier in the transaction.
+        
+        Args:
+            import_job_id: Import job the rows belong to
+            rows: Parsed rows that passed validation
+        
+        Returns:
+            BatchWriteResult with the written rows and the rejected rows
+        """
+        result = BatchWriteResult()
+        pending = [rows] if rows else []
         
-        return employee
+        while pending:
+            chunk = pending.pop()
+            try:
+                with self.session.begin_nested():
+                    self.session.execute(
+                        insert(Employee),
+                        [self._employee_values(row.data) for row in chunk],
+                    )
+                    self.session.execute(
+                        self._import_row_upsert(),
+                        [self._import_row_values(import_job_id, row) for row in chunk],
+                    )
+                result.written.extend(chunk)
+            except DBAPIError as e:
+                if len(chunk) == 1:
+                    result.failed.append((chunk[0], e))
+                    continue
+                middle = len(chunk) // 2
+                # Second half first on the stack so rows are retried in file order
+                pending.append(chunk[middle:])
+                pending.append(chunk[:middle])
+        
+        return result
+    
+    def _employee_values(self, row_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Column values for an Employee created from parsed row data."""
+        values = {field_name: row_data.get(field_name) for field_name in IMPORTABLE_EMPLOYEE_FIELDS}
+        values["employment_status"] = row_data.get("employment_status") or "active"
+        return values
 
@@ -5,6 +5,7 @@ from typing import Any, Dict, List, Optional, Set
 from sqlalchemy import select
 from sqlalchemy.orm import Session, joinedload
 
+from src.data.employee_hierarchy_repository import EmployeeHierarchyRepository
 from src.models.employee import Department, Employee, Location
 from src.schemas.employee_org import (
     DirectReportSummary,
@@ -13,6 +14,7 @@ from src.schemas.employee_org import (
     OrgChartPeer,
     OrgChartResponse,
 )
+from src.services.org_tree_service import OrgTreeEntry, OrgTreeService
 from src.utils.auth import CurrentUser, UserRole
 from src.utils.errors import ForbiddenError, NotFoundError, create_not_found_error
 
@@ -30,6 +32,8 @@ class EmployeeOrgService:
     def __init__(self, session: Session):
         """Initialize with database session."""
         self.session = session
+        self.hierarchy = EmployeeHierarchyRepository(session)
+        self.org_tree = OrgTreeService(session)
     
     def get_direct_reports(
         self,
@@ -207,19 +211,7 @@ class EmployeeOrgService:
         if manager_id is None:
             return False
         
-        current = employee
-        depth = 0
-        
-        while current and depth < max_depth:
-            if current.manager_id == manager_id:
-                return True
-            if current.manager_id:
-                current = self.session.get(Employee, current.manager_id)
-            else:
-                break
-            depth += 1
-        
-        return False
+        return self.hierarchy.is_ancestor(manager_id, employee.id, max_depth=max_depth)
     
     def _is_manager_of(
         self,
@@ -231,19 +223,9 @@ class EmployeeOrgService:
         if employee_id is None:
             return False
         
-        current_id = employee_id
-        depth = 0
-        
-        while current_id and depth < max_depth:
-            emp = self.session.get(Employee, current_id)
-            if emp is None:
-                break
-            if emp.manager_id == potential_manager_id:
-                return True
-            current_id = emp.manager_id
-            depth += 1
-        
-        return False
+        return self.hierarchy.is_ancestor(
+            potential_manager_id, employee_id, max_depth=max_depth
+        )
     
     def _build_direct_report_summary(self, employee: Employee) -> DirectReportSummary:
         """Build a direct report summary from an employee."""
@@ -289,25 +271,27 @@ class EmployeeOrgService:
     
     def _build_manager_chain(self, employee: Employee) -> List[OrgChartNode]:
         """Build the manager chain going up from an employee."""
-        chain: List[OrgChartNode] = []
-        current = employee
-        level = -1  # Managers are above the employee
-        
-        while current.manager_id is not None:
-            manager = self._get_employee_with_relations(current.manager_id)
-            if manager is None:
-                break
-            
-            chain.append(self._build_org_chart_node(manager, level, "manager"))
-            current = manager
-            level -= 1
+        # Nearest manager first, from the hierarchy index
+        manager_ids = self.hierarchy.get_ancestor_ids(employee.id)
+        if not manager_ids:
+            return []
         
-        # Reverse so top of chain is first
-        chain.reverse()
+        stmt = (
+            select(Employee)
+            .options(
+                joinedload(Employee.department),
+                joinedload(Employee.location),
+            )
+            .where(Employee.id.in_(manager_ids))
+        )
+        managers = {m.id: m for m in self.session.execute(stmt).scalars().unique()}
         
-        # Update levels to be positive (0 = top)
-        for i, node in enumerate(chain):
-            node.level = i
+        # Top of chain first, levels positive (0 = top)
+        chain: List[OrgChartNode] = []
+        for manager_id in reversed(manager_ids):
+            manager = managers.get(manager_id)
+            if manager is not None:
+                chain.append(self._build_org_chart_node(manager, len(chain), "manager"))
         
         return chain
     
@@ -347,48 +331,32 @@ class EmployeeOrgService:
         max_depth: int,
     ) -> OrgChartNode:
         """
-        Build organizational tree recursively.
+        Build organizational tree from a single subtree query.
         
         Args:
             employee: Root employee for this subtree
-            current_depth: Current depth level
+            current_depth: Level assigned to the root node
             max_depth: Maximum depth to traverse
             
         Returns:
             OrgChartNode with children populated
         """
-        node = self._build_org_chart_node(
-            employee,
-            level=current_depth,
-            relationship="self" if current_depth == 0 else "direct_report",
-        )
-        
-        # Stop if we've reached max depth
-        if current_depth >= max_depth:
-            return node
-        
-        # Get direct reports
-        stmt = (
-            select(Employee)
-            .options(
-                joinedload(Employee.department),
-                joinedload(Employee.location),
+        subtree = self.org_tree.get_subtree(employee.id, max_depth - current_depth)
+        
+        def make_node(entry: OrgTreeEntry, children: List[OrgChartNode]) -> OrgChartNode:
+            level = current_depth + entry.depth
+            node = self._build_org_chart_node(
+                entry.employee,
+                level=level,
+                relationship="self" if level == 0 else "direct_report",
             )
-            .where(Employee.manager_id == employee.id)
-            .where(Employee.is_active == True)
-            .order_by(Employee.last_name, Employee.first_name)
-        )
-        
-        result = self.session.execute(stmt)
-        direct_reports = list(result.scalars().unique())
+            node.children = children
+            return node
         
-        # Recursively build children
-        node.children = [
-            self._build_org_tree(dr, current_depth + 1, max_depth)
-            for dr in direct_reports
-        ]
+        if subtree is None:
+            return make_node(OrgTreeEntry(employee=employee, depth=0), [])
         
-        return node
+        return subtree.build(make_node)
     
     def _count_nodes(self, node: OrgChartNode) -> int:
         """Count total nodes in a tree."""
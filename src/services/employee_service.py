@@ -16,11 +16,13 @@ from src.data.employee_repository import (
     SearchResult,
     SortParams,
 )
+from src.data.keyset_pagination import CountMode
 from src.employees.models import (
     EmployeeCreateRequest,
     EmployeeResponse,
     EmployeeUpdateRequest,
 )
+from src.infrastructure.redis.caching_service import get_cache_service
 from src.models.employee import Department, Employee, Location, WorkSchedule
 from src.utils.auth import CurrentUser, filter_employee_response
 from src.utils.errors import (
@@ -43,11 +45,15 @@ class EmployeeService:
     Handles business logic, validation, and audit logging.
     """
     
+    # Fields that change which employees a user can see
+    VISIBILITY_FIELDS = frozenset({"manager_id", "department_id", "is_active"})
+    
     def __init__(self, session: Session):
         """Initialize service with database session."""
         self.session = session
         self.audit_service = AuditService(session)
-        self.repository = EmployeeRepository(session)
+        self.cache = get_cache_service()
+        self.repository = EmployeeRepository(session, cache=self.cache)
         self.settings = get_settings()
     
     # =========================================================================
@@ -132,6 +138,8 @@ class EmployeeService:
             self.session.rollback()
             raise DatabaseError(f"Failed to create employee: {str(e)}")
         
+        self.cache.invalidate_visibility_sets_on_commit(self.session)
+        
         # Load relationships and return response
         return self._build_employee_response(employee, current_user)
     
@@ -198,12 +206,15 @@ class EmployeeService:
         status: Optional[str] = None,
         sort_by: str = "last_name",
         sort_order: str = "asc",
+        cursor: Optional[str] = None,
+        count: CountMode = CountMode.EXACT,
     ) -> Dict[str, Any]:
         """
         Get paginated employee directory with filtering and sorting.
         
         Applies role-based visibility controls to show only employees
-        the requesting user is authorized to view.
+        the requesting user is authorized to view. Pages can be walked by
+        number or, cheaply at any depth, by passing back ``next_cursor``.
         """
         # Validate and constrain pagination
         settings = self.settings.pagination
@@ -230,24 +241,33 @@ class EmployeeService:
         sort = SortParams(field=sort_by, order=sort_order)
         
         # Get employees
-        employees, total_count = self.repository.get_directory(
+        result = self.repository.get_directory(
             pagination=pagination,
             sort=sort,
             filters=filters,
             visible_employee_ids=visible_ids,
+            cursor=cursor,
+            count_mode=count,
         )
         
+        total_pages = None
+        if result.total is not None:
+            total_pages = (result.total + page_size - 1) // page_size
+        
         # Build response
         return {
             "data": [
                 self._build_employee_response(emp, current_user)
-                for emp in employees
+                for emp in result.items
             ],
             "pagination": {
-                "page": page,
+                "page": None if cursor else page,
                 "page_size": page_size,
-                "total_items": total_count,
-                "total_pages": (total_count + page_size - 1) // page_size,
+                "total_items": result.total,
+                "total_pages": total_pages,
+                "total_is_estimate": result.total_is_estimate,
+                "has_more": result.has_more,
+                "next_cursor": result.next_cursor,
             },
         }
     
@@ -467,6 +487,9 @@ class EmployeeService:
             self.session.rollback()
             raise DatabaseError(f"Failed to update employee: {str(e)}")
         
+        if self.VISIBILITY_FIELDS.intersection(update_data):
+            self.cache.invalidate_visibility_sets_on_commit(self.session)
+        
         # Reload relationships and return response
         self.session.refresh(employee)
         return self._build_employee_response(employee, current_user)
@@ -529,6 +552,8 @@ class EmployeeService:
             self.session.rollback()
             raise DatabaseError(f"Failed to terminate employee: {str(e)}")
         
+        self.cache.invalidate_visibility_sets_on_commit(self.session)
+        
         return self._build_employee_response(employee, current_user)
     
     # =========================================================================
@@ -6,7 +6,7 @@ from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
 from sqlalchemy import select, func
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, load_only, selectinload
 
 from src.models.employee import Employee
 from src.models.envelope import (
@@ -26,6 +26,7 @@ from src.schemas.envelope import (
     EnvelopeResponse,
     EnvelopeStatusEnum,
     EnvelopeStatusUpdateResponse,
+    EnvelopeSummary,
     FieldPosition,
     FieldResponse,
     FieldTypeEnum,
@@ -97,6 +98,33 @@ VALID_STATUS_TRANSITIONS = {
 }
 
 
+# Columns read for envelope list entries
+ENVELOPE_SUMMARY_COLUMNS = (
+    Envelope.id,
+    Envelope.external_id,
+    Envelope.subject,
+    Envelope.status,
+    Envelope.sender_employee_id,
+    Envelope.sender_email,
+    Envelope.sender_name,
+    Envelope.related_entity_type,
+    Envelope.related_entity_id,
+    Envelope.routing_order_enabled,
+    Envelope.expiration_date,
+    Envelope.created_at,
+    Envelope.updated_at,
+    Envelope.sent_at,
+    Envelope.completed_at,
+    Envelope.voided_at,
+)
+RECIPIENT_SUMMARY_COLUMNS = (
+    EnvelopeRecipient.name,
+    EnvelopeRecipient.recipient_type,
+    EnvelopeRecipient.routing_order,
+    EnvelopeRecipient.status,
+)
+
+
 class EnvelopeService:
     """Service for managing e-signature envelopes."""
 
@@ -412,9 +440,7 @@ class EnvelopeService:
         workflow_status = self._build_workflow_status(envelope)
         
         # Calculate completion
-        signers = [r for r in envelope.recipients if r.recipient_type == RecipientType.SIGNER.value]
-        completed_signers = [r for r in signers if r.status == RecipientStatus.SIGNED.value]
-        completion_pct = (len(completed_signers) / len(signers) * 100) if signers else 0
+        completed_count, total_signers, completion_pct = self._signing_progress(envelope)
         
         return EnvelopeResponse(
             id=envelope.id,
@@ -436,8 +462,8 @@ class EnvelopeService:
             document_ids=envelope.document_ids,
             routing_order_enabled=envelope.routing_order_enabled,
             workflow_status=workflow_status,
-            completed_count=len(completed_signers),
-            total_recipients=len(signers),
+            completed_count=completed_count,
+            total_recipients=total_signers,
             completion_percentage=completion_pct,
             created_at=envelope.created_at,
             updated_at=envelope.updated_at,
@@ -448,6 +474,51 @@ class EnvelopeService:
             void_reason=envelope.void_reason,
         )
 
+    def _build_envelope_summary(
+        self,
+        envelope: Envelope,
+        fields_total: int = 0,
+        fields_completed: int = 0,
+    ) -> EnvelopeSummary:
+        """Build envelope list entry, from the summary columns and recipients."""
+        completed_count, total_signers, completion_pct = self._signing_progress(envelope)
+        
+        return EnvelopeSummary(
+            id=envelope.id,
+            external_id=envelope.external_id,
+            subject=envelope.subject,
+            status=EnvelopeStatusEnum(envelope.status),
+            status_description=STATUS_DESCRIPTIONS.get(
+                EnvelopeStatus(envelope.status),
+                envelope.status
+            ),
+            sender_email=envelope.sender_email,
+            sender_name=envelope.sender_name,
+            sender_employee_id=envelope.sender_employee_id,
+            related_entity_type=envelope.related_entity_type,
+            related_entity_id=envelope.related_entity_id,
+            routing_order_enabled=envelope.routing_order_enabled,
+            workflow_status=self._build_workflow_status(envelope),
+            completed_count=completed_count,
+            total_recipients=total_signers,
+            completion_percentage=completion_pct,
+            fields_total=fields_total,
+            fields_completed=fields_completed,
+            created_at=envelope.created_at,
+            updated_at=envelope.updated_at,
+            sent_at=envelope.sent_at,
+            completed_at=envelope.completed_at,
+            expiration_date=envelope.expiration_date,
+            voided_at=envelope.voided_at,
+        )
+
+    def _signing_progress(self, envelope: Envelope) -> Tuple[int, int, float]:
+        """Signed signers, total signers and percentage signed."""
+        signers = [r for r in envelope.recipients if r.recipient_type == RecipientType.SIGNER.value]
+        completed_signers = [r for r in signers if r.status == RecipientStatus.SIGNED.value]
+        completion_pct = (len(completed_signers) / len(signers) * 100) if signers else 0
+        return len(completed_signers), len(signers), completion_pct
+
     def _build_workflow_status(self, envelope: Envelope) -> WorkflowStatus:
         """Build workflow status from envelope."""
         signers = [r for r in envelope.recipients if r.recipient_type == RecipientType.SIGNER.value]
@@ -696,14 +767,20 @@ class EnvelopeService:
         status: Optional[EnvelopeStatusEnum] = None,
         page: int = 1,
         page_size: int = 20,
-    ) -> Tuple[List[EnvelopeResponse], int]:
-        """List envelopes for the current user."""
-        # Build query
+    ) -> Tuple[List[EnvelopeSummary], int]:
+        """
+        List envelopes for the current user, as summaries.
+        
+        The page is selected on envelopes alone, with the total counted in
+        the same statement; recipients and field counts for the page are
+        then read in one IN query each. Joining both collections into the
+        page query would return recipients x fields rows per envelope.
+        """
         stmt = (
-            select(Envelope)
+            select(Envelope, func.count().over().label("total"))
             .options(
-                joinedload(Envelope.recipients),
-                joinedload(Envelope.fields),
+                load_only(*ENVELOPE_SUMMARY_COLUMNS),
+                selectinload(Envelope.recipients).load_only(*RECIPIENT_SUMMARY_COLUMNS),
             )
         )
         
@@ -722,22 +799,53 @@ class EnvelopeService:
         if status:
             stmt = stmt.where(Envelope.status == status.value)
         
-        # Count total
-        count_stmt = select(func.count()).select_from(stmt.subquery())
-        total = self.session.execute(count_stmt).scalar() or 0
-        
         # Apply pagination and ordering
-        stmt = (
+        rows = self.session.execute(
             stmt
-            .order_by(Envelope.created_at.desc())
+            .order_by(Envelope.created_at.desc(), Envelope.id.desc())
             .offset((page - 1) * page_size)
             .limit(page_size)
-        )
+        ).all()
+        
+        if rows:
+            total = rows[0].total
+        elif page > 1:
+            # Past the last page, no row carries the total
+            count_stmt = select(func.count()).select_from(
+                stmt.with_only_columns(Envelope.id).subquery()
+            )
+            total = self.session.execute(count_stmt).scalar() or 0
+        else:
+            total = 0
         
-        envelopes = self.session.execute(stmt).unique().scalars().all()
+        envelopes = [row.Envelope for row in rows]
+        field_counts = self._count_fields([e.id for e in envelopes])
         
         return (
-            [self._build_envelope_response(e) for e in envelopes],
+            [
+                self._build_envelope_summary(e, *field_counts.get(e.id, (0, 0)))
+                for e in envelopes
+            ],
             total,
         )
 
+    def _count_fields(self, envelope_ids: List[int]) -> Dict[int, Tuple[int, int]]:
+        """Total and completed fields per envelope."""
+        if not envelope_ids:
+            return {}
+        
+        stmt = (
+            select(
+                EnvelopeField.envelope_id,
+                func.count(),
+                func.count().filter(EnvelopeField.completed == True),
+            )
+            .where(EnvelopeField.envelope_id.in_(envelope_ids))
+            .group_by(EnvelopeField.envelope_id)
+        )
+        
+        return {
+            envelope_id: (total, completed)
+            for envelope_id, total, completed in self.session.execute(stmt)
+        }
+
@@ -20,16 +20,19 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from enum import Enum
 from functools import lru_cache
+from operator import attrgetter
 from typing import Any, Dict, List, Optional
 
 from fastapi import Depends
 from pydantic import BaseModel, Field
-from sqlalchemy import func, literal_column, text
+from sqlalchemy import cast, func, select
 from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import Session
 
+from src.data.keyset_pagination import CountMode, KeysetPage, SortKey, fetch_keyset_page
 from src.database.database import get_db
 from src.models.employee import Employee
+from src.utils.errors import ValidationError
 
 logger = logging.getLogger(__name__)
 
@@ -70,6 +73,10 @@ class SearchConfig:
     })
     fuzzy_matching: bool = True
     highlight_results: bool = True
+    # Employee searches with at most rank_all_limit matches rank every
+    # match; broader ones rank the rank_candidates matches with the lowest ids
+    rank_all_limit: int = 10000
+    rank_candidates: int = 1000
 
 
 @dataclass
@@ -89,6 +96,8 @@ class SearchQuery:
     highlight: bool = True
     min_score: Optional[float] = None
     user_id: Optional[int] = None  # For analytics
+    cursor: Optional[str] = None  # Employee search: resume after this cursor
+    count_mode: CountMode = CountMode.EXACT
 
 
 @dataclass
@@ -116,13 +125,17 @@ class SearchResponse:
     results: List[SearchResult]
     page: int
     page_size: int
-    total_results: int
-    total_pages: int
+    total_results: Optional[int]
+    total_pages: Optional[int]
     has_next: bool
     has_previous: bool
     execution_time_ms: int
     parsed_query: Optional[str] = None
     suggestions: List[str] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    total_is_estimate: bool = False
+    # More matches exist than were ranked; total_results counts the ranked ones
+    results_truncated: bool = False
 
 
 # =============================================================================
@@ -165,9 +178,15 @@ class FullTextSearchService:
             # Parse and validate query
             parsed_query = self._parse_query(query)
             
+            next_cursor = None
+            total_is_estimate = False
+            results_truncated = False
+            
             # Execute search based on type
             if query.search_type == SearchType.EMPLOYEE:
-                results, total = self._search_employees(query, parsed_query)
+                page, results_truncated = self._search_employees_page(query, parsed_query)
+                results, total = page.items, page.total
+                next_cursor, total_is_estimate = page.next_cursor, page.total_is_estimate
             elif query.search_type == SearchType.DOCUMENT:
                 results, total = self._search_documents(query, parsed_query)
             elif query.search_type == SearchType.DEPARTMENT:
@@ -178,14 +197,18 @@ class FullTextSearchService:
                 results, total = [], 0
             
             # Calculate pagination
-            total_pages = (total + query.page_size - 1) // query.page_size if total > 0 else 0
+            total_pages = None
+            if total is not None:
+                total_pages = (total + query.page_size - 1) // query.page_size if total > 0 else 0
+            has_next = next_cursor is not None if query.search_type == SearchType.EMPLOYEE \
+                else query.page < total_pages
             
             # Track search for analytics
             self._track_search(query, total, results)
             
             # Get suggestions if few results
             suggestions = []
-            if total < 3 and query.query:
+            if total is not None and total < 3 and query.query:
                 suggestions = self.get_query_suggestions(query.query, limit=3)
             
             execution_time_ms = int((time.time() - start_time) * 1000)
@@ -198,13 +221,18 @@ class FullTextSearchService:
                 page_size=query.page_size,
                 total_results=total,
                 total_pages=total_pages,
-                has_next=query.page < total_pages,
-                has_previous=query.page > 1,
+                has_next=has_next,
+                has_previous=query.page > 1 or query.cursor is not None,
                 execution_time_ms=execution_time_ms,
                 parsed_query=parsed_query,
                 suggestions=suggestions,
+                next_cursor=next_cursor,
+                total_is_estimate=total_is_estimate,
+                results_truncated=results_truncated,
             )
             
+        except ValidationError:
+            raise
         except Exception as e:
             logger.error(f"Search error: {e}", exc_info=True)
             execution_time_ms = int((time.time() - start_time) * 1000)
@@ -331,72 +359,109 @@ class FullTextSearchService:
         parsed_query: str,
     ) -> tuple[List[SearchResult], int]:
         """Search employee directory."""
+        page, _ = self._search_employees_page(query, parsed_query)
+        return page.items, page.total or 0
+    
+    def _search_employees_page(
+        self,
+        query: SearchQuery,
+        parsed_query: str,
+    ) -> tuple[KeysetPage, bool]:
+        """
+        One page of ranked employee matches.
+        
+        Matching uses the stored, weighted ``search_vector`` column through
+        its GIN index (migration 002), so no tsvector is built per row, and
+        full employee rows are loaded only for the page.
+        
+        Up to ``config.rank_all_limit`` matches, every match is ranked.
+        Past that, ranking runs only on the ``config.rank_candidates``
+        matches with the lowest ids, a set that stays the same from one
+        cursor page to the next; the total is capped at the candidates and
+        the page is flagged as truncated, since better-ranked matches may
+        lie outside them.
+        
+        Results are in keyset order on (rank, id), both descending, so a
+        cursor from the previous page resumes after its last match rather
+        than re-ranking and skipping every match in front of the page.
+        
+        Returns:
+            Tuple of (page, whether more matches exist than were ranked)
+        """
         if not parsed_query:
-            return [], 0
+            return KeysetPage(items=[], total=0), False
         
         try:
-            # Build the tsquery
             tsquery = func.to_tsquery('english', parsed_query)
             
-            # Build the search query
-            # Using plainto_tsquery as fallback for simpler queries
-            search_expression = text("""
-                (
-                    to_tsvector('english', 
-                        COALESCE(first_name, '') || ' ' || 
-                        COALESCE(last_name, '') || ' ' || 
-                        COALESCE(email, '') || ' ' ||
-                        COALESCE(job_title, '')
-                    ) @@ to_tsquery('english', :query)
-                )
-            """)
-            
-            rank_expression = text("""
-                ts_rank_cd(
-                    to_tsvector('english', 
-                        COALESCE(first_name, '') || ' ' || 
-                        COALESCE(last_name, '') || ' ' || 
-                        COALESCE(email, '') || ' ' ||
-                        COALESCE(job_title, '')
-                    ),
-                    to_tsquery('english', :query)
-                )
-            """)
-            
-            # Base query
-            base_query = self.db.query(
-                Employee,
-                rank_expression.bindparams(query=parsed_query).label('rank')
-            ).filter(
-                search_expression.bindparams(query=parsed_query)
-            )
+            conditions = [Employee.search_vector.op('@@')(tsquery)]
             
             # Apply filters
             if query.department_ids:
-                base_query = base_query.filter(
-                    Employee.department_id.in_(query.department_ids)
-                )
+                conditions.append(Employee.department_id.in_(query.department_ids))
             
             if query.location_ids:
-                base_query = base_query.filter(
-                    Employee.location_id.in_(query.location_ids)
-                )
+                conditions.append(Employee.location_id.in_(query.location_ids))
             
             if query.is_active is not None:
-                base_query = base_query.filter(Employee.is_active == query.is_active)
+                conditions.append(Employee.is_active == query.is_active)
             
-            # Get total count
-            total = base_query.count()
+            # The count stops at rank_all_limit + 1 matches, so it costs a
+            # broad query no more than ranking would have
+            matches = select(Employee.id).where(*conditions)
+            truncated = self.db.execute(
+                select(func.count()).select_from(
+                    matches.limit(self.config.rank_all_limit + 1).subquery()
+                )
+            ).scalar() > self.config.rank_all_limit
+            
+            # ts_rank_cd returns float4, which does not survive the round
+            # trip through a Python float; as float8 the cursor's rank
+            # compares equal again
+            candidates = select(
+                Employee.id,
+                cast(
+                    func.ts_rank_cd(Employee.search_vector, tsquery),
+                    postgresql.DOUBLE_PRECISION,
+                ).label('rank'),
+            ).where(*conditions)
+            if truncated:
+                candidates = candidates.order_by(Employee.id).limit(self.config.rank_candidates)
+            candidates = candidates.subquery('candidates')
+            stmt = (
+                select(Employee, candidates.c.rank)
+                .join(candidates, candidates.c.id == Employee.id)
+            )
             
-            # Apply pagination and ordering
             offset = (query.page - 1) * query.page_size
-            results = base_query.order_by(
-                text('rank DESC')
-            ).offset(offset).limit(query.page_size).all()
+            page = fetch_keyset_page(
+                self.db,
+                stmt,
+                keys=(
+                    SortKey(candidates.c.rank, attrgetter('rank')),
+                    SortKey(candidates.c.id, attrgetter('Employee.id')),
+                ),
+                scope=f"search:employee:{parsed_query}",
+                # The total counts every match, not just the ranked candidates
+                count_stmt=matches,
+                page_size=query.page_size,
+                cursor=query.cursor,
+                descending=True,
+                offset=offset,
+                count_mode=query.count_mode,
+                scalars=False,
+            )
+            
+            # The last candidate page issues no cursor; keep the total to match
+            if truncated and page.total is not None:
+                page.total = min(page.total, self.config.rank_candidates)
+            
+            # After a cursor, ranks count from the start of this page
+            first_rank = 1 if query.cursor else offset + 1
             
             # Convert to SearchResult
             search_results = []
-            for i, (employee, rank) in enumerate(results):
+            for i, (employee, rank) in enumerate(page.items):
                 # Create highlighted versions if enabled
                 highlighted_title = None
                 if query.highlight:
@@ -409,7 +474,7 @@ class FullTextSearchService:
                     id=employee.id,
                     result_type="employee",
                     score=float(rank) if rank else 0.0,
-                    rank=offset + i + 1,
+                    rank=first_rank + i,
                     title=f"{employee.first_name} {employee.last_name}",
                     subtitle=employee.job_title,
                     description=employee.email,
@@ -424,12 +489,16 @@ class FullTextSearchService:
                     }
                 ))
             
-            return search_results, total
+            page.items = search_results
+            return page, truncated
             
+        except ValidationError:
+            raise
         except Exception as e:
             logger.error(f"Employee search error: {e}", exc_info=True)
             # Fallback to simple ILIKE search
-            return self._search_employees_fallback(query)
+            results, total = self._search_employees_fallback(query)
+            return KeysetPage(items=results, total=total), False
     
     def _search_employees_fallback(
         self,
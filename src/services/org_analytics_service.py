@@ -0,0 +1,293 @@
+"""
+Reporting-line analytics for the whole organization.
+
+Span of control, total reports, depth and department density all come from
+one read of the active reporting edges (employee, manager, department,
+location) and one pass over the tree they form: a top-down walk assigns
+each employee a level, and the same walk in reverse adds every subtree's
+size and height into its manager. Nothing is counted per manager or per
+department in the database.
+
+Results are cached per process by directory data version. The version is
+bumped by triggers on every employee, department and location write, and
+read in the same statement as the edges, so a cached result is never
+served after a write has committed.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from src.infrastructure.redis.local_cache import LocalCache
+from src.models.data_version import DIRECTORY, current_version
+from src.models.employee import Employee
+
+
+# Results are keyed by data version, so the TTL only bounds how long a
+# superseded tree is held
+ORG_ANALYTICS_TTL_SECONDS = 600
+_analytics = LocalCache(max_entries=4)
+
+# (employee id, manager id, department id, location id)
+Edge = Tuple[int, Optional[int], Optional[int], Optional[int]]
+
+
+@dataclass
+class ManagerSpan:
+    """Span of control of one manager."""
+
+    employee_id: int
+    department_id: Optional[int]
+    location_id: Optional[int]
+
+    direct_reports: int
+    # Everyone below the manager, at any level
+    total_reports: int
+    # 0 for the top of a reporting line
+    level: int
+    # Levels of reports below the manager, 1 when all are individual contributors
+    levels_below: int
+
+
+@dataclass
+class Headcount:
+    """Employees, managers and levels of a group of employees."""
+
+    employees: int = 0
+    managers: int = 0
+    # Direct reports of the group's managers, wherever the reports sit
+    direct_reports: int = 0
+    # Sum over employees of their level counted from 1, for the average depth
+    level_total: int = 0
+    top_level: Optional[int] = None
+    bottom_level: Optional[int] = None
+
+    @property
+    def individual_contributors(self) -> int:
+        return self.employees - self.managers
+
+    @property
+    def manager_ratio(self) -> float:
+        return self.managers / self.employees if self.employees else 0.0
+
+    @property
+    def average_span(self) -> float:
+        return self.direct_reports / self.managers if self.managers else 0.0
+
+    @property
+    def average_depth(self) -> float:
+        return self.level_total / self.employees if self.employees else 0.0
+
+    @property
+    def depth(self) -> int:
+        """Reporting levels the group spans."""
+        if self.top_level is None:
+            return 0
+        return self.bottom_level - self.top_level + 1
+
+    def add(self, other: "Headcount") -> None:
+        self.employees += other.employees
+        self.managers += other.managers
+        self.direct_reports += other.direct_reports
+        self.level_total += other.level_total
+        if other.top_level is not None:
+            self.top_level = other.top_level if self.top_level is None else min(self.top_level, other.top_level)
+            self.bottom_level = other.bottom_level if self.bottom_level is None else max(self.bottom_level, other.bottom_level)
+
+
+@dataclass
+class OrgAnalytics:
+    """The organization's reporting tree, summarized."""
+
+    # Manager employee ID -> span, for every active employee with active reports
+    managers: Dict[int, ManagerSpan] = field(default_factory=dict)
+
+    # (department ID, location ID) -> headcount of the employees there
+    cells: Dict[Tuple[Optional[int], Optional[int]], Headcount] = field(default_factory=dict)
+
+    # Employees whose manager is set but is not an active employee
+    detached: int = 0
+    # Reporting cycles, each cut at one edge to make a reporting line
+    cycles: int = 0
+
+    # Directory data version the tree was read at
+    version: Optional[int] = None
+
+    @classmethod
+    def build(cls, edges: Iterable[Edge], version: Optional[int] = None) -> "OrgAnalytics":
+        """Summarize the tree formed by the edges, in time linear in their number."""
+        ids: List[int] = []
+        manager_ids: List[Optional[int]] = []
+        places: List[Tuple[Optional[int], Optional[int]]] = []
+        for employee_id, manager_id, department_id, location_id in edges:
+            ids.append(employee_id)
+            manager_ids.append(manager_id)
+            places.append((department_id, location_id))
+
+        count = len(ids)
+        position = {employee_id: i for i, employee_id in enumerate(ids)}
+        parent = [-1] * count
+        children: List[List[int]] = [[] for _ in range(count)]
+        analytics = cls(version=version)
+
+        roots = []
+        for i, manager_id in enumerate(manager_ids):
+            p = position.get(manager_id)
+            if p is None or p == i:
+                roots.append(i)
+                if manager_id is not None:
+                    analytics.detached += 1
+            else:
+                parent[i] = p
+                children[p].append(i)
+
+        # Top down: every employee after their manager, with their level
+        level = [-1] * count
+        order: List[int] = []
+
+        def descend(root: int) -> None:
+            level[root] = 0
+            k = len(order)
+            order.append(root)
+            while k < len(order):
+                i = order[k]
+                k += 1
+                for child in children[i]:
+                    level[child] = level[i] + 1
+                    order.append(child)
+
+        for root in roots:
+            descend(root)
+
+        # Whoever was not reached reports into a cycle. Walk up from each
+        # until the walk meets itself, and cut the cycle there.
+        if len(order) < count:
+            walked = [False] * count
+            for start in range(count):
+                if level[start] >= 0 or walked[start]:
+                    continue
+                i = start
+                while not walked[i]:
+                    walked[i] = True
+                    i = parent[i]
+                if level[i] < 0:
+                    children[parent[i]].remove(i)
+                    parent[i] = -1
+                    analytics.cycles += 1
+                    descend(i)
+
+        # Bottom up: subtree sizes and heights into each manager
+        size = [1] * count
+        height = [0] * count
+        for i in reversed(order):
+            p = parent[i]
+            if p >= 0:
+                size[p] += size[i]
+                if height[i] + 1 > height[p]:
+                    height[p] = height[i] + 1
+
+        cells: Dict[Tuple[Optional[int], Optional[int]], Headcount] = defaultdict(Headcount)
+        for i in range(count):
+            cell = cells[places[i]]
+            cell.employees += 1
+            cell.level_total += level[i] + 1
+            if cell.top_level is None or level[i] < cell.top_level:
+                cell.top_level = level[i]
+            if cell.bottom_level is None or level[i] > cell.bottom_level:
+                cell.bottom_level = level[i]
+            if children[i]:
+                cell.managers += 1
+                cell.direct_reports += len(children[i])
+                analytics.managers[ids[i]] = ManagerSpan(
+                    employee_id=ids[i],
+                    department_id=places[i][0],
+                    location_id=places[i][1],
+                    direct_reports=len(children[i]),
+                    total_reports=size[i] - 1,
+                    level=level[i],
+                    levels_below=height[i],
+                )
+        analytics.cells = dict(cells)
+        return analytics
+
+    def headcount(
+        self,
+        department_id: Optional[int] = None,
+        location_id: Optional[int] = None,
+    ) -> Headcount:
+        """Headcount of a department, a location, both, or the whole organization."""
+        total = Headcount()
+        for (cell_department, cell_location), cell in self.cells.items():
+            if department_id is not None and cell_department != department_id:
+                continue
+            if location_id is not None and cell_location != location_id:
+                continue
+            total.add(cell)
+        return total
+
+    def department_ids(self, location_id: Optional[int] = None) -> List[int]:
+        """Departments with active employees, optionally at one location."""
+        return sorted({
+            department for (department, location), cell in self.cells.items()
+            if department is not None and cell.employees
+            and (location_id is None or location == location_id)
+        })
+
+    def spans(
+        self,
+        department_id: Optional[int] = None,
+        location_id: Optional[int] = None,
+    ) -> List[ManagerSpan]:
+        """Managers in a department and/or location, the largest organizations first."""
+        return sorted(
+            (
+                span for span in self.managers.values()
+                if (department_id is None or span.department_id == department_id)
+                and (location_id is None or span.location_id == location_id)
+            ),
+            key=lambda span: (-span.total_reports, span.level, span.employee_id),
+        )
+
+
+class OrgAnalyticsService:
+    """Builds and caches reporting-line analytics."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def data_version(self) -> Optional[int]:
+        """Current directory data version, None before it is set up."""
+        return self.session.execute(select(current_version(DIRECTORY))).scalar()
+
+    def get_analytics(self) -> OrgAnalytics:
+        """
+        Analytics of the current reporting tree, cached.
+
+        A cache hit costs one read of the data version and its unfolded changes.
+        """
+        version = self.data_version()
+        if version is not None:
+            cached = _analytics.get(str(version))
+            if cached is not None:
+                return cached
+
+        analytics = self.build_analytics()
+        if analytics.version is not None:
+            _analytics.set(str(analytics.version), analytics, ORG_ANALYTICS_TTL_SECONDS)
+        return analytics
+
+    def build_analytics(self) -> OrgAnalytics:
+        """Read the reporting edges and summarize them, uncached."""
+        version = current_version(DIRECTORY)
+        # One row of four arrays: far cheaper to fetch than a row per employee
+        columns = (Employee.id, Employee.manager_id, Employee.department_id, Employee.location_id)
+        row = self.session.execute(
+            select(*(func.array_agg(column) for column in columns), version)
+            .where(Employee.is_active == True)
+        ).one()
+
+        arrays = [values or [] for values in row[:-1]]
+        return OrgAnalytics.build(zip(*arrays), version=row[-1])
@@ -0,0 +1,151 @@
+"""Service for loading organizational subtrees in a single query."""
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, TypeVar
+
+from sqlalchemy import func, literal, select
+from sqlalchemy.orm import Session, aliased, joinedload
+
+from src.models.employee import Employee
+
+
+NodeT = TypeVar("NodeT")
+
+
+@dataclass
+class OrgTreeEntry:
+    """An employee in a loaded subtree with its position in the tree."""
+
+    employee: Employee
+    depth: int
+    direct_reports_count: int = 0
+    child_ids: List[int] = field(default_factory=list)
+
+
+@dataclass
+class OrgSubtree:
+    """
+    A subtree of the reporting hierarchy held in memory.
+
+    Entries are keyed by employee ID and held in depth order, as the
+    loading query returns them; ``child_ids`` on each entry are ordered by
+    last name, first name, then ID.
+    """
+
+    root_id: int
+    max_depth: int
+    entries: Dict[int, OrgTreeEntry] = field(default_factory=dict)
+
+    @property
+    def root(self) -> OrgTreeEntry:
+        """Entry for the subtree root."""
+        return self.entries[self.root_id]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def build(self, make_node: Callable[[OrgTreeEntry, List[NodeT]], NodeT]) -> NodeT:
+        """
+        Build a node tree bottom-up in O(n).
+
+        Args:
+            make_node: Called once per entry with the already-built child
+                nodes, returns the node for that entry
+
+        Returns:
+            The node built for the root entry
+        """
+        built: Dict[int, NodeT] = {}
+
+        # Entries are in depth order, so walking them backwards builds every
+        # child before its parent
+        for entry in reversed(self.entries.values()):
+            children = [built[child_id] for child_id in entry.child_ids]
+            built[entry.employee.id] = make_node(entry, children)
+
+        return built[self.root_id]
+
+
+class OrgTreeService:
+    """
+    Service for fetching reporting subtrees.
+
+    Loads an entire subtree down to a depth limit with one recursive CTE,
+    eager-loading each employee's department and location in the same
+    statement, then links parents to children in memory.
+    """
+
+    def __init__(self, session: Session):
+        """Initialize with database session."""
+        self.session = session
+
+    def get_subtree(
+        self,
+        root_id: int,
+        max_depth: int,
+        active_only: bool = True,
+    ) -> Optional[OrgSubtree]:
+        """
+        Load the subtree below an employee.
+
+        Args:
+            root_id: Employee at the top of the subtree
+            max_depth: Number of reporting levels to include below the root
+            active_only: Skip inactive reports (and everyone below them)
+
+        Returns:
+            OrgSubtree, or None if the root employee does not exist
+        """
+        # Recursive walk down manager_id, carrying depth
+        anchor = select(
+            Employee.id.label("id"),
+            literal(0).label("depth"),
+        ).where(Employee.id == root_id)
+        tree = anchor.cte("org_tree", recursive=True)
+
+        report = aliased(Employee)
+        step = select(
+            report.id,
+            (tree.c.depth + 1).label("depth"),
+        ).where(report.manager_id == tree.c.id).where(tree.c.depth < max_depth)
+        if active_only:
+            step = step.where(report.is_active == True)
+        tree = tree.union_all(step)
+
+        # Direct report count per node, needed for nodes at the depth limit
+        counted = aliased(Employee)
+        count_stmt = select(func.count()).where(counted.manager_id == Employee.id)
+        if active_only:
+            count_stmt = count_stmt.where(counted.is_active == True)
+        direct_reports_count = count_stmt.correlate(Employee).scalar_subquery()
+
+        stmt = (
+            select(Employee, tree.c.depth, direct_reports_count.label("direct_reports_count"))
+            .join(tree, tree.c.id == Employee.id)
+            .options(
+                joinedload(Employee.department),
+                joinedload(Employee.location),
+            )
+            .order_by(tree.c.depth, Employee.last_name, Employee.first_name, Employee.id)
+        )
+
+        subtree = OrgSubtree(root_id=root_id, max_depth=max_depth)
+        for employee, depth, count in self.session.execute(stmt).unique():
+            subtree.entries[employee.id] = OrgTreeEntry(
+                employee=employee,
+                depth=depth,
+                direct_reports_count=count or 0,
+            )
+
+        if root_id not in subtree.entries:
+            return None
+
+        # Rows arrive ordered by depth then name, so appending keeps children sorted
+        for entry in subtree.entries.values():
+            if entry.depth == 0:
+                continue
+            parent = subtree.entries.get(entry.employee.manager_id)
+            if parent is not None:
+                parent.child_ids.append(entry.employee.id)
+
+        return subtree
@@ -1,9 +1,9 @@
 """Policy engine service for evaluating employee eligibility and policy constraints."""
 
-import json
 import logging
+from dataclasses import dataclass
 from datetime import date, datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from sqlalchemy import select
 from sqlalchemy.orm import Session
@@ -26,6 +26,7 @@ from src.schemas.employee_policy_info import (
     RequestRules,
     UsageRestriction,
 )
+from src.services.policy_rules import CompiledPolicy, get_compiled_policy
 
 logger = logging.getLogger(__name__)
 
@@ -94,6 +95,20 @@ ACCRUAL_METHOD_DESCRIPTIONS = {
 }
 
 
+@dataclass
+class PolicyEvaluation:
+    """Eligibility and accrual tier of one policy for one employee."""
+
+    policy_id: int
+    is_eligible: bool
+    status: str
+    eligibility_start_date: Optional[date]
+    waiting_period_remaining: Optional[int]
+    current_rate: Optional[float]
+    next_rate: Optional[float]
+    next_tier_date: Optional[date]
+
+
 class PolicyEngineService:
     """Service for policy eligibility evaluation and constraint queries."""
 
@@ -109,6 +124,7 @@ class PolicyEngineService:
         self,
         employee: Employee,
         policy: TimeOffPolicy,
+        today: Optional[date] = None,
     ) -> Tuple[bool, str, Optional[date], Optional[int]]:
         """
         Evaluate if an employee is eligible for a policy.
@@ -116,8 +132,20 @@ class PolicyEngineService:
         Returns:
             Tuple of (is_eligible, status_message, eligibility_start_date, waiting_period_remaining)
         """
-        today = date.today()
+        today = today or date.today()
+        
+        policy_result = self._evaluate_policy_dates(policy, today)
+        if policy_result is not None:
+            return policy_result
         
+        return self._evaluate_employee(employee, policy, get_compiled_policy(policy), today)
+
+    def _evaluate_policy_dates(
+        self,
+        policy: TimeOffPolicy,
+        today: date,
+    ) -> Optional[Tuple[bool, str, Optional[date], Optional[int]]]:
+        """Check policy status and effective dates; None if the policy applies today."""
         # Check if policy is active
         if policy.status != PolicyStatus.ACTIVE.value:
             return False, "Policy is not active", None, None
@@ -130,6 +158,16 @@ class PolicyEngineService:
         if policy.expiry_date and policy.expiry_date.date() < today:
             return False, "Policy has expired", None, None
         
+        return None
+
+    def _evaluate_employee(
+        self,
+        employee: Employee,
+        policy: TimeOffPolicy,
+        compiled: CompiledPolicy,
+        today: date,
+    ) -> Tuple[bool, str, Optional[date], Optional[int]]:
+        """Check waiting period and eligibility rules for an applicable policy."""
         # Check employee hire date and waiting period
         if employee.hire_date:
             days_employed = (today - employee.hire_date).days
@@ -149,66 +187,55 @@ class PolicyEngineService:
         else:
             eligibility_start = today
         
-        # Check eligibility criteria (JSON rules)
-        if policy.eligibility_criteria:
-            try:
-                rules = json.loads(policy.eligibility_criteria)
-                is_eligible, message = self._evaluate_eligibility_rules(employee, rules)
-                if not is_eligible:
-                    return False, message, None, None
-            except (json.JSONDecodeError, Exception) as e:
-                logger.warning(f"Error evaluating eligibility rules: {e}")
+        # Check eligibility criteria (compiled JSON rules)
+        is_eligible, message = compiled.check_rules(employee, today)
+        if not is_eligible:
+            return False, message, None, None
         
         return True, "Eligible", eligibility_start, None
 
-    def _evaluate_eligibility_rules(
+    def evaluate_many(
         self,
-        employee: Employee,
-        rules: List[Dict[str, Any]],
-    ) -> Tuple[bool, str]:
-        """Evaluate eligibility rules against employee attributes."""
-        for rule in rules:
-            rule_type = rule.get("rule_type", "")
-            field = rule.get("field", "")
-            operator = rule.get("operator", "")
-            value = rule.get("value")
-            
-            # Get employee attribute value
-            emp_value = getattr(employee, field, None)
-            
-            # Handle location-based rules
-            if field == "location_id" and employee.location:
-                if operator == "in" and isinstance(value, list):
-                    if employee.location_id not in value:
-                        return False, f"Not in eligible locations"
-                elif operator == "not_in" and isinstance(value, list):
-                    if employee.location_id in value:
-                        return False, f"Location not eligible"
-            
-            # Handle department-based rules
-            elif field == "department_id" and employee.department:
-                if operator == "in" and isinstance(value, list):
-                    if employee.department_id not in value:
-                        return False, f"Department not eligible"
-            
-            # Handle employment type rules
-            elif field == "employment_type":
-                if operator == "equals" and emp_value != value:
-                    return False, f"Employment type '{emp_value}' not eligible"
-                elif operator == "in" and isinstance(value, list):
-                    if emp_value not in value:
-                        return False, f"Employment type not eligible"
-            
-            # Handle tenure rules
-            elif field == "tenure_years":
-                if employee.hire_date:
-                    tenure = (date.today() - employee.hire_date).days / 365.25
-                    if operator == "gte" and tenure < value:
-                        return False, f"Requires {value}+ years tenure"
-                    elif operator == "lte" and tenure > value:
-                        return False, f"Exceeds tenure limit"
+        employees: Sequence[Employee],
+        policies: Sequence[TimeOffPolicy],
+        today: Optional[date] = None,
+    ) -> Dict[int, List[PolicyEvaluation]]:
+        """
+        Evaluate eligibility and tenure tiers for every employee and policy.
         
-        return True, "Meets all eligibility criteria"
+        Policies are compiled and date-checked once, then applied to each
+        employee, so whole-company runs avoid per-pair JSON parsing.
+        
+        Returns:
+            Evaluations keyed by employee id, in policy order
+        """
+        today = today or date.today()
+        prepared = [
+            (policy, get_compiled_policy(policy), self._evaluate_policy_dates(policy, today))
+            for policy in policies
+        ]
+        
+        results: Dict[int, List[PolicyEvaluation]] = {}
+        for employee in employees:
+            evaluations = []
+            for policy, compiled, policy_result in prepared:
+                is_eligible, status, start_date, remaining = (
+                    policy_result or self._evaluate_employee(employee, policy, compiled, today)
+                )
+                current_rate, next_rate, next_tier_date = compiled.tenure_tier(employee, today)
+                evaluations.append(PolicyEvaluation(
+                    policy_id=policy.id,
+                    is_eligible=is_eligible,
+                    status=status,
+                    eligibility_start_date=start_date,
+                    waiting_period_remaining=remaining,
+                    current_rate=current_rate,
+                    next_rate=next_rate,
+                    next_tier_date=next_tier_date,
+                ))
+            results[employee.id] = evaluations
+        
+        return results
 
     # =========================================================================
     # Tenure Tier Calculation
@@ -218,6 +245,7 @@ class PolicyEngineService:
         self,
         employee: Employee,
         policy: TimeOffPolicy,
+        today: Optional[date] = None,
     ) -> Tuple[Optional[float], Optional[float], Optional[date]]:
         """
         Calculate current and next tenure tier rates.
@@ -225,41 +253,7 @@ class PolicyEngineService:
         Returns:
             Tuple of (current_rate, next_rate, next_tier_date)
         """
-        if not policy.tenure_tiers or not employee.hire_date:
-            return policy.base_accrual_rate, None, None
-        
-        try:
-            tiers = json.loads(policy.tenure_tiers)
-            tenure_years = (date.today() - employee.hire_date).days / 365.25
-            
-            current_rate = policy.base_accrual_rate
-            next_rate = None
-            next_tier_date = None
-            
-            sorted_tiers = sorted(tiers, key=lambda t: t.get("min_years", 0))
-            
-            for i, tier in enumerate(sorted_tiers):
-                min_years = tier.get("min_years", 0)
-                max_years = tier.get("max_years")
-                tier_rate = tier.get("accrual_rate", policy.base_accrual_rate)
-                
-                if tenure_years >= min_years:
-                    if max_years is None or tenure_years < max_years:
-                        current_rate = tier_rate
-                        
-                        # Check for next tier
-                        if i + 1 < len(sorted_tiers):
-                            next_tier = sorted_tiers[i + 1]
-                            next_rate = next_tier.get("accrual_rate")
-                            next_min = next_tier.get("min_years", 0)
-                            next_tier_date = employee.hire_date + timedelta(days=int(next_min * 365.25))
-                        break
-            
-            return current_rate, next_rate, next_tier_date
-            
-        except (json.JSONDecodeError, Exception) as e:
-            logger.warning(f"Error parsing tenure tiers: {e}")
-            return policy.base_accrual_rate, None, None
+        return get_compiled_policy(policy).tenure_tier(employee, today or date.today())
 
     # =========================================================================
     # Policy Response Building
@@ -0,0 +1,249 @@
+"""Compiled policy eligibility rules and tenure tiers."""
+
+import json
+import logging
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.infrastructure.redis.local_cache import LocalCache
+from src.models.employee import Employee
+from src.models.time_off_policy import TimeOffPolicy
+
+logger = logging.getLogger(__name__)
+
+
+DAYS_PER_YEAR = 365.25
+
+# Compiled policies are keyed by id and version, so entries only go stale
+# when a write skips the version bump; the write path also evicts them.
+COMPILED_POLICY_TTL_SECONDS = 86400
+_compiled = LocalCache(max_entries=5000)
+
+# A predicate returns a failure message, or None when the employee passes
+RulePredicate = Callable[[Employee, date], Optional[str]]
+
+
+def tenure_years(employee: Employee, today: date) -> float:
+    """Years since hire, or 0 without a hire date."""
+    if not employee.hire_date:
+        return 0.0
+    return (today - employee.hire_date).days / DAYS_PER_YEAR
+
+
+# =============================================================================
+# Eligibility Rules
+# =============================================================================
+
+def _membership_rule(attr: str, values: List[Any], message: str, negate: bool = False) -> RulePredicate:
+    allowed = frozenset(values)
+
+    def check(employee: Employee, today: date) -> Optional[str]:
+        value = getattr(employee, attr, None)
+        if value is None and attr in ("location_id", "department_id"):
+            return None  # Location and department rules skip unassigned employees
+        if (value in allowed) == negate:
+            return message
+        return None
+
+    return check
+
+
+def _compile_rule(rule: Dict[str, Any]) -> Optional[RulePredicate]:
+    """Compile one JSON rule; rules that can never fail compile to None."""
+    field = rule.get("field", "")
+    operator = rule.get("operator", "")
+    value = rule.get("value")
+
+    if field == "location_id" and isinstance(value, list):
+        if operator == "in":
+            return _membership_rule(field, value, "Not in eligible locations")
+        if operator == "not_in":
+            return _membership_rule(field, value, "Location not eligible", negate=True)
+
+    elif field == "department_id" and isinstance(value, list):
+        if operator == "in":
+            return _membership_rule(field, value, "Department not eligible")
+
+    elif field == "employment_type":
+        if operator == "equals":
+            def check(employee: Employee, today: date) -> Optional[str]:
+                if employee.employment_type != value:
+                    return f"Employment type '{employee.employment_type}' not eligible"
+                return None
+            return check
+        if operator == "in" and isinstance(value, list):
+            return _membership_rule(field, value, "Employment type not eligible")
+
+    elif field == "tenure_years" and isinstance(value, (int, float)):
+        if operator == "gte":
+            def check(employee: Employee, today: date) -> Optional[str]:
+                if employee.hire_date and tenure_years(employee, today) < value:
+                    return f"Requires {value}+ years tenure"
+                return None
+            return check
+        if operator == "lte":
+            def check(employee: Employee, today: date) -> Optional[str]:
+                if employee.hire_date and tenure_years(employee, today) > value:
+                    return "Exceeds tenure limit"
+                return None
+            return check
+
+    return None
+
+
+# =============================================================================
+# Tenure Tiers
+# =============================================================================
+
+@dataclass(frozen=True)
+class TenureTier:
+    """One tenure band of a policy."""
+
+    min_years: float
+    max_years: Optional[float]
+    accrual_rate: Optional[float]
+
+
+@dataclass(frozen=True)
+class TenureTierTable:
+    """
+    Tenure tiers sorted by min_years.
+
+    Disjoint tiers are looked up by bisecting their lower bounds;
+    overlapping tiers fall back to a first-match scan.
+    """
+
+    tiers: Tuple[TenureTier, ...]
+    bounds: Tuple[float, ...]
+    disjoint: bool
+
+    @classmethod
+    def from_json(cls, tiers: List[Dict[str, Any]], base_rate: Optional[float]) -> "TenureTierTable":
+        ordered = sorted(tiers, key=lambda t: t.get("min_years", 0))
+        compiled = tuple(
+            TenureTier(
+                min_years=tier.get("min_years", 0),
+                max_years=tier.get("max_years"),
+                accrual_rate=tier.get("accrual_rate", base_rate),
+            )
+            for tier in ordered
+        )
+        disjoint = all(
+            tier.max_years is not None and tier.max_years <= following.min_years
+            for tier, following in zip(compiled, compiled[1:])
+        )
+        return cls(compiled, tuple(tier.min_years for tier in compiled), disjoint)
+
+    def find(self, years: float) -> Optional[int]:
+        """Index of the tier containing a tenure, or None."""
+        if self.disjoint:
+            index = bisect_right(self.bounds, years) - 1
+            if index >= 0:
+                tier = self.tiers[index]
+                if tier.max_years is None or years < tier.max_years:
+                    return index
+            return None
+
+        for index, tier in enumerate(self.tiers):
+            if years >= tier.min_years and (tier.max_years is None or years < tier.max_years):
+                return index
+        return None
+
+
+# =============================================================================
+# Compiled Policy
+# =============================================================================
+
+@dataclass(frozen=True)
+class CompiledPolicy:
+    """Parsed eligibility rules and tenure tiers for one policy version."""
+
+    policy_id: int
+    version: int
+    base_accrual_rate: Optional[float]
+    rules: Tuple[RulePredicate, ...] = ()
+    tiers: Optional[TenureTierTable] = None
+
+    def check_rules(self, employee: Employee, today: date) -> Tuple[bool, str]:
+        """Evaluate the eligibility rules against an employee."""
+        for rule in self.rules:
+            message = rule(employee, today)
+            if message is not None:
+                return False, message
+        return True, "Meets all eligibility criteria"
+
+    def tenure_tier(
+        self,
+        employee: Employee,
+        today: date,
+    ) -> Tuple[Optional[float], Optional[float], Optional[date]]:
+        """Current rate, next tier rate and next tier date for an employee."""
+        if self.tiers is None or not employee.hire_date:
+            return self.base_accrual_rate, None, None
+
+        index = self.tiers.find(tenure_years(employee, today))
+        if index is None:
+            return self.base_accrual_rate, None, None
+
+        current_rate = self.tiers.tiers[index].accrual_rate
+        if index + 1 >= len(self.tiers.tiers):
+            return current_rate, None, None
+
+        next_tier = self.tiers.tiers[index + 1]
+        next_tier_date = employee.hire_date + timedelta(days=int(next_tier.min_years * DAYS_PER_YEAR))
+        return current_rate, next_tier.accrual_rate, next_tier_date
+
+
+def compile_policy(policy: TimeOffPolicy) -> CompiledPolicy:
+    """
+    Parse a policy's JSON rules and tiers.
+
+    Malformed JSON is logged and treated as absent, as the uncompiled
+    evaluation did.
+    """
+    rules: List[RulePredicate] = []
+    if policy.eligibility_criteria:
+        try:
+            for rule in json.loads(policy.eligibility_criteria):
+                predicate = _compile_rule(rule)
+                if predicate is not None:
+                    rules.append(predicate)
+        except (ValueError, TypeError, AttributeError) as e:
+            logger.warning(f"Error compiling eligibility rules for policy {policy.id}: {e}")
+            rules = []
+
+    tiers = None
+    if policy.tenure_tiers:
+        try:
+            tiers = TenureTierTable.from_json(json.loads(policy.tenure_tiers), policy.base_accrual_rate)
+        except (ValueError, TypeError, AttributeError) as e:
+            logger.warning(f"Error parsing tenure tiers for policy {policy.id}: {e}")
+
+    return CompiledPolicy(
+        policy_id=policy.id,
+        version=policy.version,
+        base_accrual_rate=policy.base_accrual_rate,
+        rules=tuple(rules),
+        tiers=tiers,
+    )
+
+
+def get_compiled_policy(policy: TimeOffPolicy) -> CompiledPolicy:
+    """Get the compiled form of a policy, compiling it on first use."""
+    key = f"{policy.id}:{policy.version}"
+    compiled = _compiled.get(key)
+    if compiled is None:
+        compiled = compile_policy(policy)
+        _compiled.set(key, compiled, COMPILED_POLICY_TTL_SECONDS)
+    return compiled
+
+
+def invalidate_compiled_policy(policy_id: Optional[int] = None) -> int:
+    """Drop compiled versions of a policy, or of all policies."""
+    if policy_id is None:
+        count = len(_compiled)
+        _compiled.clear()
+        return count
+    return _compiled.delete_matching(f"{policy_id}:*")
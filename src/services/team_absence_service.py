@@ -0,0 +1,175 @@
+"""Service for loading a team's time-off over a date window in one query."""
+
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Integer, any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
+
+from src.models.time_off_request import TimeOffRequest, TimeOffRequestStatus
+
+
+ACTIVE_STATUSES = (
+    TimeOffRequestStatus.APPROVED.value,
+    TimeOffRequestStatus.PENDING_APPROVAL.value,
+)
+
+
+@dataclass
+class TeamAbsenceWindow:
+    """
+    Approved and pending requests for a team that touch a date window.
+
+    Requests are grouped by employee and ordered by start date; all
+    per-day and overlap analysis runs in memory over this single load.
+    """
+
+    start_date: date
+    end_date: date
+    requests_by_employee: Dict[int, List[TimeOffRequest]] = field(default_factory=dict)
+
+    @property
+    def num_days(self) -> int:
+        """Number of calendar days in the window."""
+        return (self.end_date - self.start_date).days + 1
+
+    def dates(self) -> Iterator[date]:
+        """Iterate calendar days in the window."""
+        for offset in range(self.num_days):
+            yield self.start_date + timedelta(days=offset)
+
+    def requests_for(
+        self,
+        employee_id: int,
+        statuses: Iterable[str] = ACTIVE_STATUSES,
+    ) -> List[TimeOffRequest]:
+        """Get an employee's requests in the window with the given statuses."""
+        wanted = set(statuses)
+        return [
+            req for req in self.requests_by_employee.get(employee_id, [])
+            if req.status in wanted
+        ]
+
+    def absence_buckets(
+        self,
+        member_ids: Sequence[int],
+        statuses: Iterable[str] = (TimeOffRequestStatus.APPROVED.value,),
+    ) -> List[List[int]]:
+        """
+        Build a day-bucket array of absent members.
+
+        Each member's requests are clipped to the window and merged, so a
+        member appears at most once per day even with overlapping requests.
+
+        Args:
+            member_ids: Team members, in the order they should be listed
+            statuses: Request statuses that count as absent
+
+        Returns:
+            One list of member IDs per day, index 0 being start_date
+        """
+        buckets: List[List[int]] = [[] for _ in range(self.num_days)]
+        for member_id in member_ids:
+            for first, last in self._merged_offsets(self.requests_for(member_id, statuses)):
+                for offset in range(first, last + 1):
+                    buckets[offset].append(member_id)
+        return buckets
+
+    def overlaps(
+        self,
+        start_date: date,
+        end_date: date,
+        member_ids: Sequence[int],
+        exclude_employee_id: Optional[int] = None,
+        statuses: Iterable[str] = ACTIVE_STATUSES,
+    ) -> Iterator[Tuple[int, TimeOffRequest, date, date]]:
+        """
+        Find requests overlapping a date range.
+
+        Yields:
+            (employee_id, request, overlap_start, overlap_end) in member order
+        """
+        for member_id in member_ids:
+            if member_id == exclude_employee_id:
+                continue
+            for req in self.requests_for(member_id, statuses):
+                overlap_start = max(start_date, req.start_date)
+                overlap_end = min(end_date, req.end_date)
+                if overlap_start <= overlap_end:
+                    yield member_id, req, overlap_start, overlap_end
+
+    def _merged_offsets(self, requests: List[TimeOffRequest]) -> List[Tuple[int, int]]:
+        """Clip requests to the window and merge them into day-offset intervals."""
+        last_offset = self.num_days - 1
+        intervals = sorted(
+            (
+                max(0, (req.start_date - self.start_date).days),
+                min(last_offset, (req.end_date - self.start_date).days),
+            )
+            for req in requests
+        )
+
+        merged: List[Tuple[int, int]] = []
+        for first, last in intervals:
+            if first > last:
+                continue
+            if merged and first <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+            else:
+                merged.append((first, last))
+        return merged
+
+
+class TeamAbsenceService:
+    """
+    Service for team time-off lookups.
+
+    Replaces per-member (and per-member-per-day) queries with one range
+    query per team.
+    """
+
+    def __init__(self, session: Session):
+        """Initialize with database session."""
+        self.session = session
+
+    def load_window(
+        self,
+        member_ids: Sequence[int],
+        start_date: date,
+        end_date: date,
+        statuses: Iterable[str] = ACTIVE_STATUSES,
+    ) -> TeamAbsenceWindow:
+        """
+        Load every request for the team that overlaps a date window.
+
+        Args:
+            member_ids: Team member employee IDs
+            start_date: First day of the window
+            end_date: Last day of the window
+            statuses: Request statuses to load
+
+        Returns:
+            TeamAbsenceWindow with requests grouped by employee
+        """
+        window = TeamAbsenceWindow(start_date=start_date, end_date=end_date)
+        if not member_ids:
+            return window
+
+        members = bindparam("member_ids", value=list(member_ids), type_=ARRAY(Integer))
+        stmt = (
+            select(TimeOffRequest)
+            .where(
+                TimeOffRequest.employee_id == any_(members),
+                TimeOffRequest.status.in_(list(statuses)),
+                TimeOffRequest.start_date <= end_date,
+                TimeOffRequest.end_date >= start_date,
+            )
+            .order_by(TimeOffRequest.employee_id, TimeOffRequest.start_date, TimeOffRequest.id)
+        )
+
+        for req in self.session.execute(stmt).scalars():
+            window.requests_by_employee.setdefault(req.employee_id, []).append(req)
+
+        return window
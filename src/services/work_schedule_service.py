@@ -21,6 +21,7 @@ from src.schemas.work_schedule import (
     WorkScheduleResponse,
     WorkingPattern,
 )
+from src.services.business_calendar_service import invalidate_business_calendars
 from src.utils.auth import CurrentUser
 
 logger = logging.getLogger(__name__)
@@ -242,6 +243,7 @@ class WorkScheduleService:
             schedule.applicable_departments = request.applicable_departments
         
         self.session.commit()
+        invalidate_business_calendars(work_schedule_id=schedule_id)
         
         logger.info(f"Updated work schedule {schedule_id}")
         
@@ -285,6 +287,7 @@ class WorkScheduleService:
         # Deactivate
         schedule.is_active = False
         self.session.commit()
+        invalidate_business_calendars(work_schedule_id=schedule_id)
         
         logger.info(
             f"Deactivated work schedule {schedule_id}, "
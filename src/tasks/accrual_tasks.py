@@ -9,6 +9,25 @@ import logging
 from datetime import date, datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 
+from sqlalchemy import func, select
+
+try:
+    from celery import chord, group
+except ImportError:
+    chord = None
+    group = None
+
+from src.database.database import get_db_context
+from src.infrastructure.redis.caching_service import CacheTag, get_cache_service
+from src.models.accrual_run import AccrualRunShard
+from src.models.employee import Employee
+from src.services.accrual_engine import AccrualEngine, AccrualRunResult
+from src.services.accrual_run_service import (
+    ACCRUAL_CHECKPOINT_SIZE,
+    ACCRUAL_SHARD_SIZE,
+    AccrualRunService,
+)
+from src.services.balance_ledger_service import COMPACTION_BATCH_SIZE, BalanceLedgerService
 from src.tasks.base import (
     BaseTask,
     RetryConfig,
@@ -33,6 +52,10 @@ ACCRUAL_RETRY_CONFIG = RetryConfig(
     max_backoff_delay=7200,  # 2 hours
 )
 
+# A shard records its failure as final on its last delivery instead of
+# raising, so the run's chord callback still fires and reports it
+ACCRUAL_SHARD_MAX_ATTEMPTS = ACCRUAL_RETRY_CONFIG.max_retries + 1
+
 
 # =============================================================================
 # Accrual Calculation Tasks
@@ -74,32 +97,25 @@ def calculate_employee_accrual(
         else date.today()
     )
     
-    # This would connect to the actual accrual calculation logic
-    # Placeholder implementation
+    with get_db_context() as session:
+        run = AccrualEngine(session).run(calc_date, [employee_id], policy_ids)
+    _invalidate_balance_caches(run)
+    
     results = {
         "employee_id": employee_id,
         "calculation_date": calc_date.isoformat(),
-        "policies_processed": [],
-        "total_accrued": 0.0,
-        "status": "completed",
+        "policies_processed": [
+            {
+                "policy_id": policy.policy_id,
+                "accrued_hours": policy.total_accrued,
+            }
+            for policy in run.policies
+            if policy.employees_eligible
+        ],
+        "total_accrued": sum(policy.total_accrued for policy in run.policies),
+        "status": "completed" if run.employees else "skipped",
     }
     
-    # Simulate policy processing
-    policies = policy_ids or [1, 2]  # Default policies
-    for policy_id in policies:
-        # In real implementation, this would:
-        # 1. Get policy configuration
-        # 2. Calculate accrual based on employee tenure, hours worked, etc.
-        # 3. Update balance records
-        accrual_amount = 8.0  # Placeholder: 8 hours accrued
-        
-        results["policies_processed"].append({
-            "policy_id": policy_id,
-            "accrued_hours": accrual_amount,
-            "new_balance": 80.0 + accrual_amount,  # Placeholder
-        })
-        results["total_accrued"] += accrual_amount
-    
     logger.info(
         f"Completed accrual calculation for employee {employee_id}: "
         f"{results['total_accrued']} hours accrued"
@@ -138,6 +154,12 @@ def calculate_batch_accruals(
     """
     logger.info(f"Processing batch accrual for {len(employee_ids)} employees")
     
+    calc_date = (
+        datetime.fromisoformat(accrual_date).date()
+        if accrual_date
+        else date.today()
+    )
+    
     results = {
         "batch_id": batch_id or f"batch_{datetime.now(timezone.utc).timestamp()}",
         "total_employees": len(employee_ids),
@@ -147,23 +169,25 @@ def calculate_batch_accruals(
         "started_at": datetime.now(timezone.utc).isoformat(),
     }
     
-    for employee_id in employee_ids:
-        try:
-            # Process each employee
-            employee_result = calculate_employee_accrual(
-                employee_id=employee_id,
-                accrual_date=accrual_date,
-            )
-            results["successful"] += 1
-            
-        except Exception as e:
-            results["failed"] += 1
-            results["errors"].append({
-                "employee_id": employee_id,
-                "error": str(e),
-            })
-            logger.error(f"Failed to process accrual for employee {employee_id}: {e}")
-    
+    # One columnar pass and one upsert per policy; a failure rolls the
+    # whole batch back so the retry starts clean
+    with get_db_context() as session:
+        run = AccrualEngine(session).run(calc_date, employee_ids)
+    _invalidate_balance_caches(run)
+    
+    results["successful"] = run.employees
+    results["skipped"] = len(set(employee_ids)) - run.employees  # Missing or inactive
+    results["policies"] = [
+        {
+            "policy_id": policy.policy_id,
+            "balance_type": policy.balance_type,
+            "employees_accrued": policy.employees_eligible,
+            "employees_capped": policy.employees_capped,
+            "total_accrued": policy.total_accrued,
+        }
+        for policy in run.policies
+    ]
+    results["employees_per_second"] = round(run.employees_per_second, 1)
     results["completed_at"] = datetime.now(timezone.utc).isoformat()
     
     logger.info(
@@ -174,6 +198,264 @@ def calculate_batch_accruals(
     return results
 
 
+# =============================================================================
+# Sharded Accrual Runs
+# =============================================================================
+
+@register_task(
+    queue="balance_calc",
+    description="Plan a sharded accrual run and fan the shards out",
+    tags=["accrual", "balance", "batch", "coordinator"],
+)
+@background_task(
+    name="tasks.run_accruals",
+    queue="balance_calc",
+    retry_config=RetryConfig(max_retries=2, default_retry_delay=60),
+    soft_time_limit=300,
+    time_limit=600,
+)
+def run_accruals(
+    accrual_date: Optional[str] = None,
+    shard_size: int = ACCRUAL_SHARD_SIZE,
+) -> Dict[str, Any]:
+    """
+    Accrue the whole active population for a date across workers.
+    
+    The population is split into shards of shard_size employees, run as a
+    chord of calculate_accrual_shard tasks on the balance_calc queue, and
+    finalize_accrual_run aggregates the shards into the run report. Without
+    Celery the shards run inline and the report is returned directly.
+    
+    Policies accrue only on the day their accrual period ends. Without an
+    accrual_date the scheduled run catches up: it runs every such date
+    since the last completed run (AccrualRunService.dates_to_run), so a
+    late or missed run does not lose a period.
+    
+    Args:
+        accrual_date: Date to accrue (defaults to catching up through today)
+        shard_size: Active employees per shard
+    
+    Returns:
+        Dictionary with the run id and shard count, or the run report; for
+        a catch-up, the dates run and one such dictionary per date
+    """
+    if accrual_date:
+        return _run_accruals_for(datetime.fromisoformat(accrual_date).date(), shard_size)
+    
+    today = date.today()
+    with get_db_context() as session:
+        accrual_dates = AccrualRunService(session).dates_to_run(today)
+    
+    if not accrual_dates:
+        logger.info(f"No accrual periods end on or before {today} since the last completed run")
+    
+    return {
+        "through": today.isoformat(),
+        "accrual_dates": [d.isoformat() for d in accrual_dates],
+        "runs": [_run_accruals_for(d, shard_size) for d in accrual_dates],
+    }
+
+
+def _run_accruals_for(calc_date: date, shard_size: int) -> Dict[str, Any]:
+    """Plan one date's run and start its shards; skipped if no period ends on it."""
+    with get_db_context() as session:
+        if not AccrualEngine(session).load_policies(calc_date):
+            logger.info(f"No accrual periods end on {calc_date}; skipping accrual run")
+            return {
+                "accrual_date": calc_date.isoformat(),
+                "shards": 0,
+                "status": "skipped",
+            }
+        run = AccrualRunService(session).plan_run(calc_date, shard_size)
+        run_id = run.id
+        shard_ids = [shard.id for shard in run.shards]
+    
+    if chord is None or not shard_ids:
+        for shard_id in shard_ids:
+            calculate_accrual_shard(shard_id, max_attempts=1)
+        return finalize_accrual_run(run_id)
+    
+    chord(
+        group(calculate_accrual_shard.s(shard_id) for shard_id in shard_ids)
+    )(finalize_accrual_run.si(run_id))
+    
+    logger.info(f"Dispatched accrual run {run_id} for {calc_date}: {len(shard_ids)} shards")
+    
+    return {
+        "run_id": run_id,
+        "accrual_date": calc_date.isoformat(),
+        "shards": len(shard_ids),
+        "status": "dispatched",
+    }
+
+
+@register_task(
+    queue="balance_calc",
+    description="Calculate accruals for one shard of an accrual run",
+    tags=["accrual", "balance", "batch"],
+)
+@background_task(
+    name="tasks.calculate_accrual_shard",
+    queue="balance_calc",
+    retry_config=ACCRUAL_RETRY_CONFIG,
+    soft_time_limit=600,
+    time_limit=900,
+)
+def calculate_accrual_shard(
+    shard_id: int,
+    checkpoint_size: int = ACCRUAL_CHECKPOINT_SIZE,
+    max_attempts: int = ACCRUAL_SHARD_MAX_ATTEMPTS,
+) -> Dict[str, Any]:
+    """
+    Calculate accruals for a shard, resuming from its checkpoint.
+    
+    Accruals are committed with the checkpoint every checkpoint_size
+    employees, so a retry (including one after the soft time limit)
+    continues after the last committed employee.
+    
+    Args:
+        shard_id: Shard to process
+        checkpoint_size: Employees per committed checkpoint
+        max_attempts: Deliveries after which a failure is final
+    
+    Returns:
+        Dictionary with the shard's progress
+    """
+    with get_db_context() as session:
+        shard = AccrualRunService(session).run_shard(
+            shard_id,
+            checkpoint_size=checkpoint_size,
+            max_attempts=max_attempts,
+            on_checkpoint=_invalidate_balance_caches,
+        )
+        return _shard_summary(shard)
+
+
+@register_task(
+    queue="balance_calc",
+    description="Aggregate an accrual run's shards into its report",
+    tags=["accrual", "balance", "report"],
+)
+@background_task(
+    name="tasks.finalize_accrual_run",
+    queue="balance_calc",
+    retry_config=RetryConfig(max_retries=3, default_retry_delay=30),
+    soft_time_limit=60,
+    time_limit=120,
+)
+def finalize_accrual_run(run_id: int) -> Dict[str, Any]:
+    """
+    Record the report of an accrual run once its shards have finished.
+    
+    Args:
+        run_id: Accrual run to finalize
+    
+    Returns:
+        Dictionary with the run status and report
+    """
+    with get_db_context() as session:
+        run = AccrualRunService(session).finalize_run(run_id)
+        return {
+            "run_id": run.id,
+            "status": run.status,
+            **run.report,
+        }
+
+
+def _shard_summary(shard: AccrualRunShard) -> Dict[str, Any]:
+    return {
+        "shard_id": shard.id,
+        "run_id": shard.run_id,
+        "shard_index": shard.shard_index,
+        "status": shard.status,
+        "attempts": shard.attempts,
+        "checkpoint_employee_id": shard.checkpoint_employee_id,
+        "employees_processed": shard.employees_processed,
+        "employees_per_second": round(shard.employees_per_second, 1),
+        "error": shard.error,
+    }
+
+
+def _invalidate_balance_caches(run: AccrualRunResult) -> None:
+    """Drop cached balances of employees who accrued."""
+    if run.accrued_employee_ids:
+        get_cache_service().invalidate_tags(
+            *[CacheTag.balance(employee_id) for employee_id in run.accrued_employee_ids]
+        )
+
+
+# =============================================================================
+# Balance Ledger
+# =============================================================================
+
+@register_task(
+    queue="balance_calc",
+    description="Snapshot balance ledger totals for fast as-of reads",
+    tags=["balance", "ledger", "maintenance"],
+)
+@background_task(
+    name="tasks.compact_balance_ledger",
+    queue="balance_calc",
+    retry_config=RetryConfig(max_retries=2, default_retry_delay=300),
+    soft_time_limit=1800,  # 30 minutes
+    time_limit=3600,  # 1 hour
+)
+def compact_balance_ledger(
+    snapshot_date: Optional[str] = None,
+    batch_size: int = COMPACTION_BATCH_SIZE,
+) -> Dict[str, Any]:
+    """
+    Write ledger snapshots so as-of reads only sum the entries after them.
+    
+    Employees are compacted in id ranges of batch_size, each committed on
+    its own; compaction is idempotent, so a retry redoes at most one range.
+    
+    Args:
+        snapshot_date: Date the snapshots cover through (defaults to the
+            last day of the previous month)
+        batch_size: Employee ids per compaction statement
+    
+    Returns:
+        Dictionary with the number of snapshots written
+    """
+    through = (
+        datetime.fromisoformat(snapshot_date).date()
+        if snapshot_date
+        else date.today().replace(day=1) - timedelta(days=1)
+    )
+    
+    results = {
+        "snapshot_date": through.isoformat(),
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "batches": 0,
+        "snapshots_written": 0,
+    }
+    
+    with get_db_context() as session:
+        first_id, last_id = session.execute(
+            select(func.min(Employee.id), func.max(Employee.id))
+        ).one()
+        service = BalanceLedgerService(session)
+        
+        for start in range(first_id or 0, (last_id or -1) + 1, batch_size):
+            results["snapshots_written"] += service.compact(
+                through,
+                first_employee_id=start,
+                last_employee_id=start + batch_size - 1,
+            )
+            results["batches"] += 1
+            session.commit()
+    
+    results["completed_at"] = datetime.now(timezone.utc).isoformat()
+    
+    logger.info(
+        f"Balance ledger compacted through {through}: "
+        f"{results['snapshots_written']} snapshots in {results['batches']} batches"
+    )
+    
+    return results
+
+
 @register_task(
     queue="balance_calc",
     description="Calculate balance projection for employee",
@@ -27,6 +27,7 @@ celery_app = configured_app or create_celery_app()
 # Auto-discover tasks from these modules
 TASK_MODULES: List[str] = [
     "src.tasks.accrual_tasks",
+    "src.tasks.data_version_tasks",
     "src.tasks.email_tasks",
     "src.tasks.report_tasks",
 ]
@@ -0,0 +1,49 @@
+"""
+Data Version Tasks
+
+Background maintenance of the data_version counters that key derived
+caches (directory facets, org analytics, business calendars).
+"""
+
+import logging
+from typing import Any, Dict
+
+from sqlalchemy import func, select
+
+from src.database.database import get_db_context
+from src.tasks.base import (
+    RetryConfig,
+    background_task,
+    register_task,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@register_task(
+    queue="default",
+    description="Fold data version change rows into the version counters",
+    tags=["cache", "maintenance"],
+)
+@background_task(
+    name="tasks.fold_data_versions",
+    queue="default",
+    retry_config=RetryConfig(max_retries=2, default_retry_delay=60),
+)
+def fold_data_versions() -> Dict[str, Any]:
+    """
+    Fold committed data_version_change rows into data_version.
+    
+    Versions are unchanged by a fold; it keeps the change rows a version
+    read has to count few. The fold only locks the data_version rows, which
+    writers no longer touch, so it never waits on a write.
+    
+    Returns:
+        Dictionary with the number of change rows folded
+    """
+    with get_db_context() as session:
+        folded = session.execute(select(func.fold_data_version_changes())).scalar() or 0
+    
+    logger.info(f"Folded {folded} data version changes")
+    
+    return {"folded": folded}
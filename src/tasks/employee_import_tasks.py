@@ -9,24 +9,46 @@ import logging
 import time
 import uuid
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
 
 from src.database.database import get_db_context
+from src.infrastructure.redis.caching_service import get_cache_service
+from src.infrastructure.storage.s3_storage import get_storage_service
 from src.models.import_audit import ActorRole
 from src.models.import_job import ImportJob, ImportJobStatus
 from src.models.import_row import ImportRow, ValidationStatus
 from src.models.validation_error import ErrorType, ImportValidationError, Severity
+from src.services.employee_import_service import (
+    IMPORT_BATCH_SIZE,
+    MAX_REPORTED_ERRORS,
+    EmployeeImportService,
+)
 from src.utils.audit_logger import ImportExportAuditContext, ImportExportAuditLogger
-from src.utils.csv_parser import parse_csv_content
+from src.utils.csv_parser import CsvSource, CsvStream, to_json_compatible
 
 
 logger = logging.getLogger(__name__)
 
 
+def _open_source(file_content: Optional[CsvSource], file_key: Optional[str]) -> CsvSource:
+    """Use the given content, or stream the uploaded file from object storage."""
+    if file_content is not None:
+        return file_content
+    if file_key:
+        stream = get_storage_service().open_stream(file_key)
+        if stream is not None:
+            return stream
+        raise ValueError(f"Import file not found in storage: {file_key}")
+    raise ValueError("Either file_content or file_key is required")
+
+
 def validate_import_job(
     import_job_id: uuid.UUID,
-    file_content: bytes,
+    file_content: Optional[CsvSource],
     user_id: uuid.UUID,
+    file_key: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Background task to validate an import job.
@@ -37,10 +59,13 @@ def validate_import_job(
     - Business rule validation
     - Duplicate detection
     
+    Rows are streamed and written in batches of IMPORT_BATCH_SIZE.
+    
     Args:
         import_job_id: UUID of the import job
-        file_content: Raw CSV file content
+        file_content: Raw CSV file content or a binary file-like object
         user_id: UUID of the user who initiated the import
+        file_key: Object storage key to stream the file from instead
     
     Returns:
         Dictionary with validation results
@@ -73,69 +98,80 @@ def validate_import_job(
             delimiter = config.get("delimiter", ",")
             field_mappings = import_job.field_mappings
             
-            parse_result = parse_csv_content(
-                content=file_content,
+            stream = CsvStream(
+                _open_source(file_content, file_key),
                 delimiter=delimiter,
                 custom_mappings=field_mappings,
             )
             
             # Store validation results
+            total_rows = 0
             valid_count = 0
             error_count = 0
+            reported_errors: List[Dict[str, Any]] = []
             
-            for row in parse_result.rows:
-                # Create ImportRow record
-                import_row = ImportRow(
-                    import_job_id=import_job.id,
-                    row_number=row.row_number,
-                    source_data=row.data,
-                    mapped_data=row.data if row.is_valid else None,
-                    validation_status=(
-                        ValidationStatus.VALID if row.is_valid
-                        else ValidationStatus.INVALID
-                    ),
-                    error_details=[e.model_dump() for e in row.errors] if row.errors else None,
-                )
-                session.add(import_row)
-                session.flush()
+            for batch in stream.batches(IMPORT_BATCH_SIZE):
+                import_rows = []
+                validation_errors = []
+                
+                for row in batch:
+                    # Row IDs are assigned here so errors can reference them
+                    row_id = uuid.uuid4()
+                    import_rows.append({
+                        "id": row_id,
+                        "import_job_id": import_job.id,
+                        "row_number": row.row_number,
+                        "source_data": to_json_compatible(row.data),
+                        "mapped_data": to_json_compatible(row.data) if row.is_valid else None,
+                        "validation_status": (
+                            ValidationStatus.VALID if row.is_valid
+                            else ValidationStatus.INVALID
+                        ),
+                        "error_details": [e.model_dump() for e in row.errors] if row.errors else None,
+                    })
+                    
+                    for field_error in row.errors:
+                        validation_errors.append({
+                            "import_job_id": import_job.id,
+                            "row_id": row_id,
+                            "error_type": ErrorType.DATA_TYPE,
+                            "severity": Severity.ERROR,
+                            "error_code": field_error.code,
+                            "error_message": field_error.message,
+                            "field_name": field_error.field,
+                            "field_value": field_error.value,
+                            "suggested_correction": field_error.suggestion,
+                        })
+                    
+                    if row.is_valid:
+                        valid_count += 1
+                    else:
+                        error_count += 1
+                        if len(reported_errors) < MAX_REPORTED_ERRORS:
+                            reported_errors.append({
+                                "row": row.row_number,
+                                "errors": [e.model_dump() for e in row.errors],
+                            })
                 
-                # Create validation error records
-                for field_error in row.errors:
-                    validation_error = ImportValidationError(
-                        import_job_id=import_job.id,
-                        row_id=import_row.id,
-                        error_type=ErrorType.DATA_TYPE,
-                        severity=Severity.ERROR,
-                        error_code=field_error.code,
-                        error_message=field_error.message,
-                        field_name=field_error.field,
-                        field_value=field_error.value,
-                        suggested_correction=field_error.suggestion,
-                    )
-                    session.add(validation_error)
+                session.execute(insert(ImportRow), import_rows)
+                if validation_errors:
+                    session.execute(insert(ImportValidationError), validation_errors)
                 
-                if row.is_valid:
-                    valid_count += 1
-                else:
-                    error_count += 1
+                total_rows += len(batch)
+                session.flush()
             
             # Update import job
-            import_job.total_rows = parse_result.total_rows
+            import_job.total_rows = total_rows
             import_job.status = ImportJobStatus.MAPPING
-            import_job.validation_errors = [
-                {
-                    "row": row.row_number,
-                    "errors": [e.model_dump() for e in row.errors],
-                }
-                for row in parse_result.rows if not row.is_valid
-            ]
+            import_job.validation_errors = reported_errors
+            import_job.validation_error_count = error_count
             
             # Log validation completion
             duration = time.time() - start_time
             audit_logger.log_import_validated(
                 import_job_id=import_job.id,
                 context=audit_context,
-                total_rows=parse_result.total_rows,
+                total_rows=total_rows,
                 valid_rows=valid_count,
                 error_rows=error_count,
             )
@@ -148,7 +184,7 @@ def validate_import_job(
             return {
                 "import_job_id": str(import_job_id),
                 "status": "validated",
-                "total_rows": parse_result.total_rows,
+                "total_rows": total_rows,
                 "valid_rows": valid_count,
                 "error_rows": error_count,
                 "duration_seconds": duration,
@@ -173,8 +209,9 @@ def validate_import_job(
 
 def process_import_job(
     import_job_id: uuid.UUID,
-    file_content: bytes,
+    file_content: Optional[CsvSource],
     user_id: uuid.UUID,
+    file_key: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Background task to process an import job and create employee records.
@@ -182,13 +219,14 @@ def process_import_job(
     This task:
     - Reads validated rows from the import job
     - Creates Employee records for valid rows
-    - Updates import job progress in real-time
+    - Updates import job progress after every batch of IMPORT_BATCH_SIZE rows
     - Handles partial imports (continues on individual row failures)
     
     Args:
         import_job_id: UUID of the import job
-        file_content: Raw CSV file content
+        file_content: Raw CSV file content or a binary file-like object
         user_id: UUID of the user who initiated the import
+        file_key: Object storage key to stream the file from instead
     
     Returns:
         Dictionary with processing results
@@ -197,8 +235,6 @@ def process_import_job(
     start_time = time.time()
     
     with get_db_context() as session:
-        from src.models.employee import Employee
-        
         # Get import job
         import_job = session.get(ImportJob, import_job_id)
         if import_job is None:
@@ -237,8 +273,8 @@ def process_import_job(
             allow_partial = config.get("allow_partial_import", True)
             field_mappings = import_job.field_mappings
             
-            parse_result = parse_csv_content(
-                content=file_content,
+            stream = CsvStream(
+                _open_source(file_content, file_key),
                 delimiter=delimiter,
                 custom_mappings=field_mappings,
             )
@@ -247,63 +283,26 @@ def process_import_job(
             successful = 0
             errors = 0
             
-            for row in parse_result.rows:
-                import_job.processed_rows += 1
+            import_service = EmployeeImportService(session)
+            
+            for batch in stream.batches(IMPORT_BATCH_SIZE):
+                valid_rows = [row for row in batch if row.is_valid]
+                write_result = import_service.write_employee_batch(import_job.id, valid_rows)
                 
-                if not row.is_valid:
-                    errors += 1
-                    import_job.error_rows += 1
-                    continue
+                for row, error in write_result.failed:
+                    logger.warning(f"Failed to create employee for row {row.row_number}: {error.orig}")
                 
-                try:
-                    # Create employee
-                    employee = Employee(
-                        employee_id=row.data.get("employee_id"),
-                        email=row.data.get("email"),
-                        first_name=row.data.get("first_name"),
-                        middle_name=row.data.get("middle_name"),
-                        last_name=row.data.get("last_name"),
-                        preferred_name=row.data.get("preferred_name"),
-                        date_of_birth=row.data.get("date_of_birth"),
-                        gender=row.data.get("gender"),
-                        personal_email=row.data.get("personal_email"),
-                        phone_number=row.data.get("phone_number"),
-                        mobile_number=row.data.get("mobile_number"),
-                        address_line1=row.data.get("address_line1"),
-                        address_line2=row.data.get("address_line2"),
-                        city=row.data.get("city"),
-                        state_province=row.data.get("state_province"),
-                        postal_code=row.data.get("postal_code"),
-                        country=row.data.get("country"),
-                        department_id=row.data.get("department_id"),
-                        manager_id=row.data.get("manager_id"),
-                        location_id=row.data.get("location_id"),
-                        work_schedule_id=row.data.get("work_schedule_id"),
-                        job_title=row.data.get("job_title"),
-                        employment_type=row.data.get("employment_type"),
-                        employment_status=row.data.get("employment_status", "active"),
-                        hire_date=row.data.get("hire_date"),
-                        termination_date=row.data.get("termination_date"),
-                        salary=row.data.get("salary"),
-                        hourly_rate=row.data.get("hourly_rate"),
-                    )
-                    session.add(employee)
-                    session.flush()
-                    
-                    successful += 1
-                    import_job.successful_rows += 1
-                    
-                except Exception as e:
-                    logger.warning(f"Failed to create employee for row {row.row_number}: {e}")
-                    errors += 1
-                    import_job.error_rows += 1
-                    
-                    if not allow_partial:
-                        raise
+                # Progress is updated once per batch
+                batch_errors = len(batch) - len(write_result.written)
+                successful += len(write_result.written)
+                errors += batch_errors
+                import_job.processed_rows += len(batch)
+                import_job.successful_rows += len(write_result.written)
+                import_job.error_rows += batch_errors
+                session.flush()
                 
-                # Periodic flush for progress tracking
-                if import_job.processed_rows % 100 == 0:
-                    session.flush()
+                if write_result.failed and not allow_partial:
+                    raise write_result.failed[0][1]
             
             # Complete the job
             import_job.completed_at = datetime.utcnow()
@@ -315,6 +314,9 @@ def process_import_job(
             
             duration = (import_job.completed_at - import_job.started_at).total_seconds()
             
+            if successful > 0:
+                get_cache_service().invalidate_visibility_sets_on_commit(session)
+            
             # Log completion
             audit_logger.log_import_completed(
                 import_job_id=import_job.id,
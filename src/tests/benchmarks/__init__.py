@@ -0,0 +1,11 @@
+"""Performance benchmarks.
+
+Benchmarks are plain scripts rather than pytest tests so they stay out of
+the regular test run. Database-backed benchmarks need a disposable
+PostgreSQL database configured through the usual DB_* environment
+variables; they create and drop their own scratch schema.
+
+Run one with, for example::
+
+    python -m src.tests.benchmarks.bench_employee_hierarchy
+"""
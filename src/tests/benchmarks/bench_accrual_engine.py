@@ -0,0 +1,239 @@
+"""Benchmark: columnar batch accruals vs. per-employee ORM accruals.
+
+Seeds synthetic employees (mixed tenure, schedules and employment types),
+a few accruing policies and existing balances for half the employees,
+then runs one accrual date with the previous per-employee path (ORM
+lookups, per-policy eligibility and tier evaluation, a flush per
+balance) and with AccrualEngine using its pure-Python and NumPy kernels.
+Every path must leave the same balances, and re-running the engine for
+the same date must not accrue again.
+
+Usage::
+
+    python -m src.tests.benchmarks.bench_accrual_engine [--sizes 10000 100000]
+"""
+
+import argparse
+import json
+import random
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from src.models.balance_ledger import BalanceLedgerEntry, BalanceLedgerSnapshot
+from src.models.employee import Employee, WorkSchedule
+from src.models.time_off_policy import TimeOffPolicy
+from src.models.time_off_request import TimeOffBalance
+from src.services.accrual_engine import STANDARD_HOURS_PER_WEEK, AccrualEngine, is_accrual_date, np
+from src.services.policy_engine_service import PolicyEngineService
+from src.tests.benchmarks.common import (
+    BenchmarkResult,
+    create_tables,
+    execute_script,
+    print_results,
+    run_benchmark,
+    scratch_schema,
+)
+
+
+# A Jan 1 pay Friday, so every benchmark policy's accrual period ends on it
+ACCRUAL_DATE = date(2027, 1, 1)
+SCHEDULE_HOURS = [40, 40, 40, 32, 20]
+EMPLOYMENT_TYPES = ["full_time"] * 8 + ["part_time", "contract"]
+SEED = 13
+
+POLICIES = [
+    dict(
+        name="Vacation", code="VAC", policy_type="vacation", accrual_method="monthly_accrual",
+        accrual_frequency="monthly", base_accrual_rate=120.0, accrual_cap=200.0,
+        waiting_period_days=90,
+        tenure_tiers=json.dumps([
+            {"min_years": 0, "max_years": 2, "accrual_rate": 120.0},
+            {"min_years": 2, "max_years": 5, "accrual_rate": 160.0},
+            {"min_years": 5, "max_years": None, "accrual_rate": 200.0},
+        ]),
+    ),
+    dict(
+        name="Sick", code="SICK", policy_type="sick", accrual_method="pay_period_accrual",
+        accrual_frequency="bi-weekly", base_accrual_rate=80.0, max_balance=120.0,
+        eligibility_criteria=json.dumps([
+            {"field": "employment_type", "operator": "in", "value": ["full_time", "part_time"]},
+        ]),
+    ),
+    dict(
+        name="Personal", code="PER", policy_type="personal", accrual_method="annual_lump_sum",
+        base_accrual_rate=24.0, prorate_first_year=True, waiting_period_days=30,
+    ),
+]
+
+
+def seed(session: Session, size: int) -> None:
+    """Create the tables and a population of ``size`` employees."""
+    create_tables(
+        session, Employee, WorkSchedule, TimeOffPolicy, TimeOffBalance,
+        BalanceLedgerEntry, BalanceLedgerSnapshot,
+    )
+    rng = random.Random(SEED)
+    connection = session.connection()
+
+    for i, hours in enumerate(SCHEDULE_HOURS, start=1):
+        session.add(WorkSchedule(id=i, name=f"{hours}h {i}", hours_per_week=hours))
+    for policy in POLICIES:
+        session.add(TimeOffPolicy(status="active", effective_date=datetime(2020, 1, 1), **policy))
+    session.flush()
+
+    employees = []
+    for i in range(1, size + 1):
+        hire = ACCRUAL_DATE - timedelta(days=rng.randint(-10, 7000))
+        employees.append((
+            i, f"E{i:07d}", f"user{i}@example.com", "First", "Last", "active", hire, True,
+            rng.randint(1, len(SCHEDULE_HOURS)), rng.choice(EMPLOYMENT_TYPES),
+        ))
+    balances = [
+        (i, balance_type, ACCRUAL_DATE.year, round(rng.uniform(0, 150), 2),
+         ACCRUAL_DATE - timedelta(days=rng.choice([14, 31])))
+        for i in range(1, size + 1, 2)
+        for balance_type in ("vacation", "sick")
+    ]
+
+    batch = 5000
+    for start in range(0, len(employees), batch):
+        connection.exec_driver_sql(
+            "INSERT INTO employee (id, employee_id, email, first_name, last_name, "
+            "employment_status, hire_date, is_active, work_schedule_id, employment_type, "
+            "created_at, updated_at) "
+            "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, now(), now())",
+            employees[start:start + batch],
+        )
+    for start in range(0, len(balances), batch):
+        connection.exec_driver_sql(
+            "INSERT INTO time_off_balance (employee_id, balance_type, year, total_allocated, "
+            "used, pending, available, carried_over, last_accrual_date) "
+            "VALUES (%s, %s, %s, %s, 0, 0, %s, 0, %s)",
+            [(e, t, y, a, a, d) for e, t, y, a, d in balances[start:start + batch]],
+        )
+    execute_script(session, "ANALYZE employee; ANALYZE time_off_balance;")
+
+
+def legacy(session: Session) -> None:
+    """Previous path: per employee and policy, evaluate in Python and flush a balance."""
+    engine = AccrualEngine(session, use_numpy=False)  # Only for the shared policy parameters
+    policy_engine = PolicyEngineService(session)
+    policies = [
+        policy
+        for policy in session.execute(select(TimeOffPolicy).order_by(TimeOffPolicy.id)).scalars().all()
+        if is_accrual_date(policy, ACCRUAL_DATE)
+    ]
+    employee_ids = session.execute(
+        select(Employee.id).where(Employee.is_active == True).order_by(Employee.id)
+    ).scalars().all()
+
+    for employee_id in employee_ids:
+        employee = session.get(Employee, employee_id)
+        schedule = session.get(WorkSchedule, employee.work_schedule_id)
+        fte = float(schedule.hours_per_week) / STANDARD_HOURS_PER_WEEK if schedule else 1.0
+        accrued_types = set()
+
+        for policy in policies:
+            is_eligible, _, _, _ = policy_engine.evaluate_employee_eligibility(
+                employee, policy, ACCRUAL_DATE
+            )
+            if not is_eligible or policy.policy_type in accrued_types:
+                continue
+            if (ACCRUAL_DATE - employee.hire_date).days < 0:
+                continue
+
+            params = engine.parameters(policy, ACCRUAL_DATE)
+            rate, _, _ = policy_engine.calculate_tenure_tier(employee, policy, ACCRUAL_DATE)
+            amount = (rate if rate is not None else params.base_rate) * fte / params.periods
+            if params.prorate_year is not None and employee.hire_date.year == params.prorate_year:
+                year_end = date(params.prorate_year, 12, 31)
+                amount *= ((year_end - employee.hire_date).days + 1) / params.days_in_year
+
+            balance = session.execute(
+                select(TimeOffBalance).where(
+                    TimeOffBalance.employee_id == employee_id,
+                    TimeOffBalance.balance_type == policy.policy_type,
+                    TimeOffBalance.year == ACCRUAL_DATE.year,
+                )
+            ).scalar_one_or_none()
+            if balance is None:
+                balance = TimeOffBalance(
+                    employee_id=employee_id, balance_type=policy.policy_type,
+                    year=ACCRUAL_DATE.year, total_allocated=0.0, used=0.0, pending=0.0,
+                    available=0.0, carried_over=0.0,
+                )
+                session.add(balance)
+            elif balance.last_accrual_date and balance.last_accrual_date >= ACCRUAL_DATE:
+                continue
+
+            if params.cap is not None and balance.available + amount > params.cap:
+                amount = max(params.cap - balance.available, 0.0)
+            balance.total_allocated += amount
+            balance.available += amount
+            balance.last_accrual_date = ACCRUAL_DATE
+            accrued_types.add(policy.policy_type)
+            session.flush()
+
+
+def total_available(session: Session) -> float:
+    return session.execute(select(func.sum(TimeOffBalance.available))).scalar_one()
+
+
+def bench_case(name: str, size: int, func) -> BenchmarkResult:
+    """Run one accrual path against a freshly seeded population."""
+    with scratch_schema(f"bench_accrual_{size}") as session:
+        seed(session, size)
+        engine = session.get_bind().engine
+        result = run_benchmark(name, size, lambda: func(session), engine=engine, repeat=1)
+
+        rerun = AccrualEngine(session).run(ACCRUAL_DATE)
+        assert not rerun.accrued_employee_ids, f"{name}: re-run accrued again"
+        result.total = total_available(session)
+        return result
+
+
+def print_throughput(results: List[BenchmarkResult]) -> None:
+    print("\nThroughput")
+    for r in results:
+        print(f"  {r.name:<40} {r.size:>8}  {r.size / (r.median_ms / 1000):>12,.0f} employees/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument(
+        "--per-employee-max",
+        type=int,
+        default=10000,
+        help="Largest size to run the slow per-employee path at",
+    )
+    args = parser.parse_args()
+
+    results: List[BenchmarkResult] = []
+    for size in args.sizes:
+        cases = []
+        if size <= args.per_employee_max:
+            cases.append(("accrual (per-employee ORM)", legacy))
+        cases.append(("accrual (engine, python)", lambda s: AccrualEngine(s, use_numpy=False).run(ACCRUAL_DATE)))
+        if np is not None:
+            cases.append(("accrual (engine, numpy)", lambda s: AccrualEngine(s, use_numpy=True).run(ACCRUAL_DATE)))
+
+        expected: Optional[float] = None
+        for name, func in cases:
+            result = bench_case(name, size, func)
+            if expected is None:
+                expected = result.total
+            assert abs(result.total - expected) < 1e-6 * max(expected, 1), (
+                f"{name}: balances total {result.total}, expected {expected}"
+            )
+            results.append(result)
+
+    print_results("Batch accrual run", results)
+    print_throughput(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""Benchmark: set-based approval conflict/coverage vs. per-member queries.
+
+Seeds one manager with teams of 5, 50 and 500 reports, each holding a
+handful of approved and pending requests around a 10-workday request,
+then compares the previous per-member (conflicts) and per-member-per-day
+(coverage) queries with the single range query plus day-bucket pass used
+by the approval context endpoint.
+
+Usage::
+
+    python -m src.tests.benchmarks.bench_approval_context [--sizes 5 50 500]
+"""
+
+import argparse
+import random
+from datetime import date, timedelta
+from typing import Dict, List, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.api.approval_context import (
+    analyze_conflicts,
+    analyze_coverage,
+    get_team_members,
+    load_team_absences,
+)
+from src.models.employee import Employee
+from src.models.time_off_request import TimeOffRequest, TimeOffRequestStatus
+from src.tests.benchmarks.common import (
+    BenchmarkResult,
+    create_tables,
+    execute_script,
+    print_results,
+    run_benchmark,
+    scratch_schema,
+)
+
+
+MANAGER_ID = 1
+REQUEST_START = date(2025, 3, 3)   # Monday
+REQUEST_DAYS = 14                  # Two calendar weeks, 10 workdays
+REQUESTS_PER_MEMBER = 4
+STATUSES = [
+    TimeOffRequestStatus.APPROVED.value,
+    TimeOffRequestStatus.PENDING_APPROVAL.value,
+    TimeOffRequestStatus.REJECTED.value,
+]
+
+
+# =============================================================================
+# Previous per-member implementations (for comparison)
+# =============================================================================
+
+def legacy_conflicts(
+    session: Session,
+    request: TimeOffRequest,
+    team_members: List[Employee],
+) -> List[Tuple[int, int]]:
+    """One overlap query per team member."""
+    conflicts = []
+    for member in team_members:
+        if member.id == request.employee_id:
+            continue
+        stmt = select(TimeOffRequest).where(
+            TimeOffRequest.employee_id == member.id,
+            TimeOffRequest.status.in_([
+                TimeOffRequestStatus.APPROVED.value,
+                TimeOffRequestStatus.PENDING_APPROVAL.value,
+            ]),
+            TimeOffRequest.start_date <= request.end_date,
+            TimeOffRequest.end_date >= request.start_date,
+        )
+        for other in session.execute(stmt).scalars().all():
+            overlap_start = max(request.start_date, other.start_date)
+            overlap_end = min(request.end_date, other.end_date)
+            conflicts.append((member.id, (overlap_end - overlap_start).days + 1))
+    return conflicts
+
+
+def legacy_coverage(
+    session: Session,
+    request: TimeOffRequest,
+    team_members: List[Employee],
+) -> Dict[date, int]:
+    """One absence query per team member per workday."""
+    available: Dict[date, int] = {}
+    current = request.start_date
+    while current <= request.end_date:
+        if current.weekday() < 5:
+            count = len(team_members)
+            for member in team_members:
+                stmt = select(TimeOffRequest).where(
+                    TimeOffRequest.employee_id == member.id,
+                    TimeOffRequest.status == TimeOffRequestStatus.APPROVED.value,
+                    TimeOffRequest.start_date <= current,
+                    TimeOffRequest.end_date >= current,
+                )
+                if session.execute(stmt).scalars().first() is not None:
+                    count -= 1
+            available[current] = count - 1
+        current += timedelta(days=1)
+    return available
+
+
+def set_based(session: Session, request: TimeOffRequest, team_members: List[Employee]):
+    """One range query shared by conflict and coverage analysis."""
+    absences = load_team_absences(request, team_members, session)
+    conflicts, _ = analyze_conflicts(request, team_members, session, absences)
+    coverage = analyze_coverage(request, team_members, session, absences)
+    return conflicts, coverage
+
+
+# =============================================================================
+# Benchmark
+# =============================================================================
+
+def seed(session: Session, team_size: int) -> TimeOffRequest:
+    """Create a manager, their team and overlapping time-off."""
+    create_tables(session, Employee, TimeOffRequest)
+    connection = session.connection()
+    rng = random.Random(team_size)
+
+    employees = [
+        (
+            i, f"E{i:06d}", f"e{i}@example.com", "First", f"Last{i:06d}",
+            "active", date(2020, 1, 1), True, MANAGER_ID if i > 1 else None,
+        )
+        for i in range(1, team_size + 2)
+    ]
+    connection.exec_driver_sql(
+        "INSERT INTO employee (id, employee_id, email, first_name, last_name, "
+        "employment_status, hire_date, is_active, manager_id) "
+        "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)",
+        employees,
+    )
+
+    requests = []
+    for employee_id in range(2, team_size + 2):
+        for _ in range(REQUESTS_PER_MEMBER):
+            start = REQUEST_START + timedelta(days=rng.randint(-20, 20))
+            end = start + timedelta(days=rng.randint(0, 6))
+            requests.append((
+                employee_id, "vacation", start, end, (end - start).days + 1,
+                False, rng.choice(STATUSES), 1,
+            ))
+    connection.exec_driver_sql(
+        "INSERT INTO time_off_request (employee_id, request_type, start_date, end_date, "
+        "total_days, is_half_day, status, approval_level) "
+        "VALUES (%s, %s, %s, %s, %s, %s, %s, %s)",
+        requests,
+    )
+    execute_script(session, "ANALYZE employee; ANALYZE time_off_request;")
+
+    request = TimeOffRequest(
+        employee_id=2,
+        request_type="vacation",
+        start_date=REQUEST_START,
+        end_date=REQUEST_START + timedelta(days=REQUEST_DAYS - 1),
+        total_days=10,
+        status=TimeOffRequestStatus.PENDING_APPROVAL.value,
+    )
+    return request
+
+
+def check_equivalent(session: Session, request: TimeOffRequest, team_members: List[Employee]) -> None:
+    """Fail loudly if the set-based analysis disagrees with the legacy queries."""
+    conflicts, coverage = set_based(session, request, team_members)
+
+    expected_conflicts = sorted(legacy_conflicts(session, request, team_members))
+    actual_conflicts = sorted(
+        (c.conflicting_employee.id, c.total_overlap_days) for c in conflicts
+    )
+    assert actual_conflicts == expected_conflicts, "conflict analysis mismatch"
+
+    expected_coverage = legacy_coverage(session, request, team_members)
+    actual_coverage = {dc.date: dc.available_count for dc in coverage.daily_coverage}
+    assert actual_coverage == expected_coverage, "coverage analysis mismatch"
+
+
+def bench_size(team_size: int) -> List[BenchmarkResult]:
+    """Run both approaches against a team of the given size."""
+    with scratch_schema(f"bench_approval_{team_size}") as session:
+        request = seed(session, team_size)
+        engine = session.get_bind().engine
+        team_members = get_team_members(MANAGER_ID, session)
+
+        check_equivalent(session, request, team_members)
+
+        def legacy():
+            legacy_conflicts(session, request, team_members)
+            legacy_coverage(session, request, team_members)
+
+        cases = [
+            ("conflicts + coverage (per member)", legacy),
+            ("conflicts + coverage (set-based)", lambda: set_based(session, request, team_members)),
+        ]
+
+        return [
+            run_benchmark(name, team_size, func, engine=engine, repeat=3)
+            for name, func in cases
+        ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 50, 500])
+    args = parser.parse_args()
+
+    results: List[BenchmarkResult] = []
+    for size in args.sizes:
+        results.extend(bench_size(size))
+
+    print_results("Approval context conflict/coverage analysis", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""Benchmark: approval analytics from request scans vs. merged rollups.
+
+Seeds three years of decided time-off requests with skewed decision
+latencies, builds the rollups with ApprovalRollupService.rebuild, then
+answers the dashboard's questions (counts, SLA compliance, average decision
+time by department and by manager, overall median and p90) for a month and
+a year, company-wide and for one manager's and one department's view:
+
+- scan: aggregate queries over the request history, with percentile_disc
+  for the overall percentiles
+- rollup: ApprovalRollupService.summarize, merging the range's daily
+  buckets in two GROUPING SETS queries
+
+Counts must agree exactly, and percentiles, also checked per department and
+per manager, within the sketch's 1% relative error. Also times recording
+single transitions, the write-side cost.
+
+Usage::
+
+    python -m src.tests.benchmarks.bench_approval_rollup [--requests 150000]
+"""
+
+import argparse
+from datetime import date, datetime
+from typing import Dict, List, Tuple
+
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+
+from src.models.approval_rollup import ApprovalRollup
+from src.models.employee import Department, Employee
+from src.models.time_off_request import TimeOffRequest, TimeOffRequestStatus
+from src.services.approval_rollup_service import SLA_TARGET_HOURS, ApprovalRollupService
+from src.tests.benchmarks.common import (
+    BenchmarkResult,
+    create_tables,
+    execute_script,
+    print_results,
+    run_benchmark,
+    scratch_schema,
+)
+
+
+EMPLOYEES = 5000
+DEPARTMENTS = 20
+TEAM_SIZE = 10
+HISTORY_START = date(2022, 1, 1)
+HISTORY_END = date(2024, 12, 31)
+RANGES = {
+    "one month": (date(2024, 6, 1), date(2024, 6, 30)),
+    "one year": (date(2024, 1, 1), date(2024, 12, 31)),
+}
+VIEWS = {
+    "company": {},
+    "one manager": {"manager_id": 11},
+    "one department": {"department_id": 3},
+}
+TRANSITIONS = 200
+
+DECIDED_AT = """
+    CASE status WHEN 'approved' THEN approved_at WHEN 'rejected' THEN rejected_at
+                ELSE cancelled_at END
+"""
+
+
+def seed(session: Session, requests: int) -> None:
+    """Create the tables, a managed population and three years of requests."""
+    create_tables(session, Department, Employee, TimeOffRequest, ApprovalRollup)
+    session.add_all(
+        Department(id=d, code=f"D{d}", name=f"Department {d}") for d in range(1, DEPARTMENTS + 1)
+    )
+    session.flush()
+    session.execute(text("""
+        INSERT INTO employee (id, employee_id, email, first_name, last_name, employment_status,
+                              hire_date, is_active, department_id, manager_id, created_at, updated_at)
+        SELECT e, 'E' || lpad(e::text, 7, '0'), 'user' || e || '@example.com', 'First' || e,
+               'Last' || e, 'active', DATE '2015-01-01', true, 1 + (e / :team) % :departments,
+               NULLIF((e - 1) / :team * :team + 1, e), now(), now()
+        FROM generate_series(1, :employees) e
+    """), {"employees": EMPLOYEES, "team": TEAM_SIZE, "departments": DEPARTMENTS})
+
+    # Latencies are e^U hours for U uniform on [0, 5.5): most decisions in
+    # a day or two, a long tail past the SLA
+    execute_script(session, "SELECT setseed(0.21);")
+    session.execute(text("""
+        INSERT INTO time_off_request (employee_id, request_type, start_date, end_date, total_days,
+                                      is_half_day, status, approval_level, current_approver_id,
+                                      updated_by, created_at, submitted_at, approved_at,
+                                      rejected_at, cancelled_at)
+        SELECT employee_id, request_type, submitted::date + 14, submitted::date + 16, 3, false,
+               status, 1, manager_id, manager_id, submitted, submitted,
+               CASE WHEN status = 'approved' THEN decided END,
+               CASE WHEN status = 'rejected' THEN decided END,
+               CASE WHEN status = 'cancelled' THEN decided END
+        FROM (
+            SELECT *, submitted + exp(random() * 5.5) * interval '1 hour' AS decided
+            FROM (
+                SELECT e.id AS employee_id, e.manager_id,
+                       (ARRAY['vacation', 'sick', 'personal', 'unpaid'])[1 + r % 4] AS request_type,
+                       CASE WHEN r % 20 = 0 THEN 'cancelled' WHEN r % 20 < 4 THEN 'rejected'
+                            WHEN r % 20 = 4 THEN 'pending_approval' ELSE 'approved' END AS status,
+                       TIMESTAMP '2022-01-01' + random() * 1085 * interval '1 day' AS submitted
+                FROM generate_series(1, :requests) r
+                JOIN employee e ON e.id = 2 + r % (:employees - 1)
+            ) submissions
+        ) generated
+    """), {"requests": requests, "employees": EMPLOYEES})
+    execute_script(session, "ANALYZE employee; ANALYZE time_off_request;")
+
+
+def scan(session: Session, start: date, end: date, view: Dict[str, int]) -> Dict[str, Dict]:
+    """Dashboard figures aggregated straight from the request history."""
+    params = {"start": start, "end": end, "sla": SLA_TARGET_HOURS, **view}
+    conditions = "".join(
+        {"manager_id": " AND coalesce(r.updated_by, 0) = :manager_id",
+         "department_id": " AND e.department_id = :department_id"}[name]
+        for name in view
+    )
+    latency = f"extract(epoch FROM {DECIDED_AT} - submitted_at) / 3600"
+    figures = {}
+    for name, group in (("overall", "NULL::int"), ("department", "e.department_id"),
+                        ("manager", "coalesce(r.updated_by, 0)")):
+        percentiles = f"""
+            percentile_disc(0.5) WITHIN GROUP (ORDER BY {latency}) FILTER (WHERE status <> 'cancelled'),
+            percentile_disc(0.9) WITHIN GROUP (ORDER BY {latency}) FILTER (WHERE status <> 'cancelled')
+        """ if name == "overall" else "NULL, NULL"
+        rows = session.execute(text(f"""
+            SELECT {group},
+                   count(*) FILTER (WHERE status = 'approved'),
+                   count(*) FILTER (WHERE status = 'rejected'),
+                   count(*) FILTER (WHERE status = 'cancelled'),
+                   count(*) FILTER (WHERE status <> 'cancelled' AND {latency} <= :sla),
+                   round((avg({latency}) FILTER (WHERE status <> 'cancelled'))::numeric, 1),
+                   {percentiles}
+            FROM time_off_request r JOIN employee e ON e.id = r.employee_id
+            WHERE status IN ('approved', 'rejected', 'cancelled')
+              AND {DECIDED_AT} >= :start AND {DECIDED_AT} < :end + 1 {conditions}
+            GROUP BY 1
+        """), params).all()
+        figures[name] = {row[0]: tuple(row[1:]) for row in rows}
+    return figures
+
+
+def rollup(session: Session, start: date, end: date, view: Dict[str, int],
+           percentiles_by: Tuple[str, ...] = ()) -> Dict[str, Dict]:
+    summary = ApprovalRollupService(session).summarize(start, end, percentiles_by=percentiles_by,
+                                                       **view)
+
+    def figures(totals) -> Tuple:
+        quantiles = ((totals.latency.quantile(0.5), totals.latency.quantile(0.9))
+                     if totals.latency else (None, None))
+        return (totals.approved, totals.denied, totals.cancelled, totals.within_sla,
+                totals.average_hours if totals.latency_count else None, *quantiles)
+
+    return {
+        "overall": {None: figures(summary.overall)},
+        "department": {key: figures(t) for key, t in summary.by_department.items()},
+        "manager": {key: figures(t) for key, t in summary.by_manager.items()},
+    }
+
+
+def check(scanned: Dict[str, Dict], merged: Dict[str, Dict]) -> None:
+    """Exact counts and means, percentiles within the sketch's relative error."""
+    for name, groups in scanned.items():
+        assert groups.keys() == merged[name].keys(), f"{name} groups differ"
+        for key, expected in groups.items():
+            actual = merged[name][key]
+            assert actual[:4] == expected[:4], f"{name} {key}: {actual[:4]} != {expected[:4]}"
+            assert expected[4] is None or abs(actual[4] - float(expected[4])) <= 0.05 + 1e-9, \
+                f"{name} {key}: average {actual[4]} vs {expected[4]}"
+            for got, want in zip(actual[5:], expected[5:]):
+                assert want is None or abs(got - float(want)) <= 0.01 * float(want) + 1e-9, \
+                    f"{name} {key}: percentile {got} vs {want}"
+
+
+def check_group_percentiles(session: Session, start: date, end: date) -> None:
+    """Per-department and per-manager percentiles merged from the bins."""
+    merged = rollup(session, start, end, {}, percentiles_by=("department", "manager"))
+    for name, group in (("department", "e.department_id"), ("manager", "coalesce(r.updated_by, 0)")):
+        latency = f"extract(epoch FROM {DECIDED_AT} - submitted_at) / 3600"
+        for key, median, p90 in session.execute(text(f"""
+            SELECT {group},
+                   percentile_disc(0.5) WITHIN GROUP (ORDER BY {latency}),
+                   percentile_disc(0.9) WITHIN GROUP (ORDER BY {latency})
+            FROM time_off_request r JOIN employee e ON e.id = r.employee_id
+            WHERE status IN ('approved', 'rejected')
+              AND {DECIDED_AT} >= :start AND {DECIDED_AT} < :end + 1
+            GROUP BY 1
+        """), {"start": start, "end": end}):
+            got = merged[name][key][5:]
+            for value, want in zip(got, (median, p90)):
+                assert abs(value - float(want)) <= 0.01 * float(want) + 1e-9, \
+                    f"{name} {key}: percentile {value} vs {want}"
+
+
+def record_transitions(session: Session, request_ids: List[int]) -> None:
+    """Approve pending requests one by one, as the endpoint does."""
+    service = ApprovalRollupService(session)
+    nested = session.begin_nested()
+    for request in session.execute(
+        select(TimeOffRequest).where(TimeOffRequest.id.in_(request_ids))
+    ).scalars():
+        request.status = TimeOffRequestStatus.APPROVED.value
+        request.approved_at = datetime(2024, 12, 31, 12, 0)
+        service.record_transition(request, decided_by=request.current_approver_id)
+    nested.rollback()
+    session.expire_all()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=150000)
+    args = parser.parse_args()
+
+    results: List[BenchmarkResult] = []
+    with scratch_schema("bench_approval_rollup") as session:
+        seed(session, args.requests)
+        engine = session.get_bind().engine
+        service = ApprovalRollupService(session)
+
+        results.append(run_benchmark("rebuild rollups for three years", args.requests,
+                                     lambda: service.rebuild(HISTORY_START, HISTORY_END),
+                                     engine=engine, repeat=1))
+        execute_script(session, "ANALYZE approval_rollup;")
+        buckets = session.execute(select(func.count()).select_from(ApprovalRollup)).scalar()
+        print(f"{buckets} buckets for {args.requests} requests")
+
+        for label, (start, end) in RANGES.items():
+            for view_label, view in VIEWS.items():
+                name = f"{label}, {view_label}"
+                results.append(run_benchmark(f"{name} (scan)", args.requests,
+                                             lambda: scan(session, start, end, view), engine=engine))
+                results.append(run_benchmark(f"{name} (rollup)", args.requests,
+                                             lambda: rollup(session, start, end, view), engine=engine))
+                check(scan(session, start, end, view), rollup(session, start, end, view))
+            check_group_percentiles(session, start, end)
+
+        pending = session.execute(
+            select(TimeOffRequest.id)
+            .where(TimeOffRequest.status == TimeOffRequestStatus.PENDING_APPROVAL.value)
+            .limit(TRANSITIONS)
+        ).scalars().all()
+        results.append(run_benchmark(f"record {TRANSITIONS} approvals", args.requests,
+                                     lambda: record_transitions(session, pending),
+                                     engine=engine, repeat=3))
+
+    print_results("Approval analytics", results)
+
+
+if __name__ == "__main__":
+    main()
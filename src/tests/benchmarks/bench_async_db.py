@@ -0,0 +1,228 @@
+"""Load test: directory and org-chart latency with sync vs. async sessions.
+
+Seeds an org (fan-out 8) of employees across departments, then drives the
+real directory and org-chart routers in-process with open-loop (Poisson)
+arrivals. Most requests are quick directory reads (one employee, the
+department list); a minority are the org-chart overview, whose counts over
+the whole org make it the slow, database-bound query. Both modes serve the
+same endpoints:
+
+- sync: the routers get a regular Session, so every query blocks the
+  event loop and quick reads queue behind slow ones
+- async: the routers get an AsyncSession and run_db runs their code over
+  asyncpg, so waiting on one query lets the loop serve other requests
+
+Router sessions come from dependency overrides bound to the scratch
+schema; the rest of the request path is the production one.
+
+Usage::
+
+    python -m src.tests.benchmarks.bench_async_db [--employees 1000000] [--rate 40]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import Any, AsyncGenerator, Callable, Dict, List, Tuple
+
+from fastapi import FastAPI
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.api.employee_directory import employee_directory_router
+from src.api.org_chart import org_chart_router
+from src.database.database import DatabaseConfig, DbSession, get_router_db
+from src.models.employee import Department, Employee, Location
+from src.tests.benchmarks.common import create_tables, execute_script, scratch_schema
+
+
+SCHEMA = "bench_async_db"
+FAN_OUT = 8
+DEPARTMENTS = 50
+SLOW_SHARE = 0.1
+SEED = 18
+POOL_SIZE = 16
+SLOW_PATH = "/api/employee-directory/organizational-chart?depth_limit=1"
+
+
+def seed(session: Session, employees: int) -> None:
+    """Create the tables and the org, committed so pooled connections see it."""
+    create_tables(session, Department, Location, Employee)
+    session.add_all(
+        Department(id=d, code=f"D{d}", name=f"Department {d}") for d in range(1, DEPARTMENTS + 1)
+    )
+    session.flush()
+    session.execute(text("""
+        INSERT INTO employee (id, employee_id, email, first_name, last_name, employment_status,
+                              hire_date, is_active, department_id, manager_id, created_at, updated_at)
+        SELECT e, 'E' || lpad(e::text, 7, '0'), 'user' || e || '@example.com', 'First' || e,
+               'Last' || e, 'active', DATE '2015-01-01', true, 1 + e % :departments,
+               CASE WHEN e = 1 THEN NULL ELSE (e - 2) / :fan_out + 1 END, now(), now()
+        FROM generate_series(1, :employees) e
+    """), {"employees": employees, "departments": DEPARTMENTS, "fan_out": FAN_OUT})
+    execute_script(session, """
+        CREATE INDEX ON employee (manager_id);
+        ANALYZE employee; ANALYZE department;
+    """)
+    session.commit()
+
+
+def session_dependency(mode: str, pool_size: int) -> Tuple[Callable, Callable]:
+    """
+    A router session dependency on the scratch schema, and its disposer.
+
+    Mirrors get_router_db: commit on success, one pool of the same size
+    per mode.
+    """
+    config = DatabaseConfig.from_env()
+
+    if mode == "async":
+        async_engine = create_async_engine(
+            config.async_url,
+            pool_size=pool_size,
+            connect_args={"server_settings": {"search_path": f"{SCHEMA}, public"}},
+        )
+        async_factory = async_sessionmaker(async_engine, expire_on_commit=False)
+
+        async def dependency() -> AsyncGenerator[DbSession, None]:
+            async with async_factory() as session:
+                yield session
+                await session.commit()
+
+        return dependency, async_engine.dispose
+
+    engine = create_engine(config.url, pool_size=pool_size)
+
+    @event.listens_for(engine, "connect")
+    def set_search_path(dbapi_connection, _):
+        with dbapi_connection.cursor() as cursor:
+            cursor.execute(f"SET search_path TO {SCHEMA}, public")
+        dbapi_connection.commit()
+
+    factory = sessionmaker(engine, expire_on_commit=False)
+
+    async def dependency() -> AsyncGenerator[DbSession, None]:
+        with factory() as session:
+            yield session
+            session.commit()
+
+    async def dispose() -> None:
+        engine.dispose()
+
+    return dependency, dispose
+
+
+async def call(app: FastAPI, path: str) -> None:
+    """Send one GET through the ASGI app."""
+    route, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": route,
+        "raw_path": route.encode(),
+        "root_path": "",
+        "query_string": query.encode(),
+        "headers": [(b"host", b"bench"), (b"x-user-role", b"employee")],
+        "client": ("bench", 1),
+        "server": ("bench", 80),
+    }
+    response: Dict[str, Any] = {}
+
+    async def receive() -> Dict[str, Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Dict[str, Any]) -> None:
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+
+    await app(scope, receive, send)
+    assert response.get("status") == 200, f"{path}: HTTP {response.get('status')}"
+
+
+async def drive(app: FastAPI, employees: int, rate: float, requests: int) -> Dict[str, Any]:
+    """
+    Send the request mix at Poisson arrivals of the given rate.
+
+    Open loop: arrivals do not wait for earlier responses, so a stalled
+    event loop shows up as latency instead of as a slower client.
+    Latency runs from the scheduled arrival to the response.
+    """
+    rng = random.Random(SEED)
+    latencies: Dict[str, List[float]] = {"fast": [], "slow": []}
+
+    async def timed(kind: str, path: str, arrival: float) -> None:
+        await call(app, path)
+        latencies[kind].append((time.perf_counter() - arrival) * 1000)
+
+    start = time.perf_counter()
+    arrival = start
+    tasks = []
+    for _ in range(requests):
+        arrival += rng.expovariate(rate)
+        await asyncio.sleep(max(0.0, arrival - time.perf_counter()))
+        if rng.random() < SLOW_SHARE:
+            kind, path = "slow", SLOW_PATH
+        elif rng.random() < 0.5:
+            kind, path = "fast", f"/api/employee-directory/employee/{rng.randint(1, employees)}"
+        else:
+            kind, path = "fast", "/api/employee-directory/departments"
+        tasks.append(asyncio.create_task(timed(kind, path, arrival)))
+
+    await asyncio.gather(*tasks)
+    return {"latencies": latencies, "elapsed": time.perf_counter() - start}
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def run_mode(mode: str, employees: int, rate: float, requests: int) -> Dict[str, Any]:
+    app = FastAPI()
+    app.include_router(employee_directory_router)
+    app.include_router(org_chart_router)
+    dependency, dispose = session_dependency(mode, POOL_SIZE)
+    app.dependency_overrides[get_router_db("directory")] = dependency
+    app.dependency_overrides[get_router_db("org_chart")] = dependency
+
+    try:
+        # Warm the pool and statement caches before measuring
+        await drive(app, employees, rate, POOL_SIZE * 4)
+        return await drive(app, employees, rate, requests)
+    finally:
+        await dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=1000000)
+    parser.add_argument("--rate", type=float, default=40.0, help="Arrivals per second")
+    parser.add_argument("--requests", type=int, default=3000)
+    args = parser.parse_args()
+
+    with scratch_schema(SCHEMA) as session:
+        seed(session, args.employees)
+
+        rows = []
+        for mode in ("sync", "async"):
+            result = asyncio.run(run_mode(mode, args.employees, args.rate, args.requests))
+            rows.append((mode, result))
+
+    print(f"\n{args.requests} requests at {args.rate:.0f}/s, "
+          f"{SLOW_SHARE:.0%} org-chart overviews, {args.employees:,} employees")
+    print(f"{'mode':<8}{'kind':<6}{'count':>7}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    print("-" * 51)
+    for mode, result in rows:
+        for kind, values in result["latencies"].items():
+            print(f"{mode:<8}{kind:<6}{len(values):>7}{statistics.median(values):>10.1f}"
+                  f"{percentile(values, 0.99):>10.1f}{max(values):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
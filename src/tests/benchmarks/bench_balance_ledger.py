@@ -0,0 +1,153 @@
+"""Benchmark: balance-as-of from ledger snapshots vs. summing full history.
+
+Seeds a multi-year ledger (bi-weekly accruals and scattered usage for
+every employee under three policies, millions of entries in total),
+compacts it into year-end and month-end snapshots, then answers "balance
+as of" for a sample of employees both by summing every entry up to the
+date and with BalanceLedgerService (latest snapshot plus tail). Both
+must agree for every (employee, policy).
+
+Usage::
+
+    python -m src.tests.benchmarks.bench_balance_ledger [--employees 5000] [--years 10]
+"""
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from typing import Dict, List, Tuple
+
+from sqlalchemy import bindparam, func, select, text
+from sqlalchemy.orm import Session
+
+from src.models.balance_ledger import BalanceLedgerEntry, BalanceLedgerSnapshot
+from src.services.balance_ledger_service import BalanceLedgerService
+from src.tests.benchmarks.common import (
+    BenchmarkResult,
+    create_tables,
+    execute_script,
+    print_results,
+    run_benchmark,
+    scratch_schema,
+)
+
+
+POLICY_IDS = [1, 2, 3]
+AS_OF_DATE = date(2025, 6, 20)
+SAMPLE = 200
+SEED = 15
+
+
+def seed(session: Session, employees: int, years: int) -> int:
+    """Create the ledger tables and fill them; returns the entry count."""
+    create_tables(session, BalanceLedgerEntry, BalanceLedgerSnapshot)
+    start = date(AS_OF_DATE.year - years, 1, 1)
+
+    session.execute(text("""
+        INSERT INTO balance_ledger_entry (employee_id, policy_id, entry_type, amount,
+                                          effective_date, source_type)
+        SELECT e, p, 'accrual', 2.0 + (e % 5) * 0.5, d::date, 'accrual_run'
+        FROM generate_series(1, :employees) e,
+             generate_series(1, 3) p,
+             generate_series(CAST(:start AS date), CAST(:end AS date), interval '14 days') d
+    """), {"employees": employees, "start": start, "end": AS_OF_DATE + timedelta(days=60)})
+    session.execute(text("""
+        INSERT INTO balance_ledger_entry (employee_id, policy_id, entry_type, amount,
+                                          effective_date, source_type)
+        SELECT e, p, 'usage', -8.0, (d + ((e * 7 + p) % 14) * interval '1 day')::date,
+               'time_off_request'
+        FROM generate_series(1, :employees) e,
+             generate_series(1, 3) p,
+             generate_series(CAST(:start AS date), CAST(:end AS date), interval '7 days') d
+        WHERE (e * 31 + p * 17 + extract(week FROM d)::int) % 6 = 0
+    """), {"employees": employees, "start": start, "end": AS_OF_DATE + timedelta(days=60)})
+    execute_script(session, "ANALYZE balance_ledger_entry;")
+
+    return session.execute(select(func.count()).select_from(BalanceLedgerEntry)).scalar_one()
+
+
+def snapshot_dates(years: int) -> List[date]:
+    """Year-ends before AS_OF_DATE's year, then its month-ends so far."""
+    dates = [date(year, 12, 31) for year in range(AS_OF_DATE.year - years, AS_OF_DATE.year)]
+    dates += [
+        date(AS_OF_DATE.year, month + 1, 1) - timedelta(days=1)
+        for month in range(1, AS_OF_DATE.month)
+    ]
+    return dates
+
+
+# Built once like BALANCES_AS_OF, so both paths are timed on the database
+FULL_HISTORY = (
+    select(BalanceLedgerEntry.policy_id, func.sum(BalanceLedgerEntry.amount))
+    .where(
+        BalanceLedgerEntry.employee_id == bindparam("employee_id"),
+        BalanceLedgerEntry.policy_id.in_(POLICY_IDS),
+        BalanceLedgerEntry.effective_date <= AS_OF_DATE,
+    )
+    .group_by(BalanceLedgerEntry.policy_id)
+)
+
+
+def full_history(session: Session, employee_ids: List[int]) -> Dict[Tuple[int, int], float]:
+    """Previous approach: sum every entry effective up to the date."""
+    balances = {}
+    for employee_id in employee_ids:
+        rows = session.execute(FULL_HISTORY, {"employee_id": employee_id}).all()
+        for policy_id, amount in rows:
+            balances[(employee_id, policy_id)] = amount
+    return balances
+
+
+def from_snapshots(session: Session, employee_ids: List[int]) -> Dict[Tuple[int, int], float]:
+    """Latest snapshot plus the entries after it."""
+    service = BalanceLedgerService(session)
+    balances = {}
+    for employee_id in employee_ids:
+        for policy_id, balance in service.balances_as_of(employee_id, POLICY_IDS, AS_OF_DATE).items():
+            balances[(employee_id, policy_id)] = balance.balance
+    return balances
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=5000)
+    parser.add_argument("--years", type=int, default=10)
+    args = parser.parse_args()
+
+    with scratch_schema("bench_balance_ledger") as session:
+        entries = seed(session, args.employees, args.years)
+        engine = session.get_bind().engine
+        sample = random.Random(SEED).sample(range(1, args.employees + 1), SAMPLE)
+        results: List[BenchmarkResult] = []
+
+        results.append(run_benchmark(
+            "as-of (sum full history)", entries, lambda: full_history(session, sample), engine=engine,
+        ))
+
+        service = BalanceLedgerService(session)
+        start = time.perf_counter()
+        snapshots = sum(service.compact(snapshot_date) for snapshot_date in snapshot_dates(args.years))
+        compact_ms = (time.perf_counter() - start) * 1000
+        execute_script(session, "ANALYZE balance_ledger_snapshot;")
+
+        results.append(run_benchmark(
+            "as-of (snapshot + tail)", entries, lambda: from_snapshots(session, sample), engine=engine,
+        ))
+
+        expected = full_history(session, sample)
+        actual = from_snapshots(session, sample)
+        for key, amount in expected.items():
+            assert abs(actual[key] - amount) < 1e-6, f"{key}: {actual[key]} != {amount}"
+
+        assert service.compact(snapshot_dates(args.years)[-1]) == 0, "re-compaction wrote snapshots"
+
+    print_results(f"Balance as of {AS_OF_DATE} for {SAMPLE} employees x {len(POLICY_IDS)} policies", results)
+    print(
+        f"\n{entries:,} ledger entries; compaction wrote {snapshots:,} snapshots "
+        f"in {compact_ms:,.0f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""Benchmark: set-based balance reconciliation vs. a per-pair loop.
+
+Seeds employees with a year of ledger entries (carryover, bi-weekly
+accruals, usage) under two balance types and stored balances that match
+the ledger, then breaks a known share of pairs: shifted allocations,
+usage and carryover, missing stored rows and stored rows without ledger
+history. Reconciliation runs with the previous per-(employee, policy)
+loop (a balance lookup and a ledger sum per pair) and with
+BalanceReconciler, and both must find exactly the broken pairs. Writing
+the corrections must leave nothing to find on the next run.
+
+Usage::
+
+    python -m src.tests.benchmarks.bench_balance_reconciliation [--sizes 5000 50000]
+"""
+
+import argparse
+from datetime import date, datetime
+from typing import List, Set, Tuple
+
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+
+from src.models.balance_ledger import BalanceLedgerEntry, BalanceLedgerSnapshot
+from src.models.employee import Employee
+from src.models.time_off_policy import PolicyStatus, TimeOffPolicy
+from src.models.time_off_request import TimeOffBalance
+from src.services.balance_reconciliation import DISCREPANCY_TOLERANCE, BalanceReconciler
+from src.tests.benchmarks.common import (
+    BenchmarkResult,
+    create_tables,
+    execute_script,
+    print_results,
+    run_benchmark,
+    scratch_schema,
+)
+
+
+AS_OF_DATE = date(2025, 6, 30)
+BALANCE_TYPES = ["vacation", "sick"]
+
+# Every BROKEN_EVERY-th employee has one broken pair, cycling through the
+# ways a pair can break
+BROKEN_EVERY = 20
+BREAKS = ["allocated", "used", "carryover", "missing_stored", "missing_ledger"]
+
+
+def seed(session: Session, size: int) -> Set[Tuple[int, str]]:
+    """Create the tables and population; returns the broken (employee, type) pairs."""
+    create_tables(
+        session, Employee, TimeOffPolicy, TimeOffBalance, BalanceLedgerEntry, BalanceLedgerSnapshot,
+    )
+    # A retired vacation policy: reporting must pick the active one
+    session.add(TimeOffPolicy(id=1, name="Vacation (2019)", code="VAC19", policy_type="vacation",
+                              status=PolicyStatus.ARCHIVED.value, effective_date=datetime(2019, 1, 1)))
+    session.add(TimeOffPolicy(id=2, name="Vacation", code="VAC", policy_type="vacation",
+                              status=PolicyStatus.ACTIVE.value, effective_date=datetime(2020, 1, 1)))
+    session.add(TimeOffPolicy(id=3, name="Sick", code="SICK", policy_type="sick",
+                              status=PolicyStatus.ACTIVE.value, effective_date=datetime(2020, 1, 1)))
+    session.flush()
+
+    params = {"size": size, "year_start": date(AS_OF_DATE.year, 1, 1), "as_of": AS_OF_DATE}
+    session.execute(text("""
+        INSERT INTO employee (id, employee_id, email, first_name, last_name, employment_status,
+                              hire_date, is_active, created_at, updated_at)
+        SELECT e, 'E' || lpad(e::text, 7, '0'), 'user' || e || '@example.com', 'First', 'Last',
+               'active', DATE '2015-01-01', true, now(), now()
+        FROM generate_series(1, :size) e
+    """), params)
+    # Carryover on Jan 1, bi-weekly accruals and occasional usage, half of
+    # the vacation history still on the retired policy
+    session.execute(text("""
+        INSERT INTO balance_ledger_entry (employee_id, policy_id, entry_type, amount,
+                                          effective_date, source_type)
+        SELECT e, p, 'carryover', (e % 7)::float, CAST(:year_start AS date), 'migration'
+        FROM generate_series(1, :size) e, (VALUES (1), (3)) AS policies(p)
+        UNION ALL
+        SELECT e, CASE WHEN p = 2 AND extract(month FROM d) <= 3 THEN 1 ELSE p END,
+               'accrual', 3.0 + (e % 4) * 0.5, d::date, 'accrual_run'
+        FROM generate_series(1, :size) e, (VALUES (2), (3)) AS policies(p),
+             generate_series(CAST(:year_start AS date), CAST(:as_of AS date), interval '14 days') d
+        UNION ALL
+        SELECT e, p, 'usage', -8.0, d::date, 'time_off_request'
+        FROM generate_series(1, :size) e, (VALUES (2), (3)) AS policies(p),
+             generate_series(CAST(:year_start AS date), CAST(:as_of AS date), interval '1 month') d
+        WHERE (e + p + extract(month FROM d)::int) % 3 = 0
+    """), params)
+    session.execute(text("""
+        INSERT INTO time_off_balance (employee_id, balance_type, year, total_allocated, used,
+                                      pending, available, carried_over)
+        SELECT l.employee_id, p.policy_type, :year,
+               sum(l.amount) FILTER (WHERE l.entry_type IN ('accrual', 'adjustment')),
+               -coalesce(sum(l.amount) FILTER (WHERE l.entry_type = 'usage'), 0),
+               0, sum(l.amount),
+               coalesce(sum(l.amount) FILTER (WHERE l.entry_type = 'carryover'), 0)
+        FROM balance_ledger_entry l JOIN time_off_policy p ON p.id = l.policy_id
+        GROUP BY l.employee_id, p.policy_type
+    """), {"year": AS_OF_DATE.year})
+
+    broken = set()
+    for index, employee_id in enumerate(range(BROKEN_EVERY, size + 1, BROKEN_EVERY)):
+        kind = BREAKS[index % len(BREAKS)]
+        balance_type = BALANCE_TYPES[index % len(BALANCE_TYPES)]
+        broken.add((employee_id, balance_type))
+        key = {"employee_id": employee_id, "balance_type": balance_type, "year": AS_OF_DATE.year}
+        match = "employee_id = :employee_id AND balance_type = :balance_type AND year = :year"
+        if kind == "allocated":
+            session.execute(text(f"UPDATE time_off_balance SET total_allocated = total_allocated + 1.5 WHERE {match}"), key)
+        elif kind == "used":
+            session.execute(text(f"UPDATE time_off_balance SET used = used + 0.25 WHERE {match}"), key)
+        elif kind == "carryover":
+            session.execute(text(f"UPDATE time_off_balance SET carried_over = carried_over + 3 WHERE {match}"), key)
+        elif kind == "missing_stored":
+            session.execute(text(f"DELETE FROM time_off_balance WHERE {match}"), key)
+        else:
+            session.execute(text("""
+                DELETE FROM balance_ledger_entry l USING time_off_policy p
+                WHERE p.id = l.policy_id AND l.employee_id = :employee_id
+                  AND p.policy_type = :balance_type
+            """), key)
+            session.execute(text(f"UPDATE time_off_balance SET total_allocated = total_allocated + 1 WHERE {match}"), key)
+
+    execute_script(session, "ANALYZE employee; ANALYZE time_off_balance; ANALYZE balance_ledger_entry;")
+    return broken
+
+
+def per_pair(session: Session) -> Set[Tuple[int, str]]:
+    """Previous shape: for every employee and active policy, query both sides."""
+    found = set()
+    employees = session.execute(select(Employee).where(Employee.is_active == True)).scalars().all()
+    policies = session.execute(
+        select(TimeOffPolicy).where(TimeOffPolicy.status == PolicyStatus.ACTIVE.value)
+    ).scalars().all()
+    year_start = date(AS_OF_DATE.year, 1, 1)
+
+    for employee in employees:
+        for policy in policies:
+            stored = session.execute(
+                select(TimeOffBalance).where(
+                    TimeOffBalance.employee_id == employee.id,
+                    TimeOffBalance.balance_type == policy.policy_type,
+                    TimeOffBalance.year == AS_OF_DATE.year,
+                )
+            ).scalar_one_or_none()
+            expected = session.execute(
+                select(func.coalesce(func.sum(BalanceLedgerEntry.amount), 0.0))
+                .join(TimeOffPolicy, TimeOffPolicy.id == BalanceLedgerEntry.policy_id)
+                .where(
+                    BalanceLedgerEntry.employee_id == employee.id,
+                    TimeOffPolicy.policy_type == policy.policy_type,
+                    BalanceLedgerEntry.effective_date.between(year_start, AS_OF_DATE),
+                )
+            ).scalar_one()
+            actual = stored.total_allocated + stored.carried_over - stored.used if stored else 0.0
+            if abs(actual - expected) >= DISCREPANCY_TOLERANCE:
+                found.add((employee.id, policy.policy_type))
+    return found
+
+
+def set_based(session: Session) -> Set[Tuple[int, str]]:
+    return {
+        (diff.employee_id, diff.balance_type)
+        for page in BalanceReconciler(session).discrepancies(AS_OF_DATE)
+        for diff in page
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5000, 50000])
+    parser.add_argument(
+        "--per-pair-max",
+        type=int,
+        default=5000,
+        help="Largest employee count to run the slow per-pair loop at",
+    )
+    args = parser.parse_args()
+
+    results: List[BenchmarkResult] = []
+    for size in args.sizes:
+        pairs = size * len(BALANCE_TYPES)
+        with scratch_schema(f"bench_reconciliation_{size}") as session:
+            broken = seed(session, size)
+            engine = session.get_bind().engine
+
+            if size <= args.per_pair_max:
+                result = run_benchmark("reconcile (per-pair loop)", pairs,
+                                       lambda: per_pair(session), engine=engine, repeat=1)
+                assert per_pair(session) == broken, "per-pair loop missed pairs"
+                results.append(result)
+
+            results.append(run_benchmark("reconcile (set-based diff)", pairs,
+                                         lambda: set_based(session), engine=engine, repeat=3))
+            assert set_based(session) == broken, "set-based diff missed pairs"
+
+            reconciler = BalanceReconciler(session)
+            diffs = [diff for page in reconciler.discrepancies(AS_OF_DATE) for diff in page]
+            results.append(run_benchmark(
+                "write corrections (one upsert)", len(diffs),
+                lambda: reconciler.apply_corrections(diffs, AS_OF_DATE, "Benchmark correction"),
+                engine=engine, repeat=1,
+            ))
+            assert not set_based(session), "corrected pairs still differ"
+
+    print_results("Balance reconciliation", results)
+    print(f"\nbroken pairs: 1 in {BROKEN_EVERY} employees")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Benchmark: team balances from batched queries vs. per-employee lookups.
+
+Seeds departments of employees with balance rows under three policies
+and a mix of pending and approved requests, then loads a team's
+per-policy balances the previous way (for each employee: the active
+policies, then a balance row and the pending requests per policy) and
+with BatchBalanceService (four queries for the whole team). Both must
+agree on every available and pending figure.
+
+Usage::
+
+    python -m src.tests.benchmarks.bench_batch_balance [--teams 10 100 1000]
+"""
+
+import argparse
+from datetime import date, datetime
+from typing import Dict, List, Tuple
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from src.models.employee import Department, Employee
+from src.models.time_off_policy import PolicyStatus, TimeOffPolicy
+from src.models.time_off_request import TimeOffBalance, TimeOffRequest, TimeOffRequestStatus
+from src.services.batch_balance_service import BatchBalanceService
+from src.tests.benchmarks.common import (
+    BenchmarkResult,
+    create_tables,
+    execute_script,
+    print_results,
+    run_benchmark,
+    scratch_schema,
+)
+
+
+AS_OF_DATE = date(2025, 6, 10)
+POLICY_TYPES = ["vacation", "sick", "personal"]
+EMPLOYEES = 20000
+
+
+def seed(session: Session) -> None:
+    """Create the tables and population."""
+    create_tables(session, Department, Employee, TimeOffPolicy, TimeOffBalance, TimeOffRequest)
+    session.add(Department(id=1, code="ENG", name="Engineering"))
+    for index, policy_type in enumerate(POLICY_TYPES, start=1):
+        session.add(TimeOffPolicy(
+            id=index, name=policy_type.title(), code=policy_type.upper(), policy_type=policy_type,
+            status=PolicyStatus.ACTIVE.value, accrual_method="monthly_accrual",
+            base_accrual_rate=12.0 * index, effective_date=datetime(2020, 1, 1),
+        ))
+    session.flush()
+
+    params = {"size": EMPLOYEES, "year": AS_OF_DATE.year, "as_of": AS_OF_DATE}
+    session.execute(text("""
+        INSERT INTO employee (id, employee_id, email, first_name, last_name, employment_status,
+                              hire_date, is_active, department_id, created_at, updated_at)
+        SELECT e, 'E' || lpad(e::text, 7, '0'), 'user' || e || '@example.com', 'First', 'Last',
+               'active', DATE '2015-01-01', true, 1, now(), now()
+        FROM generate_series(1, :size) e
+    """), params)
+    # Every third (employee, type) pair has no balance row and falls back
+    # to the policy's base allocation
+    session.execute(text("""
+        INSERT INTO time_off_balance (employee_id, balance_type, year, total_allocated, used,
+                                      pending, available, carried_over)
+        SELECT e, t, :year, 15 + e % 5, e % 7, e % 3, 0, e % 4
+        FROM generate_series(1, :size) e, unnest(ARRAY['vacation', 'sick', 'personal']) t
+        WHERE (e + length(t)) % 3 <> 0
+    """), params)
+    session.execute(text("""
+        INSERT INTO time_off_request (employee_id, request_type, start_date, end_date, total_days,
+                                      is_half_day, status, approval_level, created_at)
+        SELECT e, t, CAST(:as_of AS date) + (e % 40), CAST(:as_of AS date) + (e % 40) + 1, 2,
+               false, CASE WHEN e % 2 = 0 THEN 'pending_approval' ELSE 'approved' END, 1, now()
+        FROM generate_series(1, :size) e, unnest(ARRAY['vacation', 'sick']) t
+        WHERE e % 5 < 2
+    """), params)
+    execute_script(session, """
+        CREATE INDEX ON time_off_request (employee_id);
+        ANALYZE employee; ANALYZE time_off_balance; ANALYZE time_off_request;
+    """)
+
+
+def per_employee(session: Session, employee_ids: List[int]) -> Dict[Tuple[int, int], Tuple[float, int]]:
+    """Previous shape: get_employee_balance once per team member."""
+    figures = {}
+    for employee_id in employee_ids:
+        policies = session.execute(
+            select(TimeOffPolicy).where(TimeOffPolicy.status == PolicyStatus.ACTIVE.value)
+        ).scalars().all()
+        for policy in policies:
+            balance = session.execute(
+                select(TimeOffBalance).where(
+                    TimeOffBalance.employee_id == employee_id,
+                    TimeOffBalance.balance_type == policy.policy_type,
+                    TimeOffBalance.year == AS_OF_DATE.year,
+                )
+            ).scalars().first()
+            pending_requests = session.execute(
+                select(TimeOffRequest).where(
+                    TimeOffRequest.employee_id == employee_id,
+                    TimeOffRequest.request_type == policy.policy_type,
+                    TimeOffRequest.status == TimeOffRequestStatus.PENDING_APPROVAL.value,
+                )
+            ).scalars().all()
+            if balance:
+                available = balance.total_allocated + balance.carried_over - balance.used - balance.pending
+            else:
+                available = policy.base_accrual_rate
+            figures[(employee_id, policy.id)] = (available, len(pending_requests))
+    return figures
+
+
+def batched(session: Session, employee_ids: List[int]) -> Dict[Tuple[int, int], Tuple[float, int]]:
+    return {
+        (employee_id, p.policy.id): (p.available, len(p.pending_requests))
+        for employee_id, employee in BatchBalanceService(session).get_balances(
+            employee_ids, as_of_date=AS_OF_DATE
+        ).items()
+        for p in employee.policies
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--teams", type=int, nargs="+", default=[10, 100, 1000])
+    args = parser.parse_args()
+
+    results: List[BenchmarkResult] = []
+    with scratch_schema("bench_batch_balance") as session:
+        seed(session)
+        engine = session.get_bind().engine
+
+        for team in args.teams:
+            # A contiguous slice of the population, like a department
+            employee_ids = list(range(1, team + 1))
+            results.append(run_benchmark(f"team of {team} (per-employee)", team,
+                                         lambda: per_employee(session, employee_ids), engine=engine))
+            results.append(run_benchmark(f"team of {team} (batched)", team,
+                                         lambda: batched(session, employee_ids), engine=engine))
+            assert batched(session, employee_ids) == per_employee(session, employee_ids), "figures differ"
+
+    print_results(f"Team balances, {len(POLICY_TYPES)} policies", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Benchmark: business calendar prefix sums vs. day-by-day loops.
+
+Counts business days and working hours over random 2-year ranges with
+the previous per-day loops (the weekday loop in calculate_business_days
+and the schedule-plus-holiday loop in calculate_sick_leave_duration) and
+with BusinessCalendar lookups, and reports the one-off cost of building
+a calendar. No database is needed.
+
+Usage::
+
+    python -m src.tests.benchmarks.bench_business_calendar [--ranges 1000]
+"""
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from typing import Callable, List, Tuple
+
+from src.services.business_calendar_service import (
+    WEEKDAY_NAMES,
+    BusinessCalendar,
+    week_hours_for_days,
+)
+
+
+RANGE_DAYS = 730
+WORK_DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+HOURS_PER_DAY = 8.0
+HOLIDAYS = [
+    date(year, month, day)
+    for year in range(2024, 2029)
+    for month, day in [(1, 1), (5, 27), (7, 4), (9, 2), (11, 28), (12, 25), (12, 26)]
+]
+
+
+def weekday_loop(start: date, end: date) -> float:
+    """Previous calculate_business_days."""
+    days = 0
+    current = start
+    while current <= end:
+        if current.weekday() < 5:
+            days += 1
+        current += timedelta(days=1)
+    return float(days)
+
+
+def schedule_loop(start: date, end: date) -> float:
+    """Previous sick leave totals: day name, schedule and holiday list per day."""
+    total_hours = 0.0
+    current = start
+    while current <= end:
+        is_work = WEEKDAY_NAMES[current.weekday()].capitalize() in WORK_DAYS
+        is_holiday = current in HOLIDAYS
+        if is_work and not is_holiday:
+            total_hours += HOURS_PER_DAY
+        current += timedelta(days=1)
+    return total_hours
+
+
+def time_total(func: Callable[[date, date], float], ranges: List[Tuple[date, date]]) -> float:
+    """Total seconds to evaluate every range."""
+    start = time.perf_counter()
+    for range_start, range_end in ranges:
+        func(range_start, range_end)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ranges", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    ranges = []
+    for _ in range(args.ranges):
+        start = date(2025, 1, 1) + timedelta(days=rng.randint(0, 365))
+        ranges.append((start, start + timedelta(days=RANGE_DAYS - 1)))
+
+    week_hours = week_hours_for_days(WORK_DAYS, HOURS_PER_DAY)
+    build_start = time.perf_counter()
+    weekdays = BusinessCalendar(2024, 2028)
+    calendar = BusinessCalendar(2024, 2028, week_hours, HOLIDAYS)
+    build_ms = (time.perf_counter() - build_start) * 1000 / 2
+
+    for range_start, range_end in ranges[:50]:
+        assert weekdays.business_days(range_start, range_end) == weekday_loop(range_start, range_end)
+        assert calendar.working_hours(range_start, range_end) == schedule_loop(range_start, range_end)
+
+    rows = [
+        ("business days / weekday loop", time_total(weekday_loop, ranges)),
+        ("business days / calendar", time_total(weekdays.business_days, ranges)),
+        ("working hours / schedule loop", time_total(schedule_loop, ranges)),
+        ("working hours / calendar", time_total(calendar.working_hours, ranges)),
+    ]
+
+    print(f"\nBusiness calendar, {args.ranges} ranges of {RANGE_DAYS} days")
+    print(f"Calendar build (5 years): {build_ms:.2f} ms")
+    print(f"{'count / method':<34} {'total ms':>10} {'us/range':>10}")
+    print("-" * 56)
+    for name, seconds in rows:
+        print(f"{name:<34} {seconds * 1000:>10.1f} {seconds * 1e6 / args.ranges:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
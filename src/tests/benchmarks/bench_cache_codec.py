@@ -0,0 +1,132 @@
+"""Benchmark: cache value encoding, typed codec vs. the previous JSON path.
+
+Encodes balance projections, org subtrees and untyped team balance
+summaries of increasing size with the previous ``json.dumps(default=str)``
+/ ``json.loads`` pair and with CacheSerializer, reporting encode and
+decode time and stored size. No database or Redis is needed.
+
+Usage::
+
+    python -m src.tests.benchmarks.bench_cache_codec [--sizes 10 100 1000]
+"""
+
+import argparse
+import json
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, List
+
+from src.infrastructure.redis.codec import CacheSerializer, orjson
+
+
+REPEAT = 50
+
+
+def balance_projection(months: int) -> Dict[str, Any]:
+    """A projection with one entry per month, like BalanceProjection output."""
+    start = date(2025, 1, 1)
+    return {
+        "employee_id": 42,
+        "policy_id": 3,
+        "generated_at": datetime(2025, 1, 1, 8, 0),
+        "current_balance": Decimal("12.50"),
+        "points": [
+            {
+                "date": start + timedelta(days=30 * i),
+                "accrued": Decimal("1.25"),
+                "used": Decimal("0.00") if i % 3 else Decimal("2.00"),
+                "balance": Decimal("12.50") + Decimal("1.25") * i,
+                "capped": i % 12 == 11,
+            }
+            for i in range(months)
+        ],
+    }
+
+
+def org_subtree(size: int) -> List[Dict[str, Any]]:
+    """A flattened org subtree, like OrgTreeService output."""
+    return [
+        {
+            "id": i,
+            "manager_id": i // 5 if i else None,
+            "depth": len(bin(i + 1)) - 3,
+            "name": f"Employee {i:05d}",
+            "title": "Software Engineer",
+            "department": "Engineering",
+            "hire_date": date(2020, 1, 1) + timedelta(days=i),
+            "is_active": True,
+        }
+        for i in range(size)
+    ]
+
+
+def team_balances(size: int) -> Dict[str, Any]:
+    """Balance summaries keyed by employee, with no date or Decimal fields."""
+    return {
+        str(i): {
+            "available": 15.0 - (i % 10),
+            "pending": 2.0 if i % 2 else 0.0,
+            "used_ytd": 5.0 + (i % 7),
+            "status": "healthy",
+        }
+        for i in range(size)
+    }
+
+
+def legacy_encode(value: Any) -> str:
+    return json.dumps(value, default=str)
+
+
+def time_us(func: Callable[[], Any]) -> float:
+    """Median time per call in microseconds."""
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1e6)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def bench_value(name: str, size: int, value: Any) -> List[tuple]:
+    """Measure both encodings of one value."""
+    serializer = CacheSerializer()
+    rows = []
+
+    for label, encode, decode in [
+        ("json (default=str)", legacy_encode, json.loads),
+        ("typed codec", serializer.encode, serializer.decode),
+    ]:
+        encoded = encode(value)
+        rows.append((
+            f"{name} / {label}",
+            size,
+            time_us(lambda: encode(value)),
+            time_us(lambda: decode(encoded)),
+            len(encoded),
+        ))
+
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    args = parser.parse_args()
+
+    rows = []
+    for size in args.sizes:
+        rows.extend(bench_value("projection", size, balance_projection(size)))
+        rows.extend(bench_value("org subtree", size, org_subtree(size)))
+        rows.extend(bench_value("team balances", size, team_balances(size)))
+
+    print(f"\nCache value encoding (orjson {'available' if orjson else 'not installed'})")
+    print(f"{'payload / encoding':<36} {'size':>6} {'encode us':>11} {'decode us':>11} {'bytes':>9}")
+    print("-" * 77)
+    for name, size, encode_us, decode_us, nbytes in rows:
+        print(f"{name:<36} {size:>6} {encode_us:>11.1f} {decode_us:>11.1f} {nbytes:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""Benchmark: directory facet counts, per facet vs. one grouping query vs. cached.
+
+Seeds employees over departments, locations, employment types, managers and
+hire dates, applies the directory migration's data-version triggers, then
+counts every facet for a few filter selections:
+
+- per facet: one GROUP BY query per facet, each with every other filter
+  applied, as the filters endpoint would need to reflect the selection
+- grouped: DirectoryFacetService.count_facets, all facets in one GROUPING
+  SETS scan
+- cached: DirectoryFacetService.get_facets on a warm cache, one version read
+
+Per-facet and grouped counts must agree exactly. Also checks that a write
+to an employee retires the cached counts.
+
+Usage::
+
+    python -m src.tests.benchmarks.bench_directory_facets [--employees 100000]
+"""
+
+import argparse
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.models.employee import Department, Employee, Location
+from src.services.directory_facet_service import (
+    FACETS,
+    TENURE_BUCKETS,
+    DirectoryFacetFilters,
+    DirectoryFacetService,
+)
+from src.tests.benchmarks.common import (
+    BenchmarkResult,
+    create_tables,
+    execute_script,
+    print_results,
+    run_benchmark,
+    scratch_schema,
+)
+
+
+DEPARTMENTS = 40
+LOCATIONS = 12
+TEAM_SIZE = 8
+AS_OF = date(2025, 6, 1)
+MIGRATIONS = [
+    Path(__file__).resolve().parents[3] / "db" / "migrations" / name
+    for name in ("008_create_data_version.sql", "012_data_version_change_log.sql")
+]
+
+SELECTIONS = {
+    "no filters": DirectoryFacetFilters(),
+    "one department": DirectoryFacetFilters(department_ids=frozenset({3})),
+    "department, tenure, managers": DirectoryFacetFilters(
+        department_ids=frozenset({3, 4, 5}),
+        tenure=frozenset({"2_5_years", "5_plus_years"}),
+        is_manager=True,
+    ),
+}
+
+# Per-employee facet values, as the facet service derives them
+FACET_SQL = {
+    "department": "e.department_id",
+    "location": "e.location_id",
+    "employment_type": "e.employment_type",
+    "is_manager": "m.manager_id IS NOT NULL",
+    "tenure": "CASE WHEN e.hire_date IS NULL THEN NULL "
+              + " ".join(
+                  f"WHEN e.hire_date >= DATE '{AS_OF}' - {next_min - 1} THEN '{value}'"
+                  for (value, _, _), (_, _, next_min) in zip(TENURE_BUCKETS, TENURE_BUCKETS[1:])
+              )
+              + f" ELSE '{TENURE_BUCKETS[-1][0]}' END",
+}
+
+
+def seed(session: Session, employees: int) -> None:
+    """Create the directory tables with their version triggers, and employees."""
+    create_tables(session, Department, Location, Employee)
+    for migration in MIGRATIONS:
+        execute_script(session, migration.read_text())
+    session.add_all(
+        Department(id=d, code=f"D{d}", name=f"Department {d}") for d in range(1, DEPARTMENTS + 1)
+    )
+    session.add_all(
+        Location(id=loc, code=f"L{loc}", name=f"Location {loc}", address_line1=f"{loc} High Street",
+                 city="Springfield", postal_code="62701", country="US")
+        for loc in range(1, LOCATIONS + 1)
+    )
+    session.flush()
+    session.execute(text("""
+        INSERT INTO employee (id, employee_id, email, first_name, last_name, employment_status,
+                              employment_type, hire_date, is_active, department_id, location_id,
+                              manager_id, created_at, updated_at)
+        SELECT e, 'E' || lpad(e::text, 7, '0'), 'user' || e || '@example.com', 'First' || e,
+               'Last' || e, 'active',
+               (ARRAY['full_time', 'part_time', 'contractor', 'intern'])[1 + e % 4],
+               DATE '2025-06-01' - (e * 37 % 4000), e % 25 <> 0,
+               1 + (e / :team) % :departments, NULLIF(1 + e % (:locations + 1), :locations + 1),
+               NULLIF((e - 1) / :team * :team + 1, e), now(), now()
+        FROM generate_series(1, :employees) e
+    """), {"employees": employees, "team": TEAM_SIZE, "departments": DEPARTMENTS,
+           "locations": LOCATIONS})
+    execute_script(session, "ANALYZE employee;")
+
+
+def matches(filters: DirectoryFacetFilters) -> Dict[str, str]:
+    """SQL condition for each facet filter that is applied."""
+    def listed(values) -> str:
+        return ", ".join(f"'{value}'" if isinstance(value, str) else str(value)
+                         for value in sorted(values))
+
+    conditions = {}
+    for facet, values in (("department", filters.department_ids),
+                          ("location", filters.location_ids),
+                          ("employment_type", filters.employment_types),
+                          ("tenure", filters.tenure)):
+        if values:
+            conditions[facet] = f"({FACET_SQL[facet]}) IN ({listed(values)})"
+    if filters.is_manager is not None:
+        conditions["is_manager"] = f"({FACET_SQL['is_manager']}) = {filters.is_manager}"
+    return conditions
+
+
+def per_facet(session: Session, filters: DirectoryFacetFilters) -> Dict[str, Dict[Any, int]]:
+    """Each facet grouped in its own query, with every other filter applied."""
+    conditions = matches(filters)
+    counts = {}
+    for facet in FACETS:
+        where = ["e.is_active"] + [sql for name, sql in conditions.items() if name != facet]
+        counts[facet] = dict(session.execute(text(f"""
+            SELECT {FACET_SQL[facet]}, count(*)
+            FROM employee e
+            LEFT JOIN (SELECT manager_id FROM employee WHERE is_active AND manager_id IS NOT NULL
+                       GROUP BY manager_id) m ON m.manager_id = e.id
+            WHERE {' AND '.join(where)}
+            GROUP BY 1
+        """)).all())
+    session.execute(text("SELECT id, name FROM department WHERE is_active ORDER BY name")).all()
+    session.execute(text("SELECT id, name FROM location WHERE is_active ORDER BY name")).all()
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=100000)
+    args = parser.parse_args()
+
+    results: List[BenchmarkResult] = []
+    with scratch_schema("bench_directory_facets") as session:
+        seed(session, args.employees)
+        engine = session.get_bind().engine
+        service = DirectoryFacetService(session)
+
+        for label, filters in SELECTIONS.items():
+            expected = per_facet(session, filters)
+            counted = service.count_facets(filters, AS_OF)
+            for facet in FACETS:
+                actual = {key: count for key, count in counted.counts[facet].items() if count}
+                assert actual == expected[facet], f"{label}: {facet} counts differ"
+
+            results.append(run_benchmark(f"{label} (per facet)", args.employees,
+                                         lambda: per_facet(session, filters), engine=engine))
+            results.append(run_benchmark(f"{label} (grouped)", args.employees,
+                                         lambda: service.count_facets(filters, AS_OF), engine=engine))
+            service.get_facets(filters, AS_OF)
+            results.append(run_benchmark(f"{label} (cached)", args.employees,
+                                         lambda: service.get_facets(filters, AS_OF), engine=engine))
+
+        # A write bumps the version, and the next read recounts
+        filters = SELECTIONS["one department"]
+        before = service.get_facets(filters, AS_OF)
+        session.execute(text("UPDATE employee SET department_id = 3 WHERE id = 2"))
+        after = service.get_facets(filters, AS_OF)
+        assert after.version > before.version and after is not before
+
+    print_results("Directory facet counts", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Benchmark: closure-table hierarchy lookups vs. per-node hierarchy walks.
+
+Seeds a synthetic org (fan-out 8) of 10k and 100k employees into a scratch
+schema, then compares query count and latency for subtree, manager-chain
+and "is X above Y" lookups between the previous per-node SELECT loops and
+EmployeeHierarchyRepository.
+
+Usage::
+
+    python -m src.tests.benchmarks.bench_employee_hierarchy [--sizes 10000 100000]
+"""
+
+import argparse
+from pathlib import Path
+from typing import List
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.data.employee_hierarchy_repository import EmployeeHierarchyRepository
+from src.models.employee import Employee
+from src.tests.benchmarks.common import (
+    BenchmarkResult,
+    execute_script,
+    print_results,
+    run_benchmark,
+    scratch_schema,
+)
+
+
+FAN_OUT = 8
+MAX_DEPTH = 10
+MIGRATION_PATH = (
+    Path(__file__).resolve().parents[3] / "db" / "migrations" / "003_create_employee_hierarchy.sql"
+)
+
+EMPLOYEE_TABLE_SQL = """
+CREATE TABLE employee (
+    id INTEGER PRIMARY KEY,
+    manager_id INTEGER REFERENCES employee(id) ON DELETE SET NULL
+);
+CREATE INDEX idx_employee_manager_id ON employee(manager_id);
+"""
+
+
+# =============================================================================
+# Previous per-node implementations (for comparison)
+# =============================================================================
+
+def legacy_all_reports(session: Session, manager_id: int, max_depth: int, depth: int = 0) -> List[int]:
+    """One SELECT per manager node, recursing in Python."""
+    if depth >= max_depth:
+        return []
+    stmt = select(Employee.id).where(Employee.manager_id == manager_id)
+    direct = list(session.execute(stmt).scalars().all())
+    result = list(direct)
+    for report_id in direct:
+        result.extend(legacy_all_reports(session, report_id, max_depth, depth + 1))
+    return result
+
+
+def legacy_manager_chain(session: Session, employee_id: int, max_depth: int) -> List[int]:
+    """One SELECT per level walking up the chain."""
+    managers = []
+    current_id = employee_id
+    for _ in range(max_depth):
+        stmt = select(Employee.manager_id).where(Employee.id == current_id)
+        manager_id = session.execute(stmt).scalar_one_or_none()
+        if manager_id is None:
+            break
+        managers.append(manager_id)
+        current_id = manager_id
+    return managers
+
+
+def legacy_is_above(session: Session, manager_id: int, employee_id: int, max_depth: int) -> bool:
+    """One SELECT per level until the manager is found."""
+    chain = legacy_manager_chain(session, employee_id, max_depth)
+    return manager_id in chain
+
+
+# =============================================================================
+# Benchmark
+# =============================================================================
+
+def seed(session: Session, size: int) -> None:
+    """Create the schema and a balanced org of ``size`` employees."""
+    execute_script(session, EMPLOYEE_TABLE_SQL)
+    execute_script(session, MIGRATION_PATH.read_text())
+
+    connection = session.connection()
+
+    rows = [(1, None)] + [(i, (i - 2) // FAN_OUT + 1) for i in range(2, size + 1)]
+    batch = 5000
+    for start in range(0, len(rows), batch):
+        connection.exec_driver_sql(
+            "INSERT INTO employee (id, manager_id) VALUES (%s, %s)",
+            rows[start:start + batch],
+        )
+    execute_script(session, "ANALYZE employee; ANALYZE employee_hierarchy;")
+
+
+def bench_size(size: int) -> List[BenchmarkResult]:
+    """Run all lookups against an org of the given size."""
+    with scratch_schema(f"bench_hierarchy_{size}") as session:
+        seed(session, size)
+        engine = session.get_bind().engine
+        hierarchy = EmployeeHierarchyRepository(session)
+
+        vp_id = 2          # First-level manager, ~1/8 of the company below
+        leaf_id = size     # Deepest employee
+
+        cases = [
+            ("subtree (legacy walk)", lambda: legacy_all_reports(session, vp_id, MAX_DEPTH)),
+            ("subtree (closure)", lambda: hierarchy.get_descendant_ids(vp_id, MAX_DEPTH)),
+            ("manager chain (legacy walk)", lambda: legacy_manager_chain(session, leaf_id, MAX_DEPTH)),
+            ("manager chain (closure)", lambda: hierarchy.get_ancestor_ids(leaf_id, MAX_DEPTH)),
+            ("is above (legacy walk)", lambda: legacy_is_above(session, 1, leaf_id, MAX_DEPTH)),
+            ("is above (closure)", lambda: hierarchy.is_ancestor(1, leaf_id, MAX_DEPTH)),
+        ]
+
+        return [
+            run_benchmark(name, size, func, engine=engine, repeat=3)
+            for name, func in cases
+        ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    results: List[BenchmarkResult] = []
+    for size in args.sizes:
+        results.extend(bench_size(size))
+
+    print_results("Employee hierarchy lookups", results)
+
+
+if __name__ == "__main__":
+    main()
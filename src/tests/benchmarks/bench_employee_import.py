@@ -0,0 +1,122 @@
+"""Benchmark: batched savepoint import writes vs. per-row ORM flushes.
+
+Generates employee CSV files of increasing size with a small share of
+duplicate emails, then imports them with the previous one-flush-per-row
+path and with EmployeeImportService.write_employee_batch (multi-row
+INSERTs under a SAVEPOINT per batch, bisecting on failure). Both paths
+stream the file through CsvStream and write Employee and ImportRow rows.
+
+Usage::
+
+    python -m src.tests.benchmarks.bench_employee_import [--sizes 1000 10000 100000]
+"""
+
+import argparse
+import uuid
+from typing import List
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.models.employee import Employee
+from src.models.import_row import ImportRow, ValidationStatus
+from src.services.employee_import_service import IMPORT_BATCH_SIZE, EmployeeImportService
+from src.tests.benchmarks.common import (
+    BenchmarkResult,
+    create_tables,
+    print_results,
+    run_benchmark,
+    scratch_schema,
+)
+from src.utils.csv_parser import CsvStream, to_json_compatible
+
+
+DUPLICATE_EVERY = 997  # Roughly 0.1% of rows reuse an earlier email
+JOB_ID = uuid.uuid4()
+
+
+def generate_csv(size: int) -> bytes:
+    """Build an import file with the given number of data rows."""
+    lines = ["employee_id,email,first_name,last_name,hire_date,job_title,salary"]
+    for i in range(size):
+        email_id = i - 1 if i and i % DUPLICATE_EVERY == 0 else i
+        lines.append(
+            f"E{i:07d},user{email_id}@example.com,First{i},Last{i},"
+            f"2024-01-{1 + i % 28:02d},Engineer,{50000 + i % 1000}.00"
+        )
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def per_row(session: Session, content: bytes) -> int:
+    """Previous path: one ORM flush per employee (with a per-row savepoint so it survives duplicates)."""
+    service = EmployeeImportService(session)
+    written = 0
+    for row in CsvStream(content).rows():
+        if not row.is_valid:
+            continue
+        try:
+            with session.begin_nested():
+                session.add(Employee(**service._employee_values(row.data)))
+                session.flush()
+            session.add(ImportRow(
+                import_job_id=JOB_ID,
+                row_number=row.row_number,
+                source_data=to_json_compatible(row.data),
+                mapped_data=to_json_compatible(row.data),
+                validation_status=ValidationStatus.VALID,
+                is_processed=True,
+            ))
+            written += 1
+        except IntegrityError:
+            continue
+    session.flush()
+    return written
+
+
+def batched(session: Session, content: bytes) -> int:
+    """Multi-row INSERTs per batch under a savepoint, bisecting failures."""
+    service = EmployeeImportService(session)
+    written = 0
+    for batch in CsvStream(content).batches(IMPORT_BATCH_SIZE):
+        result = service.write_employee_batch(JOB_ID, [row for row in batch if row.is_valid])
+        written += len(result.written)
+    return written
+
+
+def bench_case(name: str, func, size: int, content: bytes, expected: int) -> BenchmarkResult:
+    """Run one import path into an empty schema."""
+    with scratch_schema(f"bench_import_{size}") as session:
+        create_tables(session, Employee, ImportRow)
+        engine = session.get_bind().engine
+        written: List[int] = []
+        result = run_benchmark(
+            name, size, lambda: written.append(func(session, content)), engine=engine, repeat=1
+        )
+        assert written == [expected], f"{name} wrote {written[0]} rows, expected {expected}"
+        return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument(
+        "--per-row-max",
+        type=int,
+        default=10000,
+        help="Largest size to run the slow per-row path at",
+    )
+    args = parser.parse_args()
+
+    results: List[BenchmarkResult] = []
+    for size in args.sizes:
+        content = generate_csv(size)
+        expected = size - (size - 1) // DUPLICATE_EVERY
+        if size <= args.per_row_max:
+            results.append(bench_case("import (per-row flush)", per_row, size, content, expected))
+        results.append(bench_case("import (batched savepoints)", batched, size, content, expected))
+
+    print_results("Employee import write path", results)
+
+
+if __name__ == "__main__":
+    main()
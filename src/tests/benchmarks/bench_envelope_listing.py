@@ -0,0 +1,179 @@
+"""Benchmark: envelope listing, joined collections vs. paged ids with IN loads.
+
+Seeds envelopes with 10 recipients and 50 fields each, sent by the listing
+user, then lists a page of them as the envelope endpoint does:
+
+- joined: the former EnvelopeService.list_envelopes, joinedloading
+  recipients and fields into the page query (500 rows per envelope) after a
+  separate subquery count, and building full envelope responses
+- paged: EnvelopeService.list_envelopes, selecting the page of envelopes
+  with the total in one statement, then recipients and field counts for the
+  page in one IN query each, and building summaries
+
+Reports rows fetched alongside time and statements. Both must list the same
+envelopes with the same total and signing progress.
+
+Usage::
+
+    python -m src.tests.benchmarks.bench_envelope_listing [--envelopes 2000] [--page-size 20]
+"""
+
+import argparse
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import event, func, select, text
+from sqlalchemy.orm import Session, joinedload
+
+from src.models.employee import Department, Employee, Location
+from src.models.envelope import Envelope, EnvelopeField, EnvelopeRecipient
+from src.services.envelope_service import EnvelopeService
+from src.tests.benchmarks.common import (
+    BenchmarkResult,
+    create_tables,
+    execute_script,
+    print_results,
+    run_benchmark,
+    scratch_schema,
+)
+from src.utils.auth import UserRole, get_mock_current_user
+
+
+RECIPIENTS = 10
+FIELDS = 50
+SENDER_ID = 1
+
+
+def seed(session: Session, envelopes: int) -> None:
+    """Create envelopes, each with its recipients and fields."""
+    create_tables(session, Department, Location, Employee, Envelope, EnvelopeRecipient, EnvelopeField)
+    session.execute(text("""
+        INSERT INTO envelope (id, external_id, subject, message, status, sender_employee_id,
+                              sender_email, sender_name, document_ids, routing_order_enabled,
+                              reminder_enabled, reminder_delay_days, reminder_frequency_days,
+                              completed_count, total_recipients, completion_percentage, created_at)
+        SELECT e, md5(e::text), 'Agreement ' || e, repeat('Please sign. ', 40),
+               (ARRAY['sent', 'in_progress', 'completed'])[1 + e % 3], :sender,
+               'sender@example.com', 'Sender', '["doc-1", "doc-2"]', true, true, 3, 3, 0, 0, 0,
+               TIMESTAMP '2025-01-01' + e * INTERVAL '1 minute'
+        FROM generate_series(1, :envelopes) e
+    """), {"envelopes": envelopes, "sender": SENDER_ID})
+    session.execute(text("""
+        INSERT INTO envelope_recipient (id, envelope_id, email, name, recipient_type, routing_order,
+                                        status, access_token, created_at)
+        SELECT (e - 1) * :recipients + r, e, 'signer' || r || '@example.com', 'Signer ' || r,
+               CASE WHEN r % 5 = 0 THEN 'carbon_copy' ELSE 'signer' END, 1 + r / 3,
+               CASE WHEN r <= e % :recipients THEN 'signed' ELSE 'sent' END, md5(e || '-' || r), now()
+        FROM generate_series(1, :envelopes) e, generate_series(1, :recipients) r
+    """), {"envelopes": envelopes, "recipients": RECIPIENTS})
+    session.execute(text("""
+        INSERT INTO envelope_field (envelope_id, recipient_id, field_type, field_name, document_index,
+                                    page_number, x_position, y_position, width, height, required,
+                                    read_only, value, completed, created_at)
+        SELECT e, (e - 1) * :recipients + 1 + f % :recipients, 'text', 'field_' || f, 0, 1 + f / 10,
+               f * 10, f * 12, 200, 50, true, false, 'value ' || f, f % 2 = 0, now()
+        FROM generate_series(1, :envelopes) e, generate_series(1, :fields) f
+    """), {"envelopes": envelopes, "recipients": RECIPIENTS, "fields": FIELDS})
+    execute_script(session, "ANALYZE envelope; ANALYZE envelope_recipient; ANALYZE envelope_field;")
+
+
+def joined(session: Session, user, page: int, page_size: int) -> Tuple[list, int]:
+    """The former listing: joined collections after a subquery count."""
+    service = EnvelopeService(session)
+    stmt = (
+        select(Envelope)
+        .options(joinedload(Envelope.recipients), joinedload(Envelope.fields))
+        .where(
+            (Envelope.sender_employee_id == user.employee_id) |
+            (Envelope.id.in_(
+                select(EnvelopeRecipient.envelope_id)
+                .where(EnvelopeRecipient.employee_id == user.employee_id)
+            ))
+        )
+    )
+    total = session.execute(select(func.count()).select_from(stmt.subquery())).scalar() or 0
+    envelopes = session.execute(
+        stmt.order_by(Envelope.created_at.desc()).offset((page - 1) * page_size).limit(page_size)
+    ).unique().scalars().all()
+    return [service._build_envelope_response(e) for e in envelopes], total
+
+
+class RowCounter:
+    """Counts rows fetched from the database while active."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.rows = 0
+
+    def _on_execute(self, conn, cursor, *args) -> None:
+        if cursor.rowcount > 0:
+            self.rows += cursor.rowcount
+
+    def __enter__(self) -> "RowCounter":
+        event.listen(self.engine, "after_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        event.remove(self.engine, "after_cursor_execute", self._on_execute)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--envelopes", type=int, default=2000)
+    parser.add_argument("--page-size", type=int, default=20)
+    args = parser.parse_args()
+
+    user = get_mock_current_user(roles=[UserRole.EMPLOYEE], employee_id=SENDER_ID)
+    results: List[BenchmarkResult] = []
+    fetched: Dict[str, int] = {}
+    with scratch_schema("bench_envelope_listing") as session:
+        seed(session, args.envelopes)
+        engine = session.get_bind().engine
+        service = EnvelopeService(session)
+        last_page = (args.envelopes + args.page_size - 1) // args.page_size
+
+        for page in (1, last_page // 2):
+            full, full_total = joined(session, user, page, args.page_size)
+            session.expunge_all()
+            summaries, total = service.list_envelopes(user, page=page, page_size=args.page_size)
+            session.expunge_all()
+            assert total == full_total == args.envelopes
+            assert [s.id for s in summaries] == [e.id for e in full]
+            for summary, envelope in zip(summaries, full):
+                assert summary.completion_percentage == envelope.completion_percentage
+                # Recipients at one routing order come in no particular order
+                for workflow in (summary.workflow_status, envelope.workflow_status):
+                    workflow.waiting_for.sort()
+                    workflow.next_recipients.sort()
+                assert summary.workflow_status == envelope.workflow_status
+                assert summary.fields_total == len(envelope.fields)
+                assert summary.fields_completed == sum(f.completed for f in envelope.fields)
+
+            def run_joined(page=page) -> Any:
+                result = joined(session, user, page, args.page_size)
+                session.expunge_all()
+                return result
+
+            def run_paged(page=page) -> Any:
+                result = service.list_envelopes(user, page=page, page_size=args.page_size)
+                session.expunge_all()
+                return result
+
+            for label, func_ in ((f"page {page} (joined)", run_joined),
+                                 (f"page {page} (paged)", run_paged)):
+                with RowCounter(engine) as counter:
+                    func_()
+                fetched[label] = counter.rows
+                results.append(run_benchmark(label, args.envelopes, func_, engine=engine))
+
+        # Past the last page the total still comes back
+        summaries, total = service.list_envelopes(user, page=last_page + 1, page_size=args.page_size)
+        assert summaries == [] and total == args.envelopes
+
+    print_results(f"Envelope listing ({RECIPIENTS} recipients, {FIELDS} fields each)", results)
+    print(f"\n{'operation':<40} {'rows fetched':>13}")
+    for label, rows in fetched.items():
+        print(f"{label:<40} {rows:>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Benchmark: employee full-text search, inline tsvector vs. stored column.
+
+Seeds employees with repeating names and job titles, then runs searches
+that match a handful, thousands, and all of the directory:
+
+- inline: the previous query; builds the tsvector from the name, email
+  and title columns for every row, twice (filter and rank), plus a
+  separate count
+- stored: FullTextSearchService on migration 002's weighted
+  ``search_vector`` column and GIN index, ranking a bounded candidate set
+
+Both must agree on how many employees match. Also times a batch of
+status-only updates, which the stored column's trigger skips.
+
+Usage::
+
+    python -m src.tests.benchmarks.bench_fulltext_search [--employees 100000]
+"""
+
+import argparse
+import importlib
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.models.employee import Department, Employee, Location
+from src.services.fulltext_search_service import FullTextSearchService, SearchQuery
+from src.tests.benchmarks.common import (
+    BenchmarkResult,
+    create_tables,
+    execute_script,
+    print_results,
+    run_benchmark,
+    scratch_schema,
+)
+
+
+fulltext_migration = importlib.import_module("src.database.migrations.002_fulltext_search")
+
+PAGE_SIZE = 20
+FIRST_NAMES = ["ada", "alan", "grace", "edsger", "barbara", "donald", "frances", "john",
+               "margaret", "dennis", "ken", "radia", "leslie", "tim", "vint", "lynn"]
+JOB_TITLES = ["Software Engineer", "Data Analyst", "Product Manager", "Designer",
+              "Recruiter", "Accountant", "Support Specialist", "Sales Executive"]
+# Search text -> what it matches
+QUERIES = {
+    "lastname4242": "one surname (a few rows)",
+    "margaret": "one first name (~6%)",
+    "engineer": "one job title (~12%)",
+    "lastname": "prefix (all rows)",
+}
+
+INLINE_DOCUMENT = """
+    to_tsvector('english',
+        COALESCE(first_name, '') || ' ' ||
+        COALESCE(last_name, '') || ' ' ||
+        COALESCE(email, '') || ' ' ||
+        COALESCE(job_title, '')
+    )
+"""
+
+
+def seed(session: Session, employees: int) -> None:
+    """Create the tables, run the migration's employee section and seed."""
+    create_tables(session, Department, Location, Employee)
+    execute_script(session, fulltext_migration.EMPLOYEE_SEARCH_MIGRATION)
+    session.execute(text("""
+        INSERT INTO employee (id, employee_id, email, first_name, last_name, job_title,
+                              employment_status, hire_date, is_active, created_at, updated_at)
+        SELECT e, 'E' || lpad(e::text, 7, '0'), 'user' || e || '@example.com',
+               (:first_names)[1 + e % 16], 'Lastname' || (e % 20000),
+               (:job_titles)[1 + e % 8], 'active', DATE '2015-01-01', true, now(), now()
+        FROM generate_series(1, :employees) e
+    """), {"employees": employees, "first_names": FIRST_NAMES, "job_titles": JOB_TITLES})
+    execute_script(session, "ANALYZE employee;")
+
+
+def inline_search(session: Session, tsquery: str) -> int:
+    """Previous shape: count, then the ranked page, both on the inline tsvector."""
+    params = {"query": tsquery, "limit": PAGE_SIZE}
+    total = session.execute(text(f"""
+        SELECT count(*) FROM employee
+        WHERE {INLINE_DOCUMENT} @@ to_tsquery('english', :query)
+    """), params).scalar()
+    session.execute(text(f"""
+        SELECT *, ts_rank_cd({INLINE_DOCUMENT}, to_tsquery('english', :query)) AS rank
+        FROM employee
+        WHERE {INLINE_DOCUMENT} @@ to_tsquery('english', :query)
+        ORDER BY rank DESC
+        LIMIT :limit
+    """), params).all()
+    return total
+
+
+def stored_search(session: Session, query: str) -> int:
+    response = FullTextSearchService(session).search(SearchQuery(query=query, page_size=PAGE_SIZE))
+    assert response.results, f"no results for {query!r}"
+    return response.total_results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=100000)
+    args = parser.parse_args()
+
+    results: List[BenchmarkResult] = []
+    with scratch_schema("bench_fulltext_search") as session:
+        seed(session, args.employees)
+        engine = session.get_bind().engine
+
+        for query, label in QUERIES.items():
+            tsquery = f"{query}:*"
+            results.append(run_benchmark(f"{label} (inline)", args.employees,
+                                         lambda: inline_search(session, tsquery), engine=engine))
+            results.append(run_benchmark(f"{label} (stored)", args.employees,
+                                         lambda: stored_search(session, query), engine=engine))
+            assert inline_search(session, tsquery) == stored_search(session, query), \
+                f"match counts differ for {query!r}"
+
+        results.append(run_benchmark("update status of 10% (trigger skips)", args.employees, lambda: (
+            session.execute(text("UPDATE employee SET employment_status = 'active' WHERE id % 10 = 0"))
+        ), engine=engine, repeat=3))
+        results.append(run_benchmark("update job title of 10%", args.employees, lambda: (
+            session.execute(text("""
+                UPDATE employee SET job_title = CASE WHEN job_title LIKE '% II'
+                    THEN left(job_title, -3) ELSE job_title || ' II' END
+                WHERE id % 10 = 0
+            """))
+        ), engine=engine, repeat=3))
+
+    print_results(f"Employee search, {PAGE_SIZE} per page", results)
+
+
+if __name__ == "__main__":
+    main()
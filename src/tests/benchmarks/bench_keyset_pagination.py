@@ -0,0 +1,133 @@
+"""Benchmark: deep directory pages with OFFSET vs. keyset cursors.
+
+Seeds employees whose names repeat (so the id tie-breaker matters), then
+loads directory pages at increasing depth through
+EmployeeRepository.get_directory:
+
+- offset: page number with an exact total, the previous shape; the
+  database reads and discards every row in front of the page and counts
+  the whole listing
+- keyset: the cursor of the row before the page with an estimated total;
+  the name index seeks straight to the page
+
+Both must return the same employees, and walking a slice of the directory
+cursor by cursor must match walking it by page number.
+
+Usage::
+
+    python -m src.tests.benchmarks.bench_keyset_pagination [--employees 1000000] [--pages 1 100 1000 10000]
+"""
+
+import argparse
+from typing import List
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from src.data.employee_repository import (
+    DIRECTORY_SORT_KEYS,
+    EmployeeRepository,
+    PaginationParams,
+    SearchFilters,
+    SortParams,
+)
+from src.data.keyset_pagination import CountMode, encode_cursor
+from src.models.employee import Department, Employee, Location
+from src.tests.benchmarks.common import (
+    BenchmarkResult,
+    create_tables,
+    execute_script,
+    print_results,
+    run_benchmark,
+    scratch_schema,
+)
+
+
+PAGE_SIZE = 20
+SCOPE = "directory:last_name:asc"
+WALK_PAGES = 25
+
+
+def seed(session: Session, employees: int) -> None:
+    """Create the tables and the population."""
+    create_tables(session, Department, Location, Employee)
+    session.add(Department(id=1, code="ENG", name="Engineering"))
+    session.flush()
+    session.execute(text("""
+        INSERT INTO employee (id, employee_id, email, first_name, last_name, employment_status,
+                              hire_date, is_active, department_id, created_at, updated_at)
+        SELECT e, 'E' || lpad(e::text, 7, '0'), 'user' || e || '@example.com',
+               'First' || (e::bigint * 7919 % 700), 'Last' || (e::bigint * 104729 % 5000),
+               'active', DATE '2015-01-01', true, 1, now(), now()
+        FROM generate_series(1, :employees) e
+    """), {"employees": employees})
+    execute_script(session, "ANALYZE employee; ANALYZE department;")
+
+
+def cursor_before(session: Session, page: int) -> str:
+    """Cursor of the last row of the previous page, as a client would hold it."""
+    keys = DIRECTORY_SORT_KEYS["last_name"]
+    row = session.execute(
+        select(*(key.column for key in keys))
+        .order_by(*(key.column for key in keys))
+        .offset((page - 1) * PAGE_SIZE - 1)
+        .limit(1)
+    ).one()
+    return encode_cursor(SCOPE, list(row))
+
+
+def by_offset(repository: EmployeeRepository, page: int) -> List[int]:
+    result = repository.get_directory(
+        PaginationParams(page=page, page_size=PAGE_SIZE), SortParams(), SearchFilters(),
+    )
+    return [e.id for e in result.items]
+
+
+def by_cursor(repository: EmployeeRepository, cursor: str) -> List[int]:
+    result = repository.get_directory(
+        PaginationParams(page_size=PAGE_SIZE), SortParams(), SearchFilters(),
+        cursor=cursor, count_mode=CountMode.ESTIMATED,
+    )
+    return [e.id for e in result.items]
+
+
+def check_walk(repository: EmployeeRepository) -> None:
+    """Following next_cursor must visit the same rows as page numbers."""
+    cursor = None
+    for page in range(1, WALK_PAGES + 1):
+        result = repository.get_directory(
+            PaginationParams(page=page, page_size=PAGE_SIZE), SortParams(), SearchFilters(),
+            cursor=cursor, count_mode=CountMode.NONE,
+        )
+        assert [e.id for e in result.items] == by_offset(repository, page), f"page {page} differs"
+        cursor = result.next_cursor
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=1000000)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 100, 1000, 10000])
+    args = parser.parse_args()
+
+    results: List[BenchmarkResult] = []
+    with scratch_schema("bench_keyset_pagination") as session:
+        seed(session, args.employees)
+        engine = session.get_bind().engine
+        repository = EmployeeRepository(session)
+        check_walk(repository)
+
+        for page in args.pages:
+            results.append(run_benchmark(f"page {page} (offset, exact count)", args.employees,
+                                         lambda: by_offset(repository, page), engine=engine))
+            if page == 1:
+                continue
+            cursor = cursor_before(session, page)
+            results.append(run_benchmark(f"page {page} (cursor, estimated count)", args.employees,
+                                         lambda: by_cursor(repository, cursor), engine=engine))
+            assert by_cursor(repository, cursor) == by_offset(repository, page), "pages differ"
+
+    print_results(f"Directory pages of {PAGE_SIZE}, by last name", results)
+
+
+if __name__ == "__main__":
+    main()
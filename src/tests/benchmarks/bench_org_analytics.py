@@ -0,0 +1,162 @@
+"""Benchmark: organizational density, count queries vs. one tree pass vs. cached.
+
+Seeds an eight-wide reporting tree over departments and locations, with
+some inactive employees cutting off their reports, applies the directory
+migration's data-version triggers, then computes span of control and
+density:
+
+- per query: the density endpoint's former approach, a count query per
+  manager and three per department (20 of each, direct reports only) and
+  two per location
+- one pass: OrgAnalyticsService.build_analytics, every manager's direct
+  and total reports, levels and every department's density, from one read
+  of the edges
+- cached: OrgAnalyticsService.get_analytics on a warm cache, one version
+  read
+
+The one-pass figures are checked against recursive queries for a sample of
+managers and against grouped counts for every department. Also checks that
+a write to an employee retires the cached tree.
+
+Usage::
+
+    python -m src.tests.benchmarks.bench_org_analytics [--employees 100000]
+"""
+
+import argparse
+from pathlib import Path
+from typing import List
+
+from sqlalchemy import distinct, func, select, text
+from sqlalchemy.orm import Session
+
+from src.models.employee import Department, Employee, Location
+from src.services.org_analytics_service import OrgAnalyticsService
+from src.tests.benchmarks.common import (
+    BenchmarkResult,
+    create_tables,
+    execute_script,
+    print_results,
+    run_benchmark,
+    scratch_schema,
+)
+
+
+DEPARTMENTS = 40
+LOCATIONS = 12
+FAN_OUT = 8
+MIGRATIONS = [
+    Path(__file__).resolve().parents[3] / "db" / "migrations" / name
+    for name in ("008_create_data_version.sql", "012_data_version_change_log.sql")
+]
+
+
+def seed(session: Session, employees: int) -> None:
+    """Create the directory tables with their version triggers, and a reporting tree."""
+    create_tables(session, Department, Location, Employee)
+    for migration in MIGRATIONS:
+        execute_script(session, migration.read_text())
+    session.add_all(
+        Department(id=d, code=f"D{d}", name=f"Department {d}") for d in range(1, DEPARTMENTS + 1)
+    )
+    session.add_all(
+        Location(id=loc, code=f"L{loc}", name=f"Location {loc}", address_line1=f"{loc} High Street",
+                 city="Springfield", postal_code="62701", country="US")
+        for loc in range(1, LOCATIONS + 1)
+    )
+    session.flush()
+    session.execute(text("""
+        INSERT INTO employee (id, employee_id, email, first_name, last_name, employment_status,
+                              employment_type, hire_date, is_active, department_id, location_id,
+                              manager_id, created_at, updated_at)
+        SELECT e, 'E' || lpad(e::text, 7, '0'), 'user' || e || '@example.com', 'First' || e,
+               'Last' || e, 'active', 'full_time', DATE '2020-01-01', e % 97 <> 0,
+               1 + e % :departments, 1 + e % :locations,
+               CASE WHEN e > 1 THEN (e - 2) / :fan_out + 1 END, now(), now()
+        FROM generate_series(1, :employees) e
+    """), {"employees": employees, "departments": DEPARTMENTS, "locations": LOCATIONS,
+           "fan_out": FAN_OUT})
+    execute_script(session, "ANALYZE employee;")
+
+
+def per_query(session: Session) -> None:
+    """Counts as the density endpoint issued them, one query each."""
+    managers = session.execute(
+        select(Employee.id)
+        .where(Employee.is_active == True)
+        .where(Employee.id.in_(select(distinct(Employee.manager_id)).where(Employee.manager_id.isnot(None))))
+        .limit(20)
+    ).scalars().all()
+    for manager_id in managers:
+        session.execute(select(func.count()).where(Employee.manager_id == manager_id,
+                                                   Employee.is_active == True)).scalar()
+    for department_id in range(1, 21):
+        session.execute(select(func.count()).where(Employee.department_id == department_id,
+                                                   Employee.is_active == True)).scalar()
+        session.execute(select(func.count(distinct(Employee.manager_id))).where(
+            Employee.department_id == department_id, Employee.manager_id.isnot(None),
+            Employee.is_active == True)).scalar()
+    for location_id in range(1, LOCATIONS + 1):
+        session.execute(select(func.count()).where(Employee.location_id == location_id,
+                                                   Employee.is_active == True)).scalar()
+        session.execute(select(func.count(distinct(Employee.department_id))).where(
+            Employee.location_id == location_id, Employee.is_active == True)).scalar()
+
+
+def check(session: Session, service: OrgAnalyticsService) -> None:
+    """Compare the one-pass figures with recursive and grouped queries."""
+    analytics = service.build_analytics()
+    for span in analytics.spans()[:10] + analytics.spans()[-10:]:
+        total, levels = session.execute(text("""
+            WITH RECURSIVE below AS (
+                SELECT id, 1 AS depth FROM employee WHERE manager_id = :id AND is_active
+                UNION ALL
+                SELECT e.id, b.depth + 1 FROM employee e JOIN below b ON e.manager_id = b.id
+                WHERE e.is_active
+            )
+            SELECT count(*), max(depth) FROM below
+        """), {"id": span.employee_id}).one()
+        assert (span.total_reports, span.levels_below) == (total, levels), span
+
+    counts = session.execute(text("""
+        SELECT e.department_id, count(*), count(*) FILTER (WHERE EXISTS (
+            SELECT 1 FROM employee r WHERE r.manager_id = e.id AND r.is_active))
+        FROM employee e WHERE e.is_active GROUP BY 1
+    """)).all()
+    for department_id, employees, managers in counts:
+        headcount = analytics.headcount(department_id=department_id)
+        assert (headcount.employees, headcount.managers) == (employees, managers), department_id
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=100000)
+    args = parser.parse_args()
+
+    results: List[BenchmarkResult] = []
+    with scratch_schema("bench_org_analytics") as session:
+        seed(session, args.employees)
+        engine = session.get_bind().engine
+        service = OrgAnalyticsService(session)
+        check(session, service)
+
+        results.append(run_benchmark("20 managers, 20 departments (per query)", args.employees,
+                                     lambda: per_query(session), engine=engine))
+        results.append(run_benchmark("every manager and department (one pass)", args.employees,
+                                     service.build_analytics, engine=engine))
+        service.get_analytics()
+        results.append(run_benchmark("every manager and department (cached)", args.employees,
+                                     service.get_analytics, engine=engine))
+
+        # A write bumps the version, and the next read rebuilds
+        before = service.get_analytics()
+        session.execute(text("UPDATE employee SET manager_id = 1 WHERE id = 50"))
+        after = service.get_analytics()
+        assert after.version > before.version and after is not before
+        assert after.managers[1].direct_reports == before.managers[1].direct_reports + 1
+
+    print_results("Organizational density", results)
+
+
+if __name__ == "__main__":
+    main()
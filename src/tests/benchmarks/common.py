@@ -0,0 +1,169 @@
+"""Shared helpers for benchmarks."""
+
+import statistics
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Generator, List, Optional, Sequence
+
+from sqlalchemy import Column, Index, MetaData, Table, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from src.database.database import DatabaseConfig, get_engine
+
+
+@dataclass
+class BenchmarkResult:
+    """Timing and query count for one benchmarked operation."""
+    
+    name: str
+    size: int
+    timings_ms: List[float] = field(default_factory=list)
+    queries: int = 0
+    
+    @property
+    def median_ms(self) -> float:
+        """Median wall time in milliseconds."""
+        return statistics.median(self.timings_ms) if self.timings_ms else 0.0
+    
+    @property
+    def best_ms(self) -> float:
+        """Fastest observed wall time in milliseconds."""
+        return min(self.timings_ms) if self.timings_ms else 0.0
+
+
+class QueryCounter:
+    """Counts statements executed on an engine while active."""
+    
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.count = 0
+    
+    def _on_execute(self, *args, **kwargs) -> None:
+        self.count += 1
+    
+    def __enter__(self) -> "QueryCounter":
+        self.count = 0
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+def run_benchmark(
+    name: str,
+    size: int,
+    func: Callable[[], object],
+    engine: Optional[Engine] = None,
+    repeat: int = 5,
+) -> BenchmarkResult:
+    """
+    Time a callable several times and count the queries of one run.
+    
+    Args:
+        name: Label for the report
+        size: Dataset size the run was made against
+        func: Zero-argument callable to time
+        engine: Engine to count queries on (skipped if None)
+        repeat: Number of timed runs
+    """
+    result = BenchmarkResult(name=name, size=size)
+    
+    for i in range(repeat):
+        if engine is not None and i == 0:
+            with QueryCounter(engine) as counter:
+                start = time.perf_counter()
+                func()
+                result.timings_ms.append((time.perf_counter() - start) * 1000)
+            result.queries = counter.count
+        else:
+            start = time.perf_counter()
+            func()
+            result.timings_ms.append((time.perf_counter() - start) * 1000)
+    
+    return result
+
+
+def print_results(title: str, results: Sequence[BenchmarkResult]) -> None:
+    """Print benchmark results as an aligned table."""
+    print(f"\n{title}")
+    print(f"{'operation':<40} {'size':>10} {'queries':>9} {'median ms':>11} {'best ms':>10}")
+    print("-" * 84)
+    for r in results:
+        print(
+            f"{r.name:<40} {r.size:>10} {r.queries:>9} "
+            f"{r.median_ms:>11.2f} {r.best_ms:>10.2f}"
+        )
+
+
+def execute_script(session: Session, sql: str) -> None:
+    """Run a multi-statement SQL script on the session's DBAPI connection."""
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.execute(sql)
+    finally:
+        cursor.close()
+
+
+def create_tables(session: Session, *models) -> None:
+    """
+    Create the tables for the given models in the current schema.
+    
+    Columns, primary keys and indexes are copied but foreign keys are not,
+    so a benchmark only needs to create the tables it actually exercises.
+    """
+    metadata = MetaData()
+    
+    for model in models:
+        source = model.__table__
+        table = Table(
+            source.name,
+            metadata,
+            *[
+                Column(
+                    column.name,
+                    column.type,
+                    primary_key=column.primary_key,
+                    nullable=column.nullable,
+                    server_default=column.server_default,
+                    autoincrement=column.autoincrement,
+                )
+                for column in source.columns
+            ],
+        )
+        for index in source.indexes:
+            Index(
+                index.name,
+                *[table.c[column.name] for column in index.columns],
+                unique=index.unique,
+            )
+    
+    metadata.create_all(session.connection())
+
+
+@contextmanager
+def scratch_schema(schema: str) -> Generator[Session, None, None]:
+    """
+    Provide a session bound to a throwaway PostgreSQL schema.
+    
+    The schema is created fresh, placed first on the search_path so
+    unqualified table names resolve to it, and dropped afterwards.
+    """
+    engine = get_engine(DatabaseConfig.from_env())
+    connection = engine.connect()
+    connection.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+    connection.execute(text(f"CREATE SCHEMA {schema}"))
+    connection.execute(text(f"SET search_path TO {schema}, public"))
+    connection.commit()
+    
+    session = Session(bind=connection, autoflush=False, expire_on_commit=False)
+    try:
+        yield session
+    finally:
+        session.close()
+        connection.rollback()
+        connection.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+        connection.commit()
+        connection.close()
@@ -0,0 +1,149 @@
+"""Tests for keyset (cursor) pagination."""
+
+import uuid
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from src.data.employee_repository import DIRECTORY_SORT_KEYS
+from src.data.keyset_pagination import (
+    CountMode,
+    decode_cursor,
+    encode_cursor,
+    fetch_keyset_page,
+    keyset_after,
+)
+from src.models.employee import Employee
+from src.utils.errors import ValidationError
+
+
+NAME_KEYS = DIRECTORY_SORT_KEYS["last_name"]
+
+
+def sql(clause) -> str:
+    return str(clause.compile(dialect=postgresql.dialect()))
+
+
+def employee(id, first_name, last_name):
+    return SimpleNamespace(id=id, first_name=first_name, last_name=last_name)
+
+
+class TestCursor:
+    """Tests for cursor encoding."""
+
+    def test_round_trip(self):
+        """Test key values of every supported type survive a round trip."""
+        values = [
+            "O'Brien", 42, None, date(2025, 6, 10),
+            datetime(2025, 6, 10, 9, 30, tzinfo=timezone.utc), uuid.uuid4(),
+        ]
+
+        cursor = encode_cursor("directory:last_name:asc", values)
+
+        assert "=" not in cursor
+        assert decode_cursor(cursor, "directory:last_name:asc", len(values)) == values
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", "", "eyJzIjoxfQ"])
+    def test_malformed_rejected(self, cursor):
+        """Test garbage cursors are a validation error."""
+        with pytest.raises(ValidationError):
+            decode_cursor(cursor, "directory:last_name:asc", 3)
+
+    def test_other_sort_rejected(self):
+        """Test a cursor only applies to the listing and sort it came from."""
+        cursor = encode_cursor("directory:last_name:asc", ["Lovelace", "Ada", 1])
+
+        with pytest.raises(ValidationError):
+            decode_cursor(cursor, "directory:last_name:desc", 3)
+
+
+class TestKeysetAfter:
+    """Tests for the after-cursor condition."""
+
+    def test_row_comparison(self):
+        """Test non-nullable keys compare as one row value."""
+        condition = sql(keyset_after(NAME_KEYS, ["Lovelace", "Ada", 1]))
+
+        assert condition.startswith(
+            "(employee.last_name, employee.first_name, employee.id) >"
+        )
+        assert " < " in sql(keyset_after(NAME_KEYS, ["Lovelace", "Ada", 1], descending=True))
+
+    def test_nullable_key_expanded(self):
+        """Test a nullable key also admits the NULLs sorted after any value."""
+        keys = DIRECTORY_SORT_KEYS["job_title"]
+
+        condition = sql(keyset_after(keys, ["Engineer", "Lovelace", "Ada", 1]))
+
+        assert "employee.job_title > %(job_title_1)s OR employee.job_title IS NULL" in condition
+
+    def test_null_cursor_value(self):
+        """Test after a NULL only later rows among the NULLs qualify."""
+        keys = DIRECTORY_SORT_KEYS["job_title"]
+
+        condition = sql(keyset_after(keys, [None, "Lovelace", "Ada", 1]))
+
+        assert "employee.job_title >" not in condition
+        assert "employee.job_title IS NULL AND employee.last_name >" in condition
+
+
+class TestFetchKeysetPage:
+    """Tests for fetching one page."""
+
+    def page_session(self, rows, total=None):
+        session = MagicMock()
+        results = []
+        if total is not None:
+            results.append(MagicMock(**{"scalar.return_value": total}))
+        page = MagicMock()
+        page.unique.return_value.scalars.return_value = iter(rows)
+        results.append(page)
+        session.execute.side_effect = results
+        return session
+
+    def test_next_cursor_from_last_row(self):
+        """Test an extra row means a next page, continuing after the last row shown."""
+        rows = [employee(1, "Ada", "Lovelace"), employee(2, "Alan", "Turing"),
+                employee(3, "Grace", "Hopper")]
+        session = self.page_session(rows, total=10)
+
+        page = fetch_keyset_page(session, select(Employee), NAME_KEYS, "directory:last_name:asc",
+                                 page_size=2)
+
+        assert [e.id for e in page.items] == [1, 2]
+        assert page.total == 10 and not page.total_is_estimate
+        assert decode_cursor(page.next_cursor, "directory:last_name:asc", 3) == ["Turing", "Alan", 2]
+
+    def test_cursor_replaces_offset(self):
+        """Test a cursor seeks past the previous page instead of skipping rows."""
+        session = self.page_session([employee(3, "Grace", "Hopper")])
+        cursor = encode_cursor("directory:last_name:asc", ["Turing", "Alan", 2])
+
+        page = fetch_keyset_page(session, select(Employee), NAME_KEYS, "directory:last_name:asc",
+                                 page_size=2, cursor=cursor, offset=40,
+                                 count_mode=CountMode.NONE)
+
+        statement = sql(session.execute.call_args.args[0])
+        assert "(employee.last_name, employee.first_name, employee.id) >" in statement
+        assert "OFFSET" not in statement
+        # count_mode=none: the page query is the only query
+        assert session.execute.call_count == 1
+        assert page.total is None and not page.has_more
+
+    def test_cached_count(self):
+        """Test a cached count skips the count query."""
+        session = self.page_session([])
+        session.get_bind.return_value.dialect = postgresql.dialect()
+        cache = MagicMock()
+        cache.get.return_value = 1234
+
+        page = fetch_keyset_page(session, select(Employee), NAME_KEYS, "directory:last_name:asc",
+                                 page_size=20, count_mode=CountMode.CACHED, cache=cache)
+
+        assert page.total == 1234
+        assert session.execute.call_count == 1
+        cache.set.assert_not_called()
@@ -0,0 +1 @@
+"""Database session tests."""
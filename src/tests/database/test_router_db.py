@@ -0,0 +1,89 @@
+"""Tests for per-router sync/async database sessions."""
+
+import asyncio
+from contextlib import asynccontextmanager, contextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import database
+from src.database.database import (
+    DEFAULT_ASYNC_ROUTERS,
+    get_router_db,
+    parse_router_names,
+    run_db,
+    set_async_routers,
+)
+
+
+async def first_session(dependency):
+    """Drive a router dependency the way FastAPI does; returns its session."""
+    generator = dependency()
+    session = await generator.__anext__()
+    await generator.aclose()
+    return session
+
+
+class TestRunDb:
+    """Tests for running sync database code on either session."""
+
+    def test_sync_session_called_directly(self):
+        """Test a sync session is passed straight to the function."""
+        session = MagicMock()
+
+        result = asyncio.run(run_db(session, lambda s, x, y=0: (s, x, y), 1, y=2))
+
+        assert result == (session, 1, 2)
+
+    def test_async_session_uses_run_sync(self):
+        """Test an async session runs the function through run_sync."""
+        session = MagicMock(spec=AsyncSession)
+        session.run_sync = AsyncMock(return_value="loaded")
+
+        def load(s, employee_id):
+            return employee_id
+
+        result = asyncio.run(run_db(session, load, 7))
+
+        assert result == "loaded"
+        session.run_sync.assert_awaited_once_with(load, 7)
+
+
+class TestGetRouterDb:
+    """Tests for choosing a router's session."""
+
+    def teardown_method(self):
+        set_async_routers(None)
+
+    def test_dependency_is_shared_per_router(self):
+        """Test every endpoint of a router gets the same dependency."""
+        assert get_router_db("directory") is get_router_db("directory")
+        assert get_router_db("directory") is not get_router_db("search")
+
+    def test_session_follows_router_setting(self):
+        """Test listed routers get the async session and others the sync one."""
+        sync_session, async_session = MagicMock(), MagicMock(spec=AsyncSession)
+
+        @contextmanager
+        def sync_context():
+            yield sync_session
+
+        @asynccontextmanager
+        async def async_context():
+            yield async_session
+
+        set_async_routers(frozenset({"directory"}))
+        with patch.object(database, "get_db_context", sync_context), \
+                patch.object(database, "get_async_db_context", async_context):
+            assert asyncio.run(first_session(get_router_db("directory"))) is async_session
+            assert asyncio.run(first_session(get_router_db("org_chart"))) is sync_session
+
+            # Switching a router takes effect on the next request
+            set_async_routers(frozenset())
+            assert asyncio.run(first_session(get_router_db("directory"))) is sync_session
+
+    def test_parse_router_names(self):
+        """Test unset means the defaults and an empty value means none."""
+        assert parse_router_names(None) == DEFAULT_ASYNC_ROUTERS
+        assert parse_router_names("") == frozenset()
+        assert parse_router_names(" directory, search ,") == frozenset({"directory", "search"})
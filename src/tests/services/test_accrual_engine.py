@@ -0,0 +1,263 @@
+"""Tests for the columnar AccrualEngine."""
+
+import json
+import random
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.services.accrual_engine import NEVER, AccrualEngine, EmployeeColumns, is_accrual_date, np
+from src.services.policy_rules import compile_policy, invalidate_compiled_policy
+
+
+ACCRUAL_DATE = date(2025, 6, 1)
+
+
+@pytest.fixture(autouse=True)
+def clear_compiled():
+    """Start every test with no compiled policies."""
+    invalidate_compiled_policy()
+    yield
+    invalidate_compiled_policy()
+
+
+def make_policy(policy_id=1, **overrides):
+    values = dict(
+        id=policy_id,
+        version=1,
+        policy_type="vacation",
+        status="active",
+        accrual_method="monthly_accrual",
+        accrual_frequency="monthly",
+        base_accrual_rate=12.0,
+        accrual_cap=None,
+        max_balance=None,
+        waiting_period_days=90,
+        prorate_first_year=False,
+        effective_date=datetime(2020, 1, 1),
+        expiry_date=None,
+        eligibility_criteria=None,
+        tenure_tiers=json.dumps([
+            {"min_years": 0, "max_years": 2, "accrual_rate": 12.0},
+            {"min_years": 2, "max_years": 5, "accrual_rate": 18.0},
+            {"min_years": 5, "max_years": None, "accrual_rate": 24.0},
+        ]),
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def make_columns(hire_dates, fte=None, **attributes):
+    rows = [
+        SimpleNamespace(id=i + 1, hire_date=hire, employment_type="full_time",
+                        location_id=1, department_id=1, **attributes)
+        for i, hire in enumerate(hire_dates)
+    ]
+    return EmployeeColumns(
+        ids=[row.id for row in rows],
+        hire_ordinals=[hire.toordinal() for hire in hire_dates],
+        fte=list(fte) if fte is not None else [1.0] * len(rows),
+        rows=rows,
+    )
+
+
+def compute(engine, policy, columns, available=None, last_accrual=None):
+    compiled = compile_policy(policy)
+    return engine.compute(
+        columns,
+        compiled,
+        engine.parameters(policy, ACCRUAL_DATE),
+        available if available is not None else [0.0] * len(columns),
+        last_accrual if last_accrual is not None else [NEVER] * len(columns),
+        engine.rule_mask(columns, compiled, ACCRUAL_DATE),
+    )
+
+
+class TestAccrualParameters:
+    """Tests for per-policy accrual inputs."""
+
+    def test_cap_is_lowest_limit(self):
+        """Test the accrual cap and maximum balance combine to the lower one."""
+        engine = AccrualEngine(MagicMock(), use_numpy=False)
+
+        params = engine.parameters(make_policy(accrual_cap=40.0, max_balance=30.0), ACCRUAL_DATE)
+
+        assert params.cap == 30.0
+        assert params.periods == 12
+
+    def test_lump_sum_is_one_period(self):
+        """Test annual lump sums accrue once and prorate the year before the run."""
+        engine = AccrualEngine(MagicMock(), use_numpy=False)
+        policy = make_policy(accrual_method="annual_lump_sum", accrual_frequency="monthly",
+                             prorate_first_year=True)
+
+        params = engine.parameters(policy, ACCRUAL_DATE)
+
+        assert (params.periods, params.prorate_year, params.days_in_year) == (1, 2024, 366)
+
+
+class TestAccrualSchedule:
+    """Tests for gating accruals on policy period boundaries."""
+
+    @pytest.mark.parametrize("overrides, due, not_due", [
+        (dict(), date(2025, 6, 1), date(2025, 6, 2)),
+        (dict(accrual_frequency="semi-monthly"), date(2025, 6, 16), date(2025, 6, 15)),
+        (dict(accrual_frequency="weekly"), date(2025, 6, 6), date(2025, 6, 7)),
+        (dict(accrual_frequency="bi-weekly"), date(2025, 6, 6), date(2025, 6, 13)),
+        (dict(accrual_method="annual_lump_sum"), date(2025, 1, 1), date(2025, 6, 1)),
+    ])
+    def test_period_boundaries(self, overrides, due, not_due):
+        """Test each frequency accrues only where its period ends."""
+        policy = make_policy(**overrides)
+
+        assert is_accrual_date(policy, due)
+        assert not is_accrual_date(policy, not_due)
+
+    def test_consecutive_days_accrue_once(self):
+        """Test running a monthly and a lump-sum policy on consecutive days accrues one period."""
+        session = MagicMock()
+        policies = [
+            make_policy(1, tenure_tiers=None, waiting_period_days=0),
+            make_policy(2, policy_type="personal", accrual_method="annual_lump_sum",
+                        tenure_tiers=None, waiting_period_days=0),
+        ]
+        session.execute.return_value.scalars.return_value.all.return_value = policies
+        session.execute.return_value.__iter__.side_effect = lambda: iter([])
+        engine = AccrualEngine(session, use_numpy=False)
+        engine.load_employees = MagicMock(return_value=make_columns([date(2015, 1, 1)]))
+
+        totals = {
+            day: {p.policy_id: p.total_accrued for p in engine.run(day).policies}
+            for day in (date(2025, 1, 1), date(2025, 1, 2), date(2025, 2, 1))
+        }
+
+        assert totals[date(2025, 1, 1)] == pytest.approx({1: 1.0, 2: 12.0})
+        assert totals[date(2025, 1, 2)] == {}
+        assert totals[date(2025, 2, 1)] == pytest.approx({1: 1.0})
+
+
+class TestAccrualCompute:
+    """Tests for the accrual kernels."""
+
+    @pytest.fixture(params=[False, True], ids=["python", "numpy"])
+    def engine(self, request):
+        if request.param and np is None:
+            pytest.skip("NumPy is not installed")
+        return AccrualEngine(MagicMock(), use_numpy=request.param)
+
+    def test_tiers_and_waiting_period(self, engine):
+        """Test rates follow tenure tiers and new hires wait."""
+        columns = make_columns([
+            date(2024, 6, 1),    # 1 year: 12/yr
+            date(2022, 1, 1),    # 3 years: 18/yr
+            date(2015, 1, 1),    # 10 years: 24/yr
+            date(2025, 5, 1),    # Inside the waiting period
+            date(2025, 7, 1),    # Not yet hired
+        ], fte=[1.0, 0.5, 1.0, 1.0, 1.0])
+
+        indexes, amounts, capped = compute(engine, make_policy(), columns)
+
+        assert indexes == [0, 1, 2]
+        assert amounts == pytest.approx([1.0, 0.75, 2.0])
+        assert capped == 0
+
+    def test_cap_limits_accrual(self, engine):
+        """Test accruals stop at the cap without going negative."""
+        columns = make_columns([date(2015, 1, 1)] * 3)
+
+        indexes, amounts, capped = compute(
+            engine, make_policy(accrual_cap=20.0), columns, available=[10.0, 19.5, 25.0]
+        )
+
+        assert amounts == pytest.approx([2.0, 0.5, 0.0])
+        assert capped == 2
+
+    def test_already_accrued_is_skipped(self, engine):
+        """Test employees accrued on or after the date are left out."""
+        columns = make_columns([date(2015, 1, 1)] * 3)
+        last_accrual = [
+            (ACCRUAL_DATE - timedelta(days=31)).toordinal(),
+            ACCRUAL_DATE.toordinal(),
+            NEVER,
+        ]
+
+        indexes, _, _ = compute(engine, make_policy(), columns, last_accrual=last_accrual)
+
+        assert indexes == [0, 2]
+
+    def test_eligibility_rules_mask_employees(self, engine):
+        """Test employees failing a policy rule do not accrue."""
+        columns = make_columns([date(2015, 1, 1)] * 2)
+        columns.rows[1].employment_type = "contract"
+        policy = make_policy(eligibility_criteria=json.dumps([
+            {"field": "employment_type", "operator": "in", "value": ["full_time"]},
+        ]))
+
+        indexes, _, _ = compute(engine, policy, columns)
+
+        assert indexes == [0]
+
+    def test_first_year_proration(self, engine):
+        """Test the first lump sum is prorated by the days worked in the hire year."""
+        run_date = date(2025, 1, 1)
+        columns = make_columns([date(2023, 5, 1), date(2024, 1, 1), date(2024, 7, 2), run_date])
+        policy = make_policy(accrual_method="annual_lump_sum", base_accrual_rate=366.0,
+                             tenure_tiers=None, waiting_period_days=0, prorate_first_year=True)
+
+        indexes, amounts, _ = engine.compute(
+            columns, compile_policy(policy), engine.parameters(policy, run_date),
+            [0.0] * len(columns), [NEVER] * len(columns),
+        )
+
+        assert indexes == [0, 1, 2, 3]
+        assert amounts == pytest.approx([366.0, 366.0, 183.0, 366.0])
+
+    @pytest.mark.skipif(np is None, reason="NumPy is not installed")
+    def test_kernels_agree(self, engine):
+        """Test the NumPy and Python kernels give the same accruals."""
+        rng = random.Random(13)
+        size = 2000
+        columns = make_columns(
+            [ACCRUAL_DATE - timedelta(days=rng.randint(-30, 6000)) for _ in range(size)],
+            fte=[rng.choice([0.5, 0.75, 1.0]) for _ in range(size)],
+        )
+        available = [rng.uniform(0, 40) for _ in range(size)]
+        last_accrual = [rng.choice([NEVER, ACCRUAL_DATE.toordinal()]) for _ in range(size)]
+        policy = make_policy(accrual_cap=35.0)
+
+        expected = compute(AccrualEngine(MagicMock(), use_numpy=False), policy, columns,
+                           available, last_accrual)
+        actual = compute(engine, policy, columns, available, last_accrual)
+
+        assert actual[0] == expected[0]
+        assert actual[1] == pytest.approx(expected[1])
+        assert actual[2] == expected[2]
+
+
+class TestAccrualWrite:
+    """Tests for writing accruals back."""
+
+    def test_write_is_single_upsert(self):
+        """Test a policy's accruals and ledger entries are written with one statement."""
+        session = MagicMock()
+        engine = AccrualEngine(session, use_numpy=False)
+        columns = make_columns([date(2015, 1, 1)] * 3)
+
+        engine.write(columns, 7, "vacation", ACCRUAL_DATE, [0, 2], [2.0, 1.5])
+
+        session.execute.assert_called_once()
+        stmt, params = session.execute.call_args[0]
+        assert params == {"employee_ids": [1, 3], "amounts": [2.0, 1.5]}
+        sql = str(stmt)
+        assert "INSERT INTO balance_ledger_entry" in sql
+        assert "DELETE FROM balance_ledger_snapshot" in sql
+
+    def test_write_skips_empty(self):
+        """Test nothing is executed when nobody accrues."""
+        session = MagicMock()
+
+        AccrualEngine(session, use_numpy=False).write(make_columns([]), 7, "vacation", ACCRUAL_DATE, [], [])
+
+        session.execute.assert_not_called()
@@ -0,0 +1,212 @@
+"""Tests for sharded, checkpointed accrual runs."""
+
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.models.accrual_run import AccrualRun, AccrualRunShard, AccrualRunStatus
+from src.services.accrual_engine import AccrualRunResult, PolicyAccrual
+from src.services.accrual_run_service import AccrualRunService, build_run_report
+
+
+ACCRUAL_DATE = date(2025, 6, 1)
+
+
+def make_shard(**overrides):
+    values = dict(
+        id=10,
+        run_id=1,
+        shard_index=0,
+        first_employee_id=1,
+        last_employee_id=100,
+        employee_count=100,
+        status=AccrualRunStatus.PENDING.value,
+        checkpoint_employee_id=None,
+        attempts=0,
+        employees_processed=0,
+        employees_accrued=0,
+        elapsed_seconds=0.0,
+        policy_totals=None,
+        error=None,
+    )
+    values.update(overrides)
+    shard = AccrualRunShard(**values)
+    shard.run = AccrualRun(id=1, accrual_date=ACCRUAL_DATE, status=AccrualRunStatus.PENDING.value)
+    return shard
+
+
+def chunk_result(employee_ids, accrued=1.0):
+    return AccrualRunResult(
+        accrual_date=ACCRUAL_DATE,
+        employees=len(employee_ids),
+        policies=[PolicyAccrual(7, "vacation", len(employee_ids), 0, accrued * len(employee_ids))],
+        accrued_employee_ids=list(employee_ids),
+        elapsed_seconds=0.5,
+    )
+
+
+@pytest.fixture
+def engine():
+    with patch("src.services.accrual_run_service.AccrualEngine") as engine_cls:
+        engine = engine_cls.return_value
+        engine.run.side_effect = lambda accrual_date, ids: chunk_result(ids)
+        yield engine
+
+
+def make_service(shard, chunks):
+    session = MagicMock()
+    session.get.return_value = shard
+    service = AccrualRunService(session)
+    service._next_chunk = MagicMock(side_effect=chunks)
+    return service
+
+
+class TestPlanRun:
+    """Tests for splitting the population into shards."""
+
+    def test_shards_cover_id_ranges(self):
+        """Test shards hold shard_size active employees over contiguous ranges."""
+        session = MagicMock()
+        session.execute.return_value.scalars.return_value.all.return_value = [3, 5, 8, 13, 21]
+
+        run = AccrualRunService(session).plan_run(ACCRUAL_DATE, shard_size=2)
+
+        assert (run.total_employees, run.shard_count) == (5, 3)
+        assert [(s.first_employee_id, s.last_employee_id, s.employee_count) for s in run.shards] == [
+            (3, 5, 2), (8, 13, 2), (21, 21, 1),
+        ]
+        session.add.assert_called_once_with(run)
+        session.commit.assert_called_once()
+
+    def test_shard_size_must_be_positive(self):
+        """Test a zero shard size is rejected."""
+        with pytest.raises(ValueError):
+            AccrualRunService(MagicMock()).plan_run(ACCRUAL_DATE, shard_size=0)
+
+
+class TestDatesToRun:
+    """Tests for picking the dates a scheduled run catches up on."""
+
+    def _session(self, last_completed, planned=()):
+        session = MagicMock()
+        session.execute.return_value.scalar.return_value = last_completed
+        session.execute.return_value.scalars.return_value = list(planned)
+        return session
+
+    def test_missed_boundary_day_is_caught_up(self, engine):
+        """Test a boundary day after the last completed run is run late."""
+        engine.load_policies.side_effect = lambda d: ["monthly"] if d.day == 1 else []
+        session = self._session(date(2025, 5, 15))
+
+        dates = AccrualRunService(session).dates_to_run(date(2025, 6, 2))
+
+        assert dates == [date(2025, 6, 1)]
+        assert engine.load_policies.call_args_list[0].args == (date(2025, 5, 16),)
+
+    def test_dates_with_live_runs_are_skipped(self, engine):
+        """Test a date already planned is not planned again."""
+        engine.load_policies.return_value = ["monthly"]
+        session = self._session(date(2025, 5, 30), planned=[date(2025, 5, 31)])
+
+        dates = AccrualRunService(session).dates_to_run(date(2025, 6, 1))
+
+        assert dates == [date(2025, 6, 1)]
+
+    def test_catch_up_is_bounded(self, engine):
+        """Test only max_days are considered, and just today before any run completed."""
+        engine.load_policies.return_value = ["daily"]
+
+        assert AccrualRunService(self._session(date(2024, 1, 1))).dates_to_run(
+            date(2025, 6, 10), max_days=3
+        ) == [date(2025, 6, 8), date(2025, 6, 9), date(2025, 6, 10)]
+        assert AccrualRunService(self._session(None)).dates_to_run(date(2025, 6, 10)) == [
+            date(2025, 6, 10)
+        ]
+
+
+class TestRunShard:
+    """Tests for checkpointed shard execution."""
+
+    def test_checkpoints_each_chunk(self, engine):
+        """Test every chunk advances the checkpoint and is committed."""
+        shard = make_shard()
+        service = make_service(shard, [[1, 2], [3], []])
+        checkpoints = []
+
+        result = service.run_shard(shard.id, on_checkpoint=checkpoints.append)
+
+        assert result.status == AccrualRunStatus.COMPLETED.value
+        assert (result.checkpoint_employee_id, result.employees_processed) == (3, 3)
+        assert result.policy_totals == {
+            "7": {"balance_type": "vacation", "employees_accrued": 3,
+                  "employees_capped": 0, "total_accrued": 3.0},
+        }
+        assert len(checkpoints) == 2
+        assert shard.run.status == AccrualRunStatus.RUNNING.value
+
+    def test_failure_keeps_checkpoint_and_raises_for_retry(self, engine):
+        """Test a failed chunk leaves earlier chunks committed and is retried."""
+        shard = make_shard()
+        service = make_service(shard, [[1, 2], [3]])
+        engine.run.side_effect = [chunk_result([1, 2]), RuntimeError("connection lost")]
+
+        with pytest.raises(RuntimeError):
+            service.run_shard(shard.id, max_attempts=3)
+
+        assert shard.status == AccrualRunStatus.RETRYING.value
+        assert shard.checkpoint_employee_id == 2
+        assert shard.error == "RuntimeError: connection lost"
+        service.session.rollback.assert_called_once()
+
+    def test_last_attempt_records_failure(self, engine):
+        """Test the final attempt returns a failed shard instead of raising."""
+        shard = make_shard(attempts=2, checkpoint_employee_id=2)
+        service = make_service(shard, [[3]])
+        engine.run.side_effect = RuntimeError("connection lost")
+
+        result = service.run_shard(shard.id, max_attempts=3)
+
+        assert result.status == AccrualRunStatus.FAILED.value
+        assert result.attempts == 3
+
+    def test_finished_shard_is_not_rerun(self, engine):
+        """Test a redelivered completed shard does no work."""
+        shard = make_shard(status=AccrualRunStatus.COMPLETED.value, attempts=1)
+        service = make_service(shard, [])
+
+        assert service.run_shard(shard.id) is shard
+        assert shard.attempts == 1
+        engine.run.assert_not_called()
+
+
+class TestRunReport:
+    """Tests for the aggregated run report."""
+
+    def test_report_aggregates_shards(self):
+        """Test throughput, policy totals and failures are summarized."""
+        started = datetime(2025, 6, 1, 2, 0, tzinfo=timezone.utc)
+        run = AccrualRun(id=1, accrual_date=ACCRUAL_DATE, total_employees=300, shard_count=3,
+                         started_at=started)
+        totals = {"7": {"balance_type": "vacation", "employees_accrued": 100,
+                        "employees_capped": 5, "total_accrued": 100.0}}
+        run.shards = [
+            make_shard(shard_index=0, status="completed", attempts=1, employees_processed=100,
+                       employees_accrued=100, elapsed_seconds=2.0, policy_totals=totals),
+            make_shard(shard_index=1, status="completed", attempts=2, employees_processed=100,
+                       employees_accrued=100, elapsed_seconds=4.0, policy_totals=totals),
+            make_shard(shard_index=2, status="failed", attempts=6, employees_processed=40,
+                       elapsed_seconds=1.0, checkpoint_employee_id=240, error="boom"),
+        ]
+
+        report = build_run_report(run, started + timedelta(seconds=10))
+
+        assert (report["shards_completed"], report["shards_failed"], report["shards_retried"]) == (2, 1, 2)
+        assert report["employees_processed"] == 240
+        assert report["employees_per_second"] == 24.0
+        assert report["shard_employees_per_second"] == {"min": 25.0, "median": 40.0, "max": 50.0}
+        assert report["policies"]["7"]["employees_capped"] == 10
+        assert report["failures"] == [{
+            "shard_index": 2, "first_employee_id": 1, "last_employee_id": 100,
+            "checkpoint_employee_id": 240, "status": "failed", "attempts": 6, "error": "boom",
+        }]
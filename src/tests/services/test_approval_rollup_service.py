@@ -0,0 +1,230 @@
+"""Tests for approval rollups and their quantile sketch."""
+
+import math
+import random
+from datetime import date, datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.models.approval_rollup import UNASSIGNED, ApprovalRollup
+from src.services.approval_rollup_service import ApprovalRollupService
+from src.utils.quantile_sketch import DDSketch
+
+
+def exact_quantile(values, q):
+    """Lower-rank quantile, as percentile_disc."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(q * len(ordered)), 1) - 1]
+
+
+def bucket(decision_date, manager_id=2, request_type="vacation", latencies=(), **counts):
+    sketch = DDSketch()
+    sketch.extend(latencies)
+    return ApprovalRollup(
+        decision_date=decision_date,
+        department_id=counts.pop("department_id", 1),
+        manager_id=manager_id,
+        request_type=request_type,
+        approved_count=counts.get("approved", 0),
+        denied_count=counts.get("denied", 0),
+        cancelled_count=counts.get("cancelled", 0),
+        within_sla_count=counts.get("within_sla", 0),
+        latency_sketch=sketch.to_dict() if latencies else None,
+    )
+
+
+class TestDDSketch:
+    """Tests for the quantile sketch."""
+
+    def test_relative_error_bound(self):
+        """Test every quantile is within the relative accuracy of the exact value."""
+        rng = random.Random(7)
+        values = [rng.lognormvariate(2.5, 1.2) for _ in range(20000)]
+        sketch = DDSketch(relative_accuracy=0.01)
+        sketch.extend(values)
+
+        for q in (0.01, 0.25, 0.5, 0.9, 0.95, 0.99):
+            expected = exact_quantile(values, q)
+            assert abs(sketch.quantile(q) - expected) <= 0.01 * expected
+        assert sketch.quantile(0) == min(values)
+        assert sketch.quantile(1) == max(values)
+        assert sketch.mean == pytest.approx(sum(values) / len(values))
+
+    def test_merge_equals_combined(self):
+        """Test merged sketches match one sketch of all the values."""
+        rng = random.Random(11)
+        parts = [[rng.expovariate(1 / 20) for _ in range(500)] for _ in range(30)]
+        merged = DDSketch()
+        for part in parts:
+            sketch = DDSketch()
+            sketch.extend(part)
+            merged.merge(DDSketch.from_dict(sketch.to_dict()))
+
+        combined = DDSketch()
+        for part in parts:
+            combined.extend(part)
+
+        assert merged.bins == combined.bins
+        assert merged.count == combined.count == 15000
+        assert merged.quantile(0.9) == combined.quantile(0.9)
+
+    def test_zero_and_bounded_size(self):
+        """Test zero latencies count, and max_bins caps the bins kept."""
+        sketch = DDSketch(max_bins=64)
+        sketch.extend([0.0, 0.0] + [1.05 ** i for i in range(500)])
+
+        assert len(sketch.bins) <= 64
+        assert sketch.count == 502
+        assert sketch.quantile(0) == 0.0
+        # Collapsing only coarsens the low end
+        assert sketch.quantile(0.99) == pytest.approx(exact_quantile(
+            [0.0, 0.0] + [1.05 ** i for i in range(500)], 0.99), rel=0.01)
+
+    def test_merge_requires_same_accuracy(self):
+        """Test sketches with different accuracy are not mergeable."""
+        with pytest.raises(ValueError):
+            DDSketch(0.01).merge(DDSketch(0.02))
+
+
+class TestRecordTransition:
+    """Tests for recording transitions into buckets."""
+
+    def request(self, status, **fields):
+        values = dict(
+            employee_id=10, request_type="vacation", current_approver_id=None,
+            submitted_at=datetime(2025, 3, 3, 9, 0), created_at=datetime(2025, 3, 3, 8, 0),
+            approved_at=None, rejected_at=None, cancelled_at=None,
+        )
+        values.update(fields)
+        return SimpleNamespace(status=status, **values)
+
+    def recording_session(self, existing):
+        session = MagicMock()
+        session.get.return_value = SimpleNamespace(department_id=4, manager_id=3)
+        session.execute.side_effect = [
+            MagicMock(),
+            MagicMock(**{"scalar_one.return_value": existing}),
+        ]
+        return session
+
+    def test_approval_adds_decision_and_latency(self):
+        """Test an approval counts, times and attributes the decision."""
+        existing = bucket(date(2025, 3, 4), approved=1, within_sla=1, latencies=[5.0])
+        session = self.recording_session(existing)
+
+        result = ApprovalRollupService(session).record_transition(
+            self.request("approved", approved_at=datetime(2025, 3, 4, 9, 0)), decided_by=8,
+        )
+
+        assert result is existing
+        assert existing.approved_count == 2
+        assert existing.within_sla_count == 2
+        sketch = DDSketch.from_dict(existing.latency_sketch)
+        assert sketch.count == 2 and sketch.max == 24.0
+
+        lookup = session.execute.call_args_list[1].args[0]
+        params = lookup.compile().params
+        assert params == {
+            "decision_date_1": date(2025, 3, 4), "department_id_1": 4,
+            "manager_id_1": 8, "request_type_1": "vacation",
+        }
+
+    def test_late_denial_over_sla(self):
+        """Test a denial after the SLA target does not count as within it."""
+        existing = bucket(date(2025, 3, 10))
+        session = self.recording_session(existing)
+
+        ApprovalRollupService(session).record_transition(
+            self.request("rejected", rejected_at=datetime(2025, 3, 10, 9, 0)),
+        )
+
+        assert existing.denied_count == 1
+        assert existing.within_sla_count == 0
+        assert DDSketch.from_dict(existing.latency_sketch).max == 168.0
+
+    def test_cancellation_counted_without_latency(self):
+        """Test a cancellation goes to the employee's manager with no latency."""
+        existing = bucket(date(2025, 3, 5))
+        session = self.recording_session(existing)
+
+        ApprovalRollupService(session).record_transition(
+            self.request("cancelled", cancelled_at=datetime(2025, 3, 5, 12, 0)),
+        )
+
+        assert existing.cancelled_count == 1
+        assert existing.latency_sketch is None
+        assert session.execute.call_args_list[1].args[0].compile().params["manager_id_1"] == 3
+
+    def test_unrecorded_status_ignored(self):
+        """Test statuses other than decisions and cancellations are skipped."""
+        session = MagicMock()
+
+        assert ApprovalRollupService(session).record_transition(
+            self.request("pending_approval")
+        ) is None
+        session.execute.assert_not_called()
+
+
+class TestSummarize:
+    """Tests for merging buckets."""
+
+    def summary_session(self, headers, bins):
+        session = MagicMock()
+        session.execute.side_effect = [iter(headers), iter(bins)]
+        return session
+
+    def test_merges_overall_and_by_dimension(self):
+        """Test grouping-set rows land on the overall totals and each dimension."""
+        sketch = DDSketch()
+        sketch.extend([2.0, 4.0, 10.0, 60.0, 1.0])
+        bins = sorted(sketch.bins.items())
+        none = (None,) * 5
+        headers = [
+            # weekday, week, request type, department, manager, then the sums
+            (*none, 4, 1, 2, 4, 5, 0, 77.0, 1.0, 60.0),
+            (Decimal(1), None, None, None, None, 3, 1, 2, 3, 4, 0, 76.0, 2.0, 60.0),
+            (Decimal(2), None, None, None, None, 1, 0, 0, 1, 1, 0, 1.0, 1.0, 1.0),
+            (None, date(2025, 3, 3), None, None, None, 4, 1, 0, 4, 5, 0, 77.0, 1.0, 60.0),
+            (None, None, "sick", None, None, 1, 0, 0, 1, 1, 0, 1.0, 1.0, 1.0),
+            (None, None, None, None, UNASSIGNED, 0, 0, 2, 0, None, None, None, None, None),
+            (None, None, None, None, 2, 4, 1, 0, 4, 5, 0, 77.0, 1.0, 60.0),
+        ]
+        session = self.summary_session(headers, bins)
+
+        summary = ApprovalRollupService(session).summarize(date(2025, 3, 1), date(2025, 3, 31))
+
+        overall = summary.overall
+        assert (overall.approved, overall.denied, overall.cancelled) == (4, 1, 2)
+        assert overall.total == 7 and overall.decisions == 5
+        assert overall.approval_rate == 57.1
+        assert overall.sla_compliance == 80.0
+        assert overall.average_hours == 15.4
+        assert overall.latency.count == 5
+        assert overall.percentile_hours(0.5) == pytest.approx(4.0, rel=0.01)
+        assert overall.percentile_hours(1) == 60.0
+
+        assert summary.by_weekday[0].total == 6  # ISO day 1 is Monday
+        assert summary.by_week[date(2025, 3, 3)].approved == 4
+        assert summary.by_request_type["sick"].approved == 1
+        assert summary.by_manager[UNASSIGNED].cancelled == 2
+        assert summary.by_manager[2].average_hours == 15.4
+        # Distributions only where asked for
+        assert summary.by_manager[2].percentile_hours(0.5) is None
+
+    def test_one_grouping_query_each(self):
+        """Test the range is merged in the database, bins only for the requested groups."""
+        session = self.summary_session([], [])
+
+        ApprovalRollupService(session).summarize(
+            date(2025, 3, 1), date(2025, 3, 31), manager_id=2, percentiles_by=("department",),
+        )
+
+        # No groups with latency: the bins query is skipped
+        assert session.execute.call_count == 1
+        sql = str(session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "GROUP BY GROUPING SETS((), (EXTRACT(isodow FROM approval_rollup.decision_date))" in sql
+        assert "approval_rollup.manager_id = %(manager_id_1)s" in sql
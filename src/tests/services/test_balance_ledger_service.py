@@ -0,0 +1,103 @@
+"""Tests for the append-only balance ledger."""
+
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from src.models.balance_ledger import LedgerEntryType
+from src.services.balance_ledger_service import BALANCES_AS_OF, BalanceLedgerService, LedgerPosting
+
+
+AS_OF = date(2025, 6, 30)
+
+
+def posting(employee_id, policy_id, entry_type, amount, effective_date):
+    return LedgerPosting(employee_id, policy_id, entry_type, amount, effective_date)
+
+
+class TestAppend:
+    """Tests for appending ledger entries."""
+
+    def test_append_inserts_and_invalidates(self):
+        """Test entries are inserted in one statement and stale snapshots dropped."""
+        session = MagicMock()
+        service = BalanceLedgerService(session)
+
+        appended = service.append([
+            posting(1, 7, LedgerEntryType.USAGE, -8.0, date(2025, 3, 10)),
+            posting(1, 7, LedgerEntryType.ADJUSTMENT, 2.0, date(2025, 2, 1)),
+            posting(2, 7, LedgerEntryType.ACCRUAL, 4.0, date(2025, 6, 1)),
+        ])
+
+        assert appended == 3
+        assert session.execute.call_count == 2
+        rows = session.execute.call_args_list[0][0][1]
+        assert [row["entry_type"] for row in rows] == ["usage", "adjustment", "accrual"]
+        stmt, params = session.execute.call_args_list[1][0]
+        assert "DELETE FROM balance_ledger_snapshot" in str(stmt)
+        assert params == {
+            "employee_ids": [1, 2],
+            "policy_ids": [7, 7],
+            "effective_dates": [date(2025, 2, 1), date(2025, 6, 1)],
+        }
+
+    def test_append_nothing(self):
+        """Test an empty append executes nothing."""
+        session = MagicMock()
+
+        assert BalanceLedgerService(session).append([]) == 0
+        session.execute.assert_not_called()
+
+
+class TestBalancesAsOf:
+    """Tests for as-of reads."""
+
+    def test_snapshot_plus_tail(self):
+        """Test balances are read with one statement and keep snapshot and tail details."""
+        session = MagicMock()
+        session.execute.return_value.all.return_value = [
+            SimpleNamespace(policy_id=7, as_of_date=date(2025, 5, 31), accrued=48.0, used=-20.0,
+                            adjusted=0.0, carried_over=8.0, entries=2),
+            SimpleNamespace(policy_id=8, as_of_date=None, accrued=3.0, used=0.0,
+                            adjusted=0.0, carried_over=0.0, entries=2),
+            SimpleNamespace(policy_id=9, as_of_date=None, accrued=0.0, used=0.0,
+                            adjusted=0.0, carried_over=0.0, entries=0),
+        ]
+
+        balances = BalanceLedgerService(session).balances_as_of(1, [7, 8, 9], AS_OF)
+
+        vacation, sick, personal = balances[7], balances[8], balances[9]
+        assert vacation.balance == 36.0
+        assert (vacation.snapshot_date, vacation.tail_entries) == (date(2025, 5, 31), 2)
+        assert (sick.balance, sick.snapshot_date, sick.has_history) == (3.0, None, True)
+        assert not personal.has_history
+        session.execute.assert_called_once_with(
+            BALANCES_AS_OF, {"employee_id": 1, "policy_ids": [7, 8, 9], "as_of_date": AS_OF},
+        )
+
+    def test_no_policies(self):
+        """Test asking for no policies does not query."""
+        session = MagicMock()
+
+        assert BalanceLedgerService(session).balances_as_of(1, [], AS_OF) == {}
+        session.execute.assert_not_called()
+
+    def test_year_balances_exclude_earlier_years(self):
+        """Test a second year's balance leaves out the first year's allocation and carryover."""
+        session = MagicMock()
+        session.execute.return_value.all.side_effect = [
+            # Through AS_OF: 2024 allocation 20, 2025 carryover 5 and allocation 20, usage
+            [SimpleNamespace(policy_id=7, as_of_date=date(2025, 5, 31), accrued=40.0, used=-18.0,
+                             adjusted=1.0, carried_over=5.0, entries=1)],
+            # Through the end of 2024
+            [SimpleNamespace(policy_id=7, as_of_date=date(2024, 12, 31), accrued=20.0, used=-15.0,
+                             adjusted=0.0, carried_over=0.0, entries=0)],
+        ]
+
+        balance = BalanceLedgerService(session).year_balances_as_of(1, [7], AS_OF)[7]
+
+        assert (balance.accrued, balance.used, balance.adjusted, balance.carried_over) == (
+            20.0, -3.0, 1.0, 5.0
+        )
+        assert balance.balance == 23.0
+        assert session.execute.call_args_list[1][0][1]["as_of_date"] == date(2024, 12, 31)
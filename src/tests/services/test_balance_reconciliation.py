@@ -0,0 +1,129 @@
+"""Tests for set-based balance reconciliation."""
+
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from src.services.balance_reconciliation import BalanceDiff, BalanceReconciler, ReconciliationScope
+
+
+AS_OF = date(2025, 6, 30)
+
+
+def make_diff(**overrides):
+    values = dict(
+        employee_id=1,
+        employee_name="Ada Lovelace",
+        policy_id=2,
+        policy_name="Vacation",
+        balance_type="vacation",
+        has_stored=True,
+        has_ledger=True,
+        expected_allocated=40.0,
+        expected_used=8.0,
+        expected_carried_over=5.0,
+        stored_allocated=40.0,
+        stored_used=8.0,
+        stored_carried_over=5.0,
+    )
+    values.update(overrides)
+    return BalanceDiff(**values)
+
+
+def diff_row(employee_id, **overrides):
+    values = dict(
+        employee_id=employee_id, first_name="Ada", last_name="Lovelace", policy_id=2,
+        policy_name="Vacation", balance_type="vacation", has_stored=True, has_ledger=True,
+        expected_allocated=40.0, expected_used=8.0, expected_carried_over=5.0,
+        stored_allocated=41.5, stored_used=8.0, stored_carried_over=5.0,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+class TestBalanceDiff:
+    """Tests for stored-vs-ledger differences."""
+
+    def test_difference_is_actual_minus_expected(self):
+        """Test balances follow TimeOffBalance: allocated + carried over - used."""
+        diff = make_diff(stored_allocated=41.5, stored_used=10.0)
+
+        assert diff.expected_balance == 37.0
+        assert diff.actual_balance == 36.5
+        assert diff.difference == -0.5
+
+
+class TestDiffQuery:
+    """Tests for the joined diff query."""
+
+    def test_one_statement_with_full_outer_join(self):
+        """Test both sides are aggregated and joined in a single statement."""
+        sql = str(BalanceReconciler(MagicMock()).diff_query(AS_OF))
+
+        assert sql.count("SELECT") > 1
+        assert "FULL OUTER JOIN" in sql
+        assert "balance_ledger_entry" in sql and "time_off_balance" in sql
+
+    def test_employee_scope_filters_both_sides(self):
+        """Test scoped runs aggregate only their employees' ledger and balances."""
+        reconciler = BalanceReconciler(MagicMock())
+
+        unscoped = str(reconciler.diff_query(AS_OF))
+        scoped = str(reconciler.diff_query(AS_OF, ReconciliationScope(employee_ids=[1, 2])))
+
+        assert scoped.count("IN (SELECT employees.id") == 2
+        assert "IN (SELECT employees.id" not in unscoped
+
+
+class TestDiscrepancies:
+    """Tests for streaming discrepancies."""
+
+    def test_streams_pages(self):
+        """Test rows are fetched through a server-side cursor and yielded per page."""
+        session = MagicMock()
+        session.execute.return_value.partitions.return_value = iter([
+            [diff_row(1), diff_row(2)],
+            [diff_row(3, has_stored=False, stored_allocated=0.0)],
+        ])
+
+        pages = list(BalanceReconciler(session).discrepancies(AS_OF, page_size=2))
+
+        assert [[d.employee_id for d in page] for page in pages] == [[1, 2], [3]]
+        assert pages[0][0].employee_name == "Ada Lovelace"
+        assert pages[0][0].difference == 1.5
+        assert not pages[1][0].has_stored
+        stmt = session.execute.call_args[0][0]
+        assert stmt.get_execution_options()["yield_per"] == 2
+
+
+class TestApplyCorrections:
+    """Tests for writing corrections."""
+
+    def test_stored_allocations_follow_the_ledger(self):
+        """Test allocation and carryover drift is corrected on the stored balance."""
+        session = MagicMock()
+        diffs = [make_diff(stored_allocated=41.5), make_diff(employee_id=3, has_stored=False)]
+
+        written = BalanceReconciler(session).apply_corrections(diffs, AS_OF, "Reconciliation ABC")
+
+        assert written == 2
+        session.execute.assert_called_once()
+        stmt, params = session.execute.call_args[0]
+        assert "INSERT INTO time_off_balance" in str(stmt)
+        assert "ON CONFLICT" in str(stmt)
+        assert params["employee_ids"] == [1, 3]
+        assert params["allocated"] == [40.0, 40.0]
+        assert params["carried_over"] == [5.0, 5.0]
+
+    def test_missing_usage_is_posted_to_the_ledger(self):
+        """Test used days the ledger lacks become usage entries, not adjustments."""
+        session = MagicMock()
+        diffs = [make_diff(stored_allocated=41.5), make_diff(employee_id=3, stored_used=9.0)]
+
+        BalanceReconciler(session).apply_corrections(diffs, AS_OF, "Reconciliation ABC")
+
+        rows = session.execute.call_args_list[1][0][1]
+        assert [(r["employee_id"], r["policy_id"], r["entry_type"], r["amount"]) for r in rows] == [
+            (3, 2, "usage", -1.0),
+        ]
+        assert {r["source_type"] for r in rows} == {"reconciliation"}
@@ -0,0 +1,120 @@
+"""Tests for batched multi-employee balances."""
+
+from datetime import date, datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from src.models.time_off_policy import TimeOffPolicy
+from src.models.time_off_request import TimeOffRequest, TimeOffRequestStatus
+from src.services.batch_balance_service import BatchBalanceService, scheduled_accruals
+
+
+AS_OF = date(2025, 6, 10)
+
+
+def policy(id, policy_type, accrual_method="monthly_accrual", base_accrual_rate=12.0):
+    return TimeOffPolicy(
+        id=id, name=policy_type.title(), code=policy_type.upper(), policy_type=policy_type,
+        accrual_method=accrual_method, base_accrual_rate=base_accrual_rate,
+    )
+
+
+def request(id, employee_id, request_type, status, start, end, days):
+    return TimeOffRequest(
+        id=id, employee_id=employee_id, request_type=request_type, status=status,
+        start_date=start, end_date=end, total_days=days, created_at=datetime(2025, 6, 1),
+    )
+
+
+def session_returning(employees, policies, balances, requests):
+    """A session answering the service's four queries in order."""
+    session = MagicMock()
+    results = [MagicMock() for _ in range(4)]
+    results[0].all.return_value = employees
+    results[1].scalars.return_value.all.return_value = policies
+    results[2].all.return_value = balances
+    results[3].scalars.return_value = iter(requests)
+    session.execute.side_effect = results
+    return session
+
+
+class TestGetBalances:
+    """Tests for loading many employees' balances."""
+
+    def test_constant_queries_and_figures(self):
+        """Test every employee and policy is answered from four queries."""
+        employees = [
+            SimpleNamespace(id=1, first_name="Ada", last_name="Lovelace", job_title="Engineer",
+                            department_id=10, department_name="Engineering"),
+            SimpleNamespace(id=2, first_name="Alan", last_name="Turing", job_title="Engineer",
+                            department_id=10, department_name="Engineering"),
+        ]
+        policies = [policy(7, "vacation"), policy(8, "sick", "annual_lump_sum", 5.0)]
+        balances = [
+            SimpleNamespace(employee_id=1, balance_type="vacation", total_allocated=15.0,
+                            used=4.0, pending=2.0, carried_over=3.0),
+        ]
+        requests = [
+            request(100, 1, "vacation", TimeOffRequestStatus.PENDING_APPROVAL.value,
+                    date(2025, 7, 1), date(2025, 7, 2), 2.0),
+            request(101, 2, "vacation", TimeOffRequestStatus.APPROVED.value,
+                    date(2025, 6, 20), date(2025, 6, 21), 2.0),
+        ]
+        session = session_returning(employees, policies, balances, requests)
+
+        figures = BatchBalanceService(session).get_balances([2, 1, 99], as_of_date=AS_OF)
+
+        assert session.execute.call_count == 4
+        assert list(figures) == [2, 1]
+
+        ada = figures[1]
+        vacation, sick = ada.policies
+        assert (vacation.available, vacation.has_balance_record) == (12.0, True)
+        assert [r.id for r in vacation.pending_requests] == [100]
+        # No balance row: the policy's base allocation applies
+        assert (sick.total_allocated, sick.available, sick.has_balance_record) == (5.0, 5.0, False)
+        assert ada.total_available == 17.0
+        assert ada.upcoming_time_off == []
+
+        alan = figures[2]
+        assert alan.employee_name == "Alan Turing"
+        assert [r.id for r in alan.upcoming_time_off] == [101]
+        assert alan.pending_requests == []
+
+    def test_next_accrual_sums_same_day(self):
+        """Test the next accrual adds up every policy accruing on the earliest date."""
+        employees = [SimpleNamespace(id=1, first_name="Ada", last_name="Lovelace", job_title=None,
+                                     department_id=None, department_name=None)]
+        policies = [policy(7, "vacation", base_accrual_rate=12.0), policy(8, "sick", base_accrual_rate=6.0)]
+        session = session_returning(employees, policies, [], [])
+
+        next_accrual = BatchBalanceService(session).get_balances([1], as_of_date=AS_OF)[1].next_accrual
+
+        assert next_accrual.accrual_date == date(2025, 7, 1)
+        assert next_accrual.amount == 1.5
+
+    def test_no_employees(self):
+        """Test an empty list does not query."""
+        session = MagicMock()
+
+        assert BatchBalanceService(session).get_balances([]) == {}
+        session.execute.assert_not_called()
+
+
+class TestScheduledAccruals:
+    """Tests for a policy's accrual schedule."""
+
+    def test_monthly(self):
+        """Test monthly accruals fall on the first of each remaining month."""
+        events = scheduled_accruals(policy(7, "vacation"), date(2025, 10, 15), date(2025, 12, 31))
+
+        assert [e.accrual_date for e in events] == [date(2025, 11, 1), date(2025, 12, 1)]
+        assert all(e.amount == 1.0 for e in events)
+
+    def test_annual_lump_sum_outside_window(self):
+        """Test a lump sum past the window is not scheduled."""
+        events = scheduled_accruals(
+            policy(8, "sick", "annual_lump_sum", 5.0), date(2025, 6, 1), date(2025, 12, 31),
+        )
+
+        assert events == []
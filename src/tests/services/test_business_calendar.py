@@ -0,0 +1,188 @@
+"""Tests for the business calendar engine."""
+
+from datetime import date, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.services.business_calendar_service import (
+    BusinessCalendar,
+    BusinessCalendarService,
+    get_static_calendar,
+    invalidate_business_calendars,
+    week_hours_for_days,
+    week_hours_for_schedule,
+)
+
+
+HOLIDAYS = [date(2025, 1, 1), date(2025, 7, 4), date(2025, 12, 25), date(2026, 1, 1)]
+
+
+@pytest.fixture(autouse=True)
+def clear_calendars():
+    """Start every test with no cached calendars."""
+    invalidate_business_calendars()
+    yield
+    invalidate_business_calendars()
+
+
+def count_days(start, end, week_hours, holidays):
+    """Reference day-by-day count."""
+    days, hours = 0, 0.0
+    current = start
+    while current <= end:
+        if week_hours[current.weekday()] > 0 and current not in holidays:
+            days += 1
+            hours += week_hours[current.weekday()]
+        current += timedelta(days=1)
+    return days, hours
+
+
+class TestBusinessCalendar:
+    """Tests for BusinessCalendar."""
+
+    def test_matches_day_by_day_count(self):
+        """Test range counts agree with a day-by-day loop."""
+        week_hours = (9.0, 9.0, 9.0, 9.0, 4.0, 0.0, 0.0)
+        calendar = BusinessCalendar(2024, 2027, week_hours, HOLIDAYS)
+        ranges = [
+            (date(2025, 1, 1), date(2025, 1, 1)),
+            (date(2024, 12, 28), date(2025, 1, 6)),
+            (date(2025, 3, 15), date(2027, 3, 14)),
+            (date(2024, 1, 1), date(2027, 12, 31)),
+        ]
+
+        for start, end in ranges:
+            days, hours = count_days(start, end, week_hours, HOLIDAYS)
+            assert calendar.business_days(start, end) == days
+            assert calendar.working_hours(start, end) == pytest.approx(hours)
+
+    def test_holidays_are_not_working_days(self):
+        """Test holidays are flagged and excluded."""
+        calendar = BusinessCalendar(2025, 2025, holidays=HOLIDAYS)
+
+        assert calendar.is_holiday(date(2025, 7, 4))
+        assert not calendar.is_working_day(date(2025, 7, 4))
+        assert calendar.scheduled_hours(date(2025, 7, 3)) == 8.0
+        assert calendar.holidays_between(date(2025, 6, 1), date(2025, 12, 31)) == [
+            date(2025, 7, 4),
+            date(2025, 12, 25),
+        ]
+
+    def test_reversed_range_is_empty(self):
+        """Test an end before the start counts nothing."""
+        calendar = BusinessCalendar(2025, 2025)
+
+        assert calendar.business_days(date(2025, 5, 2), date(2025, 5, 1)) == 0
+
+    def test_range_outside_calendar_raises(self):
+        """Test ranges beyond the built years are rejected."""
+        calendar = BusinessCalendar(2025, 2025)
+
+        with pytest.raises(ValueError):
+            calendar.business_days(date(2025, 12, 1), date(2026, 1, 5))
+
+
+class TestScheduleHours:
+    """Tests for deriving weekly hours from schedules."""
+
+    def test_spreads_hours_over_days_per_week(self):
+        """Test a compressed schedule works four 10-hour days."""
+        schedule = SimpleNamespace(
+            hours_per_week=Decimal("40.00"), days_per_week=4, schedule_pattern=None
+        )
+
+        assert week_hours_for_schedule(schedule) == (10.0, 10.0, 10.0, 10.0, 0.0, 0.0, 0.0)
+
+    def test_uses_daily_schedules_from_pattern(self):
+        """Test explicit daily schedules take precedence."""
+        schedule = SimpleNamespace(
+            hours_per_week=Decimal("20.00"),
+            days_per_week=3,
+            schedule_pattern={"daily_schedules": [
+                {"day": "tuesday", "hours": 6},
+                {"day": "thursday"},
+                {"day": "saturday", "is_working_day": False, "hours": 4},
+            ]},
+        )
+
+        assert week_hours_for_schedule(schedule) == (
+            0.0, 6.0, 0.0, 20 / 3, 0.0, 0.0, 0.0,
+        )
+
+    def test_week_hours_for_day_names(self):
+        """Test day names map onto weekdays."""
+        assert week_hours_for_days(["Monday", "Wednesday"], 7.5) == (
+            7.5, 0.0, 7.5, 0.0, 0.0, 0.0, 0.0,
+        )
+
+
+class TestBusinessCalendarService:
+    """Tests for BusinessCalendarService."""
+
+    def make_session(self, holiday_rows, versions=(1,)):
+        session = MagicMock()
+        session.get.return_value = None
+        assigned = MagicMock()
+        assigned.first.return_value = SimpleNamespace(country="US", region=None)
+        holidays = MagicMock()
+        holidays.all.return_value = holiday_rows
+        results = iter([assigned, holidays] * len(versions))
+        remaining = list(versions)
+
+        def execute(stmt):
+            if "data_version" in str(stmt):
+                version = remaining.pop(0) if len(remaining) > 1 else remaining[0]
+                return MagicMock(scalar=MagicMock(return_value=version))
+            return next(results)
+
+        session.execute.side_effect = execute
+        return session
+
+    def test_repeats_recurring_holidays_in_years_without_calendar(self):
+        """Test recurring holidays fill years that have no calendar."""
+        session = self.make_session([
+            SimpleNamespace(calendar_year=2025, date=date(2025, 7, 4), is_recurring=True),
+            SimpleNamespace(calendar_year=2025, date=date(2025, 4, 18), is_recurring=False),
+        ])
+
+        holidays = BusinessCalendarService(session).load_holidays(1, 2025, 2026)
+
+        assert holidays == {date(2025, 7, 4), date(2025, 4, 18), date(2026, 7, 4)}
+
+    def test_calendar_is_cached_until_invalidated(self):
+        """Test a built calendar is reused and rebuilt after invalidation."""
+        service = BusinessCalendarService(self.make_session([]))
+        first = service.get_calendar(1, None, date(2025, 1, 1), date(2025, 12, 31))
+
+        assert service.get_calendar(1, None, date(2025, 3, 1), date(2026, 6, 30)) is first
+
+        assert invalidate_business_calendars(location_id=1) == 1
+        service.session = self.make_session([])
+        assert service.get_calendar(1, None, date(2025, 1, 1), date(2025, 12, 31)) is not first
+
+    def test_calendar_is_rebuilt_when_data_version_changes(self):
+        """Test a write from another process retires calendars without invalidation."""
+        service = BusinessCalendarService(self.make_session([], versions=(1, 1, 2)))
+        first = service.get_calendar(1, None, date(2025, 1, 1), date(2025, 12, 31))
+
+        assert service.get_calendar(1, None, date(2025, 1, 1), date(2025, 12, 31)) is first
+        assert service.get_calendar(1, None, date(2025, 1, 1), date(2025, 12, 31)) is not first
+
+    def test_calendar_is_extended_for_later_ranges(self):
+        """Test a range past the cached years builds a wider calendar."""
+        service = BusinessCalendarService(MagicMock())
+        first = service.get_calendar(None, None, date(2025, 1, 1), date(2025, 1, 31))
+
+        wider = service.get_calendar(None, None, date(2025, 1, 1), date(2030, 1, 31))
+
+        assert wider.start == first.start
+        assert wider.end >= date(2030, 1, 31)
+
+    def test_static_calendar_matches_weekday_count(self):
+        """Test the default calendar counts Monday to Friday."""
+        calendar = get_static_calendar(date(2025, 1, 1), date(2026, 12, 31))
+
+        assert calendar.business_days(date(2025, 1, 1), date(2026, 12, 31)) == 522
@@ -0,0 +1,96 @@
+"""Tests for batched cache reads and writes."""
+
+from unittest.mock import PropertyMock, patch
+
+import pytest
+
+from src.infrastructure.redis.caching_service import CachePrefix, CachingService
+from src.infrastructure.redis.redis_client import MockRedisClient
+
+
+@pytest.fixture
+def client():
+    """Isolated mock Redis."""
+    client = MockRedisClient()
+    with patch.object(CachingService, "redis", new_callable=PropertyMock, return_value=client):
+        yield client
+
+
+class TestBatchOperations:
+    """Tests for get_many/set_many/delete_many."""
+
+    def test_set_many_then_get_many(self, client):
+        """Test values round-trip and missing keys are left out."""
+        cache = CachingService()
+        cache.set_many(CachePrefix.TEMP, {"a": 1, "b": {"x": 2}}, ttl_seconds=60)
+
+        assert cache.get_many(CachePrefix.TEMP, ["a", "b", "c"]) == {"a": 1, "b": {"x": 2}}
+        assert client.ttl("embi:temp:a") > 0
+
+    def test_get_many_uses_one_round_trip(self, client):
+        """Test a batch read issues a single MGET instead of per-key GETs."""
+        cache = CachingService()
+        cache.set_many(CachePrefix.TEMP, {str(i): i for i in range(20)})
+
+        with patch.object(client, "get", wraps=client.get) as get, \
+                patch.object(client, "mget", wraps=client.mget) as mget:
+            assert len(cache.get_many(CachePrefix.TEMP, [str(i) for i in range(20)])) == 20
+
+        assert mget.call_count == 1
+        assert get.call_count == 20  # Inside the mock's MGET only
+
+    def test_metrics_count_each_key(self, client):
+        """Test hits and misses are counted per key in a batch."""
+        cache = CachingService()
+        cache.set_many(CachePrefix.TEMP, {"a": 1, "b": 2})
+        cache.reset_metrics()
+
+        cache.get_many(CachePrefix.TEMP, ["a", "b", "c"])
+
+        summary = cache.get_metrics_summary()
+        assert (summary["hits"], summary["misses"], summary["batch_operations"]) == (2, 1, 1)
+
+    def test_delete_many(self, client):
+        """Test only existing keys are counted as deleted."""
+        cache = CachingService()
+        cache.set_many(CachePrefix.TEMP, {"a": 1, "b": 2})
+
+        assert cache.delete_many(CachePrefix.TEMP, ["a", "b", "c"]) == 2
+        assert cache.get_many(CachePrefix.TEMP, ["a", "b"]) == {}
+
+
+class TestBatchBalances:
+    """Tests for the batch balance helpers."""
+
+    def test_set_balances_registers_tags(self, client):
+        """Test batch-cached balances are reachable by per-employee tags."""
+        cache = CachingService()
+        cache.set_balances({1: {"available": 10}, 2: {"available": 5}})
+
+        cache.invalidate_balance(1)
+
+        assert cache.get_balances([1, 2]) == {2: {"available": 5}}
+
+    def test_projections_keyed_by_employee(self, client):
+        """Test batch projections come back keyed by employee ID."""
+        cache = CachingService()
+        cache.set_balance_projections("2025", {3: {"projected": 12}, 4: {"projected": 8}})
+
+        assert cache.get_balance_projections([3, 4, 5], "2025") == {
+            3: {"projected": 12},
+            4: {"projected": 8},
+        }
+        assert cache.get_balance_projection(3, "2025") == {"projected": 12}
+
+    def test_l1_prefix_batch_write_evicts_other_workers(self, client):
+        """Test set_many broadcasts invalidation for L1-cached prefixes."""
+        worker_a = CachingService()
+        worker_b = CachingService()
+        worker_a.set_many(CachePrefix.POLICY, {"constraints:1": {"max_days": 5}})
+        worker_b.get_many(CachePrefix.POLICY, ["constraints:1"])
+
+        worker_a.set_many(CachePrefix.POLICY, {"constraints:1": {"max_days": 9}})
+
+        assert worker_b.get_many(CachePrefix.POLICY, ["constraints:1"]) == {
+            "constraints:1": {"max_days": 9}
+        }
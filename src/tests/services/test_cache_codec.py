@@ -0,0 +1,52 @@
+"""Tests for cache value encoding."""
+
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from src.infrastructure.redis.codec import CacheSerializer, CodecError
+
+
+@pytest.fixture
+def serializer():
+    """Serializer with the default codec and compression."""
+    return CacheSerializer(compress_threshold=256)
+
+
+class TestCacheSerializer:
+    """Tests for CacheSerializer."""
+
+    def test_round_trips_dates_and_decimals(self, serializer):
+        """Test typed values come back with their original types."""
+        value = {
+            "as_of": date(2025, 3, 1),
+            "updated_at": datetime(2025, 3, 1, 9, 30, tzinfo=timezone.utc),
+            "available": Decimal("12.50"),
+            "days": [1, 2.5, None, "x"],
+        }
+
+        assert serializer.decode(serializer.encode(value)) == value
+
+    def test_header_names_version_and_codec(self, serializer):
+        """Test small values are stored uncompressed behind a header."""
+        assert serializer.encode({"a": 1}) == '@1j:{"a":1}'
+
+    def test_compresses_large_values(self, serializer):
+        """Test values over the threshold are compressed and still decode."""
+        value = [{"employee_id": i, "as_of": date(2025, 1, 1)} for i in range(200)]
+        encoded = serializer.encode(value)
+
+        assert encoded[3] in "zl"
+        assert len(encoded) < len(json.dumps(value, default=str)) / 4
+        assert serializer.decode(encoded) == value
+
+    def test_decodes_legacy_json(self, serializer):
+        """Test values written before headers existed still decode."""
+        assert serializer.decode('{"available": 10}') == {"available": 10}
+
+    def test_rejects_unknown_version(self, serializer):
+        """Test values from a newer format are refused, not misread."""
+        with pytest.raises(CodecError):
+            serializer.decode('@9j:{"a":1}')
@@ -0,0 +1,104 @@
+"""Tests for tag-based cache invalidation."""
+
+from unittest.mock import PropertyMock, patch
+
+import pytest
+
+from src.infrastructure.redis.caching_service import CachePrefix, CacheTag, CachingService
+from src.infrastructure.redis.redis_client import MockRedisClient
+from src.middleware import caching
+
+
+@pytest.fixture
+def cache():
+    """Caching service backed by an isolated mock Redis."""
+    client = MockRedisClient()
+    with patch.object(CachingService, "redis", new_callable=PropertyMock, return_value=client):
+        yield CachingService()
+
+
+class TestTagInvalidation:
+    """Tests for CachingService.invalidate_tags."""
+
+    def test_invalidate_balance_leaves_other_employees(self, cache):
+        """Test only the tagged employee's balance entries are removed."""
+        cache.set_balance(1, {"available": 10})
+        cache.set_balance_projection(1, "2025", {"projected": 12})
+        cache.set_balance(2, {"available": 5})
+
+        assert cache.invalidate_balance(1) is True
+
+        assert cache.get_balance(1) is None
+        assert cache.get_balance_projection(1, "2025") is None
+        assert cache.get_balance(2) == {"available": 5}
+
+    def test_invalidate_employee_covers_all_entries(self, cache):
+        """Test the employee tag reaches entries cached under narrower tags."""
+        cache.set_balance(3, {"available": 1})
+        cache.set_validation_result(
+            "overlap", "3:2025-01", {"valid": True}, tags=[CacheTag.employee(3)]
+        )
+
+        assert cache.invalidate_employee(3) == 2
+        assert cache.get_validation_result("overlap", "3:2025-01") is None
+
+    def test_metrics_count_keys_per_tag_family(self, cache):
+        """Test invalidation metrics bucket tags by family."""
+        cache.set_policy_constraints(7, {"max_days": 5})
+        cache.set_policy_constraints(8, {"max_days": 3})
+
+        cache.invalidate_policy(7)
+        cache.invalidate_policy(8)
+
+        summary = cache.get_metrics_summary()
+        assert summary["invalidated_keys"] == 2
+        assert summary["invalidations_by_tag"] == {"policy:*": 2}
+
+    def test_invalidate_unknown_tag(self, cache):
+        """Test invalidating a tag with no members is a no-op."""
+        assert cache.invalidate_tags(CacheTag.org(4)) == 0
+
+
+class TestPatternInvalidation:
+    """Tests for SCAN-based pattern invalidation."""
+
+    def test_invalidate_pattern_removes_untagged_keys(self, cache):
+        """Test legacy untagged keys are still reachable by pattern."""
+        cache.redis.set("embi:balance:detail:9:2025", "{}")
+        cache.redis.set("embi:balance:detail:10:2025", "{}")
+
+        assert cache.invalidate_pattern(CachePrefix.BALANCE, "detail:9*") == 1
+        assert cache.redis.get("embi:balance:detail:10:2025") == "{}"
+
+
+class TestMiddlewareTags:
+    """Tests for tag registration in the API caching middleware."""
+
+    @pytest.fixture(autouse=True)
+    def client(self):
+        with patch.object(caching, "_cache_client", caching.MockRedisClient()):
+            yield
+
+    def test_profile_update_drops_cached_profile(self):
+        """Test invalidating an employee reaches profile and validation entries."""
+        profiles = {5: {"title": "Engineer"}}
+
+        @caching.cached("profile:employee", key_builder=lambda prefix, employee_id: f"{prefix}:{employee_id}")
+        def get_profile(employee_id):
+            return dict(profiles[employee_id])
+
+        get_profile(5)
+        caching.cache_validation_result("employee:5:overlap", {"valid": True})
+
+        profiles[5]["title"] = "Manager"
+        caching.invalidate_employee_cache(5)
+
+        assert get_profile(5) == {"title": "Manager"}
+        assert caching.get_cached_validation("employee:5:overlap") is None
+
+    def test_policy_keys_are_tagged_once(self):
+        """Test entity tags derived from a key are not registered twice."""
+        caching.cache_policy_data("7", {"max_days": 5})
+
+        assert caching.default_tags("policy:7") == ["policy:all", "policy:7"]
+        assert caching.invalidate_tags("policy:7") == 1
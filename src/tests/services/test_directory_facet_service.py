@@ -0,0 +1,115 @@
+"""Tests for single-query directory facet counts."""
+
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy.dialects import postgresql
+
+from src.services import directory_facet_service
+from src.services.directory_facet_service import (
+    DirectoryFacetFilters,
+    DirectoryFacets,
+    DirectoryFacetService,
+)
+
+
+ALL = 0b11111
+
+
+def facet_row(grouping, keys=(None,) * 5, total=0, counts=(0,) * 5, version=7):
+    return (grouping, *keys, total, *counts, version)
+
+
+class TestDirectoryFacetFilters:
+    """Tests for filter signatures."""
+
+    def test_signature_ignores_order(self):
+        """Test equal selections give the same cache signature."""
+        first = DirectoryFacetFilters(department_ids=frozenset({3, 1}), tenure=frozenset({"1_2_years"}))
+        second = DirectoryFacetFilters(tenure=frozenset({"1_2_years"}), department_ids=frozenset({1, 3}))
+
+        assert first.signature() == second.signature()
+        assert first.signature() != DirectoryFacetFilters(department_ids=frozenset({1})).signature()
+
+
+class TestCountFacets:
+    """Tests for the grouping query and reading its rows."""
+
+    def counting_session(self, rows):
+        session = MagicMock()
+        session.execute.side_effect = [
+            iter(rows),
+            iter([SimpleNamespace(id=1, name="Engineering"), SimpleNamespace(id=2, name="Sales")]),
+            iter([SimpleNamespace(id=5, name="Berlin")]),
+        ]
+        return session
+
+    def test_rows_land_on_their_facet(self):
+        """Test each grouping set's row fills its facet from its own count column."""
+        rows = [
+            facet_row(ALL, total=40, counts=(40, 40, 40, 40, 40)),
+            # Department grouped: its count excludes the department filter
+            facet_row(0b01111, keys=(1, None, None, None, None), counts=(30, 0, 0, 0, 0)),
+            facet_row(0b01111, keys=(2, None, None, None, None), counts=(25, 0, 0, 0, 0)),
+            facet_row(0b10111, keys=(None, 5, None, None, None), counts=(0, 40, 0, 0, 0)),
+            # A NULL location is its own option, told apart by GROUPING
+            facet_row(0b10111, keys=(None, None, None, None, None), counts=(0, 3, 0, 0, 0)),
+            facet_row(0b11101, keys=(None, None, None, True, None), counts=(0, 0, 0, 6, 0)),
+            facet_row(0b11110, keys=(None, None, None, None, "2_5_years"), counts=(0, 0, 0, 0, 12)),
+        ]
+        session = self.counting_session(rows)
+
+        facets = DirectoryFacetService(session).count_facets(
+            DirectoryFacetFilters(department_ids=frozenset({1})), date(2025, 1, 1),
+        )
+
+        assert facets.total == 40
+        assert facets.version == 7
+        assert facets.counts["department"] == {1: 30, 2: 25}
+        assert facets.counts["location"] == {5: 40, None: 3}
+        assert facets.count("is_manager", True) == 6
+        assert facets.count("is_manager", False) == 0
+        assert facets.count("tenure", "2_5_years") == 12
+        assert facets.departments == [(1, "Engineering"), (2, "Sales")]
+        assert facets.locations == [(5, "Berlin")]
+
+    def test_one_grouping_query(self):
+        """Test every facet is counted in one statement, each excluding its own filter."""
+        session = self.counting_session([])
+
+        DirectoryFacetService(session).count_facets(
+            DirectoryFacetFilters(department_ids=frozenset({1, 2}), is_manager=True),
+            date(2025, 1, 1),
+        )
+
+        sql = str(session.execute.call_args_list[0].args[0].compile(dialect=postgresql.dialect()))
+        assert sql.count("GROUPING SETS") == 1
+        # Totals need both filters; the department facet only the manager one
+        assert "count(*) FILTER (WHERE faceted.matches_department AND faceted.matches_is_manager)" in sql
+        assert "count(*) FILTER (WHERE faceted.matches_is_manager)" in sql
+        assert "count(*) FILTER (WHERE faceted.matches_department)" in sql
+        assert "data_version.name" in sql
+
+
+class TestGetFacets:
+    """Tests for caching by filter signature and data version."""
+
+    def test_cached_until_version_changes(self):
+        """Test a repeat is served from cache and a new version recounts."""
+        session = MagicMock()
+        session.execute.return_value.scalar.side_effect = [11, 11, 12]
+        service = DirectoryFacetService(session)
+        filters = DirectoryFacetFilters(location_ids=frozenset({5}))
+
+        with patch.object(directory_facet_service, "_facets", directory_facet_service.LocalCache()), \
+                patch.object(service, "count_facets", side_effect=[
+                    DirectoryFacets(total=3, version=11), DirectoryFacets(total=4, version=12),
+                ]) as count:
+            first = service.get_facets(filters, as_of=date(2025, 1, 1))
+            second = service.get_facets(filters, as_of=date(2025, 1, 1))
+            third = service.get_facets(filters, as_of=date(2025, 1, 1))
+
+        assert first is second
+        assert third.total == 4
+        assert count.call_count == 2
@@ -12,7 +12,7 @@ from src.schemas.employee_export import (
     ExportFilters,
     ExportRequest,
 )
-from src.utils.csv_parser import generate_csv_content
+from src.utils.csv_parser import generate_csv_content, iter_csv_chunks
 
 
 # =============================================================================
@@ -265,3 +265,90 @@ class TestRoleBasedFieldFiltering:
         assert len(manager_fields) >= len(employee_fields)
         assert len(manager_fields) <= len(admin_fields)
 
+
+# =============================================================================
+# Streaming Export Tests
+# =============================================================================
+
+class TestCSVChunks:
+    """Test cases for chunked CSV rendering."""
+    
+    def test_chunks_match_generated_content(self):
+        """Test the joined chunks equal the buffered CSV, chunked by size."""
+        fields = ["employee_id", "hire_date", "salary", "middle_name"]
+        rows = [
+            (f"EMP{i:03d}", date(2020, 1, 1 + i % 28), Decimal("1000.50"), None)
+            for i in range(200)
+        ]
+        
+        chunks = list(iter_csv_chunks(rows, fields, delimiter=";", chunk_size=512))
+        
+        assert len(chunks) > 1
+        assert all(len(chunk) < 512 + 100 for chunk in chunks)
+        assert b"".join(chunks) == generate_csv_content(
+            [dict(zip(fields, row)) for row in rows], fields, delimiter=";",
+        )
+    
+    def test_headers_only_when_no_rows(self):
+        """Test an empty export is just the header row, or nothing."""
+        assert list(iter_csv_chunks([], ["email"])) == [b"email\r\n"]
+        assert list(iter_csv_chunks([], ["email"], include_headers=False)) == []
+
+
+class TestStreamEmployees:
+    """Test cases for streaming exports."""
+    
+    def stream(self, rows, **request_fields):
+        from src.services.employee_export_service import EmployeeExportService
+        from src.utils.auth import get_mock_current_user
+        
+        session = MagicMock()
+        result = MagicMock()
+        result.__iter__.return_value = iter(rows)
+        session.execute.return_value = result
+        service = EmployeeExportService(session)
+        service.audit_logger = MagicMock()
+        
+        chunks, response = service.stream_employees(
+            current_user=get_mock_current_user(),
+            request=ExportRequest(
+                field_selection=ExportFieldSelection(fields=["employee_id", "email"]),
+                **request_fields,
+            ),
+        )
+        return session, service.audit_logger, chunks, response
+    
+    def test_selects_columns_through_server_side_cursor(self):
+        """Test only the exported columns are read, in batches."""
+        session, _, _, response = self.stream([])
+        
+        stmt = session.execute.call_args.args[0]
+        assert [column.name for column in stmt.selected_columns] == ["employee_id", "email"]
+        assert stmt.get_execution_options()["yield_per"] == 1000
+        assert response.total_records is None
+        assert response.exported_fields == ["employee_id", "email"]
+    
+    def test_completion_audited_when_stream_ends(self):
+        """Test completion is logged with the streamed count only at the end."""
+        rows = [("EMP001", "a@example.com"), ("EMP002", "b@example.com")]
+        _, audit_logger, chunks, response = self.stream(rows)
+        
+        audit_logger.log_export_completed.assert_not_called()
+        content = b"".join(chunks)
+        
+        assert content == b"employee_id,email\r\nEMP001,a@example.com\r\nEMP002,b@example.com\r\n"
+        completed = audit_logger.log_export_completed.call_args.kwargs
+        assert completed["total_records"] == 2
+        assert completed["filename"] == response.filename
+        audit_logger.log_export_failed.assert_not_called()
+    
+    def test_abandoned_stream_audited_as_failed(self):
+        """Test a stream closed early, as on a client disconnect, is logged as failed."""
+        rows = [(f"EMP{i:05d}", f"user{i}@example.com") for i in range(10000)]
+        _, audit_logger, chunks, _ = self.stream(rows)
+        
+        next(chunks)
+        chunks.close()
+        
+        audit_logger.log_export_completed.assert_not_called()
+        assert "closed after" in audit_logger.log_export_failed.call_args.kwargs["error_message"]
@@ -1,5 +1,6 @@
 """Tests for employee import service."""
 
+import io
 import uuid
 from datetime import date
 from unittest.mock import MagicMock, patch
@@ -9,8 +10,10 @@ import pytest
 from src.schemas.employee_import import ImportFieldError, ImportStatus
 from src.utils.csv_parser import (
     REQUIRED_FIELDS,
+    CsvStream,
     ParseResult,
     ParsedRow,
+    compute_file_checksum,
     parse_csv_content,
     suggest_field_mapping,
     validate_and_convert_field,
@@ -75,6 +78,70 @@ EMP001;john@example.com;John;Doe;2024-01-15"""
         assert result.valid_rows == 1
 
 
+# =============================================================================
+# CSV Streaming Tests
+# =============================================================================
+
+class TestCsvStream:
+    """Test cases for incremental CSV parsing."""
+    
+    HEADER = "employee_id,email,first_name,last_name,hire_date\n"
+    
+    def _rows(self, count: int) -> str:
+        return "".join(
+            f"EMP{i:03d},e{i}@example.com,Zoë,Müller,2024-01-15\n" for i in range(count)
+        )
+    
+    def test_small_chunks_match_whole_file(self):
+        """Test chunk boundaries inside lines and multibyte characters are handled."""
+        content = (self.HEADER + self._rows(20)).encode("utf-8")
+        
+        stream = CsvStream(io.BytesIO(content), chunk_size=7)
+        rows = list(stream.rows())
+        
+        expected = parse_csv_content(content)
+        assert [r.data for r in rows] == [r.data for r in expected.rows]
+        assert rows[0].data["first_name"] == "Zoë"
+        assert stream.checksum == compute_file_checksum(content)
+        assert stream.bytes_read == len(content)
+    
+    def test_quoted_newline_across_chunks(self):
+        """Test quoted fields spanning lines stay in one record."""
+        content = (
+            self.HEADER.replace("\n", ",job_title\n")
+            + 'EMP001,a@example.com,Ann,Lee,2024-01-15,"Lead\nEngineer"\n'
+        ).encode("utf-8")
+        
+        rows = list(CsvStream(io.BytesIO(content), chunk_size=5).rows())
+        
+        assert len(rows) == 1
+        assert rows[0].data["job_title"] == "Lead\nEngineer"
+        assert rows[0].row_number == 2
+    
+    def test_batches(self):
+        """Test rows are yielded in fixed-size batches."""
+        content = (self.HEADER + self._rows(25)).encode("utf-8")
+        
+        sizes = [len(b) for b in CsvStream(content).batches(10)]
+        
+        assert sizes == [10, 10, 5]
+    
+    def test_latin1_fallback(self):
+        """Test non-UTF-8 content is decoded as latin-1."""
+        content = (self.HEADER + "EMP001,a@example.com,José,Pé,2024-01-15\n").encode("latin-1")
+        
+        rows = list(CsvStream(io.BytesIO(content), chunk_size=8).rows())
+        
+        assert rows[0].data["first_name"] == "José"
+        assert rows[0].data["last_name"] == "Pé"
+    
+    def test_count_rows(self):
+        """Test rows can be counted without validating them."""
+        content = (self.HEADER + self._rows(12)).encode("utf-8")
+        
+        assert CsvStream(content).count_rows() == 12
+
+
 # =============================================================================
 # Email Validation Tests
 # =============================================================================
@@ -321,3 +388,178 @@ class TestChecksum:
         
         assert checksum1 != checksum2
 
+
+
+# =============================================================================
+# Streaming Import Tests
+# =============================================================================
+
+class TestStreamingImport:
+    """Test cases for batched import processing."""
+    
+    def _service(self, job):
+        from src.services.employee_import_service import EmployeeImportService
+        
+        session = MagicMock()
+        session.get.return_value = job
+        service = EmployeeImportService(session)
+        service.audit_logger = MagicMock()
+        return service, session
+    
+    def test_process_import_writes_per_batch(self):
+        """Test progress and import rows are written once per batch."""
+        from datetime import datetime
+        from src.models.import_job import ImportJobStatus
+        from src.services import employee_import_service as module
+        
+        job = MagicMock(
+            id=uuid.uuid4(),
+            import_reference_id="IMP-1",
+            created_by_user_id=uuid.uuid4(),
+            created_at=datetime.utcnow(),
+            status=ImportJobStatus.MAPPING,
+            mapping_config={},
+            field_mappings=None,
+            is_deleted=False,
+            total_rows=25,
+            processed_rows=0,
+            successful_rows=0,
+            error_rows=0,
+        )
+        service, session = self._service(job)
+        content = "employee_id,email,first_name,last_name,hire_date\n" + "".join(
+            f"EMP{i:03d},e{i}@example.com,A,B,2024-01-15\n" for i in range(24)
+        ) + "EMP999,bad-email,A,B,2024-01-15\n"
+        
+        with patch.object(module, "IMPORT_BATCH_SIZE", 10), \
+                patch.object(module, "get_cache_service"):
+            result = service.process_import(job.id, io.BytesIO(content.encode()), MagicMock())
+        
+        # One Employee and one ImportRow insert per batch, each under a savepoint
+        assert session.execute.call_count == 6
+        assert session.begin_nested.call_count == 3
+        assert result.progress.processed_rows == 25
+        assert result.progress.successful_rows == 24
+        assert result.error_summary == {"invalid_email": 1}
+    
+    def test_failing_batch_is_bisected(self):
+        """Test only the rows the database rejects are reported."""
+        from sqlalchemy.exc import IntegrityError
+        from src.utils.csv_parser import ParsedRow
+        
+        service, session = self._service(MagicMock())
+        rows = [
+            ParsedRow(row_number=i + 2, data={"employee_id": f"EMP{i:03d}"})
+            for i in range(16)
+        ]
+        
+        def execute(stmt, params):
+            if any(p.get("employee_id") in ("EMP003", "EMP011") for p in params):
+                raise IntegrityError("INSERT", params, Exception("duplicate key"))
+        
+        session.execute.side_effect = execute
+        
+        result = service.write_employee_batch(uuid.uuid4(), rows)
+        
+        assert [row.data["employee_id"] for row, _ in result.failed] == ["EMP003", "EMP011"]
+        assert len(result.written) == 14
+        assert [row.row_number for row in result.written] == sorted(
+            row.row_number for row in result.written
+        )
+    
+    def test_validate_then_process_same_job(self):
+        """Test processing a validated job updates its ImportRows instead of duplicating them."""
+        from contextlib import contextmanager, nullcontext
+        from datetime import datetime
+        from sqlalchemy.dialects import postgresql
+        from sqlalchemy.exc import IntegrityError
+        from src.models.import_job import ImportJobStatus
+        from src.tasks import employee_import_tasks as tasks
+        
+        job = MagicMock(
+            id=uuid.uuid4(),
+            status=ImportJobStatus.PENDING,
+            started_at=None,
+            mapping_config={},
+            field_mappings=None,
+            total_rows=0,
+            processed_rows=0,
+            successful_rows=0,
+            error_rows=0,
+        )
+        import_rows = set()
+        employees = []
+        
+        def execute(stmt, params):
+            table = getattr(stmt, "table", None)
+            if table is None or table.name not in ("import_rows", "employee"):
+                return
+            if table.name == "employee":
+                employees.extend(p["employee_id"] for p in params)
+                return
+            upsert = "ON CONFLICT" in str(stmt.compile(dialect=postgresql.dialect()))
+            for p in params:
+                key = (p["import_job_id"], p["row_number"])
+                if key in import_rows and not upsert:
+                    raise IntegrityError("INSERT", params, Exception("uq_import_row_job_row_number"))
+                import_rows.add(key)
+        
+        session = MagicMock()
+        session.get.return_value = job
+        session.execute.side_effect = execute
+        session.begin_nested.side_effect = lambda: nullcontext()
+        
+        @contextmanager
+        def db_context():
+            yield session
+        
+        content = "employee_id,email,first_name,last_name,hire_date\n" + "".join(
+            f"EMP{i:03d},e{i}@example.com,A,B,2024-01-15\n" for i in range(5)
+        )
+        
+        with patch.object(tasks, "get_db_context", db_context), \
+                patch.object(tasks, "ImportExportAuditLogger"), \
+                patch.object(tasks, "get_cache_service"):
+            validated = tasks.validate_import_job(job.id, content.encode(), uuid.uuid4())
+            job.started_at = datetime.utcnow()
+            processed = tasks.process_import_job(job.id, content.encode(), uuid.uuid4())
+        
+        assert validated["status"] == "validated"
+        assert processed["successful_rows"] == 5
+        assert processed["error_rows"] == 0
+        assert len(employees) == 5
+        assert len(import_rows) == 5
+    
+    def test_status_reports_truncated_validation_errors(self):
+        """Test the status counts every validation error, not just the stored ones."""
+        from datetime import datetime
+        from src.models.import_job import ImportJobStatus
+        
+        stored = [
+            {"row": i + 2, "errors": [{"field": "email", "message": "Invalid email",
+                                       "code": "invalid_email"}]}
+            for i in range(3)
+        ]
+        job = MagicMock(
+            id=uuid.uuid4(),
+            import_reference_id="IMP-1",
+            created_by_user_id=uuid.uuid4(),
+            created_at=datetime.utcnow(),
+            started_at=None,
+            completed_at=None,
+            status=ImportJobStatus.MAPPING,
+            is_deleted=False,
+            total_rows=10,
+            processed_rows=0,
+            successful_rows=0,
+            error_rows=0,
+            validation_errors=stored,
+            validation_error_count=7,
+        )
+        service, _ = self._service(job)
+        
+        status = service.get_import_status(job.id, MagicMock())
+        
+        assert len(status.validation_errors) == 3
+        assert status.validation_error_count == 7
+        assert status.validation_errors_truncated
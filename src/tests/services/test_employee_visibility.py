@@ -0,0 +1,72 @@
+"""Tests for cached employee visibility sets."""
+
+from unittest.mock import MagicMock, PropertyMock, patch
+
+from src.data.employee_repository import EmployeeRepository
+from src.infrastructure.redis.caching_service import CachingService, pack_id_set, unpack_id_set
+from src.infrastructure.redis.redis_client import MockRedisClient
+
+
+class TestIdSetPacking:
+    """Tests for compact ID set encoding."""
+
+    def test_round_trip_sorts_and_dedupes(self):
+        """Test unpacking returns the sorted, distinct IDs."""
+        assert unpack_id_set(pack_id_set([42, 7, 7, 100000, 1])) == [1, 7, 42, 100000]
+
+    def test_empty_set(self):
+        """Test an empty set round-trips."""
+        assert unpack_id_set(pack_id_set([])) == []
+
+    def test_dense_range_is_compact(self):
+        """Test contiguous IDs pack well below one byte each."""
+        assert len(pack_id_set(list(range(1, 100001)))) < 10000
+
+
+class TestVisibleEmployeeIds:
+    """Tests for EmployeeRepository.get_visible_employee_ids caching."""
+
+    def test_admin_bypasses_cache(self):
+        """Test admins see everyone without touching the cache."""
+        cache = MagicMock()
+        repository = EmployeeRepository(MagicMock(), cache=cache)
+
+        assert repository.get_visible_employee_ids(1, ["admin"]) is None
+        cache.get_visibility_set.assert_not_called()
+
+    def test_cache_hit_skips_queries(self):
+        """Test a cached set is returned without querying."""
+        session = MagicMock()
+        cache = MagicMock()
+        cache.get_visibility_set.return_value = ([1, 2, 3], "3")
+        repository = EmployeeRepository(session, cache=cache)
+
+        assert repository.get_visible_employee_ids(2, ["employee"]) == [1, 2, 3]
+        cache.get_visibility_set.assert_called_once_with(2, 10)
+        session.execute.assert_not_called()
+
+    def test_cache_miss_computes_and_stores(self):
+        """Test a miss computes the set and caches it sorted under the version it read."""
+        cache = MagicMock()
+        cache.get_visibility_set.return_value = (None, "3")
+        repository = EmployeeRepository(MagicMock(), cache=cache)
+        repository._compute_visible_employee_ids = MagicMock(return_value={9, 2, 5})
+
+        assert repository.get_visible_employee_ids(2, ["employee"], 4) == [2, 5, 9]
+        cache.set_visibility_set.assert_called_once_with(2, 4, [2, 5, 9], "3")
+
+    def test_set_computed_across_invalidation_is_not_served(self):
+        """Test a set computed while the hierarchy changed is stored under the old version."""
+        with patch.object(CachingService, "redis", new_callable=PropertyMock,
+                          return_value=MockRedisClient()):
+            cache = CachingService()
+            repository = EmployeeRepository(MagicMock(), cache=cache)
+
+            def compute(employee_id, max_depth):
+                cache.invalidate_visibility_sets()
+                return {2, 5}
+
+            repository._compute_visible_employee_ids = MagicMock(side_effect=compute)
+            repository.get_visible_employee_ids(2, ["employee"])
+
+            assert cache.get_visibility_set(2, 10)[0] is None
@@ -0,0 +1,92 @@
+"""Tests for envelope listing."""
+
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from src.schemas.envelope import EnvelopeStatusEnum
+from src.services.envelope_service import EnvelopeService
+from src.utils.auth import UserRole, get_mock_current_user
+
+
+def envelope(envelope_id, signed=0, signers=2):
+    recipients = [
+        SimpleNamespace(name=f"Signer {i}", recipient_type="signer", routing_order=i,
+                        status="signed" if i <= signed else "sent")
+        for i in range(1, signers + 1)
+    ]
+    recipients.append(SimpleNamespace(name="Copy", recipient_type="carbon_copy",
+                                      routing_order=1, status="sent"))
+    return SimpleNamespace(
+        id=envelope_id, external_id=f"ext-{envelope_id}", subject=f"Agreement {envelope_id}",
+        status="in_progress", sender_email="hr@example.com", sender_name="HR",
+        sender_employee_id=1, related_entity_type=None, related_entity_id=None,
+        routing_order_enabled=True, recipients=recipients, created_at=datetime(2025, 3, 1),
+        updated_at=None, sent_at=None, completed_at=None, expiration_date=None, voided_at=None,
+    )
+
+
+def compiled(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestListEnvelopes:
+    """Tests for paging envelopes and loading their summaries."""
+
+    user = get_mock_current_user(roles=[UserRole.EMPLOYEE], employee_id=1)
+
+    def test_page_with_total_then_field_counts(self):
+        """Test the page carries its total, and fields are counted, not joined."""
+        session = MagicMock()
+        session.execute.side_effect = [
+            MagicMock(**{"all.return_value": [
+                SimpleNamespace(Envelope=envelope(7, signed=1), total=41),
+                SimpleNamespace(Envelope=envelope(6), total=41),
+            ]}),
+            iter([(7, 50, 20)]),
+        ]
+
+        summaries, total = EnvelopeService(session).list_envelopes(
+            self.user, status=EnvelopeStatusEnum.IN_PROGRESS, page=2, page_size=2,
+        )
+
+        assert total == 41
+        assert [s.id for s in summaries] == [7, 6]
+        assert (summaries[0].completed_count, summaries[0].total_recipients) == (1, 2)
+        assert summaries[0].completion_percentage == 50.0
+        assert summaries[0].workflow_status.waiting_for == ["Signer 2"]
+        assert (summaries[0].fields_total, summaries[0].fields_completed) == (50, 20)
+        assert (summaries[1].fields_total, summaries[1].fields_completed) == (0, 0)
+
+        page_sql = compiled(session.execute.call_args_list[0].args[0])
+        assert "count(*) OVER ()" in page_sql
+        assert "envelope_field" not in page_sql
+        assert "LEFT OUTER JOIN" not in page_sql
+        assert "envelope.message" not in page_sql
+        fields_sql = compiled(session.execute.call_args_list[1].args[0])
+        assert "GROUP BY envelope_field.envelope_id" in fields_sql
+        assert "envelope_field.envelope_id IN" in fields_sql
+
+    def test_past_last_page_counts_separately(self):
+        """Test an empty page past the end still reports the total."""
+        session = MagicMock()
+        session.execute.side_effect = [
+            MagicMock(**{"all.return_value": []}),
+            MagicMock(**{"scalar.return_value": 41}),
+        ]
+
+        summaries, total = EnvelopeService(session).list_envelopes(self.user, page=30)
+
+        assert summaries == []
+        assert total == 41
+        assert session.execute.call_count == 2
+
+    def test_empty_first_page(self):
+        """Test no envelopes needs only the page query."""
+        session = MagicMock()
+        session.execute.return_value.all.return_value = []
+
+        assert EnvelopeService(session).list_envelopes(self.user) == ([], 0)
+        assert session.execute.call_count == 1
@@ -0,0 +1,125 @@
+"""Tests for full-text employee search."""
+
+import re
+from collections import namedtuple
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from src.data.keyset_pagination import CountMode
+from src.services.fulltext_search_service import FullTextSearchService, SearchConfig, SearchQuery
+
+
+Row = namedtuple("Row", "Employee rank")
+
+
+def compiled(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def counted(total):
+    result = MagicMock()
+    result.scalar.return_value = total
+    return result
+
+
+class TestSearchEmployees:
+    """Tests for the employee search query."""
+
+    def test_stored_vector_and_bounded_ranking(self):
+        """Test a broad query uses the stored column and ranks a stable, capped candidate set."""
+        employee = SimpleNamespace(id=7, first_name="Ada", last_name="Lovelace", job_title="Engineer",
+                                   email="ada@example.com", department_id=1, location_id=None,
+                                   is_active=True)
+        session = MagicMock()
+        session.execute.side_effect = [counted(101), iter([Row(employee, 0.5)])]
+        service = FullTextSearchService(session, SearchConfig(rank_all_limit=100, rank_candidates=250))
+
+        response = service.search(SearchQuery(query="ada", count_mode=CountMode.NONE, highlight=False))
+
+        bounded = session.execute.call_args_list[0].args[0]
+        assert 101 in bounded.compile().params.values()
+        statement = session.execute.call_args.args[0]
+        sql = compiled(statement)
+        assert "to_tsvector" not in sql
+        assert "employee.search_vector @@ to_tsquery" in sql
+        assert "ts_rank_cd(employee.search_vector" in sql
+        assert "ORDER BY employee.id" in sql
+        assert 250 in statement.compile().params.values()
+        assert [r.id for r in response.results] == [7]
+        assert response.total_results is None and not response.has_next
+        assert response.results_truncated
+
+    def test_narrow_query_ranks_every_match(self):
+        """Test a query with few enough matches ranks all of them."""
+        session = MagicMock()
+        session.execute.side_effect = [counted(100), iter([])]
+        service = FullTextSearchService(session, SearchConfig(rank_all_limit=100, rank_candidates=50))
+
+        response = service.search(SearchQuery(query="ada", count_mode=CountMode.NONE, highlight=False))
+
+        statement = session.execute.call_args.args[0]
+        assert "ORDER BY employee.id" not in compiled(statement)
+        assert 50 not in statement.compile().params.values()
+        assert not response.results_truncated
+
+    def test_total_capped_at_ranked_candidates(self):
+        """Test more matches than rank_candidates caps the total and flags truncation."""
+        employees = [
+            SimpleNamespace(id=i, first_name="Ada", last_name=f"L{i}", job_title=None,
+                            email=f"ada{i}@example.com", department_id=1, location_id=None,
+                            is_active=True)
+            for i in (3, 2, 1)
+        ]
+        session = MagicMock()
+        session.execute.side_effect = [
+            counted(11), counted(5000), iter([Row(e, 0.5) for e in employees]),
+        ]
+        service = FullTextSearchService(session, SearchConfig(rank_all_limit=10, rank_candidates=3))
+
+        response = service.search(SearchQuery(query="ada", page_size=3, highlight=False))
+
+        assert response.total_results == 3
+        assert response.total_pages == 1
+        assert response.results_truncated
+        assert not response.has_next and response.next_cursor is None
+
+    def test_cursor_pages_through_tied_ranks(self):
+        """Test every match is served exactly once when all ranks tie."""
+        employees = {
+            i: SimpleNamespace(id=i, first_name="Ada", last_name=f"L{i}", job_title=None,
+                               email=f"ada{i}@example.com", department_id=1, location_id=None,
+                               is_active=True)
+            for i in range(1, 8)
+        }
+
+        def execute(statement):
+            # Stands in for Postgres: the keyset row comparison, then LIMIT
+            sql = compiled(statement)
+            if sql.startswith("SELECT count(*)"):
+                return counted(len(employees))
+            params = statement.compile(dialect=postgresql.dialect()).params
+            names = re.findall(r"%\((\w+)\)s", sql)
+            assert "AS DOUBLE PRECISION) AS rank" in sql
+            rows = sorted(((0.1, i) for i in employees), reverse=True)
+            after = sql.split("(candidates.rank, candidates.id) < ", 1)
+            if len(after) == 2:
+                rank, last_id = (params[n] for n in re.findall(r"%\((\w+)\)s", after[1])[:2])
+                rows = [row for row in rows if row < (rank, last_id)]
+            return iter(Row(employees[i], rank) for rank, i in rows[:params[names[-1]]])
+
+        session = MagicMock()
+        session.execute.side_effect = execute
+        service = FullTextSearchService(session)
+
+        seen, cursor = [], None
+        for _ in range(len(employees)):
+            response = service.search(SearchQuery(query="ada", page_size=3, cursor=cursor,
+                                                  count_mode=CountMode.NONE, highlight=False))
+            seen.extend(r.id for r in response.results)
+            cursor = response.next_cursor
+            if cursor is None:
+                break
+
+        assert seen == [7, 6, 5, 4, 3, 2, 1]
@@ -0,0 +1,126 @@
+"""Tests for one-pass reporting-line analytics."""
+
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy.dialects import postgresql
+
+from src.services import org_analytics_service
+from src.services.org_analytics_service import OrgAnalytics, OrgAnalyticsService
+
+
+# 1 heads the org; 2 and 3 report to 1; 4, 5, 6 to 2; 7 to 6
+EDGES = [
+    (1, None, 10, 100),
+    (2, 1, 20, 100),
+    (3, 1, 30, 200),
+    (4, 2, 20, 100),
+    (5, 2, 20, 200),
+    (6, 2, 20, 100),
+    (7, 6, 20, 100),
+]
+
+
+class TestBuild:
+    """Tests for the tree pass."""
+
+    def test_spans_include_every_level(self):
+        """Test total reports, levels and levels below come from the whole subtree."""
+        analytics = OrgAnalytics.build(EDGES, version=3)
+
+        assert sorted(analytics.managers) == [1, 2, 6]
+        top = analytics.managers[1]
+        assert (top.direct_reports, top.total_reports, top.level, top.levels_below) == (2, 6, 0, 3)
+        middle = analytics.managers[2]
+        assert (middle.direct_reports, middle.total_reports, middle.level, middle.levels_below) == (3, 4, 1, 2)
+        assert analytics.managers[6].total_reports == 1
+        assert [span.employee_id for span in analytics.spans()] == [1, 2, 6]
+        assert analytics.version == 3
+
+    def test_headcount_by_department_and_location(self):
+        """Test department and location headcounts, ratios and depth."""
+        analytics = OrgAnalytics.build(EDGES)
+
+        org = analytics.headcount()
+        assert (org.employees, org.managers, org.direct_reports) == (7, 3, 6)
+        assert org.depth == 4
+        assert org.average_depth == (1 + 2 + 2 + 3 + 3 + 3 + 4) / 7
+
+        sales = analytics.headcount(department_id=20)
+        assert (sales.employees, sales.managers, sales.individual_contributors) == (5, 2, 3)
+        assert sales.average_span == 2.0
+        assert sales.depth == 3
+
+        assert analytics.headcount(department_id=20, location_id=200).employees == 1
+        assert analytics.headcount(location_id=100).employees == 5
+        assert analytics.department_ids(location_id=100) == [10, 20]
+        assert analytics.spans(department_id=20, location_id=100)[0].employee_id == 2
+
+    def test_detached_and_cycles(self):
+        """Test reports of missing managers become tops, and cycles are cut once."""
+        edges = [
+            (1, 99, 10, None),  # manager not active
+            (2, 1, 10, None),
+            (3, 4, 10, None),  # 3 and 4 report to each other
+            (4, 3, 10, None),
+            (5, 4, 10, None),
+            (6, 6, 10, None),  # reports to themselves
+        ]
+
+        analytics = OrgAnalytics.build(edges)
+
+        assert analytics.detached == 2
+        assert analytics.cycles == 1
+        assert analytics.headcount().employees == 6
+        cycle = analytics.managers[3] if analytics.managers[3].level == 0 else analytics.managers[4]
+        assert cycle.total_reports == 2
+        assert sum(span.direct_reports for span in analytics.managers.values()) == 3
+
+
+class TestGetAnalytics:
+    """Tests for reading the edges and caching by data version."""
+
+    def test_one_query_with_version(self):
+        """Test the edges and the data version are read in one statement, as arrays."""
+        session = MagicMock()
+        session.execute.return_value.one.return_value = ([1, 2], [None, 1], [10, 10], [100, 100], 5)
+
+        analytics = OrgAnalyticsService(session).build_analytics()
+
+        assert session.execute.call_count == 1
+        sql = str(session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "array_agg(employee.manager_id)" in sql
+        assert "data_version.name" in sql
+        # Unfolded changes count towards the version
+        assert "FROM data_version_change" in sql
+        assert "employee.is_active = true" in sql
+        assert analytics.version == 5
+        assert analytics.managers[1].direct_reports == 1
+
+    def test_no_employees(self):
+        """Test an empty directory, whose arrays aggregate to NULL, builds empty."""
+        session = MagicMock()
+        session.execute.return_value.one.return_value = (None, None, None, None, 5)
+
+        analytics = OrgAnalyticsService(session).build_analytics()
+
+        assert analytics.headcount().employees == 0
+        assert analytics.managers == {}
+        assert analytics.version == 5
+
+    def test_cached_until_version_changes(self):
+        """Test a repeat is served from cache and a new version rebuilds."""
+        session = MagicMock()
+        session.execute.return_value.scalar.side_effect = [11, 11, 12]
+        service = OrgAnalyticsService(session)
+
+        with patch.object(org_analytics_service, "_analytics", org_analytics_service.LocalCache()), \
+                patch.object(service, "build_analytics", side_effect=[
+                    OrgAnalytics(version=11), OrgAnalytics(version=12),
+                ]) as build:
+            first = service.get_analytics()
+            second = service.get_analytics()
+            third = service.get_analytics()
+
+        assert first is second
+        assert third.version == 12
+        assert build.call_count == 2
@@ -0,0 +1,85 @@
+"""Tests for org tree service."""
+
+from unittest.mock import MagicMock
+
+from src.services.org_tree_service import OrgSubtree, OrgTreeEntry, OrgTreeService
+
+
+def make_entry(employee_id: int, depth: int, manager_id=None, direct_reports_count: int = 0):
+    """Create a subtree entry backed by a mock employee."""
+    employee = MagicMock()
+    employee.id = employee_id
+    employee.manager_id = manager_id
+    return OrgTreeEntry(
+        employee=employee,
+        depth=depth,
+        direct_reports_count=direct_reports_count,
+    )
+
+
+class TestOrgSubtree:
+    """Tests for in-memory subtree building."""
+
+    def test_build_links_children_bottom_up(self):
+        """Test nodes are built after their children, in child order."""
+        subtree = OrgSubtree(root_id=1, max_depth=2)
+        subtree.entries = {
+            1: make_entry(1, 0),
+            2: make_entry(2, 1, manager_id=1),
+            3: make_entry(3, 1, manager_id=1),
+            4: make_entry(4, 2, manager_id=2),
+        }
+        subtree.entries[1].child_ids = [2, 3]
+        subtree.entries[2].child_ids = [4]
+
+        calls = []
+
+        def make_node(entry, children):
+            calls.append(entry.employee.id)
+            return {"id": entry.employee.id, "children": children}
+
+        tree = subtree.build(make_node)
+
+        assert tree["id"] == 1
+        assert [c["id"] for c in tree["children"]] == [2, 3]
+        assert tree["children"][0]["children"][0]["id"] == 4
+        assert calls.index(4) < calls.index(2) < calls.index(1)
+        assert len(subtree) == 4
+
+    def test_build_single_node(self):
+        """Test a root without reports builds a leaf node."""
+        subtree = OrgSubtree(root_id=7, max_depth=3)
+        subtree.entries = {7: make_entry(7, 0, direct_reports_count=0)}
+
+        tree = subtree.build(lambda entry, children: (entry.employee.id, children))
+
+        assert tree == (7, [])
+
+
+class TestOrgTreeService:
+    """Tests for OrgTreeService."""
+
+    def test_get_subtree_links_rows_in_query_order(self):
+        """Test rows from the recursive query are linked to their managers."""
+        rows = [
+            (make_entry(1, 0).employee, 0, 2),
+            (make_entry(3, 1, manager_id=1).employee, 1, 0),
+            (make_entry(2, 1, manager_id=1).employee, 1, 1),
+            (make_entry(4, 2, manager_id=2).employee, 2, 5),
+        ]
+        session = MagicMock()
+        session.execute.return_value.unique.return_value = rows
+
+        subtree = OrgTreeService(session).get_subtree(1, max_depth=2)
+
+        assert session.execute.call_count == 1
+        assert subtree.root.child_ids == [3, 2]
+        assert subtree.entries[2].child_ids == [4]
+        assert subtree.entries[4].direct_reports_count == 5
+
+    def test_get_subtree_missing_root(self):
+        """Test a missing root returns None."""
+        session = MagicMock()
+        session.execute.return_value.unique.return_value = []
+
+        assert OrgTreeService(session).get_subtree(99, max_depth=3) is None
@@ -0,0 +1,148 @@
+"""Tests for compiled policy evaluation in PolicyEngineService."""
+
+import json
+from datetime import date, datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.services.policy_engine_service import PolicyEngineService
+from src.services.policy_rules import (
+    compile_policy,
+    get_compiled_policy,
+    invalidate_compiled_policy,
+)
+
+
+TODAY = date(2025, 6, 1)
+
+
+@pytest.fixture(autouse=True)
+def clear_compiled():
+    """Start every test with no compiled policies."""
+    invalidate_compiled_policy()
+    yield
+    invalidate_compiled_policy()
+
+
+def make_policy(policy_id=1, version=1, **overrides):
+    values = dict(
+        id=policy_id,
+        version=version,
+        status="active",
+        effective_date=datetime(2020, 1, 1),
+        expiry_date=None,
+        waiting_period_days=90,
+        base_accrual_rate=10.0,
+        eligibility_criteria=json.dumps([
+            {"field": "employment_type", "operator": "in", "value": ["full_time"]},
+            {"field": "location_id", "operator": "not_in", "value": [9]},
+        ]),
+        tenure_tiers=json.dumps([
+            {"min_years": 5, "max_years": None, "accrual_rate": 20.0},
+            {"min_years": 0, "max_years": 2, "accrual_rate": 12.0},
+            {"min_years": 2, "max_years": 5, "accrual_rate": 15.0},
+        ]),
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def make_employee(employee_id=1, hire_date=date(2022, 1, 1), **overrides):
+    values = dict(
+        id=employee_id,
+        hire_date=hire_date,
+        employment_type="full_time",
+        location_id=1,
+        department_id=1,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+class TestCompiledPolicy:
+    """Tests for policy compilation and caching."""
+
+    def test_tiers_are_sorted_and_bisected(self):
+        """Test the tier containing the tenure is found with its successor."""
+        compiled = compile_policy(make_policy())
+
+        assert compiled.tiers.disjoint
+        assert compiled.tenure_tier(make_employee(), TODAY) == (15.0, 20.0, date(2027, 1, 1))
+        assert compiled.tenure_tier(make_employee(hire_date=date(2010, 1, 1)), TODAY) == (20.0, None, None)
+
+    def test_malformed_rules_are_ignored(self):
+        """Test unparseable criteria leave the employee eligible."""
+        compiled = compile_policy(make_policy(eligibility_criteria="not json"))
+
+        assert compiled.rules == ()
+        assert compiled.check_rules(make_employee(), TODAY) == (True, "Meets all eligibility criteria")
+
+    def test_compiled_once_per_version(self):
+        """Test a policy is compiled once until its version changes."""
+        with patch("src.services.policy_rules.compile_policy", wraps=compile_policy) as compile_mock:
+            get_compiled_policy(make_policy())
+            get_compiled_policy(make_policy())
+            get_compiled_policy(make_policy(version=2))
+
+        assert compile_mock.call_count == 2
+
+    def test_invalidation_drops_all_versions(self):
+        """Test invalidating a policy forces recompilation."""
+        first = get_compiled_policy(make_policy())
+
+        assert invalidate_compiled_policy(1) == 1
+        assert get_compiled_policy(make_policy()) is not first
+
+
+class TestPolicyEngineEligibility:
+    """Tests for PolicyEngineService eligibility evaluation."""
+
+    def test_rule_failure_message(self):
+        """Test the first failing rule's message is returned."""
+        service = PolicyEngineService(MagicMock())
+
+        result = service.evaluate_employee_eligibility(
+            make_employee(employment_type="contract"), make_policy(), TODAY
+        )
+
+        assert result == (False, "Employment type not eligible", None, None)
+
+    def test_evaluate_many_scores_every_pair(self):
+        """Test bulk evaluation covers each employee and policy in order."""
+        service = PolicyEngineService(MagicMock())
+        employees = [
+            make_employee(1),
+            make_employee(2, hire_date=date(2025, 5, 1)),
+            make_employee(3, location_id=9),
+        ]
+        policies = [make_policy(1), make_policy(2, status="archived")]
+
+        results = service.evaluate_many(employees, policies, TODAY)
+
+        assert [e.policy_id for e in results[1]] == [1, 2]
+        assert results[1][0].is_eligible and results[1][0].current_rate == 15.0
+        assert results[2][0].waiting_period_remaining == 59
+        assert results[3][0].status == "Location not eligible"
+        assert all(not r[1].is_eligible for r in results.values())
+
+    def test_evaluate_many_matches_single_evaluation(self):
+        """Test bulk results agree with per-pair evaluation."""
+        service = PolicyEngineService(MagicMock())
+        employee = make_employee(hire_date=date(2019, 3, 15))
+        policy = make_policy()
+
+        evaluation = service.evaluate_many([employee], [policy], TODAY)[employee.id][0]
+
+        assert (
+            evaluation.is_eligible,
+            evaluation.status,
+            evaluation.eligibility_start_date,
+            evaluation.waiting_period_remaining,
+        ) == service.evaluate_employee_eligibility(employee, policy, TODAY)
+        assert (
+            evaluation.current_rate,
+            evaluation.next_rate,
+            evaluation.next_tier_date,
+        ) == service.calculate_tenure_tier(employee, policy, TODAY)
@@ -0,0 +1,81 @@
+"""Tests for team absence service."""
+
+from datetime import date
+from unittest.mock import MagicMock
+
+from src.services.team_absence_service import TeamAbsenceService, TeamAbsenceWindow
+
+
+def make_request(employee_id: int, start: date, end: date, status: str = "approved"):
+    """Create a mock time-off request."""
+    req = MagicMock()
+    req.employee_id = employee_id
+    req.start_date = start
+    req.end_date = end
+    req.status = status
+    return req
+
+
+class TestTeamAbsenceWindow:
+    """Tests for in-memory absence analysis."""
+
+    def test_absence_buckets_merge_overlapping_requests(self):
+        """Test a member is listed once per day even with overlapping requests."""
+        window = TeamAbsenceWindow(start_date=date(2025, 3, 3), end_date=date(2025, 3, 7))
+        window.requests_by_employee = {
+            1: [
+                make_request(1, date(2025, 3, 1), date(2025, 3, 4)),
+                make_request(1, date(2025, 3, 4), date(2025, 3, 5)),
+            ],
+            2: [make_request(2, date(2025, 3, 7), date(2025, 3, 20))],
+            3: [make_request(3, date(2025, 3, 3), date(2025, 3, 7), "pending_approval")],
+        }
+
+        buckets = window.absence_buckets([2, 1, 3])
+
+        assert buckets == [[1], [1], [1], [], [2]]
+
+    def test_overlaps_excludes_requester_and_clips(self):
+        """Test overlaps skip the requester and report clipped ranges."""
+        window = TeamAbsenceWindow(start_date=date(2025, 3, 3), end_date=date(2025, 3, 7))
+        window.requests_by_employee = {
+            1: [make_request(1, date(2025, 3, 3), date(2025, 3, 7), "pending_approval")],
+            2: [make_request(2, date(2025, 3, 1), date(2025, 3, 4))],
+        }
+
+        overlaps = list(window.overlaps(date(2025, 3, 3), date(2025, 3, 7), [1, 2], 1))
+
+        assert [(o[0], o[2], o[3]) for o in overlaps] == [
+            (2, date(2025, 3, 3), date(2025, 3, 4)),
+        ]
+
+
+class TestTeamAbsenceService:
+    """Tests for TeamAbsenceService."""
+
+    def test_load_window_groups_by_employee_in_one_query(self):
+        """Test requests are loaded once and grouped per employee."""
+        rows = [
+            make_request(1, date(2025, 3, 3), date(2025, 3, 4)),
+            make_request(1, date(2025, 3, 6), date(2025, 3, 6)),
+            make_request(2, date(2025, 3, 5), date(2025, 3, 5)),
+        ]
+        session = MagicMock()
+        session.execute.return_value.scalars.return_value = rows
+
+        window = TeamAbsenceService(session).load_window(
+            [1, 2], date(2025, 3, 3), date(2025, 3, 7)
+        )
+
+        assert session.execute.call_count == 1
+        assert len(window.requests_by_employee[1]) == 2
+        assert len(window.requests_by_employee[2]) == 1
+
+    def test_load_window_empty_team(self):
+        """Test an empty team skips the query."""
+        session = MagicMock()
+
+        window = TeamAbsenceService(session).load_window([], date(2025, 3, 3), date(2025, 3, 7))
+
+        session.execute.assert_not_called()
+        assert window.requests_by_employee == {}
@@ -0,0 +1,189 @@
+"""Tests for the in-process cache tier and stampede protection."""
+
+import threading
+import time
+from unittest.mock import PropertyMock, patch
+
+import pytest
+
+from src.infrastructure.redis.caching_service import CachePrefix, CachingService
+from src.infrastructure.redis.local_cache import LocalCache, SingleFlight
+from src.infrastructure.redis.redis_client import MockRedisClient
+
+
+@pytest.fixture
+def client():
+    """Mock Redis shared by every service in a test, like one Redis server."""
+    client = MockRedisClient()
+    with patch.object(CachingService, "redis", new_callable=PropertyMock, return_value=client):
+        yield client
+
+
+class TestLocalCache:
+    """Tests for LocalCache."""
+
+    def test_evicts_least_recently_used(self):
+        """Test the oldest untouched entry is evicted when full."""
+        cache = LocalCache(max_entries=2)
+        cache.set("a", 1, 60)
+        cache.set("b", 2, 60)
+        cache.get("a")
+        cache.set("c", 3, 60)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.evictions == 1
+
+    def test_expired_entries_are_missing(self):
+        """Test entries disappear after their TTL."""
+        cache = LocalCache()
+        cache.set("a", 1, 0.01)
+        time.sleep(0.02)
+
+        assert cache.contains("a") is False
+
+    def test_set_skipped_after_invalidation(self):
+        """Test a store read before a delete does not repopulate the key."""
+        cache = LocalCache()
+        generation = cache.generation
+        cache.delete("a")
+
+        assert cache.set("a", 1, 60, generation) is False
+        assert cache.set("a", 1, 60, cache.generation) is True
+        assert cache.get("a") == 1
+
+
+class TestSingleFlight:
+    """Tests for SingleFlight."""
+
+    def test_concurrent_callers_share_one_call(self):
+        """Test callers arriving mid-flight get the leader's result."""
+        flight = SingleFlight()
+        calls = []
+        started = threading.Event()
+        release = threading.Event()
+
+        def compute():
+            calls.append(1)
+            started.set()
+            release.wait(1)
+            return "value"
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flight.do("k", compute)))
+        leader.start()
+        started.wait(1)
+        followers = [
+            threading.Thread(target=lambda: results.append(flight.do("k", compute)))
+            for _ in range(5)
+        ]
+        for follower in followers:
+            follower.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join(1)
+
+        assert len(calls) == 1
+        assert results == ["value"] * 6
+
+
+class TestTwoTierCache:
+    """Tests for CachingService L1 behaviour."""
+
+    def test_l1_serves_repeat_reads(self, client):
+        """Test a second read of an L1 prefix does not reach Redis."""
+        cache = CachingService()
+        cache.set_policy_constraints(1, {"max_days": 5})
+        cache.get_policy_constraints(1)
+
+        with patch.object(client, "get", side_effect=AssertionError("L2 read")):
+            assert cache.get_policy_constraints(1) == {"max_days": 5}
+
+        metrics = cache.get_metrics().by_prefix["policy"]
+        assert (metrics.l1_hits, metrics.l2_hits) == (1, 1)
+
+    def test_l1_hits_are_independent_copies(self, client):
+        """Test mutating a value read from L1 does not change the cached entry."""
+        cache = CachingService()
+        cache.set_policy_constraints(4, {"max_days": 5, "blackouts": []})
+        cache.get_policy_constraints(4)
+
+        hit = cache.get_policy_constraints(4)
+        hit["blackouts"].append("2025-12-25")
+
+        assert cache.get_policy_constraints(4) == {"max_days": 5, "blackouts": []}
+        assert cache.get_metrics().by_prefix["policy"].l1_hits == 2
+
+    def test_write_on_one_worker_evicts_another(self, client):
+        """Test a write is broadcast so other workers drop their L1 copy."""
+        worker_a = CachingService()
+        worker_b = CachingService()
+        worker_a.set_policy_constraints(1, {"max_days": 5})
+        assert worker_b.get_policy_constraints(1) == {"max_days": 5}
+
+        worker_a.set_policy_constraints(1, {"max_days": 10})
+
+        assert worker_b.get_policy_constraints(1) == {"max_days": 10}
+
+    def test_tag_invalidation_evicts_l1(self, client):
+        """Test tag invalidation reaches other workers' L1."""
+        worker_a = CachingService()
+        worker_b = CachingService()
+        worker_a.set_policy_constraints(2, {"max_days": 5})
+        worker_b.get_policy_constraints(2)
+
+        worker_a.invalidate_policy(2)
+
+        assert worker_b.get_policy_constraints(2) is None
+
+    def test_l1_disabled_without_listener(self, client):
+        """Test L1 is bypassed when invalidations cannot be received."""
+        cache = CachingService()
+        cache.set_policy_constraints(3, {"max_days": 5})
+
+        with patch.object(client, "pubsub", side_effect=ConnectionError("down")):
+            cache.get_policy_constraints(3)
+            cache.get_policy_constraints(3)
+
+        assert cache.get_metrics().by_prefix["policy"].l1_hits == 0
+
+
+class TestGetOrSet:
+    """Tests for CachingService.get_or_set."""
+
+    def test_computes_once_then_hits(self, client):
+        """Test the value is computed on miss and served afterwards."""
+        cache = CachingService()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return {"total": 3}
+
+        first = cache.get_or_set(CachePrefix.BALANCE, "team:1", compute, 300, beta=0)
+        second = cache.get_or_set(CachePrefix.BALANCE, "team:1", compute, 300, beta=0)
+
+        assert first == second == {"total": 3}
+        assert len(calls) == 1
+
+    def test_refreshes_early_near_expiry(self, client):
+        """Test an entry past its XFetch threshold is recomputed."""
+        cache = CachingService()
+        cache.set(CachePrefix.BALANCE, "team:2", {"v": 1, "d": 10.0, "x": time.time() + 1}, 300)
+
+        with patch("src.infrastructure.redis.caching_service.random.random", return_value=0.5):
+            value = cache.get_or_set(CachePrefix.BALANCE, "team:2", lambda: 2, 300)
+
+        assert value == 2
+        assert cache.get_metrics().by_prefix["balance"].early_refreshes == 1
+
+    def test_serves_stale_while_other_worker_refreshes(self, client):
+        """Test a locked refresh returns the stale value instead of waiting."""
+        cache = CachingService()
+        cache.set(CachePrefix.BALANCE, "team:3", {"v": 1, "d": 10.0, "x": time.time() - 1}, 300)
+        client.set("embi:balance:team:3:recompute", "other-worker", ex=30)
+
+        value = cache.get_or_set(CachePrefix.BALANCE, "team:3", lambda: 2, 300)
+
+        assert value == 1
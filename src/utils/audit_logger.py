@@ -12,6 +12,14 @@ from sqlalchemy.orm import Session
 from src.models.import_audit import ActionType, ActorRole, ImportAuditLog
 
 
+class ImportExportAction(str, Enum):
+    """Export actions, which have no import job to attach an audit log to."""
+    
+    EXPORT_STARTED = "export_started"
+    EXPORT_COMPLETED = "export_completed"
+    EXPORT_FAILED = "export_failed"
+
+
 @dataclass
 class ImportExportAuditContext:
     """Context information for import/export audit logging."""
@@ -1,5 +1,6 @@
 """CSV parsing utilities for employee import/export operations."""
 
+import codecs
 import csv
 import hashlib
 import io
@@ -7,7 +8,7 @@ import re
 from dataclasses import dataclass, field
 from datetime import date, datetime
 from decimal import Decimal, InvalidOperation
-from typing import Any, Dict, Generator, List, Optional, Tuple
+from typing import Any, BinaryIO, Dict, Generator, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
 from src.schemas.employee_import import ImportFieldError
 
@@ -44,6 +45,15 @@ EMPLOYEE_FIELDS: Dict[str, str] = {
     "hourly_rate": "decimal",
 }
 
+# Bytes read from a CSV source at a time when streaming
+CSV_READ_CHUNK_SIZE = 64 * 1024
+
+# Characters rendered before a chunk of a streamed CSV is emitted
+CSV_WRITE_CHUNK_SIZE = 64 * 1024
+
+# Raw CSV content or a binary file-like object to stream it from
+CsvSource = Union[bytes, BinaryIO]
+
 # Required fields for employee creation
 REQUIRED_FIELDS = {"employee_id", "email", "first_name", "last_name", "hire_date"}
 
@@ -103,6 +113,18 @@ class ParseResult:
     suggested_mappings: Dict[str, str] = field(default_factory=dict)
 
 
+def to_json_compatible(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert parsed row values (dates, Decimals) for storage in a JSON column."""
+    return {
+        key: (
+            value.isoformat() if isinstance(value, (date, datetime))
+            else str(value) if isinstance(value, Decimal)
+            else value
+        )
+        for key, value in data.items()
+    }
+
+
 def compute_file_checksum(content: bytes) -> str:
     """Compute SHA-256 checksum of file content."""
     return hashlib.sha256(content).hexdigest()
@@ -365,8 +387,131 @@ def parse_csv_row(
     )
 
 
+class CsvStream:
+    """
+    Incrementally decoded, parsed and validated CSV source.
+    
+    Bytes are read in fixed-size chunks from a file-like object (an
+    upload's spooled file, an S3 StreamingBody) or an in-memory bytes
+    value, decoded as UTF-8 with a latin-1 fallback, and split into lines
+    for the csv reader, so memory use is bounded by the chunk and batch
+    sizes rather than the file size. A stream can be iterated once.
+    
+    The checksum and byte count cover what has been read so far and are
+    final once the rows are exhausted.
+    """
+    
+    def __init__(
+        self,
+        source: CsvSource,
+        delimiter: str = ",",
+        skip_first_row: bool = True,
+        custom_mappings: Optional[Dict[str, str]] = None,
+        chunk_size: int = CSV_READ_CHUNK_SIZE,
+    ):
+        """
+        Args:
+            source: Raw CSV content, or a binary file-like object to read
+            delimiter: CSV delimiter character (detected if not supported)
+            skip_first_row: Whether the first row is headers
+            custom_mappings: Custom column to field mappings (overrides auto-detection)
+            chunk_size: Bytes read from the source at a time
+        """
+        self._source: BinaryIO = io.BytesIO(source) if isinstance(source, bytes) else source
+        self._chunk_size = chunk_size
+        self._hasher = hashlib.sha256()
+        self._first_row_number = 2 if skip_first_row else 1
+        self.bytes_read = 0
+        
+        text_chunks = self._iter_text()
+        first_chunk = next(text_chunks, "")
+        
+        # Auto-detect delimiter if needed
+        if not delimiter or delimiter not in [",", ";", "\t", "|"]:
+            delimiter = detect_delimiter(first_chunk[:1000])
+        self.delimiter = delimiter
+        
+        self._reader = csv.DictReader(
+            self._iter_lines(first_chunk, text_chunks),
+            delimiter=delimiter,
+        )
+        self.headers: List[str] = self._reader.fieldnames or []
+        
+        # Generate field mappings
+        self.suggested_mappings = suggest_field_mapping(self.headers)
+        self.field_mappings = custom_mappings if custom_mappings else self.suggested_mappings
+    
+    @property
+    def checksum(self) -> str:
+        """SHA-256 of the bytes read so far."""
+        return self._hasher.hexdigest()
+    
+    def _iter_text(self) -> Iterator[str]:
+        """Read and decode the source chunk by chunk."""
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        
+        while True:
+            chunk = self._source.read(self._chunk_size)
+            if not chunk:
+                break
+            self._hasher.update(chunk)
+            self.bytes_read += len(chunk)
+            
+            try:
+                yield decoder.decode(chunk)
+            except UnicodeDecodeError:
+                # Not UTF-8 after all; decode from here on as latin-1
+                pending, _ = decoder.getstate()
+                decoder = codecs.getincrementaldecoder("latin-1")()
+                yield decoder.decode(pending + chunk)
+        
+        try:
+            yield decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            pending, _ = decoder.getstate()
+            yield pending.decode("latin-1")
+    
+    @staticmethod
+    def _iter_lines(first_chunk: str, text_chunks: Iterator[str]) -> Iterator[str]:
+        """Re-split decoded chunks into newline-terminated lines."""
+        pending = first_chunk
+        for text in text_chunks:
+            pending += text
+            lines = pending.split("\n")
+            pending = lines.pop()
+            for line in lines:
+                yield line + "\n"
+        
+        lines = pending.split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line + "\n"
+        if pending:
+            yield pending
+    
+    def rows(self) -> Iterator[ParsedRow]:
+        """Parse and validate rows one at a time."""
+        for idx, row in enumerate(self._reader, start=self._first_row_number):
+            yield parse_csv_row(row, idx, self.field_mappings)
+    
+    def batches(self, batch_size: int) -> Iterator[List[ParsedRow]]:
+        """Parse and validate rows in lists of at most batch_size."""
+        batch: List[ParsedRow] = []
+        for row in self.rows():
+            batch.append(row)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    
+    def count_rows(self) -> int:
+        """Count the remaining rows without validating them."""
+        return sum(1 for _ in self._reader)
+
+
 def parse_csv_content(
-    content: bytes,
+    content: CsvSource,
     delimiter: str = ",",
     skip_first_row: bool = True,
     custom_mappings: Optional[Dict[str, str]] = None,
@@ -374,8 +519,10 @@ def parse_csv_content(
     """
     Parse CSV content and validate all rows.
     
+    Holds every row in memory; use CsvStream for large files.
+    
     Args:
-        content: Raw CSV file content as bytes
+        content: Raw CSV file content as bytes, or a binary file-like object
         delimiter: CSV delimiter character
         skip_first_row: Whether the first row is headers
         custom_mappings: Custom column to field mappings (overrides auto-detection)
@@ -383,35 +530,13 @@ def parse_csv_content(
     Returns:
         ParseResult with all parsed rows and metadata
     """
-    # Compute checksum
-    file_checksum = compute_file_checksum(content)
-    
-    # Decode content
-    try:
-        text_content = content.decode("utf-8")
-    except UnicodeDecodeError:
-        # Try latin-1 as fallback
-        text_content = content.decode("latin-1")
-    
-    # Auto-detect delimiter if needed
-    if not delimiter or delimiter not in [",", ";", "\t", "|"]:
-        delimiter = detect_delimiter(text_content[:1000])
+    stream = CsvStream(content, delimiter, skip_first_row, custom_mappings)
     
-    # Parse CSV
-    reader = csv.DictReader(io.StringIO(text_content), delimiter=delimiter)
-    headers = reader.fieldnames or []
-    
-    # Generate field mappings
-    auto_mappings = suggest_field_mapping(headers)
-    field_mappings = custom_mappings if custom_mappings else auto_mappings
-    
-    # Parse all rows
     rows: List[ParsedRow] = []
     valid_count = 0
     error_count = 0
     
-    for idx, row in enumerate(reader, start=2 if skip_first_row else 1):
-        parsed_row = parse_csv_row(row, idx, field_mappings)
+    for parsed_row in stream.rows():
         rows.append(parsed_row)
         
         if parsed_row.is_valid:
@@ -421,17 +546,17 @@ def parse_csv_content(
     
     return ParseResult(
         rows=rows,
-        headers=headers,
+        headers=stream.headers,
         total_rows=len(rows),
         valid_rows=valid_count,
         error_rows=error_count,
-        file_checksum=file_checksum,
-        suggested_mappings=auto_mappings,
+        file_checksum=stream.checksum,
+        suggested_mappings=stream.suggested_mappings,
     )
 
 
 def stream_csv_rows(
-    content: bytes,
+    content: CsvSource,
     delimiter: str = ",",
     skip_first_row: bool = True,
     custom_mappings: Optional[Dict[str, str]] = None,
@@ -441,27 +566,16 @@ def stream_csv_rows(
     
     Useful for very large files where loading all rows at once is not feasible.
     """
-    # Decode content
-    try:
-        text_content = content.decode("utf-8")
-    except UnicodeDecodeError:
-        text_content = content.decode("latin-1")
-    
-    # Auto-detect delimiter
-    if not delimiter:
-        delimiter = detect_delimiter(text_content[:1000])
-    
-    # Parse CSV
-    reader = csv.DictReader(io.StringIO(text_content), delimiter=delimiter)
-    headers = reader.fieldnames or []
-    
-    # Generate field mappings
-    auto_mappings = suggest_field_mapping(headers)
-    field_mappings = custom_mappings if custom_mappings else auto_mappings
-    
-    # Yield rows one at a time
-    for idx, row in enumerate(reader, start=2 if skip_first_row else 1):
-        yield parse_csv_row(row, idx, field_mappings)
+    yield from CsvStream(content, delimiter, skip_first_row, custom_mappings).rows()
+
+
+def format_csv_value(value: Any) -> str:
+    """Render a value as a CSV cell."""
+    if value is None:
+        return ""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
 
 
 def generate_csv_content(
@@ -494,19 +608,47 @@ def generate_csv_content(
         writer.writeheader()
     
     for row in data:
-        # Convert values to strings, handling special types
-        string_row = {}
-        for field in fields:
-            value = row.get(field)
-            if value is None:
-                string_row[field] = ""
-            elif isinstance(value, (date, datetime)):
-                string_row[field] = value.isoformat()
-            elif isinstance(value, Decimal):
-                string_row[field] = str(value)
-            else:
-                string_row[field] = str(value)
-        writer.writerow(string_row)
+        writer.writerow({field: format_csv_value(row.get(field)) for field in fields})
     
     return output.getvalue().encode("utf-8")
 
+
+def iter_csv_chunks(
+    rows: Iterable[Sequence[Any]],
+    fields: List[str],
+    include_headers: bool = True,
+    delimiter: str = ",",
+    chunk_size: int = CSV_WRITE_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """
+    Render CSV incrementally, in chunks of about ``chunk_size`` characters.
+    
+    The streaming counterpart of generate_csv_content, with the same output:
+    rows are rendered as they are consumed, so only one chunk is held at a
+    time however many rows there are.
+    
+    Args:
+        rows: Row values in the order of ``fields``
+        fields: Field names, for the header row
+        include_headers: Whether to include a header row
+        delimiter: CSV delimiter character
+        chunk_size: Characters to buffer before emitting a chunk
+    
+    Yields:
+        UTF-8 encoded CSV chunks
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=delimiter)
+    
+    if include_headers:
+        writer.writerow(fields)
+    
+    for row in rows:
+        writer.writerow([format_csv_value(value) for value in row])
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
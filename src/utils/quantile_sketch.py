@@ -0,0 +1,176 @@
+"""
+Mergeable quantile sketch with a relative-error guarantee (DDSketch).
+
+Values are counted in logarithmically sized bins: bin ``i`` holds the values
+in ``(gamma^(i-1), gamma^i]`` with ``gamma = (1 + alpha) / (1 - alpha)``, and
+reports them as the point whose relative distance to both edges is
+``alpha``. Any quantile read back is therefore within ``alpha`` relative
+error of a value actually at that rank: with the default 1%, a true p90 of
+36 hours reads between 35.64 and 36.36.
+
+Two sketches with the same ``alpha`` merge by adding bin counts, and merging
+is exact: the merged sketch is bin for bin the sketch of the combined
+values. That is what lets per-bucket sketches be stored and summed over any
+range later. Size is logarithmic in the value range (about 1,300 bins span
+one millisecond to ten years at 1%), and ``max_bins`` caps it by folding
+the lowest bins together, which only coarsens the smallest quantiles.
+"""
+
+import math
+from typing import Any, Dict, Iterable, Optional
+
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+DEFAULT_MAX_BINS = 2048
+
+# Values at or below this count as zero (they have no finite log bin)
+MIN_INDEXABLE_VALUE = 1e-9
+
+
+class DDSketch:
+    """
+    Quantile sketch over non-negative values.
+
+    Count, sum, min and max are tracked exactly; quantiles are within
+    ``relative_accuracy`` of the true value.
+    """
+
+    def __init__(
+        self,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+        max_bins: int = DEFAULT_MAX_BINS,
+    ):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    # -------------------------------------------------------------------------
+    # Building
+    # -------------------------------------------------------------------------
+
+    def _index(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, index: int) -> float:
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def add(self, value: float, count: int = 1) -> None:
+        """Add a value (``count`` times)."""
+        if value < 0:
+            raise ValueError("DDSketch only accepts non-negative values")
+        if value <= MIN_INDEXABLE_VALUE:
+            self.zero_count += count
+        else:
+            index = self._index(value)
+            self.bins[index] = self.bins.get(index, 0) + count
+            self._collapse()
+
+        self.count += count
+        self.sum += value * count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def extend(self, values: Iterable[float]) -> None:
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: "DDSketch") -> None:
+        """Add another sketch's values to this one."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        if not other.count:
+            return
+
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+        self._collapse()
+
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def _collapse(self) -> None:
+        """Fold the lowest bins into one while over max_bins."""
+        excess = len(self.bins) - self.max_bins
+        if excess <= 0:
+            return
+        lowest = sorted(self.bins)[:excess + 1]
+        folded = sum(self.bins.pop(index) for index in lowest)
+        self.bins[lowest[-1]] = folded
+
+    # -------------------------------------------------------------------------
+    # Reading
+    # -------------------------------------------------------------------------
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Value at quantile ``q`` (0 to 1), or None when empty.
+
+        Ranks like ``percentile_disc``: the first value with at least a
+        fraction ``q`` of all values at or below it. p0 and p100 are the
+        exact min and max, and other results are clamped between them.
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        if not self.count:
+            return None
+
+        if q == 0:
+            return self.min
+        if q == 1:
+            return self.max
+
+        # 1-based rank of the value, as percentile_disc picks it
+        rank = max(math.ceil(q * self.count), 1)
+        if rank <= self.zero_count:
+            return self.min
+
+        seen = self.zero_count
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if seen >= rank:
+                return min(max(self._value(index), self.min), self.max)
+        return self.max
+
+    # -------------------------------------------------------------------------
+    # Storage
+    # -------------------------------------------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serialisable form; bins keyed by string index."""
+        return {
+            "alpha": self.relative_accuracy,
+            "zero": self.zero_count,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max,
+            "bins": {str(index): count for index, count in self.bins.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], max_bins: int = DEFAULT_MAX_BINS) -> "DDSketch":
+        sketch = cls(data["alpha"], max_bins)
+        sketch.bins = {int(index): count for index, count in data["bins"].items()}
+        sketch.zero_count = data["zero"]
+        sketch.count = data["count"]
+        sketch.sum = data["sum"]
+        sketch.min = data["min"]
+        sketch.max = data["max"]
+        return sketch